@@ -0,0 +1,19 @@
+-- Migration: Run records for the process-jobs pipeline.
+-- Each cron / queue / HTTP pipeline run stores its merged stats, per-phase
+-- metrics (limit, processed, errors, elapsed seconds, tier mix) and the
+-- batch plan (chosen sizes + reasons). The batch-size controller in
+-- workers/process-jobs/src/batch_tuning.py reads the most recent rows to
+-- pick the next run's batch sizes.
+
+CREATE TABLE IF NOT EXISTS pipeline_runs (
+  id          INTEGER PRIMARY KEY AUTOINCREMENT,
+  trigger     TEXT NOT NULL,              -- cron | queue | http
+  started_at  TEXT NOT NULL,
+  finished_at TEXT,
+  stats       TEXT,                       -- JSON: merged stats
+  phases      TEXT,                       -- JSON: per-phase metrics
+  plan        TEXT,                       -- JSON: per-phase {limit, reasons}
+  created_at  TEXT NOT NULL DEFAULT (datetime('now'))
+);
+
+CREATE INDEX IF NOT EXISTS idx_pipeline_runs_started_at ON pipeline_runs (started_at);
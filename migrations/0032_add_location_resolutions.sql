@@ -0,0 +1,20 @@
+-- Migration: Persisted location resolutions for the eu-classifier.
+-- Maps a normalized (lowercased, trimmed) job location string to what the
+-- location alone says: country code, EU membership, EU country names and
+-- the "Remote" flag. Fresh Worker isolates warm their in-memory LRU from the
+-- most-hit rows; each classify batch upserts the locations it looked up.
+-- Rows from an older resolver version are ignored and overwritten.
+-- See workers/eu-classifier/src/location_cache.py.
+
+CREATE TABLE IF NOT EXISTS location_resolutions (
+  location          TEXT PRIMARY KEY,         -- normalized location string
+  country_code      TEXT,                     -- ISO 3166-1 alpha-2, NULL if none
+  is_eu             INTEGER NOT NULL DEFAULT 0,
+  eu_country_names  TEXT NOT NULL DEFAULT '[]', -- JSON array
+  is_remote         INTEGER NOT NULL DEFAULT 0,
+  hits              INTEGER NOT NULL DEFAULT 0,
+  version           INTEGER NOT NULL,
+  updated_at        TEXT NOT NULL DEFAULT (datetime('now'))
+);
+
+CREATE INDEX IF NOT EXISTS idx_location_resolutions_hits ON location_resolutions (version, hits);
@@ -0,0 +1,15 @@
+-- Migration: Per-company remote-policy evidence for the eu-classifier.
+-- Each high-confidence verdict on a company's remote posting adds to
+-- eu_score / non_eu_score, pre-multiplied by 2^(t / 30 days) so the upsert is
+-- a plain sum and the decayed evidence is score / 2^(now / 30 days).
+-- Once enough consistent evidence exists, new postings from the company are
+-- classified from this prior (source "company-policy") instead of an LLM.
+-- See workers/eu-classifier/src/company_policy.py.
+
+CREATE TABLE IF NOT EXISTS company_remote_policies (
+  company_key   TEXT PRIMARY KEY,
+  eu_score      REAL NOT NULL DEFAULT 0,
+  non_eu_score  REAL NOT NULL DEFAULT 0,
+  jobs          INTEGER NOT NULL DEFAULT 0,   -- verdicts recorded (undecayed)
+  updated_at    TEXT NOT NULL DEFAULT (datetime('now'))
+);
@@ -0,0 +1,27 @@
+-- Migration: Workers AI model-routing decisions and outcomes.
+-- One row per model call made through the model router (process-jobs,
+-- eu-classifier, job-matcher): which model was picked for which task, why
+-- (default / long-input / hard-signals / rolling-stats / explore / escalated),
+-- the input size, latency and whether the answer held up. Workers warm their
+-- rolling per-model stats from the latest rows; the table is also the data
+-- for evaluating the routing policy offline.
+-- See workers/process-jobs/src/model_router.py.
+
+CREATE TABLE IF NOT EXISTS llm_routing_log (
+  id              INTEGER PRIMARY KEY AUTOINCREMENT,
+  worker          TEXT NOT NULL,
+  task            TEXT NOT NULL,              -- role_tag | eu_classify | skills | title_score | chat
+  model           TEXT NOT NULL,
+  step            INTEGER NOT NULL,           -- position in the task's route (0 = smallest)
+  reason          TEXT NOT NULL,
+  input_chars     INTEGER NOT NULL,
+  hard            INTEGER NOT NULL DEFAULT 0, -- signals marked the input as hard
+  escalated_from  TEXT,                       -- previous model when escalated
+  outcome         TEXT NOT NULL,              -- accepted | unsure | escalated | failed
+  ok              INTEGER NOT NULL,           -- counted as correct in rolling accuracy
+  latency_ms      REAL,
+  created_at      TEXT NOT NULL DEFAULT (datetime('now'))
+);
+
+CREATE INDEX IF NOT EXISTS idx_llm_routing_log_worker ON llm_routing_log(worker, id);
+CREATE INDEX IF NOT EXISTS idx_llm_routing_log_task_model ON llm_routing_log(task, model);
@@ -0,0 +1,15 @@
+-- Migration: Freshness-priority scheduling for the processing backlog.
+-- process-jobs scores each job once, before Phase 1 selects it, from
+-- freshness, source kind, the role keyword heuristic and the company's
+-- EU-remote history (priority, 0..1). priority_rank is the sort key every
+-- phase selector orders by: priority minus 0.01 per hour between
+-- 2025-01-01 and scoring time, so jobs that have waited longer age upward
+-- without being rewritten. Unscored rows (NULL) sort last.
+-- See workers/process-jobs/src/priority.py.
+
+ALTER TABLE jobs ADD COLUMN priority REAL;
+ALTER TABLE jobs ADD COLUMN priority_rank REAL;
+
+CREATE INDEX IF NOT EXISTS idx_jobs_status_priority_rank ON jobs(status, priority_rank);
+-- The scoring pass reads the newest unscored jobs
+CREATE INDEX IF NOT EXISTS idx_jobs_unscored ON jobs(created_at) WHERE priority IS NULL;
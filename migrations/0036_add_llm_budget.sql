@@ -0,0 +1,25 @@
+-- Migration: shared DeepSeek rate limit and daily spend budget.
+-- llm_rate_windows counts requests per provider per minute (window_start =
+-- epoch minute); workers lease a few requests at a time with one upsert
+-- that refuses to go past DEEPSEEK_RPM. llm_budget_ledger accumulates
+-- requests, tokens and estimated USD per provider per UTC day and is
+-- checked against DEEPSEEK_DAILY_TOKENS / DEEPSEEK_DAILY_USD.
+-- Used by process-jobs, eu-classifier, job-matcher and job-reporter-llm.
+-- See workers/process-jobs/src/llm_budget.py.
+
+CREATE TABLE IF NOT EXISTS llm_rate_windows (
+  provider      TEXT NOT NULL,
+  window_start  INTEGER NOT NULL,            -- unix epoch minute
+  requests      INTEGER NOT NULL DEFAULT 0,  -- leased, not necessarily sent
+  PRIMARY KEY (provider, window_start)
+);
+
+CREATE TABLE IF NOT EXISTS llm_budget_ledger (
+  provider    TEXT NOT NULL,
+  day         TEXT NOT NULL,                 -- YYYY-MM-DD (UTC)
+  requests    INTEGER NOT NULL DEFAULT 0,
+  tokens      INTEGER NOT NULL DEFAULT 0,    -- prompt + completion
+  cost_usd    REAL NOT NULL DEFAULT 0,       -- list-price estimate
+  updated_at  TEXT NOT NULL DEFAULT (datetime('now')),
+  PRIMARY KEY (provider, day)
+);
@@ -0,0 +1,33 @@
+-- Migration: near-duplicate postings (same role from several sources, or
+-- one job posted per city). process-jobs fingerprints jobs as they reach
+-- 'enhanced' with a 64-value MinHash over word 3-grams of title +
+-- description; job_lsh_bands holds one bucket per band of 4 values, so
+-- earlier copies are found with one indexed lookup. Clustered jobs copy
+-- role tags, skills and (same location only) the EU verdict from an
+-- already-processed copy instead of paying for them again.
+--   dup_cluster_id  cluster the job belongs to (its own id when unique;
+--                   NULL until fingerprinted)
+--   dup_of          closest verified copy, dup_similarity its estimated Jaccard
+-- See workers/process-jobs/src/dedup.py.
+
+ALTER TABLE jobs ADD COLUMN dup_cluster_id INTEGER;
+ALTER TABLE jobs ADD COLUMN dup_of INTEGER;
+ALTER TABLE jobs ADD COLUMN dup_similarity REAL;
+
+CREATE INDEX IF NOT EXISTS idx_jobs_dup_cluster ON jobs(dup_cluster_id);
+-- The fingerprinting pass reads jobs that have no cluster yet
+CREATE INDEX IF NOT EXISTS idx_jobs_unfingerprinted ON jobs(created_at) WHERE dup_cluster_id IS NULL;
+
+CREATE TABLE IF NOT EXISTS job_fingerprints (
+  job_id      INTEGER PRIMARY KEY,
+  signature   TEXT NOT NULL,                       -- 64 x 8 hex digits
+  created_at  TEXT NOT NULL DEFAULT (datetime('now'))
+);
+
+CREATE TABLE IF NOT EXISTS job_lsh_bands (
+  bucket  INTEGER NOT NULL,                        -- 48-bit hash of (band, band values)
+  job_id  INTEGER NOT NULL,
+  PRIMARY KEY (bucket, job_id)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_job_lsh_bands_job ON job_lsh_bands(job_id);
@@ -0,0 +1,13 @@
+-- Migration: kNN role tagging (workers/process-jobs/src/role_knn.py).
+-- Phase 2 embeds ambiguous jobs with bge-base-en-v1.5 and lets the nearest
+-- previously labelled jobs in the ROLE_INDEX Vectorize index vote before any
+-- chat completion. High-confidence labels from the heuristic / LLM tiers are
+-- added to the index each run, newest first; role_indexed_at marks the jobs
+-- already in it. Create the index once:
+--   npx wrangler vectorize create role-tags-index --dimensions=768 --metric=cosine
+
+ALTER TABLE jobs ADD COLUMN role_indexed_at TEXT;
+
+-- The indexing pass reads labelled jobs not yet in the index
+CREATE INDEX IF NOT EXISTS idx_jobs_role_unindexed ON jobs(id)
+  WHERE role_indexed_at IS NULL AND role_confidence = 'high';
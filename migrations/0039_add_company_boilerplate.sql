@@ -0,0 +1,18 @@
+-- Migration: per-company boilerplate models (workers/process-jobs/src/boilerplate.py).
+-- Phase 1 learns, per company_key, the word 4-gram shingles that recur in
+-- most of the company's postings (one per duplicate cluster, newest 40).
+-- Phases 2 and 4 drop description blocks made of those shingles ("About us",
+-- benefits, EEO) from the text the role heuristic and the tagging / skill
+-- prompts see. jobs.description itself is never rewritten.
+--   shingles       sorted big-endian uint32 crc32 values, base64 ('' when the
+--                  company had too few postings; rechecked after 7 days)
+--   shingle_count  number of shingles in the model
+--   postings       postings the model was learned from
+
+CREATE TABLE IF NOT EXISTS company_boilerplate (
+  company_key    TEXT PRIMARY KEY,
+  shingles       TEXT NOT NULL,
+  shingle_count  INTEGER NOT NULL DEFAULT 0,
+  postings       INTEGER NOT NULL DEFAULT 0,
+  updated_at     TEXT NOT NULL DEFAULT (datetime('now'))
+);
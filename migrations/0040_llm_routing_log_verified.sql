@@ -0,0 +1,13 @@
+-- Migration: verified routing outcomes and retention for llm_routing_log.
+-- ok used to be the model's own accept() flag (its confidence), which says
+-- nothing about whether the answer was right. Rolling accuracy now only
+-- counts rows with verified = 1: answers compared with the top model's
+-- (after an escalation, or on an audit run) and failed calls. Older rows
+-- keep verified = 0 and stop steering the router.
+-- Each worker deletes its own rows older than 30 days when it warms up
+-- (model_router.PRUNE_SQL); the created_at index keeps that cheap.
+-- See workers/lib/python/model_router.py.
+
+ALTER TABLE llm_routing_log ADD COLUMN verified INTEGER NOT NULL DEFAULT 0;
+
+CREATE INDEX IF NOT EXISTS idx_llm_routing_log_created ON llm_routing_log(worker, created_at);
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+bench-eu-scanner.py — Compare the separate description regexes with the single-pass scanner.
+
+"separate" reproduces the previous per-job work: NEGATIVE_EU_PATTERN,
+US_IMPLICIT_PATTERN and EU_TIMEZONE_PATTERN over location + the first 8,000
+description chars, then the heuristic's explicit / vague worldwide patterns
+(compiled per call) and the EU-eligibility search over the full description.
+"single-pass" is scanner.scan_text over the same text.
+
+Runs on the synthetic rows from bench-eu-signals.py and on adversarial
+descriptions (long whitespace runs, thousands of "remote" tokens on one
+line with no "eu") where the old ``remote.*\\beu\\b`` alternative is
+quadratic.
+
+Usage:
+    python3 scripts/bench-eu-scanner.py [--rows 20000] [--seed 7] [--adversarial-chars 50000]
+"""
+
+import argparse
+import importlib.util
+import os
+import random
+import re
+import sys
+import time
+
+HERE = os.path.dirname(__file__)
+sys.path.insert(0, os.path.join(HERE, "..", "workers", "eu-classifier", "src"))
+
+from constants import (  # noqa: E402
+    EU_TIMEZONE_PATTERN,
+    NEGATIVE_EU_PATTERN,
+    US_IMPLICIT_PATTERN,
+    normalize_text_for_signals,
+)
+from scanner import scan_text  # noqa: E402
+
+_spec = importlib.util.spec_from_file_location("bench_eu_signals", os.path.join(HERE, "bench-eu-signals.py"))
+_bench = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(_bench)
+synthetic_row = _bench.synthetic_row
+
+
+def separate_scans(location: str, description: str) -> None:
+    full_text = normalize_text_for_signals(f"{location} {description[:8000]}")
+    [m.group(0) for m in NEGATIVE_EU_PATTERN.finditer(full_text)]
+    [m.group(0) for m in US_IMPLICIT_PATTERN.finditer(full_text)]
+    EU_TIMEZONE_PATTERN.search(full_text)
+
+    desc_lower = normalize_text_for_signals(description)
+    re.compile(
+        r"\b(anywhere in the world|work from anywhere"
+        r"|location.agnostic|digital nomad)\b",
+        re.IGNORECASE,
+    ).search(desc_lower)
+    re.compile(
+        r"\b(global(?:ly)?|worldwide|distributed team|fully distributed"
+        r"|remote.first|remote.friendly)\b",
+        re.IGNORECASE,
+    ).search(desc_lower)
+    re.search(
+        r"\b(eu\s+(?:based|eligible|residents?|citizens?|work\s*(?:authorization|permit))"
+        r"|european\s+(?:union|economic\s+area)"
+        r"|remote.*\beu\b"
+        r"|emea)"
+        r"\b",
+        desc_lower,
+        re.IGNORECASE,
+    )
+
+
+def single_pass(location: str, description: str) -> None:
+    scan_text(normalize_text_for_signals(location), normalize_text_for_signals(description))
+
+
+def time_inputs(fn, inputs: list[tuple[str, str]]) -> float:
+    t0 = time.perf_counter()
+    for location, description in inputs:
+        fn(location, description)
+    return time.perf_counter() - t0
+
+
+def adversarial_inputs(chars: int) -> dict[str, tuple[str, str]]:
+    return {
+        "remote tokens, no eu": ("remote", ("remote " * (chars // 7))[:chars]),
+        "whitespace runs":      ("", ("medical," + " " * 200 + "dental " + "cet" + " " * 200) * (chars // 420)),
+        "long single word":     ("", "a" * chars),
+        "dollar / digits":      ("", ("$" + "9" * 40 + " usd ") * (chars // 46)),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--adversarial-chars", type=int, default=50_000)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    inputs = []
+    for i in range(args.rows):
+        row = synthetic_row(rng, i)
+        inputs.append((row["location"].lower(), row["description"].lower()))
+    print(f"Generated {len(inputs):,} synthetic rows")
+
+    per_job = 1e6 / len(inputs)
+    old = time_inputs(separate_scans, inputs)
+    new = time_inputs(single_pass, inputs)
+    print(f"\nsynthetic rows:  separate {old * per_job:7.1f} µs/job   single-pass {new * per_job:7.1f} µs/job")
+
+    print(f"\nadversarial inputs ({args.adversarial_chars:,} chars):")
+    for name, text in adversarial_inputs(args.adversarial_chars).items():
+        old = time_inputs(separate_scans, [text])
+        new = time_inputs(single_pass, [text])
+        print(f"  {name:<22} separate {old * 1e3:9.1f} ms   single-pass {new * 1e3:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
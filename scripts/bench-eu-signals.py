@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+bench-eu-signals.py — Benchmark eu-classifier signal extraction on synthetic ATS rows.
+
+Builds N synthetic job rows shaped like the D1 SELECT in classify_batch
+(location, country, workplace_type, offices, categories, ashby_* columns,
+description) and times extract_eu_signals_batch + format_signals.
+
+Usage:
+    python3 scripts/bench-eu-signals.py [--rows 100000] [--seed 7] [--repeat 3]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "workers", "eu-classifier", "src"))
+
+from signals import _loads_json_column, extract_eu_signals_batch, format_signals  # noqa: E402
+
+LOCATIONS = [
+    "Remote", "Remote - EU", "Berlin, Germany", "USA | Remote", "Remote (Europe)",
+    "London, UK", "Amsterdam", "Paris, France / Remote", "New York, NY", "Worldwide",
+    "Lisbon, Portugal", "Remote – EMEA", "San Francisco, CA", "Toronto, Canada", "",
+]
+COUNTRIES = ["", "DE", "US", "FR", "Netherlands", "GB", "PT", "united states", "CA", "ES"]
+WORKPLACE = ["", "remote", "hybrid", "onsite", "Remote"]
+SOURCES = ["greenhouse", "lever", "ashby", "remoteok", "remotive"]
+DESCRIPTION_PARTS = [
+    "We are a fully distributed team building developer tooling.",
+    "Candidates must be based in the US and have US work authorization.",
+    "Competitive salary of $150k plus 401(k) and medical, dental and vision.",
+    "You will collaborate during European business hours (CET +/- 2).",
+    "This is an on-site role in our downtown office.",
+    "EU based candidates welcome; we sponsor work permits across the European Union.",
+    "Work from anywhere in the world.",
+    "Experience with React, TypeScript and LLM tooling is a plus.",
+]
+
+
+def synthetic_row(rng: random.Random, i: int) -> dict:
+    location = rng.choice(LOCATIONS)
+    offices = [{"name": rng.choice(LOCATIONS) or "HQ"} for _ in range(rng.randint(0, 3))]
+    return {
+        "id": i,
+        "title": "Software Engineer",
+        "location": location,
+        "country": rng.choice(COUNTRIES),
+        "workplace_type": rng.choice(WORKPLACE),
+        "ashby_is_remote": rng.choice([0, 1, None]),
+        "source_kind": rng.choice(SOURCES),
+        "company_key": f"company{i % 500}",
+        "offices": json.dumps(offices),
+        "categories": json.dumps({"allLocations": [location, rng.choice(LOCATIONS)]}),
+        "ashby_secondary_locations": json.dumps([{"location": rng.choice(LOCATIONS)}]),
+        "ashby_address": json.dumps({"postalAddress": {"addressCountry": rng.choice(COUNTRIES)}}),
+        "description": " ".join(rng.choice(DESCRIPTION_PARTS) for _ in range(rng.randint(4, 40))),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    rows = [synthetic_row(rng, i) for i in range(args.rows)]
+    print(f"Generated {len(rows):,} synthetic rows")
+
+    best_extract = best_format = float("inf")
+    for run in range(args.repeat):
+        _loads_json_column.cache_clear()
+
+        t0 = time.perf_counter()
+        signals = extract_eu_signals_batch(rows)
+        t1 = time.perf_counter()
+        for s in signals:
+            format_signals(s)
+        t2 = time.perf_counter()
+
+        best_extract = min(best_extract, t1 - t0)
+        best_format = min(best_format, t2 - t1)
+        print(f"  run {run + 1}: extract {t1 - t0:.2f}s, format {t2 - t1:.2f}s")
+
+    per_job = 1e6 / len(rows)
+    info = _loads_json_column.cache_info()
+    print(f"\nextract_eu_signals_batch: {best_extract * per_job:.1f} µs/job (best of {args.repeat})")
+    print(f"format_signals:           {best_format * per_job:.1f} µs/job")
+    print(f"JSON column cache:        {info.hits:,} hits / {info.misses:,} misses")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+bench-gazetteer.py — Microbenchmark for the eu-classifier city / region gazetteer.
+
+Reports the lazy build time, the parsed trie's memory footprint against its
+budget, and per-lookup latency for typical ATS location strings.
+
+Usage:
+    python3 scripts/bench-gazetteer.py [--lookups 200000]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "workers", "eu-classifier", "src"))
+
+import gazetteer  # noqa: E402
+
+SAMPLES = [
+    "Remote - Lisbon", "Amsterdam or Munich", "Barcelona / Warsaw", "Hybrid, Dublin",
+    "San Francisco, CA", "Remote", "New York City, NY", "Frankfurt am Main, Germany",
+    "Zürich, Switzerland", "Remote (Europe)", "Kraków", "Toronto | Remote",
+]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("--lookups", type=int, default=200_000)
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    gazetteer.find_places("warm up")
+    build_ms = (time.perf_counter() - t0) * 1000
+
+    footprint = gazetteer.memory_footprint()
+    print(f"Build (lazy, first lookup): {build_ms:.1f} ms")
+    print(f"Trie footprint:             {footprint / 1024:.0f} KiB "
+          f"(budget {gazetteer.MEMORY_BUDGET_BYTES / 1024:.0f} KiB)")
+
+    n = args.lookups
+    t0 = time.perf_counter()
+    for i in range(n):
+        gazetteer.country_for(SAMPLES[i % len(SAMPLES)])
+    elapsed = time.perf_counter() - t0
+    print(f"country_for:                {elapsed / n * 1e6:.2f} µs/lookup over {n:,} lookups")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+bench-prompt-layer.py — Compare the in-house ChatPrompt layer with the langchain path it replaced.
+
+Measures the three costs the LLM workers (process-jobs, eu-classifier) paid
+for langchain on every isolate and every call:
+
+  cold start   wall time of a fresh interpreter importing the prompt layer
+               (chat_prompt + prompts) vs langchain_core.prompts +
+               langchain_cloudflare — the imports entry.py used to run
+  per call     building one CLASSIFICATION_PROMPT request body:
+                 langchain   ChatPromptTemplate.format_messages + role map + json.dumps
+                 formatted   ChatPrompt.format_messages + json.dumps (no pre-serialization)
+                 prebuilt    ChatPrompt.request_body (static system message pre-encoded)
+  bundle size  bytes under a worker's python_modules/ that only langchain
+               needed (langchain*, langgraph*, langsmith and the tenacity /
+               ormsgpack / xxhash stubs) vs the whole directory
+
+The langchain columns are skipped when langchain-core / langchain-cloudflare
+aren't installed. Run it once on a checkout from before the switch (with the
+old python_modules/) and once after to get the before / after numbers.
+
+Usage:
+    python3 scripts/bench-prompt-layer.py [--calls 20000] [--imports 10]
+        [--python-modules workers/process-jobs/python_modules]
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+import time
+
+HERE = os.path.dirname(__file__)
+SRC  = os.path.join(HERE, "..", "workers", "eu-classifier", "src")
+sys.path.insert(0, SRC)
+
+from prompts import CLASSIFICATION_PROMPT  # noqa: E402
+
+LANGCHAIN_PREFIXES = ("langchain", "langgraph", "langsmith", "tenacity", "ormsgpack", "xxhash")
+
+VALUES = {
+    "title":              "Senior Frontend Engineer (React)",
+    "location":           "Remote — Europe",
+    "description":        "We are a fully distributed team hiring across the EU. " * 100,
+    "structured_signals": "ats_remote=true; countries=DE,FR,NL; timezone=CET",
+}
+FIELDS = {"model": "deepseek-chat", "temperature": 0.3, "response_format": {"type": "json_object"}}
+
+
+def have(module: str) -> bool:
+    return importlib.util.find_spec(module) is not None
+
+
+def import_ms(statement: str, runs: int) -> float:
+    """Best-of-``runs`` wall time (ms) of a fresh interpreter running ``statement``."""
+    base = min(_spawn_ms("pass") for _ in range(runs))
+    return max(0.0, min(_spawn_ms(statement) for _ in range(runs)) - base)
+
+
+def _spawn_ms(statement: str) -> float:
+    env = {**os.environ, "PYTHONPATH": SRC, "PYTHONDONTWRITEBYTECODE": "1"}
+    t0  = time.perf_counter()
+    subprocess.run([sys.executable, "-c", statement], env=env, check=True)
+    return (time.perf_counter() - t0) * 1e3
+
+
+def per_call_us(fn, calls: int) -> float:
+    t0 = time.perf_counter()
+    for _ in range(calls):
+        fn()
+    return (time.perf_counter() - t0) * 1e6 / calls
+
+
+def langchain_body():
+    from langchain_core.prompts import ChatPromptTemplate
+
+    prompt   = ChatPromptTemplate.from_messages([
+        ("human" if role == "user" else role, template) for role, template in CLASSIFICATION_PROMPT.messages
+    ])
+    role_map = {"system": "system", "human": "user", "ai": "assistant"}
+
+    def build():
+        messages = [
+            {"role": role_map.get(m.type, m.type), "content": m.content}
+            for m in prompt.format_messages(**VALUES)
+        ]
+        return json.dumps({**FIELDS, "messages": messages})
+    return build
+
+
+def dir_bytes(path: str) -> int:
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    return sum(
+        os.path.getsize(os.path.join(root, name))
+        for root, _, names in os.walk(path) for name in names
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("--calls", type=int, default=20_000)
+    parser.add_argument("--imports", type=int, default=10)
+    parser.add_argument("--python-modules", default=os.path.join(HERE, "..", "workers", "process-jobs", "python_modules"))
+    args = parser.parse_args()
+
+    langchain = have("langchain_core")
+
+    print("cold start (fresh interpreter, best of %d):" % args.imports)
+    print(f"  chat_prompt + prompts          {import_ms('import prompts', args.imports):8.1f} ms")
+    if langchain:
+        statement = "import langchain_core.prompts"
+        if have("langchain_cloudflare"):
+            statement += "; import langchain_cloudflare"
+        print(f"  langchain                      {import_ms(statement, args.imports):8.1f} ms   ({statement})")
+    else:
+        print("  langchain                      not installed — skipped")
+
+    prebuilt  = lambda: CLASSIFICATION_PROMPT.request_body(VALUES, **FIELDS)  # noqa: E731
+    formatted = lambda: json.dumps({**FIELDS, "messages": CLASSIFICATION_PROMPT.format_messages(**VALUES)})  # noqa: E731
+    assert json.loads(prebuilt()) == json.loads(formatted())
+
+    print(f"\nper call ({args.calls:,} CLASSIFICATION_PROMPT request bodies):")
+    if langchain:
+        build = langchain_body()
+        assert json.loads(build()) == json.loads(prebuilt())
+        print(f"  langchain   {per_call_us(build, args.calls):8.1f} µs/call")
+    print(f"  formatted   {per_call_us(formatted, args.calls):8.1f} µs/call")
+    print(f"  prebuilt    {per_call_us(prebuilt, args.calls):8.1f} µs/call")
+
+    modules = os.path.realpath(args.python_modules)
+    print(f"\nbundle ({modules}):")
+    if not os.path.isdir(modules):
+        print("  not found — run `uv run pywrangler sync` in the worker first")
+        return
+    entries = os.listdir(modules)
+    total   = sum(dir_bytes(os.path.join(modules, e)) for e in entries)
+    lc      = sum(dir_bytes(os.path.join(modules, e)) for e in entries if e.lower().startswith(LANGCHAIN_PREFIXES))
+    print(f"  python_modules total   {total / 1e6:7.2f} MB")
+    print(f"  langchain-only         {lc / 1e6:7.2f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+profile-worker-imports.py — Per-module import times of each Python worker's main module under CPython.
+
+Loads every Python worker's ``main`` module (from its wrangler config) in a
+fresh interpreter with the worker's own ``import_profile.IMPORT_PROFILE``
+hooked in, exactly as the module does on a cold isolate, and prints the
+same ``report()`` that ``GET /health`` returns under ``imports``: module
+init time and the slowest first imports (inclusive and self ms). Use it to
+decide what to lazy-load.
+
+Runtime-only modules (``js``, ``workers``, ``pyodide``) can't be imported
+under CPython; they are replaced by inert placeholders, which show up at
+~0 ms. A worker whose other dependencies aren't installed locally is
+reported with the ImportError instead.
+
+Usage:
+    python3 scripts/profile-worker-imports.py [--worker process-jobs] [--top 15] [--runs 3] [--json]
+"""
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+
+HERE    = os.path.dirname(os.path.abspath(__file__))
+WORKERS = os.path.join(HERE, "..", "workers")
+
+RUNTIME_MODULES = ("js", "workers", "pyodide", "pyodide.ffi")
+
+# Runs in the child interpreter: placeholder runtime modules, then import
+# the main module and dump the profile it recorded.
+CHILD = r"""
+import importlib.abc, importlib.machinery, json, sys, types
+
+class _RuntimeMeta(type):
+    def __getattr__(cls, name):
+        return _runtime_class(name)
+
+class _Runtime(metaclass=_RuntimeMeta):
+    def __init__(self, *args, **kwargs):
+        pass
+    def __getattr__(self, name):
+        return _runtime_class(name)()
+    def __call__(self, *args, **kwargs):
+        return _Runtime()
+
+def _runtime_class(name):
+    return _RuntimeMeta(name, (_Runtime,), {})
+
+class _RuntimeFinder(importlib.abc.MetaPathFinder, importlib.abc.Loader):
+    def find_spec(self, name, path, target=None):
+        if name in RUNTIME_MODULES:
+            return importlib.machinery.ModuleSpec(name, self, is_package=True)
+        return None
+    def create_module(self, spec):
+        module = types.ModuleType(spec.name)
+        module.__path__ = []
+        module.__getattr__ = _runtime_class
+        return module
+    def exec_module(self, module):
+        pass
+
+sys.meta_path.insert(0, _RuntimeFinder())
+sys.path.insert(0, SRC)
+try:
+    __import__(MAIN)
+except Exception as exc:
+    print(json.dumps({"error": f"{type(exc).__name__}: {exc}"}))
+else:
+    from import_profile import IMPORT_PROFILE
+    print(json.dumps(IMPORT_PROFILE.report(TOP)))
+"""
+
+
+def python_workers() -> dict[str, str]:
+    """worker name -> path of its Python main module."""
+    found = {}
+    for name in sorted(os.listdir(WORKERS)):
+        for config in ("wrangler.jsonc", "wrangler.toml"):
+            path = os.path.join(WORKERS, name, config)
+            if not os.path.isfile(path):
+                continue
+            match = re.search(r'"?main"?\s*[:=]\s*"([^"]+\.py)"', open(path).read())
+            if match:
+                found[name] = os.path.join(WORKERS, name, match.group(1))
+            break
+    return found
+
+
+def profile(main: str, top: int) -> dict:
+    src    = os.path.dirname(main)
+    module = os.path.splitext(os.path.basename(main))[0]
+    code   = (
+        f"RUNTIME_MODULES = {RUNTIME_MODULES!r}\nSRC = {src!r}\nMAIN = {module!r}\nTOP = {top}\n"
+        + CHILD
+    )
+    env  = {**os.environ, "PYTHONDONTWRITEBYTECODE": "1"}
+    proc = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, cwd=src, env=env)
+    lines = [line for line in proc.stdout.splitlines() if line.startswith("{")]
+    if proc.returncode or not lines:
+        return {"error": (proc.stderr.strip().splitlines() or ["no output"])[-1]}
+    return json.loads(lines[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("--worker", action="append", help="limit to these workers (repeatable)")
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--runs", type=int, default=3, help="fresh interpreters per worker; fastest init kept")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    workers = python_workers()
+    if args.worker:
+        workers = {k: v for k, v in workers.items() if k in args.worker}
+
+    results = {}
+    for name, main_path in workers.items():
+        runs = [profile(main_path, args.top) for _ in range(max(1, args.runs))]
+        ok   = [r for r in runs if "error" not in r]
+        results[name] = min(ok, key=lambda r: r["initMs"] or 0) if ok else runs[0]
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    for name, report in results.items():
+        if "error" in report:
+            print(f"\n{name}: not importable here — {report['error']}")
+            continue
+        print(f"\n{name}: init {report['initMs']:.1f} ms, {report['moduleCount']} modules imported")
+        for row in report["modules"]:
+            print(f"  {row['ms']:8.2f} ms  (self {row['selfMs']:7.2f})  {row['module']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+sync-worker-modules.py — Copy the shared Python worker modules into each worker.
+
+Python Workers bundle only their own ``src/`` directory, so a module used by
+several workers has to exist in each of them. The one copy to edit lives in
+``workers/lib/python/``; ``MODULES`` lists which workers get it. Each copy
+gets a generated header, and ``"__WORKER__"`` (the per-isolate ``TRACER`` /
+``LOG`` name) is replaced with the worker's directory name.
+
+``--check`` writes nothing and exits 1 when any copy is missing or differs
+from what a sync would write (CI runs this).
+
+Usage:
+    python3 scripts/sync-worker-modules.py [--check]
+"""
+
+import argparse
+import os
+import sys
+
+HERE    = os.path.dirname(os.path.abspath(__file__))
+ROOT    = os.path.normpath(os.path.join(HERE, ".."))
+SOURCE  = os.path.join("workers", "lib", "python")
+
+MODULES: dict[str, tuple[str, ...]] = {
+    "chat_prompt.py":    ("eu-classifier", "process-jobs"),
+    "import_profile.py": ("cleanup-jobs", "eu-classifier", "job-matcher", "job-reporter-llm",
+                          "process-jobs", "resume-rag"),
+    "job_retry.py":      ("eu-classifier", "process-jobs"),
+    "llm_budget.py":     ("eu-classifier", "job-matcher", "job-reporter-llm", "process-jobs"),
+    "llm_stream.py":     ("eu-classifier", "job-reporter-llm", "process-jobs"),
+    "llm_usage.py":      ("eu-classifier", "process-jobs"),
+    "model_router.py":   ("eu-classifier", "job-matcher", "process-jobs", "resume-rag"),
+    "run_log.py":        ("eu-classifier", "job-reporter-llm", "process-jobs"),
+    "tracing.py":        ("eu-classifier", "process-jobs"),
+}
+
+HEADER = (
+    "# AUTO-GENERATED by scripts/sync-worker-modules.py\n"
+    "# Do NOT edit manually. Edit {source} and run `pnpm workers:sync`.\n"
+    "\n"
+)
+
+
+def render(module: str, worker: str) -> str:
+    source = os.path.join(SOURCE, module)
+    with open(os.path.join(ROOT, source), encoding="utf-8") as f:
+        text = f.read()
+    return HEADER.format(source=source.replace(os.sep, "/")) + text.replace('"__WORKER__"', f'"{worker}"')
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--check", action="store_true", help="report stale copies instead of writing them")
+    args = parser.parse_args()
+
+    stale = []
+    for module, workers in MODULES.items():
+        for worker in workers:
+            path = os.path.join(ROOT, "workers", worker, "src", module)
+            want = render(module, worker)
+            try:
+                with open(path, encoding="utf-8") as f:
+                    have = f.read()
+            except FileNotFoundError:
+                have = None
+            if have == want:
+                continue
+            stale.append(os.path.relpath(path, ROOT))
+            if not args.check:
+                with open(path, "w", encoding="utf-8") as f:
+                    f.write(want)
+
+    if args.check:
+        for path in stale:
+            print(f"out of sync: {path}")
+        if stale:
+            print("Run `pnpm workers:sync` and commit the result.")
+        return 1 if stale else 0
+    for path in stale:
+        print(f"updated: {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
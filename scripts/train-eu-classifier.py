@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""
+train-eu-classifier.py — Train the eu-classifier's learned tier (Tier 0.75) from D1 verdicts.
+
+Pulls classified jobs from D1 (or a saved `wrangler d1 execute --json`
+export), labels them from our own verdicts and fits a logistic regression
+over the features in workers/eu-classifier/src/learned_model.py:
+
+  labels    DeepSeek and Workers AI verdicts (high confidence weighs more),
+            heuristic verdicts at a lower weight; admin-confirmed
+            "misclassified" reports tagged as a location / remote problem
+            flip the stored verdict and weigh most (other confirmed
+            "misclassified" reports are dropped -- the role, not the EU
+            verdict, was wrong). Company-policy and learned-tier verdicts
+            are skipped (they are derived from the others).
+  training  Adagrad SGD with L2, pure Python; weights below --prune dropped
+  calibrate job ids ending in 0: Platt calibration, then the accept / reject
+            thresholds reaching --precision with at least --min-support jobs
+  evaluate  job ids ending in 5: precision / coverage at those thresholds,
+            on jobs neither the weights nor the thresholds were fitted to
+
+Writes workers/eu-classifier/src/eu_model_weights.py (redeploy the worker to
+pick it up) and prints evaluation precision and the share of
+heuristic-escalated jobs the tier would decide.
+
+Usage:
+    python3 scripts/train-eu-classifier.py [--input rows.json] [--precision 0.97]
+        [--hash-bits 18] [--epochs 8] [--dry-run]
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import re
+import subprocess
+import sys
+import time
+
+HERE = os.path.dirname(__file__)
+SRC  = os.path.join(HERE, "..", "workers", "eu-classifier", "src")
+sys.path.insert(0, SRC)
+
+from heuristic import keyword_eu_classify  # noqa: E402
+from learned_model import features, sigmoid  # noqa: E402
+from signals import extract_eu_signals_batch  # noqa: E402
+
+OUTPUT   = os.path.join(SRC, "eu_model_weights.py")
+DATABASE = "nomadically-work-db"
+PAGE     = 2000
+
+SELECT_SQL = """
+SELECT id, title, location, substr(description, 1, 3000) AS description,
+       country, workplace_type, offices, categories,
+       ashby_is_remote, ashby_secondary_locations, ashby_address,
+       source_kind, company_key,
+       is_remote_eu, remote_eu_confidence, substr(score_reason, 1, 40) AS score_reason,
+       report_action, report_reason, report_tags
+FROM jobs
+WHERE is_remote_eu IS NOT NULL AND id > {after}
+ORDER BY id
+LIMIT {limit}
+"""
+
+# Sample weight per verdict source and confidence; missing = not used
+SOURCE_WEIGHTS = {
+    ("deepseek",   "high"):   1.0,
+    ("deepseek",   "medium"): 1.0,
+    ("deepseek",   "low"):    0.5,
+    ("workers-ai", "high"):   1.0,
+    ("workers-ai", "medium"): 0.5,
+    ("heuristic",  "high"):   0.5,
+    ("heuristic",  "medium"): 0.25,
+}
+CONFIRMED_WEIGHT = 3.0
+
+_SOURCE_RE = re.compile(r"^\[([a-z-]+)\]")
+
+# job-reporter-llm tags that say the remote / EU verdict itself was wrong
+_REMOTE_EU_TAG_RE = re.compile(r"location|remote|region|country|(?:^|_)eu(?:_|$)")
+
+
+# ── Data ──────────────────────────────────────────────────────────────────────
+
+def wrangler_rows(sql: str) -> list[dict]:
+    out = subprocess.run(
+        ["npx", "wrangler", "d1", "execute", DATABASE, "--remote", "--json", "--command", sql],
+        check=True, capture_output=True, text=True,
+    ).stdout
+    return _results(json.loads(out))
+
+
+def _results(payload) -> list[dict]:
+    """Rows of a `wrangler d1 execute --json` payload (or a plain list of rows)."""
+    if isinstance(payload, list) and payload and isinstance(payload[0], dict) and "results" in payload[0]:
+        return [row for part in payload for row in part.get("results") or []]
+    return list(payload)
+
+
+def fetch_rows(input_path: str | None) -> list[dict]:
+    if input_path:
+        with open(input_path) as f:
+            return _results(json.load(f))
+    rows, after = [], 0
+    while True:
+        page = wrangler_rows(SELECT_SQL.format(after=after, limit=PAGE))
+        rows.extend(page)
+        print(f"  fetched {len(rows)} rows", file=sys.stderr)
+        if len(page) < PAGE:
+            return rows
+        after = page[-1]["id"]
+
+
+def report_tags(row: dict) -> list[str]:
+    """The row's ``report_tags`` JSON array (empty when missing or unreadable)."""
+    try:
+        tags = json.loads(row.get("report_tags") or "[]")
+    except (TypeError, ValueError):
+        return []
+    return [str(t).lower() for t in tags] if isinstance(tags, list) else []
+
+
+def label(row: dict) -> tuple[int, float] | None:
+    """(label, sample weight) for one row, or None when it shouldn't train the model."""
+    stored = 1 if row.get("is_remote_eu") in (1, True, "1") else 0
+    if row.get("report_action") == "confirmed" and row.get("report_reason") == "misclassified":
+        if any(_REMOTE_EU_TAG_RE.search(t) for t in report_tags(row)):
+            return 1 - stored, CONFIRMED_WEIGHT
+        return None     # wrong for another reason: the stored EU verdict is unconfirmed either way
+    m      = _SOURCE_RE.match(row.get("score_reason") or "")
+    weight = SOURCE_WEIGHTS.get((m.group(1) if m else None, row.get("remote_eu_confidence")))
+    return (stored, weight) if weight else None
+
+
+# ── Model ─────────────────────────────────────────────────────────────────────
+
+def train(samples, epochs: int, lr: float, l2: float, seed: int) -> tuple[float, dict]:
+    """Weighted logistic regression by Adagrad SGD over sparse samples ``(x, y, w)``."""
+    rng     = random.Random(seed)
+    weights: dict[int, float] = {}
+    grad_sq: dict[int, float] = {}
+    bias, bias_sq = 0.0, 0.0
+    order = list(range(len(samples)))
+    for epoch in range(epochs):
+        rng.shuffle(order)
+        loss = 0.0
+        for k in order:
+            x, y, w = samples[k]
+            p = sigmoid(bias + sum(weights.get(i, 0.0) * v for i, v in x.items()))
+            loss -= w * (y * _log(p) + (1 - y) * _log(1 - p))
+            g = w * (p - y)
+            bias_sq += g * g
+            bias    -= lr * g / (bias_sq ** 0.5 + 1e-8)
+            for i, v in x.items():
+                gi = g * v + l2 * weights.get(i, 0.0)
+                grad_sq[i] = grad_sq.get(i, 0.0) + gi * gi
+                weights[i] = weights.get(i, 0.0) - lr * gi / (grad_sq[i] ** 0.5 + 1e-8)
+        print(f"  epoch {epoch + 1}: loss {loss / max(1, len(samples)):.4f}", file=sys.stderr)
+    return bias, weights
+
+
+def _log(p: float) -> float:
+    return -50.0 if p <= 0 else math.log(p)
+
+
+def logit(bias: float, weights: dict, x: dict) -> float:
+    return bias + sum(weights.get(i, 0.0) * v for i, v in x.items())
+
+
+def platt(zs: list[float], ys: list[int], iterations: int = 2000, lr: float = 0.05) -> tuple[float, float]:
+    """Fit ``p = sigmoid(a * z + b)`` on held-out logits."""
+    a, b, n = 1.0, 0.0, max(1, len(zs))
+    for _ in range(iterations):
+        ga = gb = 0.0
+        for z, y in zip(zs, ys):
+            d   = sigmoid(a * z + b) - y
+            ga += d * z
+            gb += d
+        a -= lr * ga / n
+        b -= lr * gb / n
+    return a, b
+
+
+def threshold(scored: list[tuple[float, int]], target: float, min_support: int, positive: bool) -> float | None:
+    """Loosest cut whose decided side reaches ``target`` precision with ``min_support`` jobs.
+
+    ``positive`` scans accept cuts from p = 1 down; otherwise reject cuts from p = 0 up.
+    """
+    ranked = sorted(scored, reverse=positive)
+    best, hits = None, 0
+    for n, (p, y) in enumerate(ranked, 1):
+        hits += y if positive else 1 - y
+        tied = n < len(ranked) and ranked[n][0] == p   # a cut at p takes every tie
+        if not tied and n >= min_support and hits / n >= target:
+            best = p
+    return best
+
+
+def side_stats(scored, accept_at: float, reject_at: float) -> dict:
+    decided = [(p, y) for p, y in scored if p >= accept_at or p <= reject_at]
+    correct = sum(1 for p, y in decided if (p >= accept_at) == bool(y))
+    return {
+        "decided":  len(decided),
+        "coverage": round(len(decided) / max(1, len(scored)), 4),
+        "accuracy": round(correct / max(1, len(decided)), 4),
+    }
+
+
+# ── Artifact ──────────────────────────────────────────────────────────────────
+
+def write_artifact(path: str, artifact: dict) -> None:
+    lines = ['"""Learned EU-remote classifier weights (see learned_model.py).', "",
+             "Generated by ``python3 scripts/train-eu-classifier.py`` -- do not edit by",
+             "hand. ``None`` until a model has been trained: the learned tier is skipped.",
+             '"""', "", "MODEL = {"]
+    for key, value in artifact.items():
+        lines.append(f"    {json.dumps(key)}: {json.dumps(value)},")
+    lines.append("}")
+    with open(path, "w") as f:
+        f.write("\n".join(lines) + "\n")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--input", help="saved `wrangler d1 execute --json` output instead of querying D1")
+    parser.add_argument("--hash-bits", type=int, default=18)
+    parser.add_argument("--epochs", type=int, default=8)
+    parser.add_argument("--lr", type=float, default=0.2)
+    parser.add_argument("--l2", type=float, default=1e-4)
+    parser.add_argument("--prune", type=float, default=1e-3, help="drop weights with |w| below this")
+    parser.add_argument("--precision", type=float, default=0.97, help="target calibration precision per side")
+    parser.add_argument("--min-support", type=int, default=30)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", default=OUTPUT)
+    parser.add_argument("--dry-run", action="store_true", help="report metrics without writing the artifact")
+    args = parser.parse_args()
+
+    rows    = fetch_rows(args.input)
+    labeled = [(row, lab) for row in rows if (lab := label(row))]
+    print(f"{len(labeled)} labelled of {len(rows)} classified jobs")
+    if not labeled:
+        sys.exit("No usable labels")
+
+    signals = extract_eu_signals_batch([row for row, _ in labeled])
+    splits = {"train": [], "calibrate": [], "evaluate": []}
+    for (row, (y, w)), sig in zip(labeled, signals):
+        sample = (features(row, sig, args.hash_bits), y, w)
+        escalated = keyword_eu_classify(row, sig) is None
+        split = {0: "calibrate", 5: "evaluate"}.get(int(row["id"]) % 10, "train")
+        splits[split].append((sample, escalated))
+    train_set, calibrate, evaluate = splits["train"], splits["calibrate"], splits["evaluate"]
+
+    t0 = time.perf_counter()
+    bias, weights = train([s for s, _ in train_set], args.epochs, args.lr, args.l2, args.seed)
+    weights = {i: w for i, w in weights.items() if abs(w) >= args.prune}
+    print(f"trained in {time.perf_counter() - t0:.1f}s: {len(weights)} weights kept")
+
+    zs = [logit(bias, weights, x) for (x, _, _), _ in calibrate]
+    ys = [y for (_, y, _), _ in calibrate]
+    a, b   = platt(zs, ys)
+    scored = [(sigmoid(a * z + b), y) for z, y in zip(zs, ys)]
+    accept = threshold(scored, args.precision, args.min_support, positive=True)
+    accept_at = accept if accept is not None else 2.0
+    # Reject cuts stay below the accept cut so no probability means both
+    reject = threshold([s for s in scored if s[0] < accept_at], args.precision, args.min_support, positive=False)
+    reject_at = reject if reject is not None else -1.0
+    print(f"calibrated on {len(calibrate)} jobs: accept_at={accept_at:.3f} reject_at={reject_at:.3f}")
+
+    tested = [(sigmoid(a * logit(bias, weights, x) + b), y) for (x, y, _), _ in evaluate]
+    escalated = [s for s, (_, esc) in zip(tested, evaluate) if esc]
+    metrics = {
+        "evaluate":  side_stats(tested, accept_at, reject_at),
+        "escalated": side_stats(escalated, accept_at, reject_at),
+    }
+    print(f"evaluated on {len(evaluate)} jobs")
+    print(f"  all:       {metrics['evaluate']}")
+    print(f"  escalated: {metrics['escalated']}  (jobs the keyword heuristic sends to the LLM tiers)")
+
+    if args.dry_run:
+        return
+    indices = sorted(weights)
+    write_artifact(args.output, {
+        "version":   time.strftime("%Y%m%d", time.gmtime()),
+        "hash_bits": args.hash_bits,
+        "bias":      round(bias, 5),
+        "platt_a":   round(a, 5),
+        "platt_b":   round(b, 5),
+        "accept_at": round(accept_at, 5),
+        "reject_at": round(reject_at, 5),
+        "samples":   len(train_set),
+        "eval_accuracy":     metrics["evaluate"]["accuracy"],
+        "escalated_coverage": metrics["escalated"]["coverage"],
+        "indices":   indices,
+        "weights":   [round(weights[i], 5) for i in indices],
+    })
+    print(f"wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
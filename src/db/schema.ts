@@ -1,4 +1,4 @@
-import { sqliteTable, text, integer, real, index, uniqueIndex } from "drizzle-orm/sqlite-core";
+import { sqliteTable, text, integer, real, index, uniqueIndex, primaryKey } from "drizzle-orm/sqlite-core";
 import { sql } from "drizzle-orm";
 
 export const companies = sqliteTable("companies", {
@@ -96,6 +96,7 @@ export const jobs = sqliteTable("jobs", {
   role_confidence: text("role_confidence", { enum: ["high", "medium", "low"] }),
   role_reason: text("role_reason"),
   role_source: text("role_source"),
+  role_indexed_at: text("role_indexed_at"), // Added to the ROLE_INDEX Vectorize index (kNN role tagging)
 
   // Enhanced ATS data (JSON fields)
   ats_data: text("ats_data"), // Full JSON response from ATS API
@@ -144,6 +145,15 @@ export const jobs = sqliteTable("jobs", {
   report_trace_id: text("report_trace_id"), // Langfuse trace ID for score updates
   report_reviewed_at: text("report_reviewed_at"),
 
+  // Processing priority (written by process-jobs, see migrations/0035_add_job_priority.sql)
+  priority: real("priority"),           // 0..1 score at first sight
+  priority_rank: real("priority_rank"), // aged sort key for phase selectors
+
+  // Near-duplicate clusters (written by process-jobs, see migrations/0037_add_job_duplicates.sql)
+  dup_cluster_id: integer("dup_cluster_id"), // own id when unique; NULL until fingerprinted
+  dup_of: integer("dup_of"),                 // closest verified copy
+  dup_similarity: real("dup_similarity"),    // estimated Jaccard with dup_of
+
   created_at: text("created_at")
     .notNull()
     .default(sql`(datetime('now'))`),
@@ -157,6 +167,11 @@ export const jobs = sqliteTable("jobs", {
   companyKeyIdx: index("idx_jobs_company_key").on(table.company_key),
   sourceKindIdx: index("idx_jobs_source_kind").on(table.source_kind),
   remoteEuPostedIdx: index("idx_jobs_remote_eu_posted").on(table.is_remote_eu, table.posted_at, table.created_at),
+  statusPriorityIdx: index("idx_jobs_status_priority_rank").on(table.status, table.priority_rank),
+  unscoredIdx: index("idx_jobs_unscored").on(table.created_at).where(sql`priority IS NULL`),
+  dupClusterIdx: index("idx_jobs_dup_cluster").on(table.dup_cluster_id),
+  unfingerprintedIdx: index("idx_jobs_unfingerprinted").on(table.created_at).where(sql`dup_cluster_id IS NULL`),
+  roleUnindexedIdx: index("idx_jobs_role_unindexed").on(table.id).where(sql`role_indexed_at IS NULL AND role_confidence = 'high'`),
 }));
 
 export type Job = typeof jobs.$inferSelect;
@@ -557,6 +572,165 @@ export const jobReportEvents = sqliteTable(
 export type JobReportEvent = typeof jobReportEvents.$inferSelect;
 export type NewJobReportEvent = typeof jobReportEvents.$inferInsert;
 
+// Pipeline run records (written by process-jobs worker, read by its batch-size controller)
+export const pipelineRuns = sqliteTable(
+  "pipeline_runs",
+  {
+    id: integer("id").primaryKey({ autoIncrement: true }),
+    trigger: text("trigger").notNull(), // cron | queue | http
+    started_at: text("started_at").notNull(),
+    finished_at: text("finished_at"),
+    stats: text("stats"), // JSON: merged stats
+    phases: text("phases"), // JSON: per-phase metrics
+    plan: text("plan"), // JSON: per-phase {limit, reasons}
+    created_at: text("created_at")
+      .notNull()
+      .default(sql`(datetime('now'))`),
+  },
+  (table) => ({
+    startedAtIdx: index("idx_pipeline_runs_started_at").on(table.started_at),
+  }),
+);
+
+export type PipelineRun = typeof pipelineRuns.$inferSelect;
+export type NewPipelineRun = typeof pipelineRuns.$inferInsert;
+
+// Workers AI model-routing decisions + outcomes — see model_router.py
+export const llmRoutingLog = sqliteTable(
+  "llm_routing_log",
+  {
+    id: integer("id").primaryKey({ autoIncrement: true }),
+    worker: text("worker").notNull(),
+    task: text("task").notNull(), // role_tag | eu_classify | skills | title_score | chat
+    model: text("model").notNull(),
+    step: integer("step").notNull(),
+    reason: text("reason").notNull(),
+    input_chars: integer("input_chars").notNull(),
+    hard: integer("hard").notNull().default(0),
+    escalated_from: text("escalated_from"),
+    outcome: text("outcome").notNull(), // accepted | unsure | escalated | audit | failed
+    ok: integer("ok").notNull(),
+    verified: integer("verified").notNull().default(0), // ok was checked against the top model
+    latency_ms: real("latency_ms"),
+    created_at: text("created_at")
+      .notNull()
+      .default(sql`(datetime('now'))`),
+  },
+  (table) => ({
+    workerIdx: index("idx_llm_routing_log_worker").on(table.worker, table.id),
+    taskModelIdx: index("idx_llm_routing_log_task_model").on(table.task, table.model),
+    createdIdx: index("idx_llm_routing_log_created").on(table.worker, table.created_at),
+  }),
+);
+
+export type LlmRoutingLog = typeof llmRoutingLog.$inferSelect;
+export type NewLlmRoutingLog = typeof llmRoutingLog.$inferInsert;
+
+// Shared DeepSeek rate limit (requests per provider per epoch minute) and
+// daily spend ledger — see workers/process-jobs/src/llm_budget.py.
+export const llmRateWindows = sqliteTable(
+  "llm_rate_windows",
+  {
+    provider: text("provider").notNull(),
+    window_start: integer("window_start").notNull(), // unix epoch minute
+    requests: integer("requests").notNull().default(0),
+  },
+  (table) => ({
+    pk: primaryKey({ columns: [table.provider, table.window_start] }),
+  }),
+);
+
+export const llmBudgetLedger = sqliteTable(
+  "llm_budget_ledger",
+  {
+    provider: text("provider").notNull(),
+    day: text("day").notNull(), // YYYY-MM-DD (UTC)
+    requests: integer("requests").notNull().default(0),
+    tokens: integer("tokens").notNull().default(0),
+    cost_usd: real("cost_usd").notNull().default(0),
+    updated_at: text("updated_at")
+      .notNull()
+      .default(sql`(datetime('now'))`),
+  },
+  (table) => ({
+    pk: primaryKey({ columns: [table.provider, table.day] }),
+  }),
+);
+
+export type LlmBudgetLedger = typeof llmBudgetLedger.$inferSelect;
+
+// MinHash signatures and LSH buckets for near-duplicate detection —
+// see workers/process-jobs/src/dedup.py.
+export const jobFingerprints = sqliteTable("job_fingerprints", {
+  job_id: integer("job_id").primaryKey(),
+  signature: text("signature").notNull(), // 64 x 8 hex digits
+  created_at: text("created_at")
+    .notNull()
+    .default(sql`(datetime('now'))`),
+});
+
+export const jobLshBands = sqliteTable(
+  "job_lsh_bands",
+  {
+    bucket: integer("bucket").notNull(), // 48-bit hash of (band, band values)
+    job_id: integer("job_id").notNull(),
+  },
+  (table) => ({
+    pk: primaryKey({ columns: [table.bucket, table.job_id] }),
+    jobIdx: index("idx_job_lsh_bands_job").on(table.job_id),
+  }),
+);
+
+// Per-company boilerplate shingles stripped from prompt text —
+// see workers/process-jobs/src/boilerplate.py.
+export const companyBoilerplate = sqliteTable("company_boilerplate", {
+  company_key: text("company_key").primaryKey(),
+  shingles: text("shingles").notNull(), // sorted uint32 crc32 values, base64
+  shingle_count: integer("shingle_count").notNull().default(0),
+  postings: integer("postings").notNull().default(0),
+  updated_at: text("updated_at")
+    .notNull()
+    .default(sql`(datetime('now'))`),
+});
+
+// Location resolution cache (eu-classifier) — normalized location → signals
+export const locationResolutions = sqliteTable(
+  "location_resolutions",
+  {
+    location: text("location").primaryKey(), // lowercased, trimmed
+    country_code: text("country_code"),
+    is_eu: integer("is_eu").notNull().default(0),
+    eu_country_names: text("eu_country_names").notNull().default("[]"), // JSON array
+    is_remote: integer("is_remote").notNull().default(0),
+    hits: integer("hits").notNull().default(0),
+    version: integer("version").notNull(),
+    updated_at: text("updated_at")
+      .notNull()
+      .default(sql`(datetime('now'))`),
+  },
+  (table) => ({
+    hitsIdx: index("idx_location_resolutions_hits").on(table.version, table.hits),
+  }),
+);
+
+export type LocationResolution = typeof locationResolutions.$inferSelect;
+export type NewLocationResolution = typeof locationResolutions.$inferInsert;
+
+// Company remote-policy evidence (eu-classifier Tier 0.5 prior).
+// Scores are pre-multiplied by 2^(t / 30 days) — see company_policy.py.
+export const companyRemotePolicies = sqliteTable("company_remote_policies", {
+  company_key: text("company_key").primaryKey(),
+  eu_score: real("eu_score").notNull().default(0),
+  non_eu_score: real("non_eu_score").notNull().default(0),
+  jobs: integer("jobs").notNull().default(0),
+  updated_at: text("updated_at")
+    .notNull()
+    .default(sql`(datetime('now'))`),
+});
+
+export type CompanyRemotePolicy = typeof companyRemotePolicies.$inferSelect;
+export type NewCompanyRemotePolicy = typeof companyRemotePolicies.$inferInsert;
+
 // Contacts (from CRM — recruiters and company contacts)
 export const contacts = sqliteTable(
   "contacts",
@@ -11,6 +11,10 @@ Associated job_skill_tags are explicitly deleted since the row isn't removed
 Runs daily at 02:00 UTC via cron trigger.
 """
 
+# Time every import below — reported by GET /health (see import_profile.py)
+from import_profile import IMPORT_PROFILE
+IMPORT_PROFILE.start()
+
 import json
 from datetime import datetime, timedelta, timezone
 
@@ -161,6 +165,13 @@ async def cleanup_old_jobs(db, dry_run: bool = False) -> dict:
             ids,
         )
 
+        # Drop their duplicate-detection fingerprints so new postings don't match them
+        for table in ("job_lsh_bands", "job_fingerprints"):
+            try:
+                await d1_run(db, f"DELETE FROM {table} WHERE job_id IN ({placeholders})", ids)
+            except Exception as e:
+                print(f"  {table} cleanup skipped: {e}")
+
         # Null out data columns, set status = 'stale'
         update_sql = STALE_UPDATE_SQL.format(placeholders=placeholders)
         await d1_run(db, update_sql, [now] + ids)
@@ -210,6 +221,7 @@ class Default(WorkerEntrypoint):
         POST /cleanup      — enqueue a cleanup job
         POST /cleanup/run  — run cleanup immediately
         """
+        IMPORT_PROFILE.mark_request()
         cors_headers = {
             "Access-Control-Allow-Origin": "*",
             "Access-Control-Allow-Methods": "GET, POST, OPTIONS",
@@ -225,7 +237,7 @@ class Default(WorkerEntrypoint):
 
             if path == "health":
                 return Response.json(
-                    {"status": "ok", "worker": "cleanup-jobs"},
+                    {"status": "ok", "worker": "cleanup-jobs", "imports": IMPORT_PROFILE.report()},
                     headers=cors_headers,
                 )
 
@@ -260,6 +272,7 @@ class Default(WorkerEntrypoint):
 
     async def scheduled(self, event, env, ctx):
         """Cron trigger — runs daily at 02:00 UTC."""
+        IMPORT_PROFILE.mark_request()
         print("Cron: Starting job cleanup...")
         try:
             result = await cleanup_old_jobs(self.env.DB)
@@ -270,6 +283,7 @@ class Default(WorkerEntrypoint):
 
     async def queue(self, batch, env, ctx):
         """Consume messages from the cleanup-jobs queue."""
+        IMPORT_PROFILE.mark_request()
         for message in batch.messages:
             try:
                 body = to_py(message.body)
@@ -281,3 +295,7 @@ class Default(WorkerEntrypoint):
             except Exception as e:
                 print(f"Queue: Failed — {e}")
                 message.retry()
+
+
+# Entry module fully loaded — stop timing imports.
+IMPORT_PROFILE.stop()
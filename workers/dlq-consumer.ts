@@ -16,6 +16,10 @@ const WORKER = "dlq-consumer";
 
 interface DLQMessageBody {
   jobId?: number;
+  /** Set on per-job retries from process-jobs / eu-classifier (see their job_retry.py) */
+  jobIds?: number[];
+  /** Failed attempts so far — per-job dead letters are sent directly, not via retry exhaustion */
+  attempts?: number;
   traceId?: string;
   action?: string;
   limit?: number;
@@ -49,7 +53,7 @@ export default {
         metadata: {
           queue: batch.queue,
           messageId: msg.id,
-          attempts: msg.attempts,
+          attempts: msg.body.attempts ?? msg.attempts,
           action: msg.body.action,
           body: msg.body,
         },
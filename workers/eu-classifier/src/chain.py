@@ -1,19 +1,28 @@
-"""LangChain LCEL chains for EU remote classification.
+"""LLM calls for EU remote classification.
 
 Two-tier LLM strategy:
-  Tier 1 -- Workers AI via langchain-cloudflare (free, Cloudflare quota)
+  Tier 1 -- Workers AI via env.AI.run (free, Cloudflare quota)
   Tier 2 -- DeepSeek API (paid, fallback only)
+
+Both tiers send CLASSIFICATION_PROMPT as a pre-serialized request body
+(chat_prompt.py), stream the completion and stop at the first complete
+verdict object (llm_stream.py); the non-streaming paths remain as fallbacks.
 """
 
 import json
 import re
+import time
 
+from chat_prompt import response_text
 from constants import WORKERS_AI_MODEL
+from db import json_to_js, to_py
+from llm_stream import StreamResult, read_json_stream
+from llm_usage import DEEPSEEK_USAGE
+from llm_budget import DEEPSEEK_BUDGET
 from models import JobClassification
 from prompts import CLASSIFICATION_PROMPT
-
-# langchain-cloudflare -- Workers AI binding integration (PyPI)
-from langchain_cloudflare import ChatCloudflareWorkersAI
+from run_log import LOG
+from tracing import TRACER
 
 
 # -------------------------------------------------------------------------
@@ -69,43 +78,79 @@ def _normalise_classification_keys(raw: dict) -> dict:
     return normalised
 
 
-# -------------------------------------------------------------------------
-# Tier 1 -- Workers AI (via langchain-cloudflare)
-# -------------------------------------------------------------------------
+def _classification_values(job: dict, signals_text: str) -> dict:
+    """CLASSIFICATION_PROMPT values for one job."""
+    return {
+        "title":       job.get("title", "N/A"),
+        "location":    job.get("location") or "Not specified",
+        "description": (job.get("description") or "")[:6000],
+        "structured_signals": signals_text or "None available",
+    }
+
+
+# Keys a streamed object must carry before the stream is cut; alternate
+# spellings of isRemoteEU are still picked up by the end-of-stream fallback.
+VERDICT_KEYS = ("confidence",)
+
+
+def _stream_classification(result: StreamResult) -> JobClassification:
+    """Validate the object a streamed call produced (raw-text extractor as fallback)."""
+    raw = result.obj
+    if raw is None:
+        content_str = _guard_content(result.text)
+        if not content_str:
+            raise ValueError("Empty content in streamed classify response")
+        raw = json.loads(_extract_json_object(content_str))
+    return JobClassification.model_validate(_normalise_classification_keys(raw))
 
-def build_classification_chain(ai_binding):
-    """Build the langchain LCEL EU-classification chain."""
-    llm = ChatCloudflareWorkersAI(
-        model_name=WORKERS_AI_MODEL,
-        binding=ai_binding,
-        temperature=0.2,
-    )
-    return CLASSIFICATION_PROMPT | llm
 
+# -------------------------------------------------------------------------
+# Tier 1 -- Workers AI (env.AI.run)
+# -------------------------------------------------------------------------
 
 async def classify_with_workers_ai(
-    job: dict, ai_binding, signals_text: str = ""
+    job: dict, ai_binding, signals_text: str = "", model: str = WORKERS_AI_MODEL,
 ) -> JobClassification | None:
-    """Tier 1: EU classification via Workers AI + langchain LCEL chain.
+    """Tier 1: EU classification via Workers AI, streamed (plain AI.run as fallback).
+
+    ``model`` is the Workers AI model the router picked for this call.
 
     Returns a validated JobClassification or None if unavailable/failed.
-    Does NOT use with_structured_output() -- see _guard_content() docstring.
+    Content is parsed as raw text -- see _guard_content() docstring.
     """
     if ai_binding is None:
         return None
 
+    values = _classification_values(job, signals_text)
     try:
-        chain    = build_classification_chain(ai_binding)
-        response = await chain.ainvoke({
-            "title":       job.get("title", "N/A"),
-            "location":    job.get("location") or "Not specified",
-            "description": (job.get("description") or "")[:6000],
-            "structured_signals": signals_text or "None available",
-        })
-
-        content_str = _guard_content(response.content)
+        with TRACER.span("ai.run", "ai", model=model, stream=True):
+            started = time.monotonic()
+            stream  = await ai_binding.run(model, json_to_js(
+                CLASSIFICATION_PROMPT.request_body(values, temperature=0.2, stream=True)
+            ))
+            result = await read_json_stream(
+                stream.getReader(), VERDICT_KEYS, provider="workers_ai", started=started,
+            )
+    except Exception as e:
+        LOG.job("warn", job.get("id"), "workers ai classify stream failed, retrying without", model=model, error=str(e))
+        result = None
+
+    if result is not None:
+        try:
+            return _stream_classification(result)
+        except Exception as e:
+            LOG.job("warn", job.get("id"), "workers ai classification failed", model=model, error=str(e))
+            return None
+
+    try:
+        with TRACER.span("ai.run", "ai", model=model, stream=False):
+            response = await ai_binding.run(model, json_to_js(
+                CLASSIFICATION_PROMPT.request_body(values, temperature=0.2)
+            ))
+
+        content_str = _guard_content(response_text(to_py(response)))
         if not content_str:
-            print("   Workers AI (classify) returned null content")
+            LOG.job("warn", job.get("id"), "workers ai classify returned null content", model=model)
             return None
 
         json_str   = _extract_json_object(content_str)
@@ -114,7 +159,7 @@ async def classify_with_workers_ai(
         return JobClassification.model_validate(normalised)
 
     except Exception as e:
-        print(f"   Workers AI classification failed: {e}")
+        LOG.job("warn", job.get("id"), "workers ai classification failed", model=model, error=str(e))
         return None
 
 
@@ -130,31 +175,35 @@ async def classify_with_deepseek(
     signals_text: str = "",
     *,
     fetch_json_fn=None,
+    stream_json_fn=None,
 ) -> JobClassification:
     """Tier 2: EU classification via DeepSeek API.
 
     Called only when Workers AI fails or returns low/medium confidence.
-    Uses the provided fetch_json_fn for HTTP calls (injected from the
-    worker entrypoint to use JS fetch in the Pyodide environment).
-    Never raises -- returns a low-confidence default on any error.
+    Uses the provided stream_json_fn (or, without it, fetch_json_fn) for
+    HTTP calls -- injected from the worker entrypoint to use JS fetch in the
+    Pyodide environment. Never raises -- returns a low-confidence default
+    on any error.
     """
-    prompt_msgs = CLASSIFICATION_PROMPT.format_messages(
-        title       = job.get("title", "N/A"),
-        location    = job.get("location") or "Not specified",
-        description = (job.get("description") or "")[:6000],
-        structured_signals = signals_text or "None available",
-    )
-    role_map = {"system": "system", "human": "user", "ai": "assistant"}
-    messages = [{"role": role_map.get(m.type, m.type), "content": m.content} for m in prompt_msgs]
+    values = _classification_values(job, signals_text)
 
     try:
         url     = f"{base_url.rstrip('/')}/chat/completions"
-        payload = json.dumps({
+        headers = {
+            "Authorization": f"Bearer {api_key}",
+            "Content-Type":  "application/json",
+        }
+        request = {
             "model":           model,
             "temperature":     0.3,
             "response_format": {"type": "json_object"},
-            "messages":        messages,
-        })
+        }
+
+        if stream_json_fn is not None:
+            result = await stream_json_fn(url, headers, CLASSIFICATION_PROMPT, values, VERDICT_KEYS, **request)
+            DEEPSEEK_USAGE.record({"usage": result.usage})
+            DEEPSEEK_BUDGET.record(result.usage, result.prompt_chars, len(result.text))
+            return _stream_classification(result)
 
         if fetch_json_fn is None:
             raise ValueError("fetch_json_fn is required for DeepSeek API calls")
@@ -162,13 +211,12 @@ async def classify_with_deepseek(
         data = await fetch_json_fn(
             url,
             method  = "POST",
-            headers = {
-                "Authorization": f"Bearer {api_key}",
-                "Content-Type":  "application/json",
-            },
-            body    = payload,
+            headers = headers,
+            body    = CLASSIFICATION_PROMPT.request_body(values, **request),
             retries = 3,
         )
+        DEEPSEEK_USAGE.record(data)
+        DEEPSEEK_BUDGET.record(data.get("usage"))
 
         content = (
             (data.get("choices") or [{}])[0]
@@ -183,7 +231,7 @@ async def classify_with_deepseek(
         return JobClassification.model_validate(normalised)
 
     except Exception as e:
-        print(f"   DeepSeek classification failed: {e}")
+        LOG.job("warn", job.get("id"), "deepseek classification failed", error=str(e))
         return JobClassification(
             isRemoteEU=False,
             confidence="low",
@@ -0,0 +1,216 @@
+"""Tier 0.5: company-level remote-policy prior.
+
+Postings from one ``company_key`` usually share a remote policy ("remote
+within the EU", "US only"), yet each was classified on its own — often by
+the LLM tiers. ``CompanyPolicyStore`` accumulates the high-confidence
+verdicts on a company's remote postings and ``company_policy_classify``
+reuses them for the next posting when the job's own signals don't
+contradict the prior, so a company with dozens of openings only needs LLM
+calls for the first few.
+
+Evidence decays with a half-life of ``HALF_LIFE_DAYS`` and only counts once
+it reaches ``MIN_EVIDENCE`` (decayed) jobs with ``MIN_AGREEMENT`` of them
+agreeing. Verdicts produced by this tier are never fed back as evidence.
+
+Decay without read-modify-write: scores are stored pre-multiplied by
+``2 ** (t / half_life)`` at observation time ``t``, so the D1 upsert is a
+plain sum (safe across concurrent isolates) and the decayed evidence at
+``now`` is ``score / 2 ** (now / half_life)``.
+"""
+
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from models import JobClassification
+
+
+HALF_LIFE_DAYS = 30
+MIN_EVIDENCE   = 3.0    # decayed job count before the prior is used
+MIN_AGREEMENT  = 0.9    # share of evidence that must agree
+
+# Verdict sources that count as evidence (never "company-policy" itself).
+EVIDENCE_SOURCES = frozenset({"heuristic", "workers-ai", "deepseek"})
+
+DEFAULT_MAX_ENTRIES = 4096
+
+# Reference time for the growth factor (2026-01-01T00:00:00Z) keeps stored
+# scores small: ~2**12 per year at a 30-day half-life.
+_EPOCH = 1767225600
+
+
+def _growth(now: float) -> float:
+    return 2.0 ** ((now - _EPOCH) / (HALF_LIFE_DAYS * 86400))
+
+
+@dataclass(frozen=True, slots=True)
+class CompanyEvidence:
+    """Decayed count of a company's recent high-confidence verdicts."""
+    company_key: str
+    eu:          float
+    non_eu:      float
+
+    @property
+    def total(self) -> float:
+        return self.eu + self.non_eu
+
+    def verdict(self) -> bool | None:
+        """True / False once the evidence is sufficient and consistent, else None."""
+        if self.total < MIN_EVIDENCE:
+            return None
+        if self.eu >= MIN_AGREEMENT * self.total:
+            return True
+        if self.non_eu >= MIN_AGREEMENT * self.total:
+            return False
+        return None
+
+
+def is_remote_posting(job: dict, signals: dict) -> bool:
+    """Only remote postings carry (and receive) a company's remote policy."""
+    return bool(signals.get("ats_remote")) or "remote" in (job.get("location") or "").lower()
+
+
+def _contradicts_eu(signals: dict) -> bool:
+    if signals.get("negative_signals") or signals.get("us_implicit_signals"):
+        return True
+    if signals.get("country_code") and not signals.get("eu_country_code"):
+        return True
+    return False
+
+
+def _contradicts_non_eu(signals: dict) -> bool:
+    scan = signals.get("description_scan")
+    return bool(
+        signals.get("eu_country_code")
+        or signals.get("eu_countries_in_location")
+        or signals.get("eu_timezone")
+        or (scan is not None and scan.eu_description)
+    )
+
+
+def company_policy_classify(
+    job: dict, signals: dict, evidence: CompanyEvidence | None,
+) -> JobClassification | None:
+    """Tier 0.5: apply the company prior unless the job's own signals disagree."""
+    if evidence is None or not is_remote_posting(job, signals):
+        return None
+
+    prior = evidence.verdict()
+    if prior is None:
+        return None
+    if prior and _contradicts_eu(signals):
+        return None
+    if not prior and _contradicts_non_eu(signals):
+        return None
+
+    agreeing = evidence.eu if prior else evidence.non_eu
+    return JobClassification(
+        isRemoteEU=prior,
+        confidence="medium",
+        reason=(
+            f"Company policy: {agreeing:.1f} of {evidence.total:.1f} recent "
+            f"high-confidence {evidence.company_key} remote jobs were "
+            f"{'EU remote' if prior else 'non-EU'}; no contradicting job signals"
+        ),
+    )
+
+
+class CompanyPolicyStore:
+    """Bounded LRU of per-company evidence, optionally backed by D1."""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._scores:  OrderedDict[str, list[float]] = OrderedDict()   # key -> [eu, non_eu]
+        self._loaded:  set[str] = set()
+        self._pending: dict[str, list[float]] = {}                     # key -> [eu, non_eu, jobs]
+
+    def __len__(self) -> int:
+        return len(self._scores)
+
+    def evidence(self, company_key: str | None, now: float | None = None) -> CompanyEvidence | None:
+        scores = self._scores.get(company_key or "")
+        if scores is None:
+            return None
+        self._scores.move_to_end(company_key)
+        growth = _growth(time.time() if now is None else now)
+        return CompanyEvidence(company_key, scores[0] / growth, scores[1] / growth)
+
+    def observe(
+        self, company_key: str | None, is_eu: bool, confidence: str, source: str,
+        now: float | None = None,
+    ) -> bool:
+        """Record a verdict as evidence. Returns False when it does not qualify."""
+        if not company_key or confidence != "high" or source not in EVIDENCE_SOURCES:
+            return False
+        weight = _growth(time.time() if now is None else now)
+        slot   = 0 if is_eu else 1
+
+        scores = self._scores.setdefault(company_key, [0.0, 0.0])
+        scores[slot] += weight
+        self._scores.move_to_end(company_key)
+
+        pending = self._pending.setdefault(company_key, [0.0, 0.0, 0])
+        pending[slot] += weight
+        pending[2]    += 1
+
+        self._evict()
+        return True
+
+    def _evict(self) -> None:
+        while len(self._scores) > self.max_entries:
+            key, _ = self._scores.popitem(last=False)
+            self._loaded.discard(key)
+
+    # -- D1 persistence -----------------------------------------------------
+
+    def unloaded(self, company_keys) -> list[str]:
+        """Distinct non-empty keys not yet loaded from D1 in this isolate."""
+        return sorted({k for k in company_keys if k and k not in self._loaded})
+
+    def load(self, company_keys: list[str], rows: list[dict]) -> int:
+        """Merge persisted scores for ``company_keys`` (rows may omit unknown keys)."""
+        found = {row["company_key"]: row for row in rows if row.get("company_key")}
+        for key in company_keys:
+            row     = found.get(key)
+            pending = self._pending.get(key, [0.0, 0.0, 0])
+            if row is not None:
+                self._scores[key] = [
+                    float(row.get("eu_score") or 0.0) + pending[0],
+                    float(row.get("non_eu_score") or 0.0) + pending[1],
+                ]
+                self._scores.move_to_end(key)
+            self._loaded.add(key)
+        self._evict()
+        return len(found)
+
+    def pending_rows(self) -> list[list]:
+        """Additive upsert params since the last flush, then reset.
+
+        Each row: [company_key, eu_score, non_eu_score, jobs].
+        """
+        rows = [[key, eu, non_eu, jobs] for key, (eu, non_eu, jobs) in self._pending.items()]
+        self._pending = {}
+        return rows
+
+
+def load_sql(n: int) -> str:
+    """SELECT for ``n`` company keys (callers keep ``n`` under D1's bind limit)."""
+    return (
+        "SELECT company_key, eu_score, non_eu_score FROM company_remote_policies "
+        f"WHERE company_key IN ({', '.join('?' * n)})"
+    )
+
+
+# One store per isolate — shared by every request the isolate serves.
+COMPANY_POLICIES = CompanyPolicyStore()
+
+UPSERT_SQL = """
+    INSERT INTO company_remote_policies
+        (company_key, eu_score, non_eu_score, jobs, updated_at)
+    VALUES (?, ?, ?, ?, datetime('now'))
+    ON CONFLICT(company_key) DO UPDATE SET
+        eu_score     = company_remote_policies.eu_score + excluded.eu_score,
+        non_eu_score = company_remote_policies.non_eu_score + excluded.non_eu_score,
+        jobs         = company_remote_policies.jobs + excluded.jobs,
+        updated_at   = excluded.updated_at
+"""
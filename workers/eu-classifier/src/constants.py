@@ -53,6 +53,9 @@ COUNTRY_NAME_TO_ISO: dict[str, str] = {
 # Regex patterns
 # -------------------------------------------------------------------------
 
+_INNER_HYPHEN_PATTERN = re.compile(r"(?<=\w)-(?=\w)")
+
+
 def normalize_text_for_signals(text: str) -> str:
     """Generic text normalization: dehyphenate compound words for regex matching.
 
@@ -60,7 +63,7 @@ def normalize_text_for_signals(text: str) -> str:
     "remote-first" -> "remote first", "location-agnostic" -> "location agnostic".
     Preserves actual hyphenated tokens like "on-site" which are also in patterns.
     """
-    return re.sub(r"(?<=\w)-(?=\w)", " ", text)
+    return _INNER_HYPHEN_PATTERN.sub(" ", text)
 
 
 # Negative signal patterns -- US-only, no-EU, Swiss-only
@@ -4,29 +4,65 @@ import json
 
 from js import JSON
 
+from tracing import TRACER, sql_label
+
 
 def to_js_obj(d: dict):
     """Convert a Python dict to a JS object via JSON round-trip."""
     return JSON.parse(json.dumps(d))
 
 
+def json_to_js(text: str):
+    """Parse an already-serialized JSON string into a JS object."""
+    return JSON.parse(text)
+
+
 def to_py(js_val):
     """Convert a JS proxy value to a Python dict/list via JSON round-trip."""
     return json.loads(JSON.stringify(js_val))
 
 
+def from_rpc(val):
+    """Convert an RPC argument (JS proxy or plain Python) to Python without a JSON round-trip."""
+    return val.to_py() if hasattr(val, "to_py") else val
+
+
+def to_rpc(obj):
+    """Convert a Python return value to a JS structure for an RPC caller."""
+    from js import Object
+    from pyodide.ffi import to_js
+    return to_js(obj, dict_converter=Object.fromEntries)
+
+
 async def d1_all(db, sql: str, params: list | None = None) -> list[dict]:
     """Execute a D1 SELECT and return rows as Python list of dicts."""
-    stmt = db.prepare(sql)
-    if params:
-        stmt = stmt.bind(*JSON.parse(json.dumps(params)))
-    result = await stmt.all()
-    return to_py(result.results)
+    with TRACER.span("d1.all", "d1", sql=sql_label(sql)) as span:
+        stmt = db.prepare(sql)
+        if params:
+            stmt = stmt.bind(*JSON.parse(json.dumps(params)))
+        result = await stmt.all()
+        rows   = to_py(result.results)
+        span.attrs["rows"] = len(rows)
+        return rows
 
 
 async def d1_run(db, sql: str, params: list | None = None):
     """Execute a D1 write statement (INSERT/UPDATE/DELETE)."""
-    stmt = db.prepare(sql)
-    if params:
-        stmt = stmt.bind(*JSON.parse(json.dumps(params)))
-    await stmt.run()
+    with TRACER.span("d1.run", "d1", sql=sql_label(sql)):
+        stmt = db.prepare(sql)
+        if params:
+            stmt = stmt.bind(*JSON.parse(json.dumps(params)))
+        await stmt.run()
+
+
+async def d1_batch(db, statements: list[tuple[str, list]], chunk_size: int = 50) -> None:
+    """Execute many D1 writes as batched transactions (one round-trip per chunk)."""
+    from pyodide.ffi import to_js
+    for i in range(0, len(statements), chunk_size):
+        chunk = statements[i:i + chunk_size]
+        with TRACER.span("d1.batch", "d1", sql=sql_label(chunk[0][0]), statements=len(chunk)):
+            prepared = [
+                db.prepare(sql).bind(*JSON.parse(json.dumps(params)))
+                for sql, params in chunk
+            ]
+            await db.batch(to_js(prepared))
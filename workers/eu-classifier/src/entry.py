@@ -3,38 +3,86 @@
 Single-responsibility worker that owns all EU remote job classification logic:
   - Deterministic signal extraction from ATS metadata
   - Keyword heuristic for unambiguous cases (Tier 0)
-  - Workers AI via langchain-cloudflare LCEL chain (Tier 1 — free)
+  - Company remote-policy prior from the company's recent jobs (Tier 0.5)
+  - Learned classifier trained on past verdicts (Tier 0.75)
+  - Workers AI via env.AI.run (Tier 1 — free)
   - DeepSeek API fallback (Tier 2 — paid)
 
-Pipeline: extract signals -> heuristic -> Workers AI -> DeepSeek fallback
+Pipeline: extract signals -> heuristic -> company policy -> learned model -> Workers AI -> DeepSeek fallback
 
 Endpoints:
   GET  /health         — D1 + AI binding health check
   POST /classify       — Batch classify jobs at status='role-match'
   POST /classify-one   — Classify a single job by ID
+  POST /prescreen      — Tier 0 only over caller-supplied rows (no D1, no LLM)
   POST /               — Enqueue to CF Queue for async processing
 
+RPC (service binding):
+  classify_jobs(rows)  — Classify caller-supplied rows, return per-job results (no D1)
+
 Triggers:
   Cron (every 6h)      — Classify all pending jobs
   Queue consumer       — Process queued classification requests
 
-Based on the langchain-cloudflare Python Worker pattern.
-LangChain features used:
-  - ChatCloudflareWorkersAI — Workers AI binding for free classification
-  - ChatPromptTemplate — reusable, parameterised prompt templates
-  - LCEL chain (prompt | model) — composable classification pipeline
+LLM calls go straight to the AI binding / DeepSeek with request bodies
+pre-serialized by ChatPrompt (chat_prompt.py) — no langchain on the import
+or request path.
 """
 
+# Time every import below -- reported by GET /health (see import_profile.py)
+from import_profile import IMPORT_PROFILE
+IMPORT_PROFILE.start()
+
 import asyncio
 import json
+import time
 
 from workers import Response, WorkerEntrypoint
 
-from db import d1_all, d1_run, to_js_obj, to_py
-from signals import extract_eu_signals, format_signals
-from heuristic import keyword_eu_classify
+from db import d1_all, d1_batch, d1_run, from_rpc, to_js_obj, to_py, to_rpc
+from signals import conflicting_signals, extract_eu_signals, extract_eu_signals_batch, format_signals
+from heuristic import keyword_eu_classify, prescreen_jobs
+from learned_model import learned_classify
 from chain import classify_with_workers_ai, classify_with_deepseek
 from models import JobClassification
+from llm_stream import LLM_LATENCY, StreamResult, read_json_stream
+from llm_usage import DEEPSEEK_USAGE
+from llm_budget import DEEPSEEK_BUDGET
+from run_log import LOG
+from tracing import PARENT_HEADER, TRACE_HEADER, TRACER
+from job_retry import (
+    SEND_BATCH_SIZE,
+    RetryPlan,
+    chunk_ids,
+    id_filter,
+    message_job_ids,
+    plan_retries,
+    retry_delay_s,
+)
+from model_router import (
+    INSERT_SQL as ROUTING_INSERT_SQL,
+    MODEL_ROUTER,
+    TASK_EU_CLASSIFY,
+    PRUNE_SQL as ROUTING_PRUNE_SQL,
+    WARM_SQL as ROUTING_WARM_SQL,
+    insert_params as routing_insert_params,
+    prune_params as routing_prune_params,
+    run_routed,
+)
+from company_policy import (
+    COMPANY_POLICIES,
+    UPSERT_SQL as COMPANY_POLICY_UPSERT_SQL,
+    company_policy_classify,
+    is_remote_posting,
+    load_sql as company_policy_load_sql,
+)
+from location_cache import (
+    LOCATION_RESOLVER,
+    RESOLVER_VERSION,
+    UPSERT_SQL as LOCATION_UPSERT_SQL,
+    WARM_SQL as LOCATION_WARM_SQL,
+    cache_stats as location_cache_stats,
+)
 
 
 # -------------------------------------------------------------------------
@@ -55,8 +103,18 @@ async def fetch_json(
     headers: dict | None = None,
     body: str | None = None,
     retries: int = 2,
+    read=None,
 ) -> dict:
-    """Fetch JSON from a URL using JS fetch with retry support."""
+    """Fetch JSON from a URL using JS fetch with retry support.
+
+    ``read`` (async, takes the OK response) replaces the JSON parse — used
+    by stream_json to consume a streamed body under the same retry policy.
+    """
+    with TRACER.span("fetch", "fetch", method=method, host=url.split("/")[2] if "://" in url else url) as span:
+        return await _fetch_json(url, method, headers, body, retries, read, span)
+
+
+async def _fetch_json(url, method, headers, body, retries, read, span) -> dict:
     last_err = None
 
     for attempt in range(retries + 1):
@@ -67,7 +125,9 @@ async def fetch_json(
             if body:
                 opts["body"] = body
 
+            span.attrs["attempts"] = attempt + 1
             response = await fetch(url, to_js_obj(opts))
+            span.attrs["status"]   = response.status
 
             if response.status == 429 or 500 <= response.status <= 599:
                 if attempt == retries:
@@ -81,6 +141,9 @@ async def fetch_json(
                 text = await response.text()
                 raise Exception(f"HTTP {response.status}: {text}")
 
+            if read is not None:
+                return await read(response)
+
             data = await response.json()
             return to_py(data)
 
@@ -94,6 +157,37 @@ async def fetch_json(
     raise last_err or Exception("Unknown network error in fetch_json")
 
 
+async def stream_json(
+    url: str, headers: dict, prompt, values: dict, required: tuple[str, ...],
+    retries: int = 3, **fields,
+) -> StreamResult:
+    """POST a streamed chat-completions request and stop at the first usable JSON object.
+
+    ``prompt`` is a ChatPrompt; its pre-serialized body carries ``fields``
+    (model, temperature, ...). See llm_stream.py -- the stream is cancelled
+    once ``required`` keys have arrived, and its TTFB / time-to-decision
+    land in LLM_LATENCY.
+    """
+    started = time.monotonic()
+
+    async def read(response):
+        return await read_json_stream(
+            response.body.getReader(), required, provider="deepseek", started=started,
+        )
+
+    body   = prompt.request_body(values, **fields, stream=True, stream_options={"include_usage": True})
+    result = await fetch_json(
+        url,
+        method  = "POST",
+        headers = headers,
+        body    = body,
+        retries = retries,
+        read    = read,
+    )
+    result.prompt_chars = len(body)
+    return result
+
+
 # -------------------------------------------------------------------------
 # Job status enum values
 # -------------------------------------------------------------------------
@@ -115,13 +209,38 @@ async def classify_single_job(
     api_key: str | None,
     base_url: str,
     model: str,
+    eu_signals: dict | None = None,
 ) -> tuple[JobClassification | None, str]:
-    """Run the full three-tier classification pipeline on a single job.
+    """Run the full tiered classification pipeline on a single job.
+
+    Batch callers pass ``eu_signals`` from ``extract_eu_signals_batch``.
+    High-confidence verdicts on remote postings are recorded as evidence
+    for the job's company (see company_policy.py).
 
     Returns (classification, source) where source is one of:
-      "heuristic", "workers-ai", "deepseek"
+      "heuristic", "company-policy", "learned", "workers-ai", "deepseek"
     """
-    eu_signals   = extract_eu_signals(job)
+    if eu_signals is None:
+        eu_signals = extract_eu_signals(job)
+
+    classification, source = await _classify_tiers(
+        job, ai_binding, api_key, base_url, model, eu_signals,
+    )
+    if classification is not None and is_remote_posting(job, eu_signals):
+        COMPANY_POLICIES.observe(
+            job.get("company_key"), classification.isRemoteEU, classification.confidence, source,
+        )
+    return classification, source
+
+
+async def _classify_tiers(
+    job: dict,
+    ai_binding,
+    api_key: str | None,
+    base_url: str,
+    model: str,
+    eu_signals: dict,
+) -> tuple[JobClassification | None, str]:
     signals_text = format_signals(eu_signals)
 
     classification: JobClassification | None = None
@@ -133,48 +252,85 @@ async def classify_single_job(
     if heuristic_result is not None:
         return heuristic_result, "heuristic"
 
-    # Tier 1 -- Workers AI (primary, free)
+    # Tier 0.5 -- Company remote-policy prior (free, no LLM)
+    policy_result = company_policy_classify(
+        job, eu_signals, COMPANY_POLICIES.evidence(job.get("company_key")),
+    )
+    if policy_result is not None:
+        return policy_result, "company-policy"
+
+    # Tier 0.75 -- Learned classifier (free, no LLM); only past its calibrated thresholds
+    learned_result = learned_classify(job, eu_signals)
+    if learned_result is not None:
+        return learned_result, "learned"
+
+    # Tier 1 -- Workers AI (primary, free). Small model first, escalating to
+    # the larger one unless it's confident; conflicting signals start large.
     if ai_binding:
-        wa_result = await classify_with_workers_ai(job, ai_binding, signals_text)
+        wa_result = await run_routed(
+            MODEL_ROUTER, TASK_EU_CLASSIFY, len((job.get("description") or "")[:6000]),
+            lambda model: classify_with_workers_ai(job, ai_binding, signals_text, model),
+            lambda c: c.confidence == "high",
+            hard  = conflicting_signals(eu_signals),
+            agree = lambda a, b: a.isRemoteEU == b.isRemoteEU,
+        )
         if wa_result and wa_result.confidence == "high":
             return wa_result, "workers-ai"
 
-    # Tier 2 -- DeepSeek fallback
-    if api_key:
+    # Tier 2 -- DeepSeek fallback, while the shared rate limit / daily budget
+    # grants a permit; otherwise Workers AI's answer is accepted below
+    if api_key and await DEEPSEEK_BUDGET.acquire():
         classification = await classify_with_deepseek(
             job, api_key, base_url, model, signals_text,
             fetch_json_fn=fetch_json,
+            stream_json_fn=stream_json,
         )
         return classification, "deepseek"
 
-    # Accept Workers AI as-is when no DeepSeek key
+    # Accept Workers AI as-is when no DeepSeek key (or no budget left)
     if wa_result is not None:
         return wa_result, "workers-ai"
 
     return None, "none"
 
 
+def classification_record(job: dict, classification: JobClassification, source: str) -> dict:
+    """Build the column values stored for a classified job.
+
+    Shared by the D1 persist path and the RPC path, where the caller
+    writes the same values itself.
+    """
+    is_eu      = classification.isRemoteEU
+    confidence = classification.confidence
+    evidence   = f"title:{(job.get('title') or '')[:100]} | loc:{(job.get('location') or 'N/A')[:80]}"
+    return {
+        "id":          job["id"],
+        "isRemoteEU":  is_eu,
+        "confidence":  confidence,
+        "source":      source,
+        "reason":      classification.reason,
+        "score":       {"high": 0.9, "medium": 0.6, "low": 0.3}.get(confidence, 0.3),
+        "scoreReason": f"[{source}] {classification.reason} | evidence:{evidence}",
+        "status":      STATUS_EU_REMOTE if is_eu else STATUS_NON_EU,
+    }
+
+
 async def classify_job_and_persist(
     db, job: dict, ai_binding, api_key: str | None,
-    base_url: str, model: str,
+    base_url: str, model: str, eu_signals: dict | None = None,
 ) -> dict:
     """Classify a single job and persist the result to D1.
 
     Returns a stats dict for aggregation.
     """
     classification, source = await classify_single_job(
-        job, ai_binding, api_key, base_url, model,
+        job, ai_binding, api_key, base_url, model, eu_signals,
     )
 
     if classification is None:
         return {"error": True}
 
-    is_eu      = classification.isRemoteEU
-    confidence = classification.confidence
-    evidence   = f"title:{job.get('title','')[:100]} | loc:{job.get('location','N/A')[:80]}"
-    reason     = f"[{source}] {classification.reason} | evidence:{evidence}"
-    score      = {"high": 0.9, "medium": 0.6, "low": 0.3}.get(confidence, 0.3)
-    job_status = STATUS_EU_REMOTE if is_eu else STATUS_NON_EU
+    record = classification_record(job, classification, source)
 
     await d1_run(
         db,
@@ -185,19 +341,213 @@ async def classify_job_and_persist(
             updated_at = datetime('now')
         WHERE id = ?
         """,
-        [score, reason, job_status,
-         1 if is_eu else 0, confidence, classification.reason,
+        [record["score"], record["scoreReason"], record["status"],
+         1 if record["isRemoteEU"] else 0, record["confidence"], record["reason"],
          job["id"]],
     )
 
     return {
-        "isRemoteEU": is_eu,
-        "confidence": confidence,
+        "isRemoteEU": record["isRemoteEU"],
+        "confidence": record["confidence"],
         "source": source,
     }
 
 
-async def classify_batch(db, env, limit: int = 50) -> dict:
+def _classifier_backends(env) -> tuple:
+    """Return (ai_binding, api_key, base_url, model) from env, failing if neither backend exists."""
+    api_key    = getattr(env, "DEEPSEEK_API_KEY", None) or getattr(env, "OPENAI_API_KEY", None)
+    base_url   = getattr(env, "DEEPSEEK_BASE_URL", None) or "https://api.deepseek.com/beta"
+    model      = getattr(env, "DEEPSEEK_MODEL", None) or "deepseek-chat"
+    ai_binding = getattr(env, "AI", None)
+
+    if not ai_binding and not api_key:
+        raise Exception(
+            "No classification backend available. "
+            "Provide either the AI binding (Workers AI) or DEEPSEEK_API_KEY."
+        )
+    return ai_binding, api_key, base_url, model
+
+
+def _count_result(stats: dict, is_eu: bool, source: str) -> None:
+    stats["processed"] += 1
+    if is_eu:
+        stats["euRemote"] += 1
+    else:
+        stats["nonEuRemote"] += 1
+
+    if source == "heuristic":
+        stats["heuristic"] += 1
+    elif source == "company-policy":
+        stats["companyPolicy"] += 1
+    elif source == "learned":
+        stats["learned"] += 1
+    elif source == "workers-ai":
+        stats["workersAI"] += 1
+    elif source == "deepseek":
+        stats["deepseek"] += 1
+
+
+def _empty_stats() -> dict:
+    return {
+        "processed": 0, "euRemote": 0, "nonEuRemote": 0,
+        "errors": 0, "workersAI": 0, "deepseek": 0, "heuristic": 0,
+        "companyPolicy": 0, "learned": 0,
+    }
+
+
+ROUTING_WORKER     = "eu-classifier"
+ROUTING_WARM_LIMIT = 500
+
+
+async def prepare_model_router(db, env) -> None:
+    """Apply LLM_ROUTES, prune old llm_routing_log rows and seed rolling stats, once per isolate."""
+    MODEL_ROUTER.configure(getattr(env, "LLM_ROUTES", None))
+    if MODEL_ROUTER.warmed or db is None:
+        return
+    try:
+        await d1_run(db, ROUTING_PRUNE_SQL, routing_prune_params(ROUTING_WORKER))
+        rows = await d1_all(db, ROUTING_WARM_SQL, [ROUTING_WORKER, ROUTING_WARM_LIMIT])
+        print(f"Model router warmed with {MODEL_ROUTER.warm(rows)} outcomes")
+    except Exception as e:
+        # Table may not exist yet -- route on defaults until outcomes accumulate
+        print(f"   Model router warm-up skipped: {e}")
+        MODEL_ROUTER.warmed = True
+
+
+async def flush_routing_log(db) -> None:
+    """Persist routing decisions and outcomes recorded since the last flush (best-effort)."""
+    rows = MODEL_ROUTER.drain()
+    if not rows or db is None:
+        return
+    try:
+        await d1_batch(db, [(ROUTING_INSERT_SQL, routing_insert_params(ROUTING_WORKER, r)) for r in rows])
+    except Exception as e:
+        print(f"   Routing log flush failed ({len(rows)} rows): {e}")
+
+
+def prepare_deepseek_budget(db, env) -> None:
+    """Apply the DEEPSEEK_* limits and bind the shared budget to this request's D1."""
+    DEEPSEEK_BUDGET.configure(
+        getattr(env, "DEEPSEEK_RPM", None),
+        getattr(env, "DEEPSEEK_DAILY_TOKENS", None),
+        getattr(env, "DEEPSEEK_DAILY_USD", None),
+    )
+    if db is not None:
+        DEEPSEEK_BUDGET.bind(
+            lambda sql, params: d1_all(db, sql, params),
+            lambda seconds: sleep_ms(int(seconds * 1000)),
+        )
+
+
+async def warm_location_cache(db) -> None:
+    """Load persisted location resolutions once per isolate (best-effort)."""
+    if LOCATION_RESOLVER.warmed:
+        return
+    try:
+        rows = await d1_all(db, LOCATION_WARM_SQL, [RESOLVER_VERSION, LOCATION_RESOLVER.max_entries])
+        print(f"Location cache warmed with {LOCATION_RESOLVER.warm(rows)} resolutions")
+    except Exception as e:
+        # Table may not exist yet — run with a cold in-memory cache
+        print(f"   Location cache warm-up skipped: {e}")
+        LOCATION_RESOLVER.warmed = True
+
+
+async def flush_location_cache(db) -> None:
+    """Upsert the locations looked up since the last flush (best-effort)."""
+    rows = LOCATION_RESOLVER.pending_rows()
+    if not rows:
+        return
+    try:
+        await d1_batch(db, [(LOCATION_UPSERT_SQL, params) for params in rows])
+    except Exception as e:
+        print(f"   Location cache flush failed: {e}")
+
+
+async def load_company_policies(db, rows: list[dict]) -> None:
+    """Load persisted policies for the companies in ``rows`` (best-effort)."""
+    keys = COMPANY_POLICIES.unloaded(row.get("company_key") for row in rows)
+    try:
+        for i in range(0, len(keys), 50):
+            chunk = keys[i:i + 50]
+            COMPANY_POLICIES.load(chunk, await d1_all(db, company_policy_load_sql(len(chunk)), chunk))
+    except Exception as e:
+        # Table may not exist yet — rely on this isolate's own observations
+        print(f"   Company policy load skipped: {e}")
+
+
+async def flush_company_policies(db) -> None:
+    """Add the evidence observed since the last flush to D1 (best-effort)."""
+    rows = COMPANY_POLICIES.pending_rows()
+    if not rows:
+        return
+    try:
+        await d1_batch(db, [(COMPANY_POLICY_UPSERT_SQL, params) for params in rows])
+    except Exception as e:
+        print(f"   Company policy flush failed: {e}")
+
+
+async def classify_rows(rows: list[dict], env) -> dict:
+    """Classify caller-supplied job rows without reading or writing ``jobs``.
+
+    Rows must carry the ATS signal columns (country, workplace_type,
+    ashby_* ...) and ``company_key``. Company policies are loaded and
+    flushed through the DB binding when there is one. Returns ``{"results": [record, ...], "stats": {...}}``
+    where each record is a ``classification_record`` — jobs that produced
+    no classification are counted as errors and omitted.
+    """
+    ai_binding, api_key, base_url, model = _classifier_backends(env)
+
+    stats   = _empty_stats()
+    results = []
+
+    before      = LOCATION_RESOLVER.counters()
+    all_signals = extract_eu_signals_batch(rows)
+    stats.update(location_cache_stats(before, LOCATION_RESOLVER.counters()))
+
+    db = getattr(env, "DB", None)
+    if db is not None:
+        await load_company_policies(db, rows)
+    await prepare_model_router(db, env)
+    prepare_deepseek_budget(db, env)
+    usage_before   = DEEPSEEK_USAGE.snapshot()
+    latency_before = LLM_LATENCY.snapshot()
+    logs_before    = LOG.stats.snapshot()
+
+    for job, eu_signals in zip(rows, all_signals):
+        try:
+            classification, source = await classify_single_job(
+                job, ai_binding, api_key, base_url, model, eu_signals,
+            )
+            if classification is None:
+                stats["errors"] += 1
+                continue
+
+            results.append(classification_record(job, classification, source))
+            _count_result(stats, classification.isRemoteEU, source)
+
+            if source not in ("heuristic", "company-policy", "learned"):
+                await sleep_ms(200 if source == "deepseek" else 50)
+
+        except Exception as e:
+            LOG.job("error", job.get("id"), "error classifying job", error=str(e))
+            stats["errors"] += 1
+
+    if db is not None:
+        await flush_company_policies(db)
+    await flush_routing_log(db)
+    await DEEPSEEK_BUDGET.flush()
+    stats.update(DEEPSEEK_USAGE.since(usage_before).as_stats(jobs=stats["processed"]))
+    stats.update(LLM_LATENCY.since(latency_before).as_stats())
+    LOG.summary(
+        "rpc classification complete", jobs=len(rows), classified=stats["processed"],
+        euRemote=stats["euRemote"], errors=stats["errors"],
+    )
+    stats.update(LOG.stats.since(logs_before).as_stats())
+
+    return {"results": results, "stats": stats}
+
+
+async def classify_batch(db, env, limit: int = 50, job_ids: list | None = None) -> dict:
     """Classify all jobs at status='role-match' only.
 
     Only processes jobs that have passed role tagging (role-match) to ensure
@@ -206,82 +556,123 @@ async def classify_batch(db, env, limit: int = 50) -> dict:
     to exit the pipeline without role_ai_engineer ever being set.
 
     Three-tier strategy:
-      1. Workers AI via langchain LCEL (free) -- use directly if high confidence.
+      1. Workers AI via AI.run (free) -- use directly if high confidence.
       2. DeepSeek fallback (paid) -- if Workers AI fails or is uncertain.
       3. Accept Workers AI as-is if no DeepSeek key is configured.
-    """
-    api_key    = getattr(env, "DEEPSEEK_API_KEY", None) or getattr(env, "OPENAI_API_KEY", None)
-    base_url   = getattr(env, "DEEPSEEK_BASE_URL", None) or "https://api.deepseek.com/beta"
-    model      = getattr(env, "DEEPSEEK_MODEL", None) or "deepseek-chat"
-    ai_binding = getattr(env, "AI", None)
 
-    if not ai_binding and not api_key:
-        raise Exception(
-            "No classification backend available. "
-            "Provide either the AI binding (Workers AI) or DEEPSEEK_API_KEY."
-        )
+    Jobs are taken highest ``priority_rank`` first (scored by process-jobs,
+    see its priority.py). ``job_ids`` restricts the batch to those jobs; ids
+    that produced no classification are returned in ``failedIds``.
+    """
+    ai_binding, api_key, base_url, model = _classifier_backends(env)
 
-    print("Phase 3 -- Fetching jobs ready for EU classification...")
+    LOG.info("phase 3: fetching jobs ready for eu classification", limit=limit)
+    logs_before = LOG.stats.snapshot()
 
+    only_ids, id_params = id_filter(job_ids)
     rows = await d1_all(
         db,
         """SELECT id, title, location, description,
                   country, workplace_type, offices, categories,
                   ashby_is_remote, ashby_secondary_locations, ashby_address,
-                  source_kind
-           FROM jobs WHERE status = ? ORDER BY created_at DESC LIMIT ?""",
-        [STATUS_ROLE_MATCH, limit],
+                  source_kind, company_key
+           FROM jobs WHERE status = ?""" + only_ids + """ ORDER BY priority_rank DESC, created_at DESC LIMIT ?""",
+        [STATUS_ROLE_MATCH, *id_params, limit],
     )
 
-    print(f"Found {len(rows)} jobs to classify")
+    LOG.info("phase 3: jobs to classify", jobs=len(rows))
 
-    stats = {
-        "processed": 0, "euRemote": 0, "nonEuRemote": 0,
-        "errors": 0, "workersAI": 0, "deepseek": 0, "heuristic": 0,
-    }
+    stats  = _empty_stats()
+    failed = []
 
-    for job in rows:
-        try:
-            print(f"\nClassifying job {job['id']}: {job.get('title')}")
+    await warm_location_cache(db)
+    before      = LOCATION_RESOLVER.counters()
+    all_signals = extract_eu_signals_batch(rows)
+    stats.update(location_cache_stats(before, LOCATION_RESOLVER.counters()))
+    await flush_location_cache(db)
+    LOG.info("location cache", hitRate=stats["locationCacheHitRate"])
+    await load_company_policies(db, rows)
+    await prepare_model_router(db, env)
+    prepare_deepseek_budget(db, env)
+    usage_before   = DEEPSEEK_USAGE.snapshot()
+    latency_before = LLM_LATENCY.snapshot()
 
+    for job, eu_signals in zip(rows, all_signals):
+        try:
             result = await classify_job_and_persist(
-                db, job, ai_binding, api_key, base_url, model,
+                db, job, ai_binding, api_key, base_url, model, eu_signals,
             )
 
             if result.get("error"):
-                print(f"   No classification produced")
+                LOG.job("error", job["id"], "no classification produced")
                 stats["errors"] += 1
+                failed.append(job["id"])
                 continue
 
             source = result["source"]
             is_eu  = result["isRemoteEU"]
             conf   = result["confidence"]
 
-            stats["processed"] += 1
-            if is_eu:
-                stats["euRemote"] += 1
-            else:
-                stats["nonEuRemote"] += 1
-
-            if source == "heuristic":
-                stats["heuristic"] += 1
-            elif source == "workers-ai":
-                stats["workersAI"] += 1
-            elif source == "deepseek":
-                stats["deepseek"] += 1
+            _count_result(stats, is_eu, source)
 
-            print(f"   {'EU Remote' if is_eu else 'Non-EU'} ({conf}) [{source}]")
+            LOG.job(
+                "info", job["id"], "classified",
+                title=job.get("title"), euRemote=is_eu, confidence=conf, source=source,
+            )
 
             # Rate limit: Workers AI is same-machine, DeepSeek needs throttling
-            await sleep_ms(200 if source == "deepseek" else 50)
+            if source not in ("heuristic", "company-policy", "learned"):
+                await sleep_ms(200 if source == "deepseek" else 50)
 
         except Exception as e:
-            print(f"   Error classifying job {job['id']}: {e}")
+            LOG.job("error", job["id"], "error classifying job", error=str(e))
             stats["errors"] += 1
+            failed.append(job["id"])
+
+    await flush_company_policies(db)
+    await flush_routing_log(db)
+    await DEEPSEEK_BUDGET.flush()
+    stats.update(DEEPSEEK_USAGE.since(usage_before).as_stats(jobs=stats["processed"]))
+    stats.update(LLM_LATENCY.since(latency_before).as_stats())
+    LOG.summary(
+        "phase 3: classification complete",
+        classified=stats["processed"], euRemote=stats["euRemote"], nonEuRemote=stats["nonEuRemote"],
+        errors=stats["errors"], companyPolicy=stats["companyPolicy"], learned=stats["learned"],
+        promptCacheHitRate=stats["promptCacheHitRate"], deepseekCostPerJobUsd=stats["deepseekCostPerJobUsd"],
+        llmStreamCalls=stats["llmStreamCalls"], llmEarlyStops=stats["llmEarlyStops"],
+        llmTtfbMsAvg=stats["llmTtfbMsAvg"], llmDecisionMsAvg=stats["llmDecisionMsAvg"],
+    )
+    stats.update(LOG.stats.since(logs_before).as_stats())
+    stats["failedIds"] = failed
 
     return stats
 
 
+async def send_retry_plan(env, plan: RetryPlan) -> None:
+    """Re-enqueue failed jobs (delayed by attempt) and dead-letter the exhausted ones.
+
+    Dead letters go to EU_CLASSIFIER_DLQ when the binding exists; they are
+    logged as per-job errors either way.
+    """
+    queue = getattr(env, "EU_CLASSIFIER_QUEUE", None)
+    dlq   = getattr(env, "EU_CLASSIFIER_DLQ", None)
+    for i in range(0, len(plan.retry), SEND_BATCH_SIZE):
+        if queue is None:
+            break
+        await queue.sendBatch(to_js_obj([
+            {"body": body, "delaySeconds": retry_delay_s(body["attempts"])}
+            for body in plan.retry[i:i + SEND_BATCH_SIZE]
+        ]))
+    for body in plan.dead:
+        LOG.job("error", body["jobId"], "job dead-lettered", action=body["action"], attempts=body["attempts"])
+    for i in range(0, len(plan.dead), SEND_BATCH_SIZE):
+        if dlq is None:
+            break
+        await dlq.sendBatch(to_js_obj([{"body": body} for body in plan.dead[i:i + SEND_BATCH_SIZE]]))
+    if plan:
+        LOG.summary("queue retries planned", retried=len(plan.retry), deadLettered=len(plan.dead))
+
+
 # =========================================================================
 # Worker Entrypoint
 # =========================================================================
@@ -292,7 +683,7 @@ class Default(WorkerEntrypoint):
     Owns all EU remote classification logic:
       - Signal extraction from ATS metadata
       - Keyword heuristic (Tier 0)
-      - Workers AI via LangChain LCEL (Tier 1)
+      - Workers AI via AI.run (Tier 1)
       - DeepSeek API fallback (Tier 2)
     """
 
@@ -300,6 +691,9 @@ class Default(WorkerEntrypoint):
 
     async def fetch(self, request, env):
         """Handle incoming HTTP requests."""
+        IMPORT_PROFILE.mark_request()
+        LOG.configure(getattr(self.env, "LOG_LEVEL", None), getattr(self.env, "LOG_JOB_SAMPLE", None))
+        TRACER.start_trace(request.headers.get(TRACE_HEADER), request.headers.get(PARENT_HEADER))
         cors_headers = {
             "Access-Control-Allow-Origin":  "*",
             "Access-Control-Allow-Methods": "POST, GET, OPTIONS",
@@ -338,6 +732,8 @@ class Default(WorkerEntrypoint):
                 return await self.handle_classify(request, cors_headers)
             elif path == "classify-one":
                 return await self.handle_classify_one(request, cors_headers)
+            elif path == "prescreen":
+                return await self.handle_prescreen(request, cors_headers)
             else:
                 return await self.handle_enqueue(request, cors_headers)
 
@@ -348,6 +744,34 @@ class Default(WorkerEntrypoint):
                 status=500,
                 headers=cors_headers,
             )
+        finally:
+            TRACER.flush()
+
+    # MARK: - RPC
+
+    async def classify_jobs(self, rows, trace=None):
+        """RPC: classify already-loaded job rows and return per-job results.
+
+        Called by process-jobs over the EU_CLASSIFIER service binding with
+        rows that include the ATS signal columns. Nothing is read from or
+        written to D1 — the caller persists ``results`` in one batch.
+
+        ``trace`` is the caller's ``{traceId, parentSpanId}`` -- spans made
+        here join that trace.
+
+        Returns ``{"results": [{id, isRemoteEU, confidence, source, reason,
+        score, scoreReason, status}, ...], "stats": {...}}``.
+        """
+        IMPORT_PROFILE.mark_request()
+        LOG.configure(getattr(self.env, "LOG_LEVEL", None), getattr(self.env, "LOG_JOB_SAMPLE", None))
+        trace = from_rpc(trace) or {}
+        TRACER.start_trace(trace.get("traceId"), trace.get("parentSpanId"))
+        try:
+            rows = [r for r in (from_rpc(rows) or []) if isinstance(r, dict) and r.get("id") is not None]
+            LOG.info("rpc classify_jobs", rows=len(rows), traceId=TRACER.trace_id)
+            return to_rpc(await classify_rows(rows, self.env))
+        finally:
+            TRACER.flush()
 
     # MARK: - Scheduled (Cron) Handler
 
@@ -357,18 +781,23 @@ class Default(WorkerEntrypoint):
         Configured via [triggers].crons in wrangler.jsonc.
         Runs every 6 hours.
         """
-        print("Cron: Starting EU classification pipeline...")
+        IMPORT_PROFILE.mark_request()
+        LOG.configure(getattr(self.env, "LOG_LEVEL", None), getattr(self.env, "LOG_JOB_SAMPLE", None))
+        LOG.start_run(time.time())
+        LOG.info("cron: starting eu classification pipeline", traceId=TRACER.start_trace())
         try:
             db = self.env.DB
             stats = await classify_batch(db, self.env, 10000)
-            print(
-                f"Cron complete -- classified={stats['processed']} "
-                f"eu={stats['euRemote']} non-eu={stats['nonEuRemote']} "
-                f"heuristic={stats['heuristic']} "
-                f"workersAI={stats['workersAI']} deepseek={stats['deepseek']}"
+            LOG.summary(
+                "cron complete", classified=stats["processed"],
+                euRemote=stats["euRemote"], nonEuRemote=stats["nonEuRemote"],
+                heuristic=stats["heuristic"], workersAI=stats["workersAI"], deepseek=stats["deepseek"],
+                logLines=stats["logLines"], logSuppressed=stats["logSuppressed"], logMs=stats["logMs"],
             )
         except Exception as e:
-            print(f"Error in cron: {e}")
+            LOG.error("cron failed", error=str(e))
+        finally:
+            TRACER.flush()
 
     # MARK: - Queue Consumer
 
@@ -376,17 +805,30 @@ class Default(WorkerEntrypoint):
         """Consume messages from the eu-classifier queue.
 
         Supported actions:
-          classify     -- Batch classify pending jobs
+          classify     -- Batch classify pending jobs (or the message's ``jobIds``)
           classify-one -- Classify a single job by ID
+
+        A ``classify`` message's per-job failures -- or its whole id set if
+        classify_batch raises -- are re-enqueued one job per message and the
+        message is acked (see job_retry.py).
         """
+        IMPORT_PROFILE.mark_request()
+        LOG.configure(getattr(self.env, "LOG_LEVEL", None), getattr(self.env, "LOG_JOB_SAMPLE", None))
         for message in batch.messages:
             try:
-                body   = to_py(message.body)
-                action = body.get("action", "classify")
-                limit  = body.get("limit", 10000)
-                db     = self.env.DB
-
-                print(f"Queue message: action={action}, limit={limit}")
+                body     = to_py(message.body)
+                action   = body.get("action", "classify")
+                job_ids  = message_job_ids(body) if action == "classify" else None
+                attempts = int(body.get("attempts") or 0)
+                limit    = body.get("limit") or (len(job_ids) if job_ids is not None else 10000)
+                db       = self.env.DB
+
+                LOG.start_run(getattr(message, "id", None) or time.time())
+                LOG.info(
+                    "queue message", action=action, limit=limit, attempts=attempts,
+                    jobs=len(job_ids) if job_ids is not None else None,
+                    traceId=TRACER.start_trace(body.get("traceId")),
+                )
 
                 if action == "classify-one":
                     job_id = body.get("job_id")
@@ -396,7 +838,7 @@ class Default(WorkerEntrypoint):
                             """SELECT id, title, location, description,
                                       country, workplace_type, offices, categories,
                                       ashby_is_remote, ashby_secondary_locations, ashby_address,
-                                      source_kind
+                                      source_kind, company_key
                                FROM jobs WHERE id = ? LIMIT 1""",
                             [job_id],
                         )
@@ -404,20 +846,38 @@ class Default(WorkerEntrypoint):
                             api_key  = getattr(self.env, "DEEPSEEK_API_KEY", None) or getattr(self.env, "OPENAI_API_KEY", None)
                             base_url = getattr(self.env, "DEEPSEEK_BASE_URL", None) or "https://api.deepseek.com/beta"
                             model    = getattr(self.env, "DEEPSEEK_MODEL", None) or "deepseek-chat"
+                            await load_company_policies(db, rows)
+                            prepare_deepseek_budget(db, self.env)
                             result = await classify_job_and_persist(
                                 db, rows[0], getattr(self.env, "AI", None),
                                 api_key, base_url, model,
                             )
-                            print(f"   Classified job {job_id}: {result}")
+                            await flush_company_policies(db)
+                            await DEEPSEEK_BUDGET.flush()
+                            LOG.summary("classified job", job=job_id, **result)
                 else:
-                    stats = await classify_batch(db, self.env, limit)
-                    print(f"   Classified: {stats['processed']}, EU: {stats['euRemote']}")
+                    try:
+                        stats = await classify_batch(db, self.env, limit, job_ids)
+                    except Exception as e:
+                        if job_ids is None:
+                            raise  # nothing to isolate -- replay the message
+                        LOG.error("queue classify failed, retrying its jobs", jobs=len(job_ids), error=str(e))
+                        stats = {"processed": 0, "euRemote": 0, "failedIds": job_ids}
+                    LOG.summary(
+                        "queue classify done", classified=stats["processed"],
+                        euRemote=stats["euRemote"], failed=len(stats["failedIds"]),
+                    )
+                    await send_retry_plan(
+                        self.env, plan_retries("classify", stats["failedIds"], attempts, trace_id=TRACER.trace_id),
+                    )
 
                 message.ack()
 
             except Exception as e:
-                print(f"Queue message failed: {e}")
+                LOG.error("queue message failed", error=str(e))
                 message.retry()
+            finally:
+                TRACER.flush()
 
     # MARK: - HTTP Handlers
 
@@ -436,7 +896,9 @@ class Default(WorkerEntrypoint):
                 "queue":     hasattr(self.env, "EU_CLASSIFIER_QUEUE"),
                 "workersAI": hasattr(self.env, "AI"),
                 "deepseek":  bool(getattr(self.env, "DEEPSEEK_API_KEY", None)),
+                "deepseekBudget": DEEPSEEK_BUDGET.as_stats(),
                 "value":     rows[0]["value"] if rows else None,
+                "imports":   IMPORT_PROFILE.report(),
             }, headers=cors_headers)
         except Exception as e:
             return Response.json(
@@ -445,14 +907,38 @@ class Default(WorkerEntrypoint):
             )
 
     async def handle_classify(self, request, cors_headers: dict):
-        """Batch classify jobs at status='role-match'."""
-        limit = await self._parse_limit(request)
-        stats = await classify_batch(self.env.DB, self.env, limit)
+        """Batch classify jobs at status='role-match' (only ``jobIds`` when given)."""
+        body  = await self._read_body(request)
+        limit = self._limit_from(body)
+        stats = await classify_batch(self.env.DB, self.env, limit, message_job_ids(body))
         return Response.json(
             {"success": True, "message": f"Classified {stats['processed']} jobs", "stats": stats},
             headers=cors_headers,
         )
 
+    async def handle_prescreen(self, request, cors_headers: dict):
+        """Run the free Tier 0 check over job rows sent by the caller.
+
+        POST /prescreen
+        Body: { "jobs": [ { "id", "title", "location", "description", ATS columns... } ] }
+
+        Lets process-jobs drop non-EU jobs before paying for role tagging.
+        Nothing is persisted — the caller owns the status update.
+        """
+        try:
+            body = to_py(await request.json())
+        except Exception:
+            body = {}
+        jobs = body.get("jobs") if isinstance(body, dict) else None
+        if not isinstance(jobs, list):
+            return Response.json(
+                {"success": False, "error": "jobs (list) is required"},
+                status=400,
+                headers=cors_headers,
+            )
+        results = prescreen_jobs([j for j in jobs if isinstance(j, dict)])
+        return Response.json({"success": True, "results": results}, headers=cors_headers)
+
     async def handle_classify_one(self, request, cors_headers: dict):
         """Classify a single job by ID.
 
@@ -486,7 +972,7 @@ class Default(WorkerEntrypoint):
             """SELECT id, title, location, description,
                       country, workplace_type, offices, categories,
                       ashby_is_remote, ashby_secondary_locations, ashby_address,
-                      source_kind
+                      source_kind, company_key
                FROM jobs WHERE id = ? LIMIT 1""",
             [job_id],
         )
@@ -503,9 +989,12 @@ class Default(WorkerEntrypoint):
         model      = getattr(self.env, "DEEPSEEK_MODEL", None) or "deepseek-chat"
         ai_binding = getattr(self.env, "AI", None)
 
+        await load_company_policies(self.env.DB, rows)
+        prepare_deepseek_budget(self.env.DB, self.env)
         classification, source = await classify_single_job(
             rows[0], ai_binding, api_key, base_url, model,
         )
+        await DEEPSEEK_BUDGET.flush()
 
         if classification is None:
             return Response.json(
@@ -549,16 +1038,10 @@ class Default(WorkerEntrypoint):
 
     async def handle_enqueue(self, request, cors_headers: dict):
         """Enqueue a classification job to the CF Queue -- returns immediately."""
-        action = "classify"
-        limit  = 10000
-        try:
-            body   = to_py(await request.json())
-            action = body.get("action", "classify")
-            raw    = body.get("limit")
-            if isinstance(raw, (int, float)) and raw > 0:
-                limit = int(raw)
-        except Exception:
-            pass
+        body    = await self._read_body(request)
+        action  = body.get("action", "classify")
+        limit   = self._limit_from(body)
+        job_ids = message_job_ids(body) if action == "classify" else None
 
         queue = getattr(self.env, "EU_CLASSIFIER_QUEUE", None)
         if not queue:
@@ -568,6 +1051,15 @@ class Default(WorkerEntrypoint):
                 headers=cors_headers,
             )
 
+        if job_ids:
+            for ids in chunk_ids(job_ids):
+                await queue.send(to_js_obj({"action": action, "jobIds": ids, "traceId": TRACER.trace_id}))
+            LOG.info("enqueued", action=action, jobs=len(job_ids))
+            return Response.json(
+                {"success": True, "message": f"Queued '{action}' for {len(job_ids)} jobs", "queued": True},
+                headers=cors_headers,
+            )
+
         await queue.send(to_js_obj({"action": action, "limit": limit}))
         print(f"Enqueued: action={action}, limit={limit}")
 
@@ -580,11 +1072,22 @@ class Default(WorkerEntrypoint):
 
     async def _parse_limit(self, request) -> int:
         """Parse optional limit from request body JSON, defaulting to 10000."""
+        return self._limit_from(await self._read_body(request))
+
+    async def _read_body(self, request) -> dict:
+        """Request body JSON as a dict ({} when absent or invalid)."""
         try:
-            body  = to_py(await request.json())
-            limit = body.get("limit")
-            if isinstance(limit, (int, float)) and limit > 0:
-                return int(limit)
+            body = to_py(await request.json())
+            return body if isinstance(body, dict) else {}
         except Exception:
-            pass
+            return {}
+
+    def _limit_from(self, body: dict) -> int:
+        limit = body.get("limit")
+        if isinstance(limit, (int, float)) and limit > 0:
+            return int(limit)
         return 10000
+
+
+# Entry module fully loaded -- stop timing imports.
+IMPORT_PROFILE.stop()
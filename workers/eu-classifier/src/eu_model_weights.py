@@ -0,0 +1,7 @@
+"""Learned EU-remote classifier weights (see learned_model.py).
+
+Generated by ``python3 scripts/train-eu-classifier.py`` -- do not edit by
+hand. ``None`` until a model has been trained: the learned tier is skipped.
+"""
+
+MODEL = None
@@ -0,0 +1,179 @@
+"""Compact city / region gazetteer for location resolution.
+
+COUNTRY_NAME_TO_ISO only knows country names, so "Remote - Lisbon",
+"Amsterdam or Munich" and "Hybrid, Dublin" resolved to no country and fell
+through the heuristic to the LLM tiers. This module maps EU/EEA cities and
+regions (including native spellings) and the major non-EU hiring hubs to
+ISO codes.
+
+The data ships as one compact string and is parsed lazily on first lookup
+into a word-level trie (first word -> candidate phrases, longest first), so
+the cost is only paid by isolates that actually resolve locations.
+Accents are folded before matching ("München" == "munchen").
+
+Multi-country regions ("DACH", "Benelux", "Nordics") map to several codes;
+they contribute EU country names but never a single ``country_code``.
+"""
+
+import re
+import sys
+import unicodedata
+
+from constants import COUNTRY_NAME_TO_ISO, EU_ISO_CODES
+
+
+# Footprint ceiling for the parsed trie (checked by tests / the benchmark).
+MEMORY_BUDGET_BYTES = 256 * 1024
+
+# "ISO[,ISO...]:name;name;..." — one line per country / region group.
+_GAZETTEER_DATA = """
+AT:vienna;wien;graz;linz;salzburg;innsbruck;klagenfurt;tyrol;tirol;styria;steiermark;vorarlberg
+BE:brussels;bruxelles;brussel;antwerp;antwerpen;anvers;ghent;gent;gand;leuven;louvain;liege;luik;bruges;brugge;namur;mechelen;charleroi;flanders;vlaanderen;wallonia;wallonie
+BG:sofia;sofiya;plovdiv;varna;burgas
+HR:zagreb;rijeka;osijek;zadar
+CY:nicosia;lefkosia;limassol;lemesos;larnaca;paphos
+CZ:prague;praha;brno;ostrava;plzen;pilsen;olomouc;bohemia;moravia
+DK:copenhagen;kobenhavn;aarhus;arhus;odense;aalborg
+EE:tallinn;tartu
+FI:helsinki;helsingfors;espoo;tampere;turku;oulu;vantaa
+FR:paris;lyon;marseille;toulouse;nice;nantes;strasbourg;montpellier;bordeaux;lille;rennes;grenoble;sophia antipolis;ile de france;provence;brittany;bretagne;normandy;normandie;occitanie;auvergne rhone alpes
+DE:berlin;munich;munchen;muenchen;hamburg;cologne;koln;koeln;frankfurt;frankfurt am main;stuttgart;dusseldorf;duesseldorf;leipzig;dortmund;essen;bremen;dresden;hanover;hannover;nuremberg;nurnberg;nuernberg;karlsruhe;mannheim;heidelberg;bonn;aachen;freiburg;potsdam;bavaria;bayern;baden wurttemberg;baden wuerttemberg;hesse;hessen;saxony;sachsen;north rhine westphalia;nordrhein westfalen;nrw
+GR:athens;athina;thessaloniki;patras;heraklion
+HU:budapest;debrecen;szeged
+IE:dublin;baile atha cliath;cork;galway;limerick;waterford
+IT:rome;roma;milan;milano;turin;torino;naples;napoli;florence;firenze;bologna;genoa;genova;venice;venezia;verona;padua;padova;trieste;bari;palermo;pisa;lombardy;lombardia;piedmont;piemonte;tuscany;toscana;lazio;veneto;emilia romagna
+LV:riga
+LT:vilnius;kaunas;klaipeda
+LU:luxembourg city;esch sur alzette
+MT:valletta;sliema;st julians
+NL:amsterdam;rotterdam;the hague;den haag;s gravenhage;utrecht;eindhoven;groningen;leiden;delft;haarlem;nijmegen;tilburg;arnhem;maastricht;randstad
+PL:warsaw;warszawa;krakow;cracow;wroclaw;gdansk;gdynia;poznan;lodz;katowice;lublin;szczecin;bialystok;rzeszow;silesia;slask
+PT:lisbon;lisboa;porto;oporto;braga;coimbra;faro;aveiro;madeira;funchal;azores;algarve
+RO:bucharest;bucuresti;cluj;cluj napoca;timisoara;iasi;brasov;constanta;sibiu
+SK:bratislava;kosice;zilina
+SI:ljubljana;maribor
+ES:madrid;barcelona;valencia;seville;sevilla;malaga;bilbao;zaragoza;palma;palma de mallorca;alicante;granada;murcia;vigo;gijon;a coruna;la coruna;valladolid;san sebastian;donostia;las palmas;tenerife;catalonia;catalunya;cataluna;andalusia;andalucia;basque country;euskadi;galicia;canary islands;canarias;balearic islands
+SE:stockholm;gothenburg;goteborg;malmo;uppsala;linkoping;lund;umea;vasteras;orebro
+NO:oslo;bergen;trondheim;stavanger;tromso
+IS:reykjavik
+LI:vaduz
+DE,AT,CH:dach
+BE,NL,LU:benelux
+DK,FI,IS,NO,SE:nordics;nordic countries;scandinavia
+EE,LV,LT:baltics;baltic states
+ES,PT:iberia;iberian peninsula
+GB:london;manchester;edinburgh;glasgow;birmingham;bristol;leeds;liverpool;cambridge uk;oxford;belfast;cardiff;newcastle;sheffield;nottingham;brighton;england;scotland;wales;northern ireland
+CH:zurich;zuerich;geneva;geneve;genf;basel;bale;lausanne;bern;berne;lucerne;luzern;zug;lugano
+US:new york;new york city;nyc;san francisco;sf bay area;bay area;silicon valley;los angeles;seattle;austin;boston;chicago;denver;atlanta;miami;washington dc;dc metro;palo alto;mountain view;menlo park;sunnyvale;san jose;san diego;dallas;houston;philadelphia;pittsburgh;portland or;salt lake city;minneapolis;detroit;raleigh;nashville;phoenix;las vegas;brooklyn;manhattan;california;texas;florida;new jersey;massachusetts;colorado;illinois;virginia;north carolina;oregon;utah;arizona;ohio;michigan;pennsylvania;minnesota;tennessee;continental us;contiguous us;lower 48
+CA:toronto;vancouver;montreal;ottawa;calgary;edmonton;waterloo;quebec;ontario;british columbia;alberta
+AU:sydney;melbourne;brisbane;perth;adelaide;canberra
+NZ:auckland;wellington;christchurch
+IN:bangalore;bengaluru;mumbai;bombay;delhi;new delhi;gurgaon;gurugram;noida;hyderabad;pune;chennai;kolkata;ahmedabad
+SG:singapore city
+IL:tel aviv;tel aviv yafo;jerusalem;haifa;herzliya
+BR:sao paulo;rio de janeiro;belo horizonte;curitiba;porto alegre;florianopolis
+MX:mexico city;ciudad de mexico;cdmx;guadalajara;monterrey
+AR:buenos aires;cordoba argentina
+CO:bogota;medellin
+JP:tokyo;osaka;kyoto
+KR:seoul
+CN:beijing;shanghai;shenzhen;hangzhou
+AE:dubai;abu dhabi
+TR:istanbul;ankara;izmir
+UA:kyiv;kiev;lviv;kharkiv;odesa;odessa
+RS:belgrade;beograd;novi sad
+"""
+
+_WORD_PATTERN = re.compile(r"[a-z0-9]+")
+
+# EU/EEA ISO code -> canonical lowercase country name (first name listed wins).
+ISO_TO_EU_NAME: dict[str, str] = {}
+for _name, _iso in COUNTRY_NAME_TO_ISO.items():
+    if _iso in EU_ISO_CODES:
+        ISO_TO_EU_NAME.setdefault(_iso, _name)
+
+# Lazily built: first word -> [(remaining words, iso codes), ...], longest first.
+_TRIE: dict[str, list[tuple[tuple[str, ...], tuple[str, ...]]]] | None = None
+
+
+def fold(text: str) -> str:
+    """Lowercase and strip accents ("München" -> "munchen", "Kraków" -> "krakow")."""
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    return "".join(c for c in decomposed if not unicodedata.combining(c))
+
+
+def _words(text: str) -> list[str]:
+    return _WORD_PATTERN.findall(fold(text))
+
+
+def _build() -> dict:
+    trie: dict[str, list] = {}
+    for line in _GAZETTEER_DATA.strip().splitlines():
+        codes, _, names = line.partition(":")
+        iso_codes = tuple(codes.split(","))
+        for name in names.split(";"):
+            words = _words(name)
+            if words:
+                trie.setdefault(words[0], []).append((tuple(words[1:]), iso_codes))
+    for candidates in trie.values():
+        candidates.sort(key=lambda c: len(c[0]), reverse=True)
+    return trie
+
+
+def _trie() -> dict:
+    global _TRIE
+    if _TRIE is None:
+        _TRIE = _build()
+    return _TRIE
+
+
+def find_places(text: str) -> list[tuple[str, tuple[str, ...]]]:
+    """Return ``(matched phrase, iso codes)`` for every gazetteer hit in ``text``.
+
+    Matches are whole-word and longest-first ("frankfurt am main" beats
+    "frankfurt"); scanning resumes after each match.
+    """
+    trie  = _trie()
+    words = _words(text)
+    hits: list[tuple[str, tuple[str, ...]]] = []
+    i = 0
+    while i < len(words):
+        for rest, codes in trie.get(words[i], ()):
+            end = i + 1 + len(rest)
+            if tuple(words[i + 1:end]) == rest:
+                hits.append((" ".join(words[i:end]), codes))
+                i = end
+                break
+        else:
+            i += 1
+    return hits
+
+
+def country_for(text: str) -> str | None:
+    """ISO code of the first single-country place in ``text``, if any."""
+    for _, codes in find_places(text):
+        if len(codes) == 1:
+            return codes[0]
+    return None
+
+
+def eu_country_names_for(text: str) -> set[str]:
+    """Canonical EU/EEA country names for every place in ``text``."""
+    return {
+        ISO_TO_EU_NAME[code]
+        for _, codes in find_places(text)
+        for code in codes
+        if code in ISO_TO_EU_NAME
+    }
+
+
+def memory_footprint() -> int:
+    """Approximate bytes held by the parsed trie (keys, lists, tuples, strings)."""
+    trie  = _trie()
+    total = sys.getsizeof(trie)
+    for key, candidates in trie.items():
+        total += sys.getsizeof(key) + sys.getsizeof(candidates)
+        for rest, codes in candidates:
+            total += sys.getsizeof(rest) + sum(sys.getsizeof(w) for w in rest)
+            total += sys.getsizeof(codes)
+    return total
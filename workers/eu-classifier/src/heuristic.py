@@ -8,12 +8,18 @@ import re
 
 from constants import normalize_text_for_signals
 from models import JobClassification
+from scanner import scan_text
+from signals import extract_eu_signals_batch
 
 
 # Remote aggregator source kinds that post worldwide jobs — need EU-specific
 # location signals before heuristic can auto-accept.
 AGGREGATOR_SOURCE_KINDS = frozenset({"remoteok", "remotive", "himalayas", "jobicy"})
 
+# Location-string patterns (description phrases live in scanner.py)
+_REMOTE_EU_LOCATION_PATTERN = re.compile(r"\bremote\b.*\beu\b(?!\s*timezone)", re.IGNORECASE)
+_EUROPE_LOCATION_PATTERN    = re.compile(r"\b(europe|emea|european)\b", re.IGNORECASE)
+
 
 def keyword_eu_classify(job: dict, signals: dict) -> JobClassification | None:
     """Tier 0: deterministic EU classification heuristic.
@@ -58,7 +64,7 @@ def keyword_eu_classify(job: dict, signals: dict) -> JobClassification | None:
         )
 
     # Explicit "Remote - EU" / "Remote | EU" in location
-    if re.search(r"\bremote\b.*\beu\b(?!\s*timezone)", location, re.IGNORECASE):
+    if _REMOTE_EU_LOCATION_PATTERN.search(location):
         return JobClassification(
             isRemoteEU=True,
             confidence="high",
@@ -75,7 +81,7 @@ def keyword_eu_classify(job: dict, signals: dict) -> JobClassification | None:
         )
 
     # "Europe" or "EMEA" in location string for aggregator sources — accept with medium confidence
-    if is_aggregator and re.search(r"\b(europe|emea|european)\b", location, re.IGNORECASE):
+    if is_aggregator and _EUROPE_LOCATION_PATTERN.search(location):
         return JobClassification(
             isRemoteEU=True,
             confidence="medium",
@@ -117,48 +123,49 @@ def keyword_eu_classify(job: dict, signals: dict) -> JobClassification | None:
         )
 
     # Non-EU country but ATS remote + description signals worldwide/global scope
-    desc_lower = normalize_text_for_signals((job.get("description") or "").lower())
+    scan = signals.get("description_scan") or scan_text(
+        normalize_text_for_signals(location),
+        normalize_text_for_signals((job.get("description") or "").lower()),
+    )
     if signals["ats_remote"] and signals["country_code"] and not signals["eu_country_code"]:
         # Tier A: Explicit "work from anywhere" phrases -> auto-accept
-        _explicit_worldwide_pattern = re.compile(
-            r"\b(anywhere in the world|work from anywhere"
-            r"|location.agnostic|digital nomad)\b",
-            re.IGNORECASE,
-        )
-        explicit_match = _explicit_worldwide_pattern.search(desc_lower)
-        if explicit_match:
+        if scan.explicit_worldwide:
             return JobClassification(
                 isRemoteEU=True,
                 confidence="medium",
-                reason=f"Heuristic: non-EU HQ ({signals['country_code']}) but worldwide remote ({explicit_match.group(0)})",
+                reason=f"Heuristic: non-EU HQ ({signals['country_code']}) but worldwide remote ({scan.explicit_worldwide})",
             )
 
         # Tier B: Vague phrases -> escalate to LLM
-        _vague_worldwide_pattern = re.compile(
-            r"\b(global(?:ly)?|worldwide|distributed team|fully distributed"
-            r"|remote.first|remote.friendly)\b",
-            re.IGNORECASE,
-        )
-        vague_match = _vague_worldwide_pattern.search(desc_lower)
-        if vague_match:
+        if scan.vague_worldwide:
             return None
 
     # Check description for explicit EU eligibility even without ATS signals
-    if signals["ats_remote"]:
-        eu_desc_match = re.search(
-            r"\b(eu\s+(?:based|eligible|residents?|citizens?|work\s*(?:authorization|permit))"
-            r"|european\s+(?:union|economic\s+area)"
-            r"|remote.*\beu\b"
-            r"|emea)"
-            r"\b",
-            desc_lower if 'desc_lower' in dir() else (job.get("description") or "").lower(),
-            re.IGNORECASE,
+    if signals["ats_remote"] and scan.eu_description:
+        return JobClassification(
+            isRemoteEU=True,
+            confidence="medium",
+            reason=f"Heuristic: EU signal in description ({scan.eu_description})",
         )
-        if eu_desc_match:
-            return JobClassification(
-                isRemoteEU=True,
-                confidence="medium",
-                reason=f"Heuristic: EU signal in description ({eu_desc_match.group(0)})",
-            )
 
     return None  # Ambiguous -- escalate to LLM
+
+
+def prescreen_jobs(jobs: list[dict]) -> list[dict]:
+    """Run Tier 0 (signals + heuristic) over caller-supplied job rows.
+
+    Used by process-jobs to reject non-EU jobs before it spends paid role
+    tagging calls on them. No D1 access, no LLM calls. ``decided`` is False
+    when the heuristic would escalate the job to an LLM tier.
+    """
+    results = []
+    for job, signals in zip(jobs, extract_eu_signals_batch(jobs)):
+        verdict = keyword_eu_classify(job, signals)
+        results.append({
+            "id":         job.get("id"),
+            "decided":    verdict is not None,
+            "isRemoteEU": verdict.isRemoteEU if verdict else None,
+            "confidence": verdict.confidence if verdict else None,
+            "reason":     verdict.reason if verdict else None,
+        })
+    return results
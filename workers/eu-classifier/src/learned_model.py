@@ -0,0 +1,175 @@
+"""Tier 0.75: learned EU-remote classifier trained on our own verdicts.
+
+Most postings the keyword heuristic escalates look like postings the LLM
+tiers have already decided thousands of times. ``scripts/train-eu-classifier.py``
+fits a logistic regression on those verdicts (DeepSeek and high-confidence
+Workers AI labels, admin-confirmed misclassification reports flipped) and
+writes the weights to ``eu_model_weights.py``; this module scores a job
+with them in pure Python:
+
+  features()    -- hashed word uni/bigrams of title, location and the first
+                   ``DESCRIPTION_CHARS`` of the description (L2-normalized)
+                   plus the ``extract_eu_signals`` flags, all in one
+                   ``2 ** hash_bits`` index space; crc32 keeps the indices
+                   identical under CPython (training) and Pyodide
+  LearnedModel  -- sparse dot product, Platt-calibrated probability, and a
+                   verdict only when the probability clears the artifact's
+                   ``accept_at`` / ``reject_at`` thresholds (chosen offline
+                   for a target precision); anything between escalates
+
+The dot product touches a few hundred weights, so the tier costs
+microseconds to a millisecond and no LLM call. Its verdicts are "medium"
+confidence, are never fed back as company-policy evidence, and are left
+out of the training set. Without a trained artifact (``MODEL = None``) the
+tier is a no-op. Pure Python.
+"""
+
+import math
+import re
+import zlib
+
+from constants import EU_ISO_CODES, normalize_text_for_signals
+from eu_model_weights import MODEL
+from models import JobClassification
+
+
+DESCRIPTION_CHARS = 3000
+AGGREGATOR_SOURCE_KINDS = frozenset({"remoteok", "remotive", "himalayas", "jobicy"})
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+# ---------------------------------------------------------------------------
+# Features (shared with the training script)
+# ---------------------------------------------------------------------------
+
+def signal_features(job: dict, signals: dict) -> list[str]:
+    """Named binary features from the deterministic signal extraction."""
+    names = []
+    if signals.get("ats_remote"):
+        names.append("ats_remote")
+    if signals.get("eu_country_code"):
+        names.append("eu_country")
+    elif signals.get("country_code"):
+        names.append("non_eu_country")
+    if signals.get("negative_signals"):
+        names.append("negative")
+    if signals.get("us_implicit_signals"):
+        names.append("us_implicit")
+    if signals.get("eu_timezone"):
+        names.append("eu_timezone")
+    if signals.get("eu_countries_in_location"):
+        names.append("eu_in_location")
+    offices = signals.get("office_countries") or []
+    if offices:
+        names.append("offices_eu" if all(c in EU_ISO_CODES for c in offices) else "offices_other")
+    scan = signals.get("description_scan")
+    if scan is not None:
+        if scan.explicit_worldwide:
+            names.append("explicit_worldwide")
+        if scan.vague_worldwide:
+            names.append("vague_worldwide")
+        if scan.eu_description:
+            names.append("eu_description")
+    if (job.get("source_kind") or "").lower() in AGGREGATOR_SOURCE_KINDS:
+        names.append("aggregator")
+    workplace = (job.get("workplace_type") or "").strip().lower()
+    if workplace:
+        names.append(f"workplace={workplace}")
+    if len((job.get("description") or "").strip()) < 100:
+        names.append("short_description")
+    return names
+
+
+def _text_tokens(job: dict) -> list[str]:
+    out = []
+    for field, text in (
+        ("t", job.get("title")),
+        ("l", job.get("location")),
+        ("d", (job.get("description") or "")[:DESCRIPTION_CHARS]),
+    ):
+        words = _TOKEN_RE.findall(normalize_text_for_signals((text or "").lower()))
+        out.extend(f"{field}:{w}" for w in words)
+        out.extend(f"{field}:{a} {b}" for a, b in zip(words, words[1:]))
+    return out
+
+
+def _index(name: str, mask: int) -> int:
+    return zlib.crc32(name.encode()) & mask
+
+
+def features(job: dict, signals: dict, hash_bits: int) -> dict[int, float]:
+    """Sparse feature vector ``{index: value}`` for one job."""
+    mask = (1 << hash_bits) - 1
+    vec: dict[int, float] = {}
+    for name in _text_tokens(job):
+        i = _index(name, mask)
+        vec[i] = vec.get(i, 0.0) + 1.0
+    norm = math.sqrt(sum(v * v for v in vec.values())) or 1.0
+    for i in vec:
+        vec[i] /= norm
+    for name in signal_features(job, signals):
+        i = _index(f"s:{name}", mask)
+        vec[i] = vec.get(i, 0.0) + 1.0
+    return vec
+
+
+def sigmoid(z: float) -> float:
+    if z >= 0:
+        return 1.0 / (1.0 + math.exp(-z))
+    e = math.exp(z)
+    return e / (1.0 + e)
+
+
+# ---------------------------------------------------------------------------
+# Inference
+# ---------------------------------------------------------------------------
+
+class LearnedModel:
+    """Weights and calibrated thresholds loaded from the training artifact."""
+
+    __slots__ = ("version", "hash_bits", "bias", "weights", "platt_a", "platt_b", "accept_at", "reject_at")
+
+    def __init__(self, artifact: dict):
+        self.version   = str(artifact.get("version", ""))
+        self.hash_bits = int(artifact["hash_bits"])
+        self.bias      = float(artifact.get("bias", 0.0))
+        self.weights   = dict(zip(artifact["indices"], artifact["weights"]))
+        self.platt_a   = float(artifact.get("platt_a", 1.0))
+        self.platt_b   = float(artifact.get("platt_b", 0.0))
+        self.accept_at = float(artifact.get("accept_at", 2.0))    # > 1: never accept
+        self.reject_at = float(artifact.get("reject_at", -1.0))   # < 0: never reject
+
+    def probability(self, job: dict, signals: dict) -> float:
+        """Calibrated P(remote EU) for one job."""
+        weights = self.weights
+        z = self.bias + sum(weights.get(i, 0.0) * v for i, v in features(job, signals, self.hash_bits).items())
+        return sigmoid(self.platt_a * z + self.platt_b)
+
+    def classify(self, job: dict, signals: dict) -> JobClassification | None:
+        """A verdict when the probability clears a threshold, else None (escalate)."""
+        p = self.probability(job, signals)
+        if p >= self.accept_at:
+            is_eu = True
+        elif p <= self.reject_at:
+            is_eu = False
+        else:
+            return None
+        return JobClassification(
+            isRemoteEU=is_eu,
+            confidence="medium",
+            reason=f"Learned model {self.version}: p(remote EU)={p:.3f}",
+        )
+
+
+def load_model(artifact: dict | None) -> LearnedModel | None:
+    return LearnedModel(artifact) if artifact else None
+
+
+# Loaded once per isolate from the bundled artifact.
+LEARNED_MODEL = load_model(MODEL)
+
+
+def learned_classify(job: dict, signals: dict) -> JobClassification | None:
+    """Tier 0.75 verdict, or None when there is no model or it is unsure."""
+    return LEARNED_MODEL.classify(job, signals) if LEARNED_MODEL is not None else None
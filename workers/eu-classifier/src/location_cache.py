@@ -0,0 +1,205 @@
+"""Location resolution cache for EU signal extraction.
+
+Location strings repeat heavily across postings ("Remote", "Berlin, Germany",
+"Remote - EU", "USA | Remote"), but signal extraction used to redo the same
+token splitting, ISO-code checks, COUNTRY_NAME_TO_ISO lookups and
+EU_COUNTRY_NAMES substring loop for every job.
+
+``LocationResolver`` maps a normalized location string to a
+``LocationResolution`` (country code, EU flag, EU country names, remote flag):
+  - a bounded in-isolate LRU, alive for as long as the Worker isolate is
+  - a D1 table (``location_resolutions``) that warms a fresh isolate with
+    the most frequently seen locations and receives new resolutions after
+    each batch
+
+Rows written by an older ``RESOLVER_VERSION`` are ignored on warm-up, so
+changes to the resolution rules never serve stale answers.
+"""
+
+import json
+import re
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from constants import COUNTRY_NAME_TO_ISO, EU_COUNTRY_NAMES, EU_ISO_CODES
+from gazetteer import country_for, eu_country_names_for
+
+
+# Bump when resolve_location() rules change — older D1 rows are skipped.
+# v2: city / region gazetteer.
+RESOLVER_VERSION = 2
+
+DEFAULT_MAX_ENTRIES = 4096
+
+_LOCATION_SPLIT_PATTERN = re.compile(r"[|,/\-–—]+")
+_ISO2_PATTERN           = re.compile(r"[A-Z]{2}")
+
+
+@dataclass(frozen=True, slots=True)
+class LocationResolution:
+    """What a location string alone says about a job."""
+    country_code:     str | None
+    eu:               bool
+    eu_country_names: tuple[str, ...]
+    remote:           bool
+
+
+def normalize_location(raw: str | None) -> str:
+    """Cache key for a location string: lowercased and trimmed."""
+    return (raw or "").lower().strip()
+
+
+def resolve_location(location: str) -> LocationResolution:
+    """Resolve a normalized location string without any caching.
+
+    Country code comes from the first token (split on | , / - – —) that is a
+    known country name, contains a gazetteer city / region, or is a
+    two-letter code; "remote" tokens are skipped. The gazetteer is checked
+    before the two-letter fallback so "San Francisco, CA" resolves to US.
+    EU country names include the countries of any EU/EEA city or region.
+    """
+    country_code = None
+    for token in _LOCATION_SPLIT_PATTERN.split(location):
+        token = token.strip().rstrip(".")
+        if not token or token == "remote":
+            continue
+        iso = COUNTRY_NAME_TO_ISO.get(token) or country_for(token)
+        if iso:
+            country_code = iso
+            break
+        upper = token.upper()
+        if _ISO2_PATTERN.fullmatch(upper):
+            country_code = upper
+            break
+
+    eu_names = {name for name in EU_COUNTRY_NAMES if name in location}
+    eu_names |= eu_country_names_for(location)
+
+    return LocationResolution(
+        country_code=country_code,
+        eu=country_code in EU_ISO_CODES,
+        eu_country_names=tuple(sorted(eu_names)),
+        remote=location == "remote" or location.startswith("remote "),
+    )
+
+
+class LocationResolver:
+    """Bounded LRU over resolve_location(), optionally backed by D1."""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.hits        = 0
+        self.misses      = 0
+        self.warmed      = False
+        self._entries: OrderedDict[str, LocationResolution] = OrderedDict()
+        self._seen:    dict[str, int] = {}   # location -> lookups since last flush
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def resolve(self, raw: str | None) -> LocationResolution:
+        key = normalize_location(raw)
+        if key in self._seen or len(self._seen) < self.max_entries:
+            self._seen[key] = self._seen.get(key, 0) + 1
+
+        hit = self._entries.get(key)
+        if hit is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return hit
+
+        self.misses += 1
+        resolution = resolve_location(key)
+        self._store(key, resolution)
+        return resolution
+
+    def _store(self, key: str, resolution: LocationResolution) -> None:
+        self._entries[key] = resolution
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def counters(self) -> tuple[int, int]:
+        return self.hits, self.misses
+
+    # -- D1 persistence -----------------------------------------------------
+
+    def warm(self, rows: list[dict]) -> int:
+        """Load persisted resolutions (most frequent first). Returns rows loaded."""
+        loaded = 0
+        for row in rows:
+            if row.get("version") != RESOLVER_VERSION or row.get("location") is None:
+                continue
+            try:
+                names = tuple(json.loads(row.get("eu_country_names") or "[]"))
+            except ValueError:
+                continue
+            self._store(row["location"], LocationResolution(
+                country_code=row.get("country_code"),
+                eu=bool(row.get("is_eu")),
+                eu_country_names=names,
+                remote=bool(row.get("is_remote")),
+            ))
+            loaded += 1
+        self.warmed = True
+        return loaded
+
+    def pending_rows(self) -> list[list]:
+        """Upsert params for locations looked up since the last flush, then reset.
+
+        Each row: [location, country_code, is_eu, eu_country_names, is_remote, lookups, version].
+        """
+        rows = []
+        for key, lookups in self._seen.items():
+            resolution = self._entries.get(key) or resolve_location(key)
+            rows.append([
+                key,
+                resolution.country_code,
+                int(resolution.eu),
+                json.dumps(list(resolution.eu_country_names)),
+                int(resolution.remote),
+                lookups,
+                RESOLVER_VERSION,
+            ])
+        self._seen = {}
+        return rows
+
+
+def cache_stats(before: tuple[int, int], after: tuple[int, int]) -> dict:
+    """Hit/miss counts and hit rate between two ``counters()`` snapshots."""
+    hits   = after[0] - before[0]
+    misses = after[1] - before[1]
+    total  = hits + misses
+    return {
+        "locationCacheHits":    hits,
+        "locationCacheMisses":  misses,
+        "locationCacheHitRate": round(hits / total, 3) if total else 0.0,
+    }
+
+
+# One resolver per isolate — shared by every request the isolate serves.
+LOCATION_RESOLVER = LocationResolver()
+
+WARM_SQL = """
+    SELECT location, country_code, is_eu, eu_country_names, is_remote, version
+    FROM location_resolutions
+    WHERE version = ?
+    ORDER BY hits DESC
+    LIMIT ?
+"""
+
+UPSERT_SQL = """
+    INSERT INTO location_resolutions
+        (location, country_code, is_eu, eu_country_names, is_remote, hits, version, updated_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, datetime('now'))
+    ON CONFLICT(location) DO UPDATE SET
+        country_code     = excluded.country_code,
+        is_eu            = excluded.is_eu,
+        eu_country_names = excluded.eu_country_names,
+        is_remote        = excluded.is_remote,
+        hits             = CASE WHEN location_resolutions.version = excluded.version
+                                THEN location_resolutions.hits + excluded.hits
+                                ELSE excluded.hits END,
+        version          = excluded.version,
+        updated_at       = excluded.updated_at
+"""
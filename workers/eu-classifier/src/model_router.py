@@ -0,0 +1,341 @@
+# AUTO-GENERATED by scripts/sync-worker-modules.py
+# Do NOT edit manually. Edit workers/lib/python/model_router.py and run `pnpm workers:sync`.
+
+"""Cost- and latency-aware routing between Workers AI models.
+
+Every LLM task (role tagging, EU classification, skill extraction, title
+scoring, resume chat) has an ordered route of models, cheapest and fastest
+first. ``ModelRouter.route()`` picks the starting step from the input size,
+a caller-supplied ``hard`` flag (derived from the signals already extracted)
+and each model's rolling accuracy and latency on that task; ``escalate()``
+moves one step up only when the answer wasn't good enough.
+
+The default routes are the single models each task used before routing
+existed. A smaller first step is opt-in through the ``LLM_ROUTES`` env var
+(a JSON object mapping task -> list of model names) until the log shows it
+holds up. A model's own confidence is not evidence of that, so rolling
+accuracy only counts *verified* outcomes: a step whose answer was compared
+with the top model's -- after an escalation, or on the audit run of every
+``AUDIT_EVERY``-th accepted lower-step answer -- and failed calls.
+
+Every step taken is ``record()``ed: the outcome feeds the rolling stats and
+a row is queued for ``llm_routing_log`` so the policy can be evaluated
+offline (``drain()`` hands the rows to the caller's D1 flush; rows older
+than ``RETENTION_DAYS`` are pruned with ``PRUNE_SQL``). ``run_routed()``
+wraps the whole route / call / escalate / audit / record loop. Pure Python
+so it can be unit-tested.
+"""
+
+import json
+import time
+from collections import deque
+from dataclasses import dataclass
+
+
+SMALL_MODEL = "@cf/meta/llama-3.1-8b-instruct-fast"
+QWEN3_MODEL = "@cf/qwen/qwen3-30b-a3b-fp8"
+LLAMA_70B   = "@cf/meta/llama-3.3-70b-instruct-fp8-fast"
+
+TASK_ROLE_TAG    = "role_tag"
+TASK_EU_CLASSIFY = "eu_classify"
+TASK_SKILLS      = "skills"
+TASK_TITLE_SCORE = "title_score"
+TASK_CHAT        = "chat"
+
+# The models each task ran on before routing. SMALL_MODEL is only tried
+# where LLM_ROUTES puts it first, e.g. {"role_tag": [SMALL_MODEL, QWEN3_MODEL]}.
+DEFAULT_ROUTES: dict[str, tuple[str, ...]] = {
+    TASK_ROLE_TAG:    (QWEN3_MODEL,),
+    TASK_EU_CLASSIFY: (QWEN3_MODEL,),
+    TASK_SKILLS:      (QWEN3_MODEL,),
+    TASK_TITLE_SCORE: (LLAMA_70B,),
+    TASK_CHAT:        (LLAMA_70B,),
+}
+
+# Inputs longer than this (characters) skip the first step of the route —
+# the small model loses track of long postings / contexts.
+SMALL_INPUT_CHARS: dict[str, int] = {
+    TASK_ROLE_TAG:    4000,
+    TASK_EU_CLASSIFY: 4000,
+    TASK_SKILLS:      2500,
+    TASK_TITLE_SCORE: 1500,
+    TASK_CHAT:        6000,
+}
+
+WINDOW       = 50    # outcomes kept per (task, model)
+MIN_SAMPLES  = 20    # verified outcomes (calls, for latency) before rolling stats change routing
+MIN_ACCURACY = 0.7   # a step below this rolling accuracy is skipped
+EXPLORE_EVERY = 10   # every Nth call still tries a skipped step so its stats stay current
+AUDIT_EVERY   = 20   # every Nth accepted lower-step answer is re-run on the top model
+MAX_PENDING   = 1000 # unflushed log rows kept (oldest dropped) when no flush runs
+RETENTION_DAYS = 30  # llm_routing_log rows kept per worker
+
+
+@dataclass(slots=True)
+class RouteDecision:
+    """One step of a route: which model to call and why."""
+    task:           str
+    model:          str
+    step:           int
+    reason:         str
+    input_chars:    int
+    hard:           bool = False
+    escalated_from: str | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class ModelStats:
+    """Rolling outcome stats of one model on one task."""
+    samples:    int      # verified outcomes behind ``accuracy``
+    accuracy:   float
+    latency_ms: float
+    calls:      int = 0  # all outcomes, behind ``latency_ms``
+
+
+class ModelRouter:
+    """Per-isolate routing policy with rolling per-model outcome stats."""
+
+    def __init__(self, routes: dict | None = None):
+        self.routes    = dict(DEFAULT_ROUTES)
+        self.warmed    = False
+        self._outcomes: dict[tuple[str, str], deque] = {}
+        self._log:      list[dict] = []
+        self._configured_from = None
+        self._routed   = 0
+        self._accepted = 0
+        if routes:
+            self.configure(routes)
+
+    def configure(self, routes) -> None:
+        """Apply route overrides (dict or the raw ``LLM_ROUTES`` JSON string)."""
+        if not routes or routes is self._configured_from:
+            return
+        self._configured_from = routes
+        if isinstance(routes, str):
+            try:
+                routes = json.loads(routes)
+            except ValueError:
+                print("[model-router] LLM_ROUTES is not valid JSON — keeping default routes")
+                return
+        for task, models in dict(routes).items():
+            models = tuple(m for m in (models or ()) if m)
+            if models:
+                self.routes[task] = models
+
+    # -- rolling stats ------------------------------------------------------
+
+    def stats(self, task: str, model: str) -> ModelStats:
+        outcomes = self._outcomes.get((task, model)) or ()
+        if not outcomes:
+            return ModelStats(0, 0.0, 0.0)
+        verified  = [ok for ok, checked, _ in outcomes if checked]
+        latencies = [ms for _, _, ms in outcomes if ms is not None]
+        return ModelStats(
+            samples    = len(verified),
+            accuracy   = sum(verified) / len(verified) if verified else 0.0,
+            latency_ms = sum(latencies) / len(latencies) if latencies else 0.0,
+            calls      = len(outcomes),
+        )
+
+    def _observe(self, task: str, model: str, ok: bool, verified: bool, latency_ms: float | None) -> None:
+        key = (task, model)
+        if key not in self._outcomes:
+            self._outcomes[key] = deque(maxlen=WINDOW)
+        self._outcomes[key].append((bool(ok), bool(verified), latency_ms))
+
+    # -- routing ------------------------------------------------------------
+
+    def route(self, task: str, input_chars: int, hard: bool = False) -> RouteDecision:
+        """Pick the first model to try for one call."""
+        models = self.routes.get(task) or (QWEN3_MODEL,)
+        last   = len(models) - 1
+        if last == 0:
+            return RouteDecision(task, models[0], 0, "single-model", input_chars, hard)
+        if hard:
+            return RouteDecision(task, models[last], last, "hard-signals", input_chars, hard)
+        if input_chars > SMALL_INPUT_CHARS.get(task, 4000):
+            return RouteDecision(task, models[last], last, "long-input", input_chars, hard)
+
+        self._routed += 1
+        explore = self._routed % EXPLORE_EVERY == 0
+        for step in range(last):
+            current = self.stats(task, models[step])
+            if current.samples < MIN_SAMPLES:
+                return RouteDecision(task, models[step], step, "default", input_chars, hard)
+            upper = self.stats(task, models[step + 1])
+            skip  = current.accuracy < MIN_ACCURACY or (
+                # larger model (the reference answers are checked against) is also faster
+                upper.calls >= MIN_SAMPLES and current.calls >= MIN_SAMPLES
+                and upper.latency_ms < current.latency_ms
+            )
+            if skip and explore:
+                return RouteDecision(task, models[step], step, "explore", input_chars, hard)
+            if not skip:
+                return RouteDecision(task, models[step], step, "rolling-stats", input_chars, hard)
+        return RouteDecision(task, models[last], last, "small-models-underperform", input_chars, hard)
+
+    def escalate(self, decision: RouteDecision) -> RouteDecision | None:
+        """The next step up the route, or None when already at the top."""
+        models = self.routes.get(decision.task) or ()
+        step   = decision.step + 1
+        if step >= len(models):
+            return None
+        return RouteDecision(
+            decision.task, models[step], step, "escalated",
+            decision.input_chars, decision.hard, escalated_from=decision.model,
+        )
+
+    def audit(self, decision: RouteDecision) -> RouteDecision | None:
+        """The top step to check an accepted lower-step answer against, every ``AUDIT_EVERY``-th time."""
+        models = self.routes.get(decision.task) or ()
+        last   = len(models) - 1
+        if decision.step >= last:
+            return None
+        self._accepted += 1
+        if self._accepted % AUDIT_EVERY:
+            return None
+        return RouteDecision(
+            decision.task, models[last], last, "audit",
+            decision.input_chars, decision.hard, escalated_from=decision.model,
+        )
+
+    # -- outcomes -----------------------------------------------------------
+
+    def record(
+        self, decision: RouteDecision, *, ok: bool, outcome: str, latency_ms: float | None = None,
+        verified: bool = False,
+    ) -> None:
+        """Feed one step's outcome into the rolling stats and the routing log.
+
+        ``ok`` only counts towards rolling accuracy when ``verified``.
+        """
+        self._observe(decision.task, decision.model, ok, verified, latency_ms)
+        self._log.append({
+            "task":           decision.task,
+            "model":          decision.model,
+            "step":           decision.step,
+            "reason":         decision.reason,
+            "input_chars":    decision.input_chars,
+            "hard":           decision.hard,
+            "escalated_from": decision.escalated_from,
+            "outcome":        outcome,
+            "ok":             bool(ok),
+            "verified":       bool(verified),
+            "latency_ms":     round(latency_ms, 1) if latency_ms is not None else None,
+        })
+        if len(self._log) > MAX_PENDING:
+            del self._log[0]
+
+    def drain(self) -> list[dict]:
+        """Routing log rows recorded since the last drain."""
+        rows, self._log = self._log, []
+        return rows
+
+    def warm(self, rows: list[dict]) -> int:
+        """Seed rolling stats from persisted log rows (oldest first)."""
+        for row in rows:
+            self._observe(
+                row["task"], row["model"], bool(row.get("ok")), bool(row.get("verified")), row.get("latency_ms"),
+            )
+        self.warmed = True
+        return len(rows)
+
+
+async def run_routed(
+    router: ModelRouter,
+    task: str,
+    input_chars: int,
+    call,
+    accept,
+    *,
+    hard: bool = False,
+    agree=None,
+):
+    """Call ``await call(model)`` along the route until ``accept(result)``.
+
+    ``call`` returns None on failure. Each step is recorded. ``accept`` only
+    decides whether to stop: whether an answer was right is known when
+    ``agree(result, reference)`` compares it with an accepted top-model
+    answer -- the final answer after an escalation, or an audit run of the
+    top model on an accepted lower-step answer (every ``AUDIT_EVERY``-th).
+    Failed calls count as wrong. Returns the last step's result.
+    """
+    async def timed(step):
+        started = time.monotonic()
+        result  = await call(step.model)
+        return step, result, (time.monotonic() - started) * 1000
+
+    decision = router.route(task, input_chars, hard=hard)
+    tried    = []
+    while True:
+        tried.append(await timed(decision))
+        if tried[-1][1] is not None and accept(tried[-1][1]):
+            break
+        decision = router.escalate(decision)
+        if decision is None:
+            break
+
+    final    = tried[-1][1]
+    accepted = final is not None and bool(accept(final))
+    audit    = None
+    if accepted and agree is not None:
+        check = router.audit(tried[-1][0])
+        if check is not None:
+            audit = await timed(check)
+    reference = final if agree is not None and accepted and len(tried) > 1 else None
+    if audit is not None and audit[1] is not None and accept(audit[1]):
+        reference = audit[1]
+
+    for i, (step, result, latency_ms) in enumerate(tried):
+        last = i == len(tried) - 1
+        if result is None:
+            router.record(step, ok=False, outcome="failed", latency_ms=latency_ms, verified=True)
+            continue
+        checked = reference is not None and (not last or audit is not None)
+        ok      = bool(agree(result, reference)) if checked else last and accepted
+        outcome = ("accepted" if accepted else "unsure") if last else "escalated"
+        router.record(step, ok=ok, outcome=outcome, latency_ms=latency_ms, verified=checked)
+    if audit is not None:
+        step, result, latency_ms = audit
+        if result is None:
+            router.record(step, ok=False, outcome="failed", latency_ms=latency_ms, verified=True)
+        else:
+            router.record(step, ok=bool(accept(result)), outcome="audit", latency_ms=latency_ms)
+    return final
+
+
+# One router per isolate — shared by every request the isolate serves.
+MODEL_ROUTER = ModelRouter()
+
+WARM_SQL = """
+    SELECT task, model, ok, verified, latency_ms FROM (
+        SELECT id, task, model, ok, verified, latency_ms
+        FROM llm_routing_log
+        WHERE worker = ?
+        ORDER BY id DESC
+        LIMIT ?
+    ) ORDER BY id
+"""
+
+INSERT_SQL = """
+    INSERT INTO llm_routing_log
+        (worker, task, model, step, reason, input_chars, hard, escalated_from,
+         outcome, ok, verified, latency_ms)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+PRUNE_SQL = "DELETE FROM llm_routing_log WHERE worker = ? AND created_at < datetime('now', ?)"
+
+
+def insert_params(worker: str, row: dict) -> list:
+    """INSERT_SQL parameters for one drained log row."""
+    return [
+        worker, row["task"], row["model"], row["step"], row["reason"],
+        row["input_chars"], int(row["hard"]), row["escalated_from"],
+        row["outcome"], int(row["ok"]), int(row["verified"]), row["latency_ms"],
+    ]
+
+
+def prune_params(worker: str) -> list:
+    """PRUNE_SQL parameters: ``worker``'s rows older than ``RETENTION_DAYS``."""
+    return [worker, f"-{RETENTION_DAYS} days"]
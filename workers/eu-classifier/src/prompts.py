@@ -1,26 +1,15 @@
-"""LangChain prompt templates for EU remote classification."""
+"""Prompt templates for EU remote classification."""
 
-from langchain_core.prompts import ChatPromptTemplate
+from chat_prompt import ChatPrompt
 
 # Phase 3 -- EU Remote Classification
-CLASSIFICATION_PROMPT = ChatPromptTemplate.from_messages([
+# All static rules live in the system message and the job comes last, so
+# DeepSeek serves the shared prefix from its prompt cache. Keep the system
+# message byte-identical across calls (no per-job values in it).
+CLASSIFICATION_PROMPT = ChatPrompt.from_messages([
     (
         "system",
-        "You are an expert at classifying job postings for Remote EU eligibility. "
-        "A Remote EU position must be FULLY REMOTE and allow work from EU member countries. "
-        "Return structured JSON output with clear reasoning.",
-    ),
-    (
-        "human",
-        """Classify this job posting as Remote EU or not.
-
-JOB DETAILS:
-- Title: {title}
-- Location: {location}
-- Description: {description}
-
-STRUCTURED SIGNALS (from ATS metadata -- trust these over raw text):
-{structured_signals}
+        """You are an expert at classifying job postings for Remote EU eligibility. A Remote EU position must be FULLY REMOTE and allow work from EU member countries. Return structured JSON output with clear reasoning.
 
 CLASSIFICATION RULES (apply in order):
 
@@ -83,4 +72,16 @@ RESPOND ONLY WITH VALID JSON:
   "reason": "Brief explanation referencing the classification rules applied"
 }}""",
     ),
+    (
+        "human",
+        """Classify this job posting as Remote EU or not.
+
+JOB DETAILS:
+- Title: {title}
+- Location: {location}
+- Description: {description}
+
+STRUCTURED SIGNALS (from ATS metadata -- trust these over raw text):
+{structured_signals}""",
+    ),
 ])
@@ -0,0 +1,216 @@
+"""Single-pass description scanner for EU classification signals.
+
+Signal extraction and the keyword heuristic used to run six separate regex
+scans per job: NEGATIVE_EU_PATTERN, US_IMPLICIT_PATTERN and
+EU_TIMEZONE_PATTERN over the first 8,000 chars, then the explicit /
+vague worldwide patterns (recompiled on every call) and the EU-eligibility
+search over the full description. This module compiles all of them into one
+alternation tagged per label and walks the text once.
+
+Linear time: every alternative has a bounded maximum match length — the
+``\\s*`` / ``\\d+`` runs of the original patterns are capped (``\\s{0,3}``,
+``\\d{1,3}``) and the ``remote.*\\beu\\b`` alternative, the only one that
+could span a whole line, is replaced by recording ``remote`` and ``eu``
+word positions and pairing them afterwards. Work per start position is
+therefore bounded by a constant, and the scan is O(len(text)).
+
+Hits of different labels may overlap; the scan resumes one character after
+each hit's start so a later label is never hidden by an earlier one, while
+hits of the same label stay non-overlapping like ``finditer``.
+
+Pure Python (only ``re``) so it can be unit-tested under CPython.
+"""
+
+import re
+from bisect import bisect_left
+from dataclasses import dataclass, field
+
+
+# Characters of description considered for the negative / US-implicit /
+# timezone signals (matches the previous truncation in extract_eu_signals).
+SIGNAL_WINDOW = 8000
+
+# (label, alternatives) — alternatives that start at a word boundary share one
+# hoisted ``\b`` so mid-word positions are rejected with a single check.
+_WORD_LABELS: list[tuple[str, list[str]]] = [
+    # NEGATIVE_EU_PATTERN
+    ("negative", [
+        r"(?:us only|us-only|united states only"
+        r"|must be based in the us|must be based in the united states"
+        r"|us work authorization|authorized to work in the united states"
+        r"|us citizens? (?:and|or) permanent residents?"
+        r"|no eu applicants?|cannot accept applications? from eu"
+        r"|outside the european union"
+        r"|must be based in switzerland|swiss work permit)\b",
+    ]),
+    # EU_TIMEZONE_PATTERN (word-boundary alternatives)
+    ("eu_timezone", [
+        r"eu\s{0,3}timezone\b",
+        r"european business hours\b",
+        r"overlap with (?:cet|european)\b",
+    ]),
+    # heuristic: explicit "work from anywhere" phrases
+    ("explicit_worldwide", [
+        r"(?:anywhere in the world|work from anywhere|location.agnostic|digital nomad)\b",
+    ]),
+    # heuristic: EU eligibility in description (remote…eu handled separately)
+    ("eu_description", [
+        r"eu\s{1,3}(?:based|eligible|residents?|citizens?|work\s{0,3}(?:authorization|permit))\b",
+        r"european\s{1,3}(?:union|economic\s{1,3}area)\b",
+        r"emea\b",
+    ]),
+    # US_IMPLICIT_PATTERN (word-boundary alternatives)
+    ("us_implicit", [
+        r"dod\b",
+        r"sbir\b",
+        r"security clearance\b",
+        r"w-?2\b",
+        r"us\s{0,3}(?:holidays?|pto)\b",
+    ]),
+    # heuristic: vague worldwide phrases
+    ("vague_worldwide", [
+        r"(?:global(?:ly)?|worldwide|distributed team|fully distributed"
+        r"|remote.first|remote.friendly)\b",
+    ]),
+    # word positions for the remote … eu pairing
+    ("remote_word", [r"remote"]),
+    ("eu_word",     [r"eu\b"]),
+]
+
+# Alternatives with no leading word boundary in the original patterns.
+_SYMBOL_LABELS: list[tuple[str, list[str]]] = [
+    ("eu_timezone", [
+        r"cet\s{0,3}[+-]\s{0,3}\d",
+        r"[+-]\s{0,3}\d{1,3}\s{0,3}hours?\s{0,3}cet",
+    ]),
+    ("us_implicit", [
+        r"\$\d{2,3}k",
+        r"\$\d{3},?\d{3}",
+        r"usd\s{0,3}\d",
+        r"401\(?k\)?",
+        r"medical,?\s{0,3}dental,?\s{0,3}(?:and\s{0,3})?vision",
+    ]),
+]
+
+
+def _compile_scan_pattern() -> re.Pattern:
+    """One alternation over every label; each alternative ends in an empty
+    ``label__n`` group so ``m.lastgroup`` names the label while the
+    alternative itself still starts with a literal (which lets the regex
+    engine skip non-matching branches on their first character).
+
+    Compiled without IGNORECASE: callers pass lowercased text, and
+    case-insensitive literals would disable that first-character skip.
+    """
+    counter = 0
+
+    def tagged(labels: list[tuple[str, list[str]]]) -> str:
+        nonlocal counter
+        parts = []
+        for label, alternatives in labels:
+            for alternative in alternatives:
+                parts.append(f"{alternative}(?P<{label}__{counter}>)")
+                counter += 1
+        return "|".join(parts)
+
+    return re.compile(rf"\b(?:{tagged(_WORD_LABELS)})|{tagged(_SYMBOL_LABELS)}")
+
+
+SCAN_PATTERN = _compile_scan_pattern()
+
+_EU_WORD_PREFIX = re.compile(r"eu\b")
+
+
+@dataclass(slots=True)
+class ScanResult:
+    """Labelled hits from one scan of ``location + " " + description``."""
+    negative:           list[str] = field(default_factory=list)
+    us_implicit:        list[str] = field(default_factory=list)
+    eu_timezone:        bool = False
+    explicit_worldwide: str | None = None
+    vague_worldwide:    str | None = None
+    eu_description:     str | None = None
+
+
+def _first_remote_eu_span(text: str, remote_starts: list[int], eu_ends: list[int]) -> tuple[int, int] | None:
+    """Leftmost ``remote.*\\beu\\b`` span on one line, from recorded word positions.
+
+    ``.`` does not cross newlines, and ``.*`` is greedy, so the span runs
+    from the first ``remote`` that has an ``eu`` word later on the same line
+    to the last such ``eu`` on that line. ``remote_starts`` is ascending, so
+    each line end is looked up once and reused by later starts on the line.
+    """
+    line_end = -1
+    for start in remote_starts:
+        if start > line_end:
+            line_end = text.find("\n", start)
+            if line_end == -1:
+                line_end = len(text)
+        lo = bisect_left(eu_ends, start + len("remote") + 2)
+        hi = bisect_left(eu_ends, line_end + 1)
+        if lo < hi:
+            return start, eu_ends[hi - 1]
+    return None
+
+
+def scan_text(location: str, description: str) -> ScanResult:
+    """Scan a normalized, lowercased location and description in one pass.
+
+    Callers pass lowercased text already run through
+    ``normalize_text_for_signals``.
+    Signal labels (negative, us_implicit, eu_timezone) only count inside the
+    location plus the first ``SIGNAL_WINDOW`` description chars; heuristic
+    labels (worldwide, EU eligibility) only count inside the description.
+    """
+    text        = f"{location} {description}"
+    desc_start  = len(location) + 1
+    signal_end  = desc_start + SIGNAL_WINDOW
+    result      = ScanResult()
+    label_end:     dict[str, int] = {}
+    remote_starts: list[int] = []
+    eu_ends:       list[int] = []
+    eu_desc_start = None
+
+    pos = 0
+    search = SCAN_PATTERN.search
+    while True:
+        m = search(text, pos)
+        if m is None:
+            break
+        start, end = m.span()
+        label      = m.lastgroup.partition("__")[0]
+        pos        = start + 1
+
+        # A labelled phrase can begin with "remote" / "eu" — keep the word positions
+        if start >= desc_start:
+            if label == "remote_word" or text.startswith("remote", start):
+                remote_starts.append(start)
+            elif label == "eu_word" or _EU_WORD_PREFIX.match(text, start):
+                eu_ends.append(start + 2)
+
+        # Same-label hits stay non-overlapping (finditer semantics)
+        if start < label_end.get(label, 0):
+            continue
+        label_end[label] = end
+
+        if label == "negative" and end <= signal_end:
+            result.negative.append(m.group())
+        elif label == "us_implicit" and end <= signal_end:
+            result.us_implicit.append(m.group())
+        elif label == "eu_timezone" and end <= signal_end:
+            result.eu_timezone = True
+        elif start < desc_start:
+            continue
+        elif label == "explicit_worldwide" and result.explicit_worldwide is None:
+            result.explicit_worldwide = m.group()
+        elif label == "vague_worldwide" and result.vague_worldwide is None:
+            result.vague_worldwide = m.group()
+        elif label == "eu_description" and eu_desc_start is None:
+            eu_desc_start = start
+            result.eu_description = m.group()
+
+    span = _first_remote_eu_span(text, remote_starts, eu_ends)
+    if span and (eu_desc_start is None or span[0] < eu_desc_start):
+        result.eu_description = text[span[0]:span[1]]
+
+    return result
@@ -3,20 +3,53 @@
 Extracts structured boolean/string signals (remote flags, country codes,
 negative signals, EU timezone mentions) that feed both the keyword
 heuristic and the LLM classification prompt.
+
+``extract_eu_signals_batch`` is the entry point for batch runs: every
+pattern is compiled once at import and identical JSON column values are
+parsed once (cached on the raw string) instead of on every call.
+Location strings are resolved through ``location_cache.LOCATION_RESOLVER``
+and descriptions are scanned once by ``scanner.scan_text``.
 """
 
 import json
 import re
+from functools import lru_cache
 
 from constants import (
     EU_ISO_CODES,
-    EU_COUNTRY_NAMES,
     COUNTRY_NAME_TO_ISO,
-    NEGATIVE_EU_PATTERN,
-    US_IMPLICIT_PATTERN,
-    EU_TIMEZONE_PATTERN,
     normalize_text_for_signals,
 )
+from location_cache import LOCATION_RESOLVER
+from scanner import scan_text
+
+
+# Compiled once — extract_eu_signals used to build this per call.
+_ISO_CODE_PATTERN = re.compile(r"[A-Z]{2,3}")
+
+
+@lru_cache(maxsize=4096)
+def _loads_json_column(raw: str):
+    """Parse a JSON column value; identical strings across rows parse once."""
+    try:
+        return json.loads(raw)
+    except ValueError:
+        return None
+
+
+def _json_column(job: dict, column: str):
+    """Return a JSON column as Python, parsing string values through the cache.
+
+    The cached objects are shared between rows — callers must not mutate them.
+    """
+    value = job.get(column)
+    return _loads_json_column(value) if isinstance(value, str) else value
+
+
+def _set_country(signals: dict, code: str) -> None:
+    signals["country_code"] = code
+    if code in EU_ISO_CODES:
+        signals["eu_country_code"] = True
 
 
 def extract_eu_signals(job: dict) -> dict:
@@ -34,111 +67,79 @@ def extract_eu_signals(job: dict) -> dict:
         "eu_timezone": False,
         "eu_countries_in_location": [],
         "all_locations": [],
+        "office_countries": [],
+        "location_country": None,
     }
 
+    raw_location = job.get("location") or ""
+    location     = raw_location.lower()
+    resolved     = LOCATION_RESOLVER.resolve(raw_location)
+
     # ATS remote flag -- from ashby_is_remote or workplace_type
     ashby_remote = job.get("ashby_is_remote")
     workplace = (job.get("workplace_type") or "").lower()
-    location_lower = (job.get("location") or "").lower().strip()
     if (ashby_remote == 1 or ashby_remote is True
             or workplace == "remote"
-            or location_lower == "remote"
-            or location_lower.startswith("remote ")):
+            or resolved.remote):
         signals["ats_remote"] = True
 
     # Country code -> EU membership check
     raw_country = (job.get("country") or "").strip()
     country = raw_country.upper()
-    if country and re.fullmatch(r"[A-Z]{2,3}", country):
-        signals["country_code"] = country
-        if country in EU_ISO_CODES:
-            signals["eu_country_code"] = True
+    if country and _ISO_CODE_PATTERN.fullmatch(country):
+        _set_country(signals, country)
     elif raw_country:
         iso = COUNTRY_NAME_TO_ISO.get(raw_country.lower())
         if iso:
-            signals["country_code"] = iso
-            if iso in EU_ISO_CODES:
-                signals["eu_country_code"] = True
+            _set_country(signals, iso)
 
     # Fallback: extract country from ashby_address if still no country_code
     if not signals["country_code"]:
         try:
-            addr = job.get("ashby_address")
-            if isinstance(addr, str):
-                addr = json.loads(addr)
+            addr = _json_column(job, "ashby_address")
             if isinstance(addr, dict):
                 postal = addr.get("postalAddress") or addr
                 addr_country = (postal.get("addressCountry") or "").strip()
                 addr_locality = (postal.get("addressLocality") or "").strip()
-                for candidate in [addr_country, addr_locality]:
+                for candidate in (addr_country, addr_locality):
                     if not candidate:
                         continue
                     upper = candidate.upper()
-                    if re.fullmatch(r"[A-Z]{2,3}", upper):
-                        signals["country_code"] = upper
-                        if upper in EU_ISO_CODES:
-                            signals["eu_country_code"] = True
+                    if _ISO_CODE_PATTERN.fullmatch(upper):
+                        _set_country(signals, upper)
                         break
                     iso = COUNTRY_NAME_TO_ISO.get(candidate.lower())
                     if iso:
-                        signals["country_code"] = iso
-                        if iso in EU_ISO_CODES:
-                            signals["eu_country_code"] = True
+                        _set_country(signals, iso)
                         break
         except Exception:
             pass
 
     # Fallback: extract country from location string (e.g. "USA | Remote")
-    if not signals["country_code"] and location_lower:
-        for token in re.split(r"[|,/\-\u2013\u2014]+", location_lower):
-            token = token.strip().rstrip(".")
-            if not token or token == "remote":
-                continue
-            iso = COUNTRY_NAME_TO_ISO.get(token)
-            if iso:
-                signals["country_code"] = iso
-                if iso in EU_ISO_CODES:
-                    signals["eu_country_code"] = True
-                break
-            upper = token.upper()
-            if re.fullmatch(r"[A-Z]{2}", upper):
-                signals["country_code"] = upper
-                if upper in EU_ISO_CODES:
-                    signals["eu_country_code"] = True
-                break
-
-    # Negative signals via regex on description
-    desc = (job.get("description") or "")[:8000].lower()
-    location = (job.get("location") or "").lower()
-    full_text = normalize_text_for_signals(f"{location} {desc}")
-    for m in NEGATIVE_EU_PATTERN.finditer(full_text):
-        signals["negative_signals"].append(m.group(0))
-
-    # US-implicit signals via regex on description
-    us_implicit: list[str] = []
-    for m in US_IMPLICIT_PATTERN.finditer(full_text):
-        us_implicit.append(m.group(0))
-    signals["us_implicit_signals"] = us_implicit
-
-    # EU timezone / business hours
-    if EU_TIMEZONE_PATTERN.search(full_text):
-        signals["eu_timezone"] = True
+    signals["location_country"] = resolved.country_code
+    if not signals["country_code"] and resolved.country_code:
+        _set_country(signals, resolved.country_code)
+
+    # Negative / US-implicit / EU timezone signals — one pass over location +
+    # description; the scan also carries the heuristic's description phrases
+    desc = normalize_text_for_signals((job.get("description") or "").lower())
+    scan = scan_text(normalize_text_for_signals(location), desc)
+    signals["description_scan"]    = scan
+    signals["negative_signals"]    = scan.negative
+    signals["us_implicit_signals"] = scan.us_implicit
+    signals["eu_timezone"]         = scan.eu_timezone
 
     # EU country names in location string
-    for name in EU_COUNTRY_NAMES:
-        if name in location:
-            signals["eu_countries_in_location"].append(name)
+    signals["eu_countries_in_location"] = list(resolved.eu_country_names)
 
     # Aggregate all ATS locations
     all_locs: list[str] = []
-    if job.get("location"):
-        all_locs.append(job["location"])
+    if raw_location:
+        all_locs.append(raw_location)
 
     # offices (Greenhouse JSON array)
     try:
-        offices = job.get("offices")
-        if isinstance(offices, str):
-            offices = json.loads(offices)
+        offices = _json_column(job, "offices")
         if isinstance(offices, list):
             for o in offices:
                 name = o.get("name") or o.get("location") if isinstance(o, dict) else str(o)
@@ -149,9 +150,7 @@ def extract_eu_signals(job: dict) -> dict:
 
     # categories.allLocations (Ashby/Lever JSON)
     try:
-        cats = job.get("categories")
-        if isinstance(cats, str):
-            cats = json.loads(cats)
+        cats = _json_column(job, "categories")
         if isinstance(cats, dict):
             for loc in (cats.get("allLocations") or []):
                 if loc and loc not in all_locs:
@@ -161,9 +160,7 @@ def extract_eu_signals(job: dict) -> dict:
 
     # ashby_secondary_locations
     try:
-        sec = job.get("ashby_secondary_locations")
-        if isinstance(sec, str):
-            sec = json.loads(sec)
+        sec = _json_column(job, "ashby_secondary_locations")
         if isinstance(sec, list):
             for s in sec:
                 loc_name = s.get("location") if isinstance(s, dict) else str(s)
@@ -173,9 +170,47 @@ def extract_eu_signals(job: dict) -> dict:
         pass
 
     signals["all_locations"] = all_locs
+
+    # Countries of the other ATS locations (offices, allLocations, secondary).
+    # Only fill country_code from them when every one of them is EU/EEA —
+    # a mixed or non-EU office list stays as before (no country code).
+    office_countries = sorted({
+        code for loc in all_locs[1 if raw_location else 0:]
+        if (code := LOCATION_RESOLVER.resolve(loc).country_code)
+    })
+    signals["office_countries"] = office_countries
+    if (not signals["country_code"] and office_countries
+            and all(code in EU_ISO_CODES for code in office_countries)):
+        _set_country(signals, office_countries[0])
+
     return signals
 
 
+def extract_eu_signals_batch(jobs: list[dict]) -> list[dict]:
+    """Extract signals for many rows at once (classify batches, offline reclassification).
+
+    Returns one signal dict per job, in order — the same shape
+    ``keyword_eu_classify`` and ``format_signals`` consume, so each row's
+    JSON columns are parsed once and reused for both.
+    """
+    return [extract_eu_signals(job) for job in jobs]
+
+
+def conflicting_signals(signals: dict) -> bool:
+    """True when the structured signals point both ways (US-only / negative
+    wording alongside EU countries, an EU country code or EU timezone).
+
+    Those are the postings a small model gets wrong most often, so the model
+    router starts them on the larger model.
+    """
+    against = signals["negative_signals"] or signals["us_implicit_signals"]
+    towards = (
+        signals["eu_country_code"] or signals["eu_timezone"]
+        or signals["eu_countries_in_location"]
+    )
+    return bool(against and towards)
+
+
 def format_signals(signals: dict) -> str:
     """Format extracted signals as a text block for the LLM prompt."""
     parts: list[str] = []
@@ -191,6 +226,8 @@ def format_signals(signals: dict) -> str:
         parts.append("- EU timezone/business hours signal detected")
     if signals["eu_countries_in_location"]:
         parts.append(f"- EU countries in location: {', '.join(signals['eu_countries_in_location'][:5])}")
+    if signals.get("office_countries"):
+        parts.append(f"- Countries of ATS locations: {', '.join(signals['office_countries'][:8])}")
     if len(signals["all_locations"]) > 1:
         parts.append(f"- All ATS locations: {', '.join(signals['all_locations'][:8])}")
 
@@ -6,8 +6,8 @@ the new modular eu-classifier worker.
 
 import pytest
 
-from src.signals import extract_eu_signals
-from src.heuristic import keyword_eu_classify
+from src.signals import conflicting_signals, extract_eu_signals, extract_eu_signals_batch
+from src.heuristic import keyword_eu_classify, prescreen_jobs
 from src.constants import (
     normalize_text_for_signals,
     COUNTRY_NAME_TO_ISO,
@@ -899,3 +899,69 @@ class TestHyphenatedWorldwideSignals:
         result = keyword_eu_classify(job, signals)
 
         assert result is None
+
+
+# =========================================================================
+# Tier 0 prescreen used by process-jobs before paid role tagging
+# =========================================================================
+
+class TestPrescreen:
+    """prescreen_jobs() runs signals + heuristic over caller rows, no D1."""
+
+    def test_onsite_job_rejected(self):
+        job = _make_job(id=7, location="New York, NY", description="This is an on-site role.")
+        [result] = prescreen_jobs([job])
+        assert result["id"] == 7
+        assert result["decided"] is True
+        assert result["isRemoteEU"] is False
+
+    def test_eu_remote_accepted(self):
+        [result] = prescreen_jobs([_make_job(id=8, country="DE", ashby_is_remote=1)])
+        assert result["decided"] is True
+        assert result["isRemoteEU"] is True
+
+    def test_ambiguous_left_undecided(self):
+        [result] = prescreen_jobs([_make_job(id=9, location="Remote, Toronto")])
+        assert result["decided"] is False
+        assert result["isRemoteEU"] is None
+
+
+# =========================================================================
+# Batch signal extraction
+# =========================================================================
+
+class TestSignalBatch:
+    """extract_eu_signals_batch() matches per-job extraction, row for row."""
+
+    def test_batch_matches_single(self):
+        jobs = [
+            _make_job(location="Berlin, Germany", ashby_is_remote=1),
+            _make_job(location="USA | Remote", description="US only. 401(k) match."),
+            _make_job(offices='[{"name": "Lisbon"}]', categories='{"allLocations": ["Remote - EU"]}'),
+            _make_job(ashby_address='{"postalAddress": {"addressCountry": "Netherlands"}}'),
+            _make_job(ashby_secondary_locations="not json"),
+        ]
+        assert extract_eu_signals_batch(jobs) == [extract_eu_signals(j) for j in jobs]
+
+    def test_shared_json_values_do_not_leak_between_rows(self):
+        offices = '[{"name": "Paris"}]'
+        first, second = extract_eu_signals_batch([
+            _make_job(location="Remote", offices=offices),
+            _make_job(location="", offices=offices),
+        ])
+        assert first["all_locations"] == ["Remote", "Paris"]
+        assert second["all_locations"] == ["Paris"]
+
+
+class TestConflictingSignals:
+    """conflicting_signals() flags postings the model router starts on the larger model."""
+
+    def test_us_only_with_eu_country(self):
+        signals = extract_eu_signals(_make_job(
+            location="Berlin, Germany", description="Remote. US only applicants.",
+        ))
+        assert conflicting_signals(signals)
+
+    def test_one_sided_signals(self):
+        assert not conflicting_signals(extract_eu_signals(_make_job(location="Remote - EU")))
+        assert not conflicting_signals(extract_eu_signals(_make_job(description="US only.")))
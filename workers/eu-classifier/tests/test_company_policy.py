@@ -0,0 +1,109 @@
+"""Tests for the company remote-policy prior (Tier 0.5)."""
+
+from src.company_policy import (
+    HALF_LIFE_DAYS,
+    CompanyEvidence,
+    CompanyPolicyStore,
+    company_policy_classify,
+    load_sql,
+)
+from src.signals import extract_eu_signals
+
+NOW = 1_780_000_000
+DAY = 86400
+
+
+def _remote_job(**overrides) -> dict:
+    job = {
+        "id": 1,
+        "title": "Backend Engineer",
+        "location": "Remote",
+        "company_key": "acme",
+        "workplace_type": "remote",
+        "description": "Join our platform team and build APIs.",
+    }
+    job.update(overrides)
+    return job
+
+
+def _store_with(is_eu: bool, n: int, now: float = NOW) -> CompanyPolicyStore:
+    store = CompanyPolicyStore()
+    for _ in range(n):
+        store.observe("acme", is_eu, "high", "deepseek", now=now)
+    return store
+
+
+class TestEvidence:
+
+    def test_minimum_evidence(self):
+        assert _store_with(True, 2).evidence("acme", now=NOW).verdict() is None
+        assert _store_with(True, 3).evidence("acme", now=NOW).verdict() is True
+        assert _store_with(False, 3).evidence("acme", now=NOW).verdict() is False
+
+    def test_disagreement_blocks_prior(self):
+        store = _store_with(True, 5)
+        store.observe("acme", False, "high", "workers-ai", now=NOW)
+        assert store.evidence("acme", now=NOW).verdict() is None
+
+    def test_decay_halves_per_half_life(self):
+        store    = _store_with(True, 4)
+        evidence = store.evidence("acme", now=NOW + HALF_LIFE_DAYS * DAY)
+        assert abs(evidence.eu - 2.0) < 1e-9
+        assert evidence.verdict() is None
+
+    def test_only_high_confidence_evidence_sources(self):
+        store = CompanyPolicyStore()
+        assert store.observe("acme", True, "medium", "deepseek", now=NOW) is False
+        assert store.observe("acme", True, "high", "company-policy", now=NOW) is False
+        assert store.observe("", True, "high", "deepseek", now=NOW) is False
+        assert store.evidence("acme", now=NOW) is None
+
+
+class TestClassify:
+
+    def test_prior_accepts_plain_remote_job(self):
+        job    = _remote_job()
+        result = company_policy_classify(job, extract_eu_signals(job), CompanyEvidence("acme", 4.0, 0.0))
+        assert result is not None
+        assert result.isRemoteEU is True
+        assert result.confidence == "medium"
+
+    def test_us_signals_contradict_eu_prior(self):
+        job = _remote_job(description="Must be based in the US. 401(k) and medical, dental and vision.")
+        assert company_policy_classify(job, extract_eu_signals(job), CompanyEvidence("acme", 4.0, 0.0)) is None
+
+    def test_eu_signals_contradict_non_eu_prior(self):
+        job = _remote_job(description="Open to EU based candidates during European business hours.")
+        assert company_policy_classify(job, extract_eu_signals(job), CompanyEvidence("acme", 0.0, 4.0)) is None
+
+    def test_prior_rejects_plain_remote_job(self):
+        job    = _remote_job()
+        result = company_policy_classify(job, extract_eu_signals(job), CompanyEvidence("acme", 0.0, 4.0))
+        assert result is not None
+        assert result.isRemoteEU is False
+
+    def test_onsite_postings_ignored(self):
+        job = _remote_job(location="Berlin, Germany", workplace_type="onsite")
+        assert company_policy_classify(job, extract_eu_signals(job), CompanyEvidence("acme", 4.0, 0.0)) is None
+
+
+class TestPersistence:
+
+    def test_pending_rows_are_deltas(self):
+        store = _store_with(True, 2)
+        rows  = store.pending_rows()
+        assert len(rows) == 1
+        key, eu, non_eu, jobs = rows[0]
+        assert (key, non_eu, jobs) == ("acme", 0.0, 2)
+        assert eu > 0
+        assert store.pending_rows() == []
+
+    def test_load_merges_unflushed_observations(self):
+        store  = _store_with(True, 1)
+        stored = _store_with(True, 2).pending_rows()[0]
+        store.load(["acme", "globex"], [{"company_key": "acme", "eu_score": stored[1], "non_eu_score": 0.0}])
+        assert abs(store.evidence("acme", now=NOW).eu - 3.0) < 1e-9
+        assert store.unloaded(["acme", "globex", "initech", None]) == ["initech"]
+
+    def test_load_sql_placeholders(self):
+        assert load_sql(3).endswith("IN (?, ?, ?)")
@@ -0,0 +1,83 @@
+"""Tests for the city / region gazetteer and its use in signal extraction."""
+
+import pytest
+
+from src.gazetteer import (
+    MEMORY_BUDGET_BYTES,
+    country_for,
+    eu_country_names_for,
+    find_places,
+    fold,
+    memory_footprint,
+)
+from src.heuristic import keyword_eu_classify
+from src.signals import extract_eu_signals
+
+
+class TestGazetteerLookup:
+
+    @pytest.mark.parametrize("text,iso", [
+        ("Remote - Lisbon", "PT"),
+        ("Amsterdam or Munich", "NL"),
+        ("Hybrid, Dublin", "IE"),
+        ("München", "DE"),
+        ("Kraków", "PL"),
+        ("Frankfurt am Main", "DE"),
+        ("San Francisco", "US"),
+        ("Zürich", "CH"),
+    ])
+    def test_country_for(self, text, iso):
+        assert country_for(text) == iso
+
+    def test_longest_phrase_wins(self):
+        assert find_places("new york city")[0][0] == "new york city"
+
+    def test_multi_country_region_has_no_single_country(self):
+        assert country_for("Remote - DACH") is None
+        assert eu_country_names_for("Remote - DACH") == {"germany", "austria"}
+
+    def test_whole_words_only(self):
+        assert find_places("Romania") == []
+        assert find_places("Parisian bakery") == []
+
+    def test_fold(self):
+        assert fold("Düsseldorf") == "dusseldorf"
+
+    def test_memory_budget(self):
+        assert memory_footprint() < MEMORY_BUDGET_BYTES
+
+
+class TestGazetteerSignals:
+
+    def test_remote_city_accepts(self):
+        job = {"id": 1, "location": "Remote - Lisbon", "description": ""}
+        signals = extract_eu_signals(job)
+        assert signals["country_code"] == "PT"
+        result = keyword_eu_classify(job, signals)
+        assert result is not None and result.isRemoteEU is True
+
+    def test_cities_in_location_listed_as_eu_countries(self):
+        signals = extract_eu_signals({"location": "Barcelona / Warsaw"})
+        assert set(signals["eu_countries_in_location"]) == {"spain", "poland"}
+
+    def test_eu_offices_fill_country(self):
+        signals = extract_eu_signals({
+            "location": "Remote",
+            "offices": '[{"name": "Berlin"}, {"name": "Vienna"}]',
+        })
+        assert signals["office_countries"] == ["AT", "DE"]
+        assert signals["eu_country_code"] is True
+
+    def test_mixed_offices_leave_country_empty(self):
+        signals = extract_eu_signals({
+            "location": "Remote",
+            "offices": '[{"name": "Berlin"}, {"name": "New York"}]',
+        })
+        assert signals["country_code"] is None
+
+    def test_resolved_city_alone_does_not_decide(self):
+        # A known place with no remote wording is left to the later tiers
+        job = {"location": "Paris", "description": "Join our growing team."}
+        signals = extract_eu_signals(job)
+        assert signals["location_country"] == "FR"
+        assert keyword_eu_classify(job, signals) is None
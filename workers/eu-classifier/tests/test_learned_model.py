@@ -0,0 +1,82 @@
+"""Tests for the learned EU-remote classifier (Tier 0.75)."""
+
+import zlib
+
+from src.learned_model import (
+    LearnedModel,
+    features,
+    learned_classify,
+    load_model,
+    signal_features,
+)
+from src.signals import extract_eu_signals
+
+HASH_BITS = 12
+
+
+def _job(**overrides) -> dict:
+    job = {
+        "id": 1,
+        "title": "Backend Engineer",
+        "location": "Remote",
+        "workplace_type": "remote",
+        "source_kind": "remoteok",
+        "description": "We hire across Germany and Spain and work CET hours. " * 4,
+    }
+    job.update(overrides)
+    return job
+
+
+def _index(name: str) -> int:
+    return zlib.crc32(name.encode()) & ((1 << HASH_BITS) - 1)
+
+
+def _model(**overrides) -> LearnedModel:
+    artifact = {
+        "version": "test", "hash_bits": HASH_BITS, "bias": 0.0,
+        "indices": [_index("d:germany"), _index("d:us")],
+        "weights": [60.0, -60.0],
+        "accept_at": 0.95, "reject_at": 0.05,
+    }
+    artifact.update(overrides)
+    return LearnedModel(artifact)
+
+
+def test_features_are_deterministic_and_in_range():
+    job = _job()
+    sig = extract_eu_signals(job)
+    vec = features(job, sig, HASH_BITS)
+    assert vec == features(job, extract_eu_signals(job), HASH_BITS)
+    assert all(0 <= i < 1 << HASH_BITS for i in vec)
+    assert _index("d:germany") in vec and _index("s:ats_remote") in vec
+
+
+def test_signal_features_name_the_extracted_flags():
+    job   = _job(description="Must be located in the US. Work from anywhere in the world is not possible.")
+    names = signal_features(job, extract_eu_signals(job))
+    assert "ats_remote" in names and "aggregator" in names and "workplace=remote" in names
+
+
+def test_verdicts_only_past_the_thresholds():
+    model = _model()
+    eu    = _job()
+    us    = _job(description="Our US team works remote within the US. " * 4)
+    vague = _job(description="Join our platform team and build APIs. " * 4)
+
+    verdict = model.classify(eu, extract_eu_signals(eu))
+    assert verdict.isRemoteEU is True and verdict.confidence == "medium"
+    assert "p(remote EU)" in verdict.reason
+    assert model.classify(us, extract_eu_signals(us)).isRemoteEU is False
+    assert model.classify(vague, extract_eu_signals(vague)) is None
+
+
+def test_untrained_thresholds_never_decide():
+    model = _model(accept_at=2.0, reject_at=-1.0)
+    job   = _job()
+    assert model.classify(job, extract_eu_signals(job)) is None
+
+
+def test_no_artifact_disables_the_tier():
+    assert load_model(None) is None
+    job = _job()
+    assert learned_classify(job, extract_eu_signals(job)) is None
@@ -0,0 +1,83 @@
+"""Tests for the location resolution cache."""
+
+import json
+
+from src.location_cache import (
+    RESOLVER_VERSION,
+    LocationResolver,
+    cache_stats,
+    normalize_location,
+    resolve_location,
+)
+
+
+class TestResolveLocation:
+
+    def test_country_name_token(self):
+        r = resolve_location("berlin, germany")
+        assert r.country_code == "DE"
+        assert r.eu is True
+        assert r.eu_country_names == ("germany",)
+
+    def test_remote_token_skipped(self):
+        r = resolve_location("usa | remote")
+        assert r.country_code == "US"
+        assert r.eu is False
+        assert r.remote is False
+
+    def test_remote_flag(self):
+        assert resolve_location("remote").remote is True
+        assert resolve_location("remote (europe)").remote is True
+        assert resolve_location("fully remote").remote is False
+
+    def test_empty(self):
+        r = resolve_location("")
+        assert r.country_code is None
+        assert r.eu_country_names == ()
+
+
+class TestLocationResolver:
+
+    def test_hits_counted_on_normalized_key(self):
+        resolver = LocationResolver()
+        resolver.resolve("Berlin, Germany")
+        resolver.resolve("  berlin, germany ")
+        assert resolver.counters() == (1, 1)
+        assert normalize_location("  Remote ") == "remote"
+
+    def test_lru_evicts_least_recent(self):
+        resolver = LocationResolver(max_entries=2)
+        resolver.resolve("a")
+        resolver.resolve("b")
+        resolver.resolve("a")
+        resolver.resolve("c")
+        assert len(resolver) == 2
+        resolver.resolve("b")
+        assert resolver.misses == 4
+
+    def test_warm_skips_old_versions(self):
+        resolver = LocationResolver()
+        loaded = resolver.warm([
+            {"location": "remote - eu", "country_code": None, "is_eu": 0,
+             "eu_country_names": "[]", "is_remote": 1, "version": RESOLVER_VERSION},
+            {"location": "paris", "country_code": "FR", "is_eu": 1,
+             "eu_country_names": "[]", "is_remote": 0, "version": RESOLVER_VERSION - 1},
+        ])
+        assert loaded == 1
+        assert resolver.resolve("Remote - EU").remote is True
+        assert resolver.counters() == (1, 0)
+
+    def test_pending_rows_carry_lookup_counts_and_reset(self):
+        resolver = LocationResolver()
+        resolver.resolve("Lisbon, Portugal")
+        resolver.resolve("lisbon, portugal")
+        [row] = resolver.pending_rows()
+        assert row[0] == "lisbon, portugal"
+        assert row[1] == "PT"
+        assert json.loads(row[3]) == ["portugal"]
+        assert row[5] == 2
+        assert resolver.pending_rows() == []
+
+    def test_cache_stats(self):
+        assert cache_stats((10, 5), (13, 6))["locationCacheHitRate"] == 0.75
+        assert cache_stats((0, 0), (0, 0))["locationCacheHitRate"] == 0.0
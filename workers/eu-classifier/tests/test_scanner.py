@@ -0,0 +1,108 @@
+"""Tests for the single-pass description scanner."""
+
+import re
+import time
+
+from src.constants import (
+    EU_TIMEZONE_PATTERN,
+    NEGATIVE_EU_PATTERN,
+    US_IMPLICIT_PATTERN,
+    normalize_text_for_signals,
+)
+from src.scanner import SIGNAL_WINDOW, _first_remote_eu_span, scan_text
+
+
+# The heuristic's previous description search, kept here as the reference.
+_OLD_EU_DESC_PATTERN = re.compile(
+    r"\b(eu\s+(?:based|eligible|residents?|citizens?|work\s*(?:authorization|permit))"
+    r"|european\s+(?:union|economic\s+area)"
+    r"|remote.*\beu\b"
+    r"|emea)"
+    r"\b",
+    re.IGNORECASE,
+)
+
+DESCRIPTIONS = [
+    "We are a fully distributed team. Must be based in the US; US holidays and $150k.",
+    "401(k), medical, dental and vision. Security clearance and W-2 only.",
+    "Collaborate during European business hours (CET +/- 2), or +2 hours CET.",
+    "EU based candidates welcome; we sponsor work permits across the European Union.",
+    "Remote role.\nWe hire in the EU and UK, eu timezone preferred.",
+    "Remote-first company, EMEA region. No EU applicants, sorry.",
+    "Work from anywhere in the world as a digital nomad.",
+    "remote remote remote\nand later the eu",
+    "US citizens or permanent residents, USD 120,000 and overlap with CET.",
+]
+
+
+def _scan(location: str, description: str):
+    return scan_text(
+        normalize_text_for_signals(location.lower()),
+        normalize_text_for_signals(description.lower()),
+    )
+
+
+class TestEquivalence:
+
+    def test_signals_match_separate_patterns(self):
+        for description in DESCRIPTIONS:
+            full_text = normalize_text_for_signals(f"remote {description.lower()}")
+            scan = _scan("Remote", description)
+            assert scan.negative == [m.group(0) for m in NEGATIVE_EU_PATTERN.finditer(full_text)]
+            assert scan.us_implicit == [m.group(0) for m in US_IMPLICIT_PATTERN.finditer(full_text)]
+            assert scan.eu_timezone == bool(EU_TIMEZONE_PATTERN.search(full_text))
+
+    def test_eu_description_matches_old_search(self):
+        for description in DESCRIPTIONS:
+            desc = normalize_text_for_signals(description.lower())
+            old = _OLD_EU_DESC_PATTERN.search(desc)
+            assert _scan("", description).eu_description == (old.group(0) if old else None)
+
+    def test_remote_eu_same_line_only(self):
+        assert _scan("", "remote\n\neu").eu_description is None
+        assert _scan("", "fully remote across the eu or eu-adjacent").eu_description == (
+            "remote across the eu or eu"
+        )
+
+
+class TestLabels:
+
+    def test_worldwide_phrases(self):
+        scan = _scan("", "A remote-first team. Work from anywhere.")
+        assert scan.vague_worldwide == "remote first"
+        assert scan.explicit_worldwide == "work from anywhere"
+
+    def test_description_labels_ignore_location(self):
+        scan = _scan("Worldwide, EMEA", "Engineering role.")
+        assert scan.vague_worldwide is None
+        assert scan.eu_description is None
+
+    def test_signal_window(self):
+        description = "x" * SIGNAL_WINDOW + " us only"
+        assert _scan("", description).negative == []
+        assert _scan("", description[-20:]).negative == ["us only"]
+
+
+class TestLinearTime:
+
+    def test_adversarial_inputs_are_fast(self):
+        chars = 200_000
+        inputs = [
+            "remote " * (chars // 7),
+            ("medical," + " " * 200 + "dental " + "cet" + " " * 200) * (chars // 420),
+            "$" + "9" * chars,
+            "a" * chars,
+        ]
+        for description in inputs:
+            t0 = time.perf_counter()
+            _scan("Remote", description)
+            assert time.perf_counter() - t0 < 2.0
+
+    def test_remote_eu_span_finds_each_line_end_once(self):
+        text   = "remote " * 300_000
+        starts = list(range(0, len(text), 7))
+        t0 = time.perf_counter()
+        assert _first_remote_eu_span(text, starts, []) is None
+        assert time.perf_counter() - t0 < 0.5
+        lines = "remote x\nremote y eu z\nremote eu"
+        assert _first_remote_eu_span(lines, [0, 9, 23], [20, 32]) == (9, 20)
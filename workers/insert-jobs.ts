@@ -6,6 +6,10 @@
  * 2. Scheduled (cron): Auto-ingest jobs from discovered ATS sources (job_sources table)
  * 3. Queue consumer: Forward ingested job batches to process-jobs worker queue
  * 4. Stalled job recovery: Re-enqueue jobs stuck in intermediate states
+ *
+ * New job ids are pushed to process-jobs as compact "advance" messages, which
+ * run the remaining pipeline phases on exactly those jobs. The process-jobs
+ * cron remains as a safety sweep.
  */
 
 import { log, generateTraceId } from "./lib/logger";
@@ -75,11 +79,19 @@ type QueueMessage = {
 };
 
 type ProcessJobsMessage = {
-  action: "process" | "enhance" | "tag" | "classify";
-  limit: number;
+  action: "process" | "enhance" | "tag" | "classify" | "advance";
+  limit?: number;
+  /** "advance": run the remaining phases on these jobs (push mode) */
+  jobIds?: number[];
   traceId?: string;
 };
 
+/** Ids per "advance" message — process-jobs' ADVANCE_BATCH (src/job_retry.py) */
+const ADVANCE_BATCH = 50;
+
+/** Queue.sendBatch message limit */
+const SEND_BATCH_SIZE = 100;
+
 // ---------------------------------------------------------------------------
 // Job input/validation
 // ---------------------------------------------------------------------------
@@ -656,6 +668,8 @@ interface IngestionStats {
   jobsInserted: number;
   jobsSkipped: number;
   jobsEnqueued: number;
+  /** Ids of the rows inserted by this run — pushed to process-jobs */
+  newJobIds: number[];
   errors: string[];
   deadBoardsDetected: number;
 }
@@ -672,6 +686,7 @@ export async function autoIngestFromSources(
     jobsInserted: 0,
     jobsSkipped: 0,
     jobsEnqueued: 0,
+    newJobIds: [],
     errors: [],
     deadBoardsDetected: 0,
   };
@@ -856,8 +871,9 @@ export async function autoIngestFromSources(
         }
       }
 
-      // Track inserted count for single trigger at end of ingest (not per-job queue messages)
+      // Pushed to process-jobs once, at the end of the ingest run
       stats.jobsEnqueued += newJobIds.length;
+      stats.newJobIds.push(...newJobIds);
 
       // Update last_fetched_at and reset consecutive_errors on success
       await d1Run(
@@ -916,7 +932,7 @@ export async function autoIngestFromSources(
 async function recoverStalledJobs(
   db: D1Database,
   traceId?: string,
-): Promise<{ recovered: number }> {
+): Promise<{ recovered: number; jobIds: number[] }> {
   // Find jobs stuck in 'new' status for more than 6 hours
   const stalledThreshold = new Date(
     Date.now() - 6 * 60 * 60 * 1000,
@@ -932,7 +948,7 @@ async function recoverStalledJobs(
     [stalledThreshold],
   );
 
-  if (stalled.rows.length === 0) return { recovered: 0 };
+  if (stalled.rows.length === 0) return { recovered: 0, jobIds: [] };
 
   log({
     worker: WORKER, action: "recover-stalled", level: "info", traceId,
@@ -949,17 +965,26 @@ async function recoverStalledJobs(
     );
   }
 
-  // Caller sends a single trigger to process-jobs-queue (not per-job messages)
-  return { recovered: ids.length };
+  // Caller pushes the ids to process-jobs-queue with the newly ingested ones
+  return { recovered: ids.length, jobIds: ids };
 }
 
 // ---------------------------------------------------------------------------
 // Process-jobs triggering
 // ---------------------------------------------------------------------------
 
+function advanceMessages(jobIds: number[], traceId?: string): ProcessJobsMessage[] {
+  const ids = [...new Set(jobIds)];
+  const messages: ProcessJobsMessage[] = [];
+  for (let i = 0; i < ids.length; i += ADVANCE_BATCH) {
+    messages.push({ action: "advance", jobIds: ids.slice(i, i + ADVANCE_BATCH), traceId });
+  }
+  return messages;
+}
+
 async function triggerProcessing(
   processQueue: Queue<ProcessJobsMessage> | undefined,
-  jobCount: number,
+  jobIds: number[],
   traceId?: string,
 ): Promise<void> {
   if (!processQueue) {
@@ -971,15 +996,17 @@ async function triggerProcessing(
   }
 
   try {
-    // Send a message to process-jobs worker to run the full pipeline
-    await processQueue.send({
-      action: "process",
-      limit: Math.min(jobCount, 50),
-      traceId,
-    });
+    // Push the ids: process-jobs coalesces a queue batch of these messages
+    // and runs the remaining phases on exactly those jobs
+    const messages = advanceMessages(jobIds, traceId);
+    for (let i = 0; i < messages.length; i += SEND_BATCH_SIZE) {
+      await processQueue.sendBatch(
+        messages.slice(i, i + SEND_BATCH_SIZE).map((body) => ({ body })),
+      );
+    }
     log({
       worker: WORKER, action: "trigger-processing", level: "info", traceId,
-      metadata: { limit: Math.min(jobCount, 50) },
+      metadata: { jobs: jobIds.length, messages: messages.length },
     });
   } catch (err) {
     log({
@@ -991,8 +1018,7 @@ async function triggerProcessing(
 
 async function triggerProcessingViaHTTP(
   env: Env,
-  action: "process" | "enhance" | "tag" | "classify" = "process",
-  limit = 50,
+  jobIds: number[],
   traceId?: string,
 ): Promise<boolean> {
   if (!env.PROCESS_JOBS_URL) return false;
@@ -1011,7 +1037,8 @@ async function triggerProcessingViaHTTP(
     const res = await fetch(env.PROCESS_JOBS_URL, {
       method: "POST",
       headers,
-      body: JSON.stringify({ action, limit }),
+      // process-jobs enqueues "advance" messages for the ids
+      body: JSON.stringify({ action: "advance", jobIds }),
     });
 
     if (!res.ok) {
@@ -1024,7 +1051,7 @@ async function triggerProcessingViaHTTP(
     }
     log({
       worker: WORKER, action: "trigger-processing-http", level: "info", traceId,
-      metadata: { action, limit },
+      metadata: { jobs: jobIds.length },
     });
     return true;
   } catch (err) {
@@ -1114,9 +1141,8 @@ export default {
         env.DB,
         { maxSources, traceId },
       );
-      // Single trigger instead of per-job queue messages
-      if (stats.jobsInserted > 0) {
-        await triggerProcessing(env.PROCESS_JOBS_QUEUE, stats.jobsInserted, traceId);
+      if (stats.newJobIds.length > 0) {
+        await triggerProcessing(env.PROCESS_JOBS_QUEUE, stats.newJobIds, traceId);
       }
       return jsonResponse(
         { success: true, message: "Ingestion complete", traceId, stats },
@@ -1180,9 +1206,13 @@ export default {
       const newJobs = successful.filter((r) => r.isNew);
       const failed = insertResults.filter((r) => !r.success);
 
-      // Single trigger for new jobs (1 queue op instead of N_jobs ops)
+      // Push the new jobs' ids (one queue op per 100 messages of 50 ids)
       if (newJobs.length > 0) {
-        await triggerProcessing(env.PROCESS_JOBS_QUEUE, newJobs.length, traceId);
+        await triggerProcessing(
+          env.PROCESS_JOBS_QUEUE,
+          newJobs.map((r) => r.jobId!),
+          traceId,
+        );
       }
 
       log({
@@ -1255,10 +1285,10 @@ export default {
       // Phase 2: Recover stalled jobs
       const recovery = await recoverStalledJobs(env.DB, traceId);
 
-      // Phase 3: Single trigger to process-jobs (1 queue op instead of N_jobs ops)
-      const totalToProcess = ingestionStats.jobsInserted + recovery.recovered;
-      if (totalToProcess > 0) {
-        await triggerProcessing(env.PROCESS_JOBS_QUEUE, totalToProcess, traceId);
+      // Phase 3: Push the inserted and recovered ids to process-jobs
+      const toProcess = [...ingestionStats.newJobIds, ...recovery.jobIds];
+      if (toProcess.length > 0) {
+        await triggerProcessing(env.PROCESS_JOBS_QUEUE, toProcess, traceId);
       }
 
       log({
@@ -1285,7 +1315,7 @@ export default {
    * Queue consumer — processes batched job IDs and triggers the processing pipeline.
    *
    * Instead of forwarding to a webhook, this accumulates job IDs from the batch
-   * and sends a single message to the process-jobs queue to handle them.
+   * and pushes them to the process-jobs queue as "advance" messages.
    */
   async queue(
     batch: MessageBatch<QueueMessage>,
@@ -1332,11 +1362,11 @@ export default {
       metadata: { jobCount: jobIds.length, batchSize: batch.messages.length },
     });
 
-    // Trigger processing for the batch
+    // Push the batch's ids to process-jobs
     const triggered =
       env.PROCESS_JOBS_QUEUE
-        ? await triggerProcessing(env.PROCESS_JOBS_QUEUE, jobIds.length, batchTraceId).then(() => true)
-        : await triggerProcessingViaHTTP(env, "process", jobIds.length, batchTraceId);
+        ? await triggerProcessing(env.PROCESS_JOBS_QUEUE, jobIds, batchTraceId).then(() => true)
+        : await triggerProcessingViaHTTP(env, jobIds, batchTraceId);
 
     if (!triggered) {
       log({
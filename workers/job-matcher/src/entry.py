@@ -1,10 +1,26 @@
+# Time every import below — reported by GET /health (see import_profile.py)
+from import_profile import IMPORT_PROFILE
+IMPORT_PROFILE.start()
+
 import asyncio
 import json
 from urllib.parse import urlparse
 from js import JSON, JSON as JsJSON, fetch
-from pyodide.ffi import to_js  # noqa: F401 — kept for future use
+from pyodide.ffi import to_js
 from workers import Response, WorkerEntrypoint
 
+from model_router import (
+    INSERT_SQL as ROUTING_INSERT_SQL,
+    MODEL_ROUTER,
+    TASK_TITLE_SCORE,
+    PRUNE_SQL as ROUTING_PRUNE_SQL,
+    WARM_SQL as ROUTING_WARM_SQL,
+    insert_params as routing_insert_params,
+    prune_params as routing_prune_params,
+    run_routed,
+)
+from llm_budget import DEEPSEEK_BUDGET
+
 # Remote EU filter — source of truth: src/lib/constants.ts (REMOTE_EU_ONLY)
 REMOTE_EU_ONLY = True
 
@@ -16,7 +32,20 @@ TARGET_ROLES = [
 ]
 ROLE_SCORE_THRESHOLD = 0.4
 MAX_CANDIDATES = 50
-LLM_MODEL = "@cf/meta/llama-3.3-70b-instruct-fp8-fast"
+# Workers AI models for title scoring come from the model router's
+# "title_score" route (llama-3.1-8b → llama-3.3-70b, override with LLM_ROUTES).
+ROUTING_WORKER = "job-matcher"
+
+# Static scoring instructions — sent first and byte-identical on every call so
+# DeepSeek serves them from its prompt-prefix cache; only the titles vary.
+SCORING_SYSTEM_PROMPT = (
+    f'You are a JSON-only job relevance scorer. Target roles: {", ".join(TARGET_ROLES)}.\n'
+    f'For each job title in the user message, return a JSON object mapping the exact title '
+    f'to a score from 0.0 to 1.0, where 1.0 = perfect match for target roles '
+    f'and 0.0 = completely unrelated.\n'
+    f'Example output: {{"AI Engineer": 0.95, "3D Furniture Designer": 0.02}}\n'
+    f'Respond ONLY with valid JSON. No explanation, no markdown.'
+)
 
 
 # ---- Module-level helpers ----
@@ -70,6 +99,71 @@ async def d1_all(db, sql: str, params: list | None = None) -> list[dict]:
     return to_py(result.results)
 
 
+def _usage_record(data: dict) -> dict:
+    """Prompt-cache hit/miss and completion tokens from a DeepSeek response."""
+    usage = data.get("usage") or {}
+    hit   = usage.get("prompt_cache_hit_tokens")
+    miss  = usage.get("prompt_cache_miss_tokens")
+    if hit is None and miss is None:
+        hit, miss = 0, usage.get("prompt_tokens")
+    return {
+        "promptCacheHitTokens":  int(hit or 0),
+        "promptCacheMissTokens": int(miss or 0),
+        "completionTokens":      int(usage.get("completion_tokens") or 0),
+    }
+
+
+async def _prepare_model_router(env) -> None:
+    """Apply LLM_ROUTES, prune old llm_routing_log rows and seed rolling stats, once per isolate."""
+    MODEL_ROUTER.configure(getattr(env, "LLM_ROUTES", None))
+    if MODEL_ROUTER.warmed:
+        return
+    try:
+        await d1_all(env.DB, ROUTING_PRUNE_SQL, routing_prune_params(ROUTING_WORKER))
+        MODEL_ROUTER.warm(await d1_all(env.DB, ROUTING_WARM_SQL, [ROUTING_WORKER, 200]))
+    except Exception as exc:
+        print(f"[job-matcher] model router warm-up skipped: {exc}")
+        MODEL_ROUTER.warmed = True
+
+
+async def _flush_routing_log(db) -> None:
+    """Persist this request's routing decisions and outcomes (best-effort)."""
+    rows = MODEL_ROUTER.drain()
+    if not rows:
+        return
+    try:
+        statements = [
+            db.prepare(ROUTING_INSERT_SQL).bind(
+                *JSON.parse(json.dumps(routing_insert_params(ROUTING_WORKER, r)))
+            )
+            for r in rows
+        ]
+        await db.batch(to_js(statements))
+    except Exception as exc:
+        print(f"[job-matcher] routing log flush failed ({len(rows)} rows): {exc}")
+
+
+def _prepare_deepseek_budget(env) -> None:
+    """Apply the DEEPSEEK_* limits and bind the shared budget to this request's D1."""
+    DEEPSEEK_BUDGET.configure(
+        getattr(env, "DEEPSEEK_RPM", None),
+        getattr(env, "DEEPSEEK_DAILY_TOKENS", None),
+        getattr(env, "DEEPSEEK_DAILY_USD", None),
+    )
+    DEEPSEEK_BUDGET.bind(
+        lambda sql, params: d1_all(env.DB, sql, params),
+        lambda seconds: _sleep_ms(int(seconds * 1000)),
+    )
+
+
+def _same_verdicts(a: dict[str, float], b: dict[str, float]) -> bool:
+    """Both score maps put every title on the same side of ROLE_SCORE_THRESHOLD."""
+    return all(
+        (a.get(t, 0.0) >= ROLE_SCORE_THRESHOLD) == (b.get(t, 0.0) >= ROLE_SCORE_THRESHOLD)
+        for t in b
+    )
+
+
 def _extract_path(url: str) -> str:
     path = urlparse(url).path.rstrip("/")
     return path.rsplit("/", 1)[-1] if "/" in path else path
@@ -89,20 +183,10 @@ class Default(WorkerEntrypoint):
         }
 
     def _build_scoring_messages(self, titles: list[str]) -> list[dict]:
-        target_str = ", ".join(TARGET_ROLES)
         titles_str = "\n".join(f"- {t}" for t in titles)
-        prompt = (
-            f'You are a job relevance scorer. Target roles: {target_str}.\n'
-            f'For each job title below, return a JSON object mapping the exact title '
-            f'to a score from 0.0 to 1.0, where 1.0 = perfect match for target roles '
-            f'and 0.0 = completely unrelated.\n'
-            f'Example output: {{"AI Engineer": 0.95, "3D Furniture Designer": 0.02}}\n'
-            f'Respond ONLY with valid JSON. No explanation, no markdown.\n\n'
-            f'Titles:\n{titles_str}'
-        )
         return [
-            {"role": "system", "content": "You are a JSON-only job relevance scorer."},
-            {"role": "user", "content": prompt},
+            {"role": "system", "content": SCORING_SYSTEM_PROMPT},
+            {"role": "user", "content": f"Titles:\n{titles_str}"},
         ]
 
     def _parse_scores(self, text: str) -> dict[str, float]:
@@ -119,24 +203,45 @@ class Default(WorkerEntrypoint):
             return {}
         messages = self._build_scoring_messages(titles)
 
-        # Tier 1: Workers AI — _to_js_obj converts dicts correctly for Workers AI binding
+        # Tier 1: Workers AI — the router starts on the small model and moves
+        # to the 70B one when a response doesn't score every title.
+        # _to_js_obj converts dicts correctly for Workers AI binding
         workers_ai_err = None
-        try:
-            result = await self.env.AI.run(
-                LLM_MODEL,
-                _to_js_obj({"messages": messages}),
-            )
-            result_dict = json.loads(JsJSON.stringify(result))
-            return self._parse_scores(result_dict.get("response", ""))
-        except Exception as exc:
-            workers_ai_err = exc
-            print(f"[job-matcher] Workers AI failed, trying DeepSeek fallback: {exc}")
 
-        # Tier 2: DeepSeek fallback — reads DEEPSEEK_API_KEY from worker secrets
+        async def score_with(model: str) -> dict[str, float] | None:
+            nonlocal workers_ai_err
+            try:
+                result = await self.env.AI.run(model, _to_js_obj({"messages": messages}))
+                result_dict = json.loads(JsJSON.stringify(result))
+                return self._parse_scores(result_dict.get("response", ""))
+            except Exception as exc:
+                workers_ai_err = exc
+                print(f"[job-matcher] Workers AI {model} failed: {exc}")
+                return None
+
+        await _prepare_model_router(self.env)
+        scores = await run_routed(
+            MODEL_ROUTER, TASK_TITLE_SCORE, len(messages[-1]["content"]), score_with,
+            lambda s: all(t in s for t in titles),
+            agree=_same_verdicts,
+        )
+        await _flush_routing_log(self.env.DB)
+        if scores is not None:
+            return scores
+        print(f"[job-matcher] Workers AI failed, trying DeepSeek fallback: {workers_ai_err}")
+
+        # Tier 2: DeepSeek fallback — reads DEEPSEEK_API_KEY from worker secrets,
+        # and only runs while the shared rate limit / daily budget grants a permit
         api_key  = getattr(self.env, "DEEPSEEK_API_KEY", None)
         base_url = getattr(self.env, "DEEPSEEK_BASE_URL", None) or DEEPSEEK_BASE_URL_DEFAULT
         model    = getattr(self.env, "DEEPSEEK_MODEL", None) or DEEPSEEK_MODEL_DEFAULT
         if api_key:
+            _prepare_deepseek_budget(self.env)
+            # Request path: never sleep for the next rate window
+            if not await DEEPSEEK_BUDGET.acquire(wait=False):
+                raise RuntimeError(
+                    f"LLM role-scoring failed: {workers_ai_err} (DeepSeek budget or rate limit exhausted)"
+                ) from workers_ai_err
             try:
                 payload = json.dumps({
                     "model":           model,
@@ -151,6 +256,10 @@ class Default(WorkerEntrypoint):
                     headers = {"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"},
                     body    = payload,
                 )
+                DEEPSEEK_BUDGET.record(data.get("usage"))
+                await DEEPSEEK_BUDGET.flush()
+                usage = _usage_record(data)
+                print(f"[job-matcher] deepseek usage {json.dumps({'titles': len(titles), **usage})}")
                 content = (data.get("choices") or [{}])[0].get("message", {}).get("content", "")
                 return self._parse_scores(content)
             except Exception as exc:
@@ -176,13 +285,23 @@ class Default(WorkerEntrypoint):
             ph = ",".join(["?"] * len(skills))
             candidate_rows = await d1_all(
                 self.env.DB,
-                f"""SELECT DISTINCT jst.job_id, j.title
+                f"""SELECT DISTINCT jst.job_id, j.title, j.dup_cluster_id
                     FROM job_skill_tags jst
                     JOIN jobs j ON j.id = jst.job_id
                     WHERE jst.tag IN ({ph}) AND j.is_remote_eu = 1  -- REMOTE_EU_ONLY
                     LIMIT {MAX_CANDIDATES}""",
                 skills,
             )
+            # One candidate per near-duplicate cluster (process-jobs dedup.py),
+            # so the same posting from several sources is matched once
+            clusters = set()
+            unique_rows = []
+            for r in candidate_rows:
+                cluster = r.get("dup_cluster_id") or r["job_id"]
+                if cluster not in clusters:
+                    clusters.add(cluster)
+                    unique_rows.append(r)
+            candidate_rows = unique_rows
             if not candidate_rows:
                 return Response.json(
                     {"jobs": [], "totalCount": 0, "hasMore": False},
@@ -293,12 +412,16 @@ class Default(WorkerEntrypoint):
             )
 
     async def fetch(self, request):
+        IMPORT_PROFILE.mark_request()
         try:
             if request.method == "OPTIONS":
                 return Response("", status=204, headers=self._cors_headers)
             path = _extract_path(request.url)
             if path in ("health", "") and request.method == "GET":
-                return Response.json({"status": "ok"}, headers=self._cors_headers)
+                return Response.json(
+                    {"status": "ok", "imports": IMPORT_PROFILE.report()},
+                    headers=self._cors_headers,
+                )
             if path == "match-jobs" and request.method == "POST":
                 return await self._handle_match_jobs(request)
             return Response.json({"error": "Not found"}, status=404, headers=self._cors_headers)
@@ -307,3 +430,7 @@ class Default(WorkerEntrypoint):
                 {"error": f"Request failed: {str(exc)}"},
                 status=500, headers=self._cors_headers
             )
+
+
+# Entry module fully loaded — stop timing imports.
+IMPORT_PROFILE.stop()
@@ -93,6 +93,13 @@ async def log_event(db, job_id: int, event_type: str,
     ).bind(job_id, event_type, actor, json.dumps(payload or {})).run()
 
 
+async def query(db, sql: str, params: list) -> list[dict]:
+    """All rows of ``sql`` as dicts (used by the shared DeepSeek budget)."""
+    result = await db.prepare(sql).bind(*params).all()
+    rows = result.results if hasattr(result, "results") else []
+    return [r.to_py() if hasattr(r, "to_py") else dict(r) for r in rows]
+
+
 def _row(row) -> dict:
     if not row:
         return {}
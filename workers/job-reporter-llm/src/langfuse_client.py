@@ -64,8 +64,10 @@ class LangfuseClient:
 
     async def create_generation(self, *, trace_id: str, id: str, name: str,
                                  model: str, input: list, output: dict,
-                                 start_time: str, end_time: str) -> dict:
-        return await self._req("POST", "/api/public/generations", {
+                                 start_time: str, end_time: str,
+                                 usage: dict | None = None,
+                                 timing: dict | None = None) -> dict:
+        body = {
             "traceId":   trace_id,
             "id":        id,
             "name":      name,
@@ -74,7 +76,19 @@ class LangfuseClient:
             "output":    output,
             "startTime": start_time,
             "endTime":   end_time,
-        })
+        }
+        if usage:
+            # DeepSeek token split (prompt cache hit / miss, completion)
+            body["usageDetails"] = {
+                "input_cache_read": usage.get("prompt_cache_hit_tokens", 0),
+                "input":            usage.get("prompt_cache_miss_tokens", 0),
+                "output":           usage.get("completion_tokens", 0),
+            }
+        if timing:
+            # Streamed call: first byte → completionStartTime, rest as metadata
+            body["completionStartTime"] = timing["completion_start_time"]
+            body["metadata"] = {k: v for k, v in timing.items() if k != "completion_start_time"}
+        return await self._req("POST", "/api/public/generations", body)
 
     async def post_score(self, *, trace_id: str, name: str,
                          value: float, comment: str = "") -> dict:
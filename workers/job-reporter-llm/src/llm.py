@@ -7,15 +7,35 @@ Per job analysed, Langfuse receives:
     generation "pass2_deepseek_reasoner" (only if pass-1 conf < 0.60)
   score      "confidence"     (raw float)
   score      "label_accuracy" (0.5 = pending, updated to 1.0/0.0 by admin action)
+
+SYSTEM_PROMPT is sent first and never varies, so DeepSeek serves it from its
+prompt-prefix cache; each generation carries the prompt_cache_hit_tokens /
+prompt_cache_miss_tokens / completion_tokens it was billed for, and the
+analysis returns their sum under "usage".
+
+Both passes stream the completion and stop reading at the first complete
+verdict object (llm_stream.py); each generation records when the first byte
+arrived (completionStartTime) and the time to decision in its metadata.
+Usage is only reported by the stream's final chunk, so a pass that stopped
+early carries no token counts.
+
+Every pass takes a permit from the shared DeepSeek budget (llm_budget.py)
+first. Without one, pass 1 is not run and the job is escalated for admin
+review (tag "budget_exhausted"); pass 2 is skipped.
 """
 
+import asyncio
 import json
 import re
+import time
 import uuid
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from js import fetch, Headers
 
+import db
 from langfuse_client import LangfuseClient
+from llm_budget import DEEPSEEK_BUDGET
+from llm_stream import read_json_stream
 
 
 VALID_REASONS  = {"spam", "irrelevant", "misclassified", "false_positive"}
@@ -57,6 +77,24 @@ def _user_prompt(job: dict) -> str:
     )
 
 
+def _usage(data: dict) -> dict:
+    """Token usage of one DeepSeek response (cache hit / miss split when reported)."""
+    usage = data.get("usage") or {}
+    hit   = usage.get("prompt_cache_hit_tokens")
+    miss  = usage.get("prompt_cache_miss_tokens")
+    if hit is None and miss is None:
+        hit, miss = 0, usage.get("prompt_tokens")
+    return {
+        "prompt_cache_hit_tokens":  int(hit or 0),
+        "prompt_cache_miss_tokens": int(miss or 0),
+        "completion_tokens":        int(usage.get("completion_tokens") or 0),
+    }
+
+
+def _add_usage(total: dict, usage: dict) -> dict:
+    return {k: total.get(k, 0) + usage.get(k, 0) for k in usage}
+
+
 def _parse(raw: str) -> dict:
     cleaned = re.sub(r"```(?:json)?|```", "", raw).strip()
     start   = cleaned.find("{")
@@ -79,8 +117,8 @@ def _parse(raw: str) -> dict:
 
 
 async def _call(gateway_url: str, api_key: str, model: str,
-                system: str, user: str) -> tuple[dict, str]:
-    """Returns (parsed_result, raw_content)."""
+                system: str, user: str) -> tuple[dict, str, dict, dict]:
+    """Returns (parsed_result, raw_content, usage, timing)."""
     is_reasoner = model == MODEL_REASONER
     extra = {"response_format": {"type": "json_object"}, "temperature": 0.1}
     if is_reasoner:
@@ -95,12 +133,16 @@ async def _call(gateway_url: str, api_key: str, model: str,
         ],
         **extra,
         "max_tokens": 600 if is_reasoner else 400,
+        "stream":     True,
+        "stream_options": {"include_usage": True},
     })
 
     h = Headers.new()
     h.set("Content-Type", "application/json")
     h.set("Authorization", f"Bearer {api_key}")
 
+    wall0   = datetime.now(timezone.utc)
+    started = time.monotonic()
     resp = await fetch(
         f"{gateway_url}/chat/completions",
         method="POST", headers=h, body=payload,
@@ -108,9 +150,19 @@ async def _call(gateway_url: str, api_key: str, model: str,
     if not resp.ok:
         raise RuntimeError(f"DeepSeek {model} {resp.status}: {(await resp.text())[:200]}")
 
-    data = json.loads(await resp.text())
-    raw  = data["choices"][0]["message"]["content"]
-    return _parse(raw), raw
+    stream = await read_json_stream(
+        resp.body.getReader(), ("reason", "confidence"), provider="deepseek", started=started,
+    )
+    raw    = stream.text
+    parsed = _parse(json.dumps(stream.obj)) if stream.obj is not None else _parse(raw)
+    timing = {
+        "completion_start_time": (wall0 + timedelta(milliseconds=stream.timings.ttfb_ms)).isoformat(),
+        "ttfb_ms":               round(stream.timings.ttfb_ms, 1),
+        "decision_ms":           round(stream.timings.decision_ms, 1),
+        "early_stop":            stream.timings.early_stop,
+    }
+    DEEPSEEK_BUDGET.record(stream.usage, len(payload), len(raw))
+    return parsed, raw, _usage({"usage": stream.usage}), timing
 
 
 def _action(result: dict, env) -> str:
@@ -123,6 +175,16 @@ def _action(result: dict, env) -> str:
     return "pending"
 
 
+def prepare_budget(env) -> None:
+    """Apply the DEEPSEEK_* limits and bind the shared budget to this request's D1."""
+    DEEPSEEK_BUDGET.configure(
+        getattr(env, "DEEPSEEK_RPM", None),
+        getattr(env, "DEEPSEEK_DAILY_TOKENS", None),
+        getattr(env, "DEEPSEEK_DAILY_USD", None),
+    )
+    DEEPSEEK_BUDGET.bind(lambda sql, params: db.query(env.DB, sql, params), asyncio.sleep)
+
+
 async def analyze_reported_job(env, job: dict, lf: LangfuseClient) -> dict:
     """
     Classify a reported job with DeepSeek and trace everything to Langfuse.
@@ -136,6 +198,7 @@ async def analyze_reported_job(env, job: dict, lf: LangfuseClient) -> dict:
 
     trace_id  = str(uuid.uuid4())
     user_msg  = _user_prompt(job)
+    usage     = _usage({})
 
     # ── Root trace ─────────────────────────────────────────────────────────
     await lf.create_trace(
@@ -152,11 +215,24 @@ async def analyze_reported_job(env, job: dict, lf: LangfuseClient) -> dict:
     )
 
     # ── Pass 1: deepseek-chat ──────────────────────────────────────────────
+    prepare_budget(env)
+    if not await DEEPSEEK_BUDGET.acquire():
+        await lf.post_score(trace_id=trace_id, name="label_accuracy",
+                            value=0.0, comment="pass1 skipped: DeepSeek budget exhausted")
+        return {
+            "reason": "irrelevant", "confidence": 0.0,
+            "reasoning": "DeepSeek rate limit or daily budget exhausted; needs manual review.",
+            "tags": ["budget_exhausted"],
+            "action": "escalated", "model_used": "none", "trace_id": trace_id,
+            "usage": usage,
+        }
+
     t0 = _now()
     try:
-        result, raw1 = await _call(gateway_url, api_key, MODEL_FAST, SYSTEM_PROMPT, user_msg)
+        result, raw1, usage1, timing1 = await _call(gateway_url, api_key, MODEL_FAST, SYSTEM_PROMPT, user_msg)
         t1 = _now()
         model_used = MODEL_FAST
+        usage      = _add_usage(usage, usage1)
 
         await lf.create_generation(
             trace_id=trace_id,
@@ -170,6 +246,8 @@ async def analyze_reported_job(env, job: dict, lf: LangfuseClient) -> dict:
             output={"raw": raw1, "parsed": result},
             start_time=t0,
             end_time=t1,
+            usage=usage1,
+            timing=timing1,
         )
 
     except Exception as exc:
@@ -179,17 +257,23 @@ async def analyze_reported_job(env, job: dict, lf: LangfuseClient) -> dict:
             "reason": "irrelevant", "confidence": 0.0,
             "reasoning": f"LLM error: {exc!s:.200}", "tags": ["llm_error"],
             "action": "escalated", "model_used": MODEL_FAST, "trace_id": trace_id,
+            "usage": usage,
         }
 
-    # ── Pass 2: deepseek-reasoner (only when unsure) ───────────────────────
-    if result["confidence"] < second_op:
+    # ── Pass 2: deepseek-reasoner (only when unsure and budget allows) ─────
+    second = result["confidence"] < second_op
+    if second and not await DEEPSEEK_BUDGET.acquire():
+        second = False
+        result["tags"].append("budget_exhausted")
+    if second:
         t2 = _now()
         try:
-            result2, raw2 = await _call(
+            result2, raw2, usage2, timing2 = await _call(
                 gateway_url, api_key, MODEL_REASONER, SYSTEM_PROMPT, user_msg
             )
             t3 = _now()
             model_used = MODEL_REASONER
+            usage      = _add_usage(usage, usage2)
 
             await lf.create_generation(
                 trace_id=trace_id,
@@ -203,6 +287,8 @@ async def analyze_reported_job(env, job: dict, lf: LangfuseClient) -> dict:
                 output={"raw": raw2, "parsed": result2},
                 start_time=t2,
                 end_time=t3,
+                usage=usage2,
+                timing=timing2,
             )
 
             result = result2
@@ -226,4 +312,5 @@ async def analyze_reported_job(env, job: dict, lf: LangfuseClient) -> dict:
     result["action"]     = _action(result, env)
     result["model_used"] = model_used
     result["trace_id"]   = trace_id
+    result["usage"]      = usage
     return result
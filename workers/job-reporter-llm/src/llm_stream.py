@@ -0,0 +1,343 @@
+# AUTO-GENERATED by scripts/sync-worker-modules.py
+# Do NOT edit manually. Edit workers/lib/python/llm_stream.py and run `pnpm workers:sync`.
+
+"""Streaming LLM responses with early JSON termination.
+
+The role-tagging, skill-extraction, EU-classification and report-triage
+prompts only need one small JSON object, but a completion keeps going
+around it -- Qwen3's ``<think>`` block before it, closing fences and prose
+after it. Streaming the response lets us stop reading (and cancel the
+upstream generation) as soon as the first complete object carrying the
+keys we need has arrived.
+
+  SseDecoder        -- ``text/event-stream`` text -> JSON events
+  content_delta()   -- answer text of one DeepSeek / Workers AI event
+  JsonObjectScanner -- incremental brace scanner over the answer text
+  read_json_stream  -- drives a ReadableStream reader through the above
+
+Every streamed call records its time to first byte and time to decision in
+``LLM_LATENCY`` (one ``LatencyRecord`` per isolate, snapshot/diff like
+``llm_usage.DEEPSEEK_USAGE``). Pure Python -- the reader is duck-typed, so
+the whole path is unit-tested with a fake reader under CPython.
+"""
+
+import codecs
+import json
+import time
+from dataclasses import dataclass, field, fields
+
+
+USAGE_GRACE_CHARS = 2000   # answer chars read past the object while waiting for usage
+
+
+# ---------------------------------------------------------------------------
+# Server-sent events
+# ---------------------------------------------------------------------------
+
+class SseDecoder:
+    """Incremental ``text/event-stream`` decoder.
+
+    ``feed()`` accepts any slice of the stream text and returns the JSON
+    payloads of the ``data:`` lines it completed; ``flush()`` returns the
+    last line when the stream ends without a trailing newline. ``done``
+    flips on the OpenAI-style ``data: [DONE]`` sentinel.
+    """
+
+    __slots__ = ("_pending", "done")
+
+    def __init__(self):
+        self._pending = ""
+        self.done     = False
+
+    def feed(self, text: str) -> list[dict]:
+        lines = (self._pending + text).split("\n")
+        self._pending = lines.pop()
+        return self._events(lines)
+
+    def flush(self) -> list[dict]:
+        lines, self._pending = [self._pending], ""
+        return self._events(lines)
+
+    def _events(self, lines: list[str]) -> list[dict]:
+        events = []
+        for line in lines:
+            line = line.rstrip("\r")
+            if not line.startswith("data:"):
+                continue  # blank separators, comments, event: / id: fields
+            payload = line[5:].strip()
+            if payload == "[DONE]":
+                self.done = True
+                continue
+            try:
+                event = json.loads(payload)
+            except ValueError:
+                continue
+            if isinstance(event, dict):
+                events.append(event)
+        return events
+
+
+def content_delta(event: dict) -> str:
+    """Answer text carried by one stream event.
+
+    DeepSeek (and Workers AI's OpenAI-compatible models) send
+    ``choices[0].delta.content``; Workers AI's native format sends
+    ``response``. ``reasoning_content`` is skipped -- the answer never
+    lives there.
+    """
+    choices = event.get("choices")
+    if choices:
+        delta = choices[0].get("delta") or {}
+        return delta.get("content") or ""
+    response = event.get("response")
+    return response if isinstance(response, str) else ""
+
+
+# ---------------------------------------------------------------------------
+# Incremental JSON object scanner
+# ---------------------------------------------------------------------------
+
+class JsonObjectScanner:
+    """Finds the first complete JSON object with ``required`` keys in a stream.
+
+    Brace depth and string/escape state survive across ``feed()`` calls, so
+    a chunk boundary can fall anywhere. Text inside ``<think>...</think>`` is
+    skipped. A balanced candidate that doesn't parse, or parses without a
+    required key (prose like ``{title}``), is dropped and scanning goes on;
+    the first object that parsed at all is kept in ``fallback`` so a model
+    using alternate key spellings still yields something to normalise.
+    """
+
+    __slots__ = (
+        "required", "result", "fallback",
+        "_chunks", "_obj", "_depth", "_in_string", "_escape", "_thinking", "_tail",
+    )
+
+    def __init__(self, required: tuple[str, ...] = ()):
+        self.required   = tuple(required)
+        self.result     = None
+        self.fallback   = None
+        self._chunks    = []
+        self._obj       = []
+        self._depth     = 0
+        self._in_string = False
+        self._escape    = False
+        self._thinking  = False
+        self._tail      = ""
+
+    @property
+    def text(self) -> str:
+        """Everything fed so far."""
+        return "".join(self._chunks)
+
+    def feed(self, text: str) -> dict | None:
+        """Scan one slice of answer text; returns the object once found."""
+        if self.result is not None or not text:
+            return self.result
+        self._chunks.append(text)
+        for ch in text:
+            if self._depth == 0:
+                self._tail = (self._tail + ch)[-8:]
+                if self._thinking:
+                    self._thinking = not self._tail.endswith("</think>")
+                elif self._tail.endswith("<think>"):
+                    self._thinking = True
+                elif ch == "{":
+                    self._depth = 1
+                    self._obj   = ["{"]
+                continue
+
+            self._obj.append(ch)
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"':
+                self._in_string = True
+            elif ch == "{":
+                self._depth += 1
+            elif ch == "}":
+                self._depth -= 1
+                if self._depth == 0 and self._accept("".join(self._obj)):
+                    return self.result
+        return None
+
+    def _accept(self, candidate: str) -> bool:
+        try:
+            obj = json.loads(candidate)
+        except ValueError:
+            return False
+        if not isinstance(obj, dict):
+            return False
+        if self.fallback is None:
+            self.fallback = obj
+        if any(key not in obj for key in self.required):
+            return False
+        self.result = obj
+        return True
+
+
+# ---------------------------------------------------------------------------
+# Latency accounting
+# ---------------------------------------------------------------------------
+
+@dataclass(slots=True)
+class StreamTimings:
+    """Timings of one streamed call, in ms from the request being issued."""
+    provider:    str
+    ttfb_ms:     float = 0.0   # first body chunk
+    decision_ms: float = 0.0   # usable object parsed (or stream ended)
+    chars:       int   = 0     # answer characters read
+    early_stop:  bool  = False # stream cancelled before it ended
+
+
+@dataclass(slots=True)
+class LatencyRecord:
+    """Summed timings over a set of streamed calls."""
+    calls:       int   = 0
+    early_stops: int   = 0
+    ttfb_ms:     float = 0.0
+    decision_ms: float = 0.0
+
+    def record(self, timings: StreamTimings) -> None:
+        self.calls       += 1
+        self.early_stops += int(timings.early_stop)
+        self.ttfb_ms     += timings.ttfb_ms
+        self.decision_ms += timings.decision_ms
+
+    def snapshot(self) -> "LatencyRecord":
+        return LatencyRecord(*(getattr(self, f.name) for f in fields(self)))
+
+    def since(self, before: "LatencyRecord") -> "LatencyRecord":
+        return LatencyRecord(*(getattr(self, f.name) - getattr(before, f.name) for f in fields(self)))
+
+    def __add__(self, other: "LatencyRecord") -> "LatencyRecord":
+        return LatencyRecord(*(getattr(self, f.name) + getattr(other, f.name) for f in fields(self)))
+
+    def as_stats(self) -> dict:
+        """camelCase counters merged into phase / run stats dicts."""
+        calls = self.calls or 1
+        return {
+            "llmStreamCalls":   self.calls,
+            "llmEarlyStops":    self.early_stops,
+            "llmTtfbMsSum":     round(self.ttfb_ms, 1),
+            "llmDecisionMsSum": round(self.decision_ms, 1),
+            "llmTtfbMsAvg":     round(self.ttfb_ms / calls, 1),
+            "llmDecisionMsAvg": round(self.decision_ms / calls, 1),
+        }
+
+    @classmethod
+    def from_stats(cls, stats: dict) -> "LatencyRecord":
+        """Inverse of ``as_stats`` (sums, not averages, so records add up)."""
+        return cls(
+            calls       = int(stats.get("llmStreamCalls") or 0),
+            early_stops = int(stats.get("llmEarlyStops") or 0),
+            ttfb_ms     = float(stats.get("llmTtfbMsSum") or 0.0),
+            decision_ms = float(stats.get("llmDecisionMsSum") or 0.0),
+        )
+
+
+# One accumulator per isolate — shared by every request the isolate serves.
+LLM_LATENCY = LatencyRecord()
+
+
+# ---------------------------------------------------------------------------
+# Stream reader
+# ---------------------------------------------------------------------------
+
+@dataclass(slots=True)
+class StreamResult:
+    """What a streamed call produced."""
+    obj:     dict | None      # first object with the required keys (else fallback)
+    text:    str              # answer text read so far
+    usage:   dict | None      # DeepSeek ``usage`` block, if the stream got that far
+    timings: StreamTimings = field(default_factory=lambda: StreamTimings("unknown"))
+    prompt_chars: int = 0     # request body length, set by the caller (budget estimate)
+
+
+def _chunk_bytes(value) -> bytes:
+    """Bytes of one ReadableStream chunk (Uint8Array JsProxy or bytes-like)."""
+    if hasattr(value, "to_bytes"):
+        return value.to_bytes()
+    return bytes(value)
+
+
+async def read_json_stream(
+    reader,
+    required: tuple[str, ...] = (),
+    *,
+    provider: str,
+    started: float | None = None,
+    wait_usage: bool | None = None,
+) -> StreamResult:
+    """Read an SSE chat-completions stream until a usable JSON object appears.
+
+    ``reader`` is a ReadableStream reader (``await reader.read()`` yields
+    objects with ``done`` / ``value``). Once the scanner returns an object
+    the reader is cancelled, which aborts the upstream generation. With
+    ``wait_usage`` (default: DeepSeek, whose ``include_usage`` event comes
+    after the content) reading goes on until that event or ``[DONE]``, for
+    at most ``USAGE_GRACE_CHARS`` more answer characters. Timings are
+    measured from ``started`` (``time.monotonic()`` before the request) and
+    recorded in ``LLM_LATENCY``; ``decision_ms`` is when the object closed.
+    """
+    started    = time.monotonic() if started is None else started
+    wait_usage = provider == "deepseek" if wait_usage is None else wait_usage
+    timings    = StreamTimings(provider)
+    decoder    = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    sse        = SseDecoder()
+    scanner    = JsonObjectScanner(required)
+    usage      = None
+    ended      = False
+    first      = True
+    trailing   = 0     # answer chars read after the object closed
+
+    def consume(events: list[dict]) -> bool:
+        """Process ``events``; True once nothing more is worth reading."""
+        nonlocal usage, trailing
+        for event in events:
+            if event.get("usage"):
+                usage = event["usage"]
+            delta = content_delta(event)
+            timings.chars += len(delta)
+            if scanner.result is not None:
+                trailing += len(delta)
+            elif scanner.feed(delta) is not None:
+                timings.decision_ms = (time.monotonic() - started) * 1000
+        if scanner.result is None:
+            return False
+        return not wait_usage or usage is not None or trailing > USAGE_GRACE_CHARS
+
+    while True:
+        chunk = await reader.read()
+        if first:
+            timings.ttfb_ms, first = (time.monotonic() - started) * 1000, False
+        if chunk.done:
+            consume(sse.feed(decoder.decode(b"", final=True)) + sse.flush())
+            ended = True
+            break
+        if consume(sse.feed(decoder.decode(_chunk_bytes(chunk.value)))):
+            break
+        if sse.done:
+            ended = True
+            break
+
+    if scanner.result is None:
+        timings.decision_ms = (time.monotonic() - started) * 1000
+    if not ended:
+        timings.early_stop = True
+        try:
+            await reader.cancel()
+        except Exception:
+            pass  # stream already closed — nothing left to abort
+
+    LLM_LATENCY.record(timings)
+    return StreamResult(
+        obj     = scanner.result if scanner.result is not None else scanner.fallback,
+        text    = scanner.text,
+        usage   = usage,
+        timings = timings,
+    )
@@ -0,0 +1,161 @@
+# AUTO-GENERATED by scripts/sync-worker-modules.py
+# Do NOT edit manually. Edit workers/lib/python/run_log.py and run `pnpm workers:sync`.
+
+"""Leveled, structured, sampled logging for the per-job pipeline loops.
+
+A 10k-job queue run used to print several lines per job. Each of those
+lines costs Pyodide CPU and floods the tail-worker pipeline. ``RunLogger``
+replaces those prints:
+
+  debug / info / warn / error -- run-level lines, filtered by ``LOG_LEVEL``
+  job(level, job_id, msg)     -- per-job lines, also sampled: only jobs whose
+                                 id hashes into ``LOG_JOB_SAMPLE`` (a fraction,
+                                 salted per run) are printed, so a sampled job
+                                 keeps all of its lines; errors always print
+  summary(msg)                -- run summaries, always printed
+
+Lines are single JSON objects (``level``, ``worker``, ``msg`` plus the
+key/value fields) so Workers Logs indexes the fields. What was printed,
+what sampling suppressed and the time spent formatting and printing are
+counted in ``LOG.stats`` (a ``LogStats``, snapshot/diff like
+``llm_stream.LLM_LATENCY``) and surface in the phase / run metrics.
+Pure Python -- the sink is injectable for tests.
+"""
+
+import json
+import time
+import zlib
+from dataclasses import dataclass, fields
+
+
+LEVELS = {"debug": 10, "info": 20, "warn": 30, "error": 40}
+
+DEFAULT_LEVEL      = "info"
+DEFAULT_JOB_SAMPLE = 0.02   # fraction of jobs whose per-job lines are printed
+
+
+@dataclass(slots=True)
+class LogStats:
+    """Log volume and cost over a set of lines."""
+    lines:      int   = 0
+    suppressed: int   = 0
+    bytes:      int   = 0
+    ms:         float = 0.0
+
+    def snapshot(self) -> "LogStats":
+        return LogStats(*(getattr(self, f.name) for f in fields(self)))
+
+    def since(self, before: "LogStats") -> "LogStats":
+        return LogStats(*(getattr(self, f.name) - getattr(before, f.name) for f in fields(self)))
+
+    def __add__(self, other: "LogStats") -> "LogStats":
+        return LogStats(*(getattr(self, f.name) + getattr(other, f.name) for f in fields(self)))
+
+    def as_stats(self) -> dict:
+        """camelCase counters merged into phase / run stats dicts."""
+        return {
+            "logLines":      self.lines,
+            "logSuppressed": self.suppressed,
+            "logBytes":      self.bytes,
+            "logMs":         round(self.ms, 2),
+        }
+
+    @classmethod
+    def from_stats(cls, stats: dict) -> "LogStats":
+        """Inverse of ``as_stats``."""
+        return cls(
+            lines      = int(stats.get("logLines") or 0),
+            suppressed = int(stats.get("logSuppressed") or 0),
+            bytes      = int(stats.get("logBytes") or 0),
+            ms         = float(stats.get("logMs") or 0.0),
+        )
+
+
+def _parse_sample(value) -> float | None:
+    try:
+        return min(1.0, max(0.0, float(value)))
+    except (TypeError, ValueError):
+        return None
+
+
+class RunLogger:
+    """Per-isolate logger; ``configure()`` from env, ``start_run()`` per run."""
+
+    __slots__ = ("worker", "level", "job_sample", "stats", "_sink", "_salt", "_configured_from")
+
+    def __init__(self, worker: str, sink=print):
+        self.worker     = worker
+        self.level      = LEVELS[DEFAULT_LEVEL]
+        self.job_sample = DEFAULT_JOB_SAMPLE
+        self.stats      = LogStats()
+        self._sink      = sink
+        self._salt      = ""
+        self._configured_from = None
+
+    def configure(self, level=None, job_sample=None) -> None:
+        """Apply ``LOG_LEVEL`` / ``LOG_JOB_SAMPLE`` env values (invalid ones keep defaults)."""
+        key = (level, job_sample)
+        if key == self._configured_from:
+            return
+        self._configured_from = key
+        self.level      = LEVELS.get(str(level or DEFAULT_LEVEL).lower(), LEVELS[DEFAULT_LEVEL])
+        sample          = _parse_sample(job_sample)
+        self.job_sample = DEFAULT_JOB_SAMPLE if sample is None else sample
+
+    def start_run(self, run_id: str) -> None:
+        """Re-salt job sampling so each run prints a different subset of jobs."""
+        self._salt = str(run_id)
+
+    def sampled(self, job_id) -> bool:
+        if self.job_sample >= 1.0:
+            return True
+        if self.job_sample <= 0.0:
+            return False
+        bucket = zlib.crc32(f"{self._salt}:{job_id}".encode()) % 10_000
+        return bucket < self.job_sample * 10_000
+
+    # -- emitters -----------------------------------------------------------
+
+    def debug(self, msg: str, **kv) -> None:
+        self.log("debug", msg, **kv)
+
+    def info(self, msg: str, **kv) -> None:
+        self.log("info", msg, **kv)
+
+    def warn(self, msg: str, **kv) -> None:
+        self.log("warn", msg, **kv)
+
+    def error(self, msg: str, **kv) -> None:
+        self.log("error", msg, **kv)
+
+    def log(self, level: str, msg: str, **kv) -> None:
+        if LEVELS[level] < self.level:
+            self.stats.suppressed += 1
+            return
+        self._emit(level, msg, kv)
+
+    def job(self, level: str, job_id, msg: str, **kv) -> None:
+        """One per-job line: level-filtered, then sampled by job id (errors always print)."""
+        if LEVELS[level] < self.level or (level != "error" and not self.sampled(job_id)):
+            self.stats.suppressed += 1
+            return
+        self._emit(level, msg, {"job": job_id, **kv})
+
+    def summary(self, msg: str, **kv) -> None:
+        """Run / phase summary: printed regardless of level and sampling."""
+        self._emit("info", msg, {"summary": True, **kv})
+
+    def _emit(self, level: str, msg: str, kv: dict) -> None:
+        started = time.perf_counter()
+        line    = json.dumps(
+            {"level": level, "worker": self.worker, "msg": msg, **kv},
+            default=str, ensure_ascii=False,
+        )
+        self._sink(line)
+        self.stats.lines += 1
+        self.stats.bytes += len(line)
+        self.stats.ms    += (time.perf_counter() - started) * 1000
+
+
+# One logger per isolate — shared by every request the isolate serves.
+LOG = RunLogger("job-reporter-llm")
@@ -18,6 +18,10 @@ Migrations:
   safe to call on every startup. No manual pnpm/wrangler command needed.
 """
 
+# Time every import below — reported by GET /health (see import_profile.py)
+from import_profile import IMPORT_PROFILE
+IMPORT_PROFILE.start()
+
 import json
 from datetime import datetime, timezone
 from urllib.parse import parse_qs, unquote
@@ -27,6 +31,7 @@ import db
 import llm
 import migrations
 from langfuse_client import LangfuseClient
+from run_log import LOG
 
 # Prevents re-running migrations in the same worker instance lifetime.
 _migrations_done = False
@@ -219,12 +224,14 @@ async def handle_debug_process(request, env) -> Response:
         snapshot = {**job, "prev_status": "enhanced"}
         lf       = LangfuseClient(env)
         analysis = await llm.analyze_reported_job(env, snapshot, lf)
+        await llm.DEEPSEEK_BUDGET.flush()
         await db.save_analysis(env.DB, job_id, analysis)
         await db.log_event(env.DB, job_id, "llm_analyzed",
                            actor=f"system:llm:{analysis['model_used']}",
                            payload={"reason": analysis["reason"],
                                     "confidence": analysis["confidence"],
-                                    "action": analysis["action"]})
+                                    "action": analysis["action"],
+                                    "usage": analysis.get("usage")})
         return _json({"ok": True, "analysis": analysis})
     except Exception as exc:
         return _json({"error": str(exc), "trace": tb.format_exc()}, 500)
@@ -234,6 +241,7 @@ async def handle_debug_process(request, env) -> Response:
 
 async def on_fetch(request, env):
     global _migrations_done
+    IMPORT_PROFILE.mark_request()
     if not _migrations_done:
         try:
             applied = await migrations.run(env.DB)
@@ -252,7 +260,10 @@ async def on_fetch(request, env):
     path   = request.url.split("?")[0]
 
     if path.endswith("/health"):
-        return _json({"ok": True, "ts": _now()})
+        return _json({
+            "ok": True, "ts": _now(), "imports": IMPORT_PROFILE.report(),
+            "deepseekBudget": llm.DEEPSEEK_BUDGET.as_stats(),
+        })
     if path.endswith("/api/report-job")     and method == "POST":
         return await handle_report_job(request, env)
     if path.endswith("/api/confirm-report") and method == "POST":
@@ -279,6 +290,11 @@ async def on_queue(batch, env):
       3. Auto-restore false positives / mark escalated
       4. Log audit event
     """
+    IMPORT_PROFILE.mark_request()
+    LOG.configure(getattr(env, "LOG_LEVEL", None), getattr(env, "LOG_JOB_SAMPLE", None))
+    LOG.start_run(datetime.now(timezone.utc).isoformat())
+    logs_before = LOG.stats.snapshot()
+    outcomes    = {"llm_analyzed": 0, "auto_restored": 0, "errors": 0}
     lf = LangfuseClient(env)
 
     for message in batch.messages:
@@ -286,16 +302,14 @@ async def on_queue(batch, env):
         if hasattr(raw, "to_py"):
             raw = raw.to_py()
         body = json.loads(raw) if isinstance(raw, str) else (raw if isinstance(raw, dict) else {})
-        print(f"[on_queue] body type={type(raw).__name__} keys={list(body.keys()) if body else None}")
         job_id   = body.get("jobId")
         snapshot = body.get("jobSnapshot", {})
+        LOG.job("debug", job_id, "queue message",
+                bodyType=type(raw).__name__, snapshotKeys=list(snapshot.keys()) if snapshot else None)
 
         try:
-            print(f"[on_queue] processing job_id={job_id} snapshot_keys={list(snapshot.keys()) if snapshot else None}")
             analysis = await llm.analyze_reported_job(env, snapshot, lf)
-            print(f"[on_queue] analysis done: action={analysis.get('action')} reason={analysis.get('reason')} conf={analysis.get('confidence')}")
             await db.save_analysis(env.DB, job_id, analysis)
-            print(f"[on_queue] save_analysis done")
 
             if analysis["action"] == "auto_restored":
                 await db.restore_job(env.DB, job_id)
@@ -316,20 +330,30 @@ async def on_queue(batch, env):
                                    "confidence": analysis["confidence"],
                                    "action":     analysis["action"],
                                    "trace_id":   analysis["trace_id"],
+                                   "usage":      analysis.get("usage"),
                                })
-            print(f"[on_queue] log_event done: {event}")
+            LOG.job("info", job_id, "analysis saved",
+                    event=event, action=analysis.get("action"), reason=analysis.get("reason"),
+                    confidence=analysis.get("confidence"))
+            outcomes[event] += 1
             message.ack()
 
         except Exception as exc:
             import traceback
-            print(f"[on_queue] ERROR job_id={job_id}: {exc}\n{traceback.format_exc()}")
+            LOG.job("error", job_id, "analysis failed", error=str(exc), traceback=traceback.format_exc())
+            outcomes["errors"] += 1
             try:
                 await db.log_event(env.DB, job_id, "llm_error",
                                    payload={"error": str(exc)[:400]})
             except Exception as log_exc:
-                print(f"[on_queue] log_event also failed: {log_exc}")
+                LOG.job("error", job_id, "llm_error audit event failed", error=str(log_exc))
             message.retry()
 
+    await llm.DEEPSEEK_BUDGET.flush()
+    LOG.summary("queue batch complete", messages=len(batch.messages), **outcomes,
+                **LOG.stats.since(logs_before).as_stats(),
+                deepseekBudget=llm.DEEPSEEK_BUDGET.as_stats())
+
 
 # ── Cron handler ───────────────────────────────────────────────────────────
 
@@ -341,6 +365,7 @@ async def on_scheduled(controller, env):
     2. Proactively scan recently classified EU-remote jobs from suspicious board
        tokens and auto-report them without waiting for a user report.
     """
+    IMPORT_PROFILE.mark_request()
     try:
         applied = await migrations.run(env.DB)
         if applied:
@@ -400,3 +425,7 @@ async def on_scheduled(controller, env):
         print(f"[cron:spam-scan] queued {queued} suspicious jobs for LLM review")
     except Exception as exc:
         print(f"[cron:spam-scan] error: {exc}")
+
+
+# Worker module fully loaded — stop timing imports.
+IMPORT_PROFILE.stop()
@@ -0,0 +1,114 @@
+"""Minimal chat prompt templates with pre-serialized request bodies.
+
+Replaces langchain's ChatPromptTemplate + ChatCloudflareWorkersAI on the
+Workers AI / DeepSeek hot path. A ``ChatPrompt`` is a list of
+``(role, template)`` pairs using ``str.format`` syntax (``{var}``, with
+``{{`` / ``}}`` for literal braces -- the same syntax the langchain
+templates used, so the prompt text is unchanged).
+
+Messages that need no per-call values (the system messages, once
+``partial()`` has bound any constants such as the skill vocabulary) are
+rendered and JSON-encoded once, when the prompt is built. Per call only
+the job-specific message is formatted and encoded; ``request_body()``
+splices it into the cached fragments, so the large static prompt is never
+re-serialized. The resulting JSON string goes straight to ``fetch`` or,
+via ``JSON.parse``, to ``env.AI.run``.
+
+Pure Python -- no js imports, so it can be unit-tested under CPython.
+"""
+
+import json
+from string import Formatter
+
+
+# langchain message types -> chat-completions roles
+_ROLES = {"system": "system", "human": "user", "user": "user", "ai": "assistant", "assistant": "assistant"}
+
+_FORMATTER = Formatter()
+
+
+def _fields(template: str) -> frozenset[str]:
+    """Top-level field names a ``str.format`` template references."""
+    return frozenset(
+        name.split(".")[0].split("[")[0]
+        for _, name, _, _ in _FORMATTER.parse(template)
+        if name
+    )
+
+
+class ChatPrompt:
+    """Ordered chat messages; static ones are pre-rendered and pre-encoded."""
+
+    __slots__ = ("messages", "bound", "_static", "_fields")
+
+    def __init__(self, messages: list[tuple[str, str]], bound: dict | None = None):
+        self.messages = [(_ROLES.get(role, role), template) for role, template in messages]
+        self.bound    = dict(bound or {})
+        # Per message: (role, template, None) when it still needs values at
+        # call time, or (role, content, encoded_json) when fully static.
+        self._static  = []
+        self._fields  = set()
+        for role, template in self.messages:
+            names = _fields(template) - self.bound.keys()
+            if names:
+                self._fields |= names
+                self._static.append((role, template, None))
+            else:
+                content = template.format(**self.bound)
+                message = {"role": role, "content": content}
+                self._static.append((role, content, json.dumps(message)))
+
+    @classmethod
+    def from_messages(cls, messages: list[tuple[str, str]]) -> "ChatPrompt":
+        return cls(messages)
+
+    @property
+    def input_variables(self) -> list[str]:
+        """Values ``format_messages()`` / ``request_body()`` still need."""
+        return sorted(self._fields)
+
+    def partial(self, **values) -> "ChatPrompt":
+        """A copy with ``values`` bound now (their messages become static)."""
+        return ChatPrompt(self.messages, {**self.bound, **values})
+
+    def format_messages(self, **values) -> list[dict]:
+        """Chat-completions messages (``[{"role", "content"}]``) for one call."""
+        values = {**self.bound, **values}
+        return [
+            {"role": role, "content": text if encoded is not None else text.format(**values)}
+            for role, text, encoded in self._static
+        ]
+
+    def request_body(self, values: dict, **fields) -> str:
+        """JSON request body: ``fields`` (model, temperature, ...) plus the messages.
+
+        Only the messages that depend on ``values`` are encoded here; the
+        static ones are spliced in from the strings cached at build time.
+        """
+        values = {**self.bound, **values}
+        parts  = [
+            encoded if encoded is not None
+            else json.dumps({"role": role, "content": text.format(**values)})
+            for role, text, encoded in self._static
+        ]
+        head = json.dumps(fields)[1:-1]
+        return "{" + head + (", " if head else "") + '"messages": [' + ", ".join(parts) + "]}"
+
+
+def response_text(result) -> str | None:
+    """Answer text of a non-streamed chat response (Workers AI or OpenAI shape).
+
+    Workers AI's native models return ``{"response": ...}`` -- already parsed
+    into an object when the model emitted bare JSON; the OpenAI-compatible
+    ones (Qwen3) and DeepSeek return ``choices[0].message.content``.
+    """
+    if not isinstance(result, dict):
+        return None
+    response = result.get("response")
+    if isinstance(response, (dict, list)):
+        return json.dumps(response)
+    if isinstance(response, str) and response.strip():
+        return response
+    choices = result.get("choices") or [{}]
+    content = (choices[0].get("message") or {}).get("content")
+    return content if isinstance(content, str) and content.strip() else None
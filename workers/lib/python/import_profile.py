@@ -0,0 +1,88 @@
+"""Import-time profile of the worker's main module.
+
+A cold isolate pays for every module the main module imports before the
+first request is served. ``IMPORT_PROFILE.start()`` (its first statement)
+wraps ``builtins.__import__`` so each module's first import is timed --
+inclusive of its own imports, and self time with them subtracted;
+``stop()`` (its last statement) unhooks it and fixes the module
+init time. ``mark_request()`` runs at the top of every handler and records
+how long after init started the first request arrived.
+
+``report()`` is what ``GET /health`` returns under ``imports``;
+``scripts/profile-worker-imports.py`` in the repo root prints the same
+numbers under CPython. In the Workers runtime the clock only advances
+across I/O, so the in-isolate numbers are coarse -- use the script for the
+per-module breakdown. Pure Python.
+"""
+
+import builtins
+import sys
+import time
+
+
+class ImportProfiler:
+    """Times first imports of modules while installed."""
+
+    __slots__ = ("started", "finished", "first_request", "modules", "_stack", "_original")
+
+    def __init__(self):
+        self.started       = None
+        self.finished      = None
+        self.first_request = None
+        self.modules: dict[str, tuple[float, float]] = {}  # name -> (inclusive s, self s)
+        self._stack:  list[float] = []
+        self._original = None
+
+    def start(self) -> None:
+        if self._original is not None:
+            return
+        self.started   = time.perf_counter()
+        self._original = builtins.__import__
+        builtins.__import__ = self._import
+
+    def stop(self) -> None:
+        if self._original is None:
+            return
+        builtins.__import__ = self._original
+        self._original = None
+        self.finished  = time.perf_counter()
+
+    def mark_request(self) -> None:
+        if self.first_request is None:
+            self.first_request = time.perf_counter()
+
+    def _import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        original = self._original or builtins.__import__
+        if level or name in sys.modules:
+            return original(name, globals, locals, fromlist, level)
+        self._stack.append(0.0)
+        t0 = time.perf_counter()
+        try:
+            return original(name, globals, locals, fromlist, level)
+        finally:
+            elapsed  = time.perf_counter() - t0
+            children = self._stack.pop()
+            if self._stack:
+                self._stack[-1] += elapsed
+            self.modules.setdefault(name, (elapsed, elapsed - children))
+
+    def report(self, top: int = 15) -> dict:
+        """camelCase summary: init / first-request ms and the slowest imports."""
+        def ms(seconds):
+            return round(seconds * 1000, 2) if seconds is not None else None
+
+        started = self.started
+        slowest = sorted(self.modules.items(), key=lambda kv: kv[1][0], reverse=True)[:top]
+        return {
+            "initMs":         ms(self.finished - started) if started and self.finished else None,
+            "firstRequestMs": ms(self.first_request - started) if started and self.first_request else None,
+            "moduleCount":    len(self.modules),
+            "modules": [
+                {"module": name, "ms": ms(total), "selfMs": ms(own)}
+                for name, (total, own) in slowest
+            ],
+        }
+
+
+# One profile per isolate — the main module's imports run once.
+IMPORT_PROFILE = ImportProfiler()
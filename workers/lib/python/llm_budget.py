@@ -0,0 +1,322 @@
+"""Shared DeepSeek rate limit and daily spend budget.
+
+Every isolate used to call DeepSeek on its own, with only ``fetch_json``'s
+local backoff between them: parallel queue consumers hit 429s together and
+nothing capped a day's spend. ``DEEPSEEK_BUDGET`` puts every DeepSeek call
+behind two D1 counters shared by all workers:
+
+  llm_rate_windows   -- requests per provider per minute. An isolate leases
+                        ``LEASE_SIZE`` requests with one atomic upsert and
+                        spends them from its in-isolate cache; a lease that
+                        would exceed ``DEEPSEEK_RPM`` is refused
+  llm_budget_ledger  -- requests / tokens / estimated USD per provider per
+                        UTC day. ``record()`` adds each response's usage
+                        locally; the deltas are written with the next lease
+                        or ``flush()``. A response without a ``usage`` block
+                        (a stream cut short) is estimated from the prompt and
+                        completion length at ``CHARS_PER_TOKEN``
+
+``acquire()`` returns False once the day's ``DEEPSEEK_DAILY_TOKENS`` or
+``DEEPSEEK_DAILY_USD`` cap is spent (0 = no cap), or when the minute's
+requests are still used up after waiting for the next window (up to a
+minute -- request-path callers pass ``wait=False`` to fail fast). Callers
+treat False like a missing API key, so every tier degrades to accepting the
+Workers AI answer until the budget resets.
+
+The ledger is re-read at most every ``LEDGER_REFRESH_S``, so concurrent
+isolates can overshoot a cap by what they spend in that interval; unused
+leased requests lapse with their minute. Any D1 error fails open -- a
+missing table must never stop the pipeline. The worker binds its query
+and sleep functions with ``bind()``. Pure Python.
+"""
+
+import time
+from dataclasses import dataclass, fields
+from datetime import datetime, timezone
+
+
+DEFAULT_RPM       = 120     # requests per minute across every worker
+LEASE_SIZE        = 5       # requests taken from the shared window per D1 round trip
+LEDGER_REFRESH_S  = 60      # how stale the cached day totals may get
+WINDOW_S          = 60
+WINDOW_RETENTION  = 60      # rate windows (minutes) kept before pruning
+CHARS_PER_TOKEN   = 4       # estimate for responses without a usage block
+
+# USD per 1M tokens (deepseek-chat list prices, as in llm_usage.py) — estimates only.
+PRICE_PER_MILLION = {
+    "cache_hit":  0.028,
+    "cache_miss": 0.28,
+    "completion": 0.42,
+}
+
+
+LEASE_SQL = """
+INSERT INTO llm_rate_windows (provider, window_start, requests)
+VALUES (?, ?, ?)
+ON CONFLICT (provider, window_start) DO UPDATE
+   SET requests = llm_rate_windows.requests + excluded.requests
+ WHERE llm_rate_windows.requests + excluded.requests <= ?
+RETURNING requests
+"""
+
+LEDGER_SQL = """
+SELECT requests, tokens, cost_usd
+FROM llm_budget_ledger
+WHERE provider = ? AND day = ?
+"""
+
+SPEND_SQL = """
+INSERT INTO llm_budget_ledger (provider, day, requests, tokens, cost_usd, updated_at)
+VALUES (?, ?, ?, ?, ?, datetime('now'))
+ON CONFLICT (provider, day) DO UPDATE
+   SET requests   = llm_budget_ledger.requests + excluded.requests,
+       tokens     = llm_budget_ledger.tokens   + excluded.tokens,
+       cost_usd   = llm_budget_ledger.cost_usd + excluded.cost_usd,
+       updated_at = excluded.updated_at
+"""
+
+PRUNE_SQL = "DELETE FROM llm_rate_windows WHERE provider = ? AND window_start < ?"
+
+
+@dataclass(slots=True)
+class Spend:
+    """Requests, tokens and estimated cost over a set of DeepSeek responses."""
+    requests: int   = 0
+    tokens:   int   = 0
+    cost_usd: float = 0.0
+
+    def __add__(self, other: "Spend") -> "Spend":
+        return Spend(*(getattr(self, f.name) + getattr(other, f.name) for f in fields(self)))
+
+    def __bool__(self) -> bool:
+        return bool(self.requests or self.tokens)
+
+
+def usage_spend(usage: dict | None) -> Spend:
+    """Spend of one response's ``usage`` block (cache fields optional)."""
+    usage = usage or {}
+    hit   = usage.get("prompt_cache_hit_tokens")
+    miss  = usage.get("prompt_cache_miss_tokens")
+    if hit is None and miss is None:
+        hit, miss = 0, usage.get("prompt_tokens")
+    hit, miss  = int(hit or 0), int(miss or 0)
+    completion = int(usage.get("completion_tokens") or 0)
+    cost = (
+        hit          * PRICE_PER_MILLION["cache_hit"]
+        + miss       * PRICE_PER_MILLION["cache_miss"]
+        + completion * PRICE_PER_MILLION["completion"]
+    ) / 1_000_000
+    return Spend(1, hit + miss + completion, cost)
+
+
+def estimated_spend(prompt_chars: int, completion_chars: int) -> Spend:
+    """Spend of one response without usage, from its text lengths (prompt as cache misses)."""
+    return usage_spend({
+        "prompt_tokens":     -(-max(0, prompt_chars) // CHARS_PER_TOKEN),
+        "completion_tokens": -(-max(0, completion_chars) // CHARS_PER_TOKEN),
+    })
+
+
+def _parse_number(value, default, cast):
+    try:
+        return max(0, cast(value)) if value not in (None, "") else default
+    except (TypeError, ValueError):
+        return default
+
+
+class BudgetLimiter:
+    """Per-isolate view of one provider's shared rate window and daily ledger."""
+
+    __slots__ = (
+        "provider", "rpm", "daily_tokens", "daily_usd",
+        "permits", "leases", "rate_waits", "rate_denied", "budget_denied", "estimated", "errors",
+        "_clock", "_query", "_sleep", "_configured_from",
+        "_window", "_leased", "_day", "_ledger", "_ledger_at", "_pending",
+    )
+
+    def __init__(self, provider: str, clock=time.time):
+        self.provider      = provider
+        self.rpm           = DEFAULT_RPM
+        self.daily_tokens  = 0
+        self.daily_usd     = 0.0
+        self.permits       = 0
+        self.leases        = 0
+        self.rate_waits    = 0
+        self.rate_denied   = 0
+        self.budget_denied = 0
+        self.estimated     = 0
+        self.errors        = 0
+        self._clock        = clock
+        self._query        = None
+        self._sleep        = None
+        self._configured_from = None
+        self._window       = None
+        self._leased       = 0
+        self._day          = None
+        self._ledger       = Spend()
+        self._ledger_at    = None
+        self._pending      = Spend()
+
+    def configure(self, rpm=None, daily_tokens=None, daily_usd=None) -> None:
+        """Apply ``DEEPSEEK_RPM`` / ``DEEPSEEK_DAILY_TOKENS`` / ``DEEPSEEK_DAILY_USD`` env values."""
+        key = (rpm, daily_tokens, daily_usd)
+        if key == self._configured_from:
+            return
+        self._configured_from = key
+        self.rpm          = _parse_number(rpm, DEFAULT_RPM, int) or DEFAULT_RPM
+        self.daily_tokens = _parse_number(daily_tokens, 0, int)
+        self.daily_usd    = _parse_number(daily_usd, 0.0, float)
+
+    def bind(self, query, sleep) -> None:
+        """``query(sql, params) -> rows`` and ``sleep(seconds)``, both async."""
+        self._query = query
+        self._sleep = sleep
+
+    # -- permits --------------------------------------------------------------
+
+    async def acquire(self, wait: bool = True) -> bool:
+        """Permit for one DeepSeek request; False means fall back to Workers AI.
+
+        With ``wait=False`` a full window is refused at once instead of
+        sleeping until the next one.
+        """
+        now = self._clock()
+        await self._refresh_ledger(now)
+        if self.exhausted():
+            self.budget_denied += 1
+            return False
+        if self._take(now):
+            return True
+        if self._query is None:
+            self.permits += 1       # unbound: no shared limit to enforce
+            return True
+        if await self._lease(now):
+            return self._take(now)
+        if not wait:
+            self.rate_denied += 1
+            return False
+        # Window full — wait once for the next minute, then give up
+        self.rate_waits += 1
+        await self._sleep(WINDOW_S - now % WINDOW_S)
+        now = self._clock()
+        if await self._lease(now):
+            return self._take(now)
+        self.rate_denied += 1
+        return False
+
+    def exhausted(self) -> bool:
+        """Whether today's token or cost cap is spent, as far as this isolate knows."""
+        spent = self._ledger + self._pending
+        return bool(
+            (self.daily_tokens and spent.tokens >= self.daily_tokens)
+            or (self.daily_usd and spent.cost_usd >= self.daily_usd)
+        )
+
+    def record(self, usage: dict | None, prompt_chars: int = 0, completion_chars: int = 0) -> None:
+        """Add one response's spend to the day's total.
+
+        ``usage`` is the response's usage block; without token counts in it
+        the spend is estimated from ``prompt_chars`` / ``completion_chars``.
+        """
+        spend = usage_spend(usage)
+        if not spend.tokens and (prompt_chars or completion_chars):
+            spend = estimated_spend(prompt_chars, completion_chars)
+            self.estimated += 1
+        self._pending = self._pending + spend
+
+    async def flush(self) -> None:
+        """Write pending spend to the ledger and prune old rate windows (fails open)."""
+        if self._query is None:
+            return
+        now = self._clock()
+        await self._write_spend(now)
+        try:
+            await self._query(PRUNE_SQL, [self.provider, int(now // WINDOW_S) - WINDOW_RETENTION])
+        except Exception:
+            self.errors += 1
+
+    def as_stats(self) -> dict:
+        spent = self._ledger + self._pending
+        return {
+            "permits":      self.permits,
+            "leases":       self.leases,
+            "rateWaits":    self.rate_waits,
+            "rateDenied":   self.rate_denied,
+            "budgetDenied": self.budget_denied,
+            "estimated":    self.estimated,
+            "errors":       self.errors,
+            "rpm":          self.rpm,
+            "dailyTokens":  self.daily_tokens,
+            "dailyUsd":     self.daily_usd,
+            "tokensToday":  spent.tokens,
+            "costTodayUsd": round(spent.cost_usd, 4),
+            "exhausted":    self.exhausted(),
+        }
+
+    # -- internals ------------------------------------------------------------
+
+    def _take(self, now: float) -> bool:
+        if self._leased <= 0 or self._window != int(now // WINDOW_S):
+            return False
+        self._leased  -= 1
+        self.permits  += 1
+        return True
+
+    def _day_of(self, now: float) -> str:
+        return datetime.fromtimestamp(now, tz=timezone.utc).strftime("%Y-%m-%d")
+
+    async def _refresh_ledger(self, now: float) -> None:
+        day = self._day_of(now)
+        if day != self._day:
+            # New UTC day: yesterday's unwritten spend still belongs to yesterday
+            await self._write_spend(now, self._day)
+            self._day, self._ledger, self._ledger_at = day, Spend(), None
+        if self._query is None:
+            return
+        if self._ledger_at is not None and now - self._ledger_at < LEDGER_REFRESH_S:
+            return
+        self._ledger_at = now
+        try:
+            rows = await self._query(LEDGER_SQL, [self.provider, day])
+        except Exception:
+            self.errors += 1
+            return
+        row = rows[0] if rows else {}
+        self._ledger = Spend(
+            int(row.get("requests") or 0), int(row.get("tokens") or 0), float(row.get("cost_usd") or 0.0),
+        )
+
+    async def _write_spend(self, now: float, day: str | None = None) -> None:
+        if not self._pending or self._query is None:
+            return
+        day     = day or self._day_of(now)
+        pending = self._pending
+        try:
+            await self._query(SPEND_SQL, [self.provider, day, pending.requests, pending.tokens, pending.cost_usd])
+        except Exception:
+            self.errors += 1
+            return
+        self._pending = Spend()
+        if day == self._day:
+            self._ledger = self._ledger + pending
+
+    async def _lease(self, now: float) -> bool:
+        """Reserve up to ``LEASE_SIZE`` requests of the current window; False when it is full."""
+        await self._write_spend(now)
+        window = int(now // WINDOW_S)
+        size   = min(LEASE_SIZE, self.rpm)
+        try:
+            rows = await self._query(LEASE_SQL, [self.provider, window, size, self.rpm])
+        except Exception:
+            self.errors  += 1
+            self._window, self._leased = window, size   # fail open
+            return True
+        if not rows:
+            return False
+        self.leases += 1
+        self._window, self._leased = window, size
+        return True
+
+
+# One limiter per isolate — shared by every request the isolate serves.
+DEEPSEEK_BUDGET = BudgetLimiter("deepseek")
@@ -1,10 +1,16 @@
 /**
- * Tail Worker — Centralized Error Logging
+ * Tail Worker — Centralized Error Logging + Trace Summaries
  *
  * Attached to all producer workers via [[tail_consumers]] in their wrangler configs.
  * Receives every log event and exception from all workers, filters for errors,
  * and re-emits them as structured logs visible in Workers Logs / `wrangler tail`.
  *
+ * The Python workers (process-jobs, eu-classifier) export trace spans as JSON log
+ * lines (`{"type": "spans"}` chunks and a closing `{"type": "trace"}` totals record,
+ * see their src/tracing.py). Those are folded into one `trace-summary` record per
+ * trace and invocation: time per span kind (d1 / fetch / ai / service / phase) and
+ * the slowest spans, keyed by the traceId shared across the service-binding hops.
+ *
  * @see https://developers.cloudflare.com/workers/observability/logs/tail-workers/
  */
 
@@ -35,12 +41,39 @@ interface ErrorEntry {
   context?: string;
 }
 
+interface SpanRecord {
+  id: string;
+  parent: string | null;
+  name: string;
+  kind: string;
+  startMs: number;
+  ms: number;
+  status: string;
+  attrs?: Record<string, unknown>;
+}
+
+interface TraceSummary {
+  parent: string | null;
+  spanCount: number;
+  errorSpans: number;
+  ms?: number;
+  kinds: Record<string, { count: number; ms: number; errors: number }>;
+  slowest: SpanRecord[];
+}
+
+const SLOWEST_SPANS = 10;
+
 function parseStructuredLog(message: readonly unknown[]): {
   level?: string;
   error?: string;
   worker?: string;
   action?: string;
   traceId?: string;
+  type?: string;
+  parent?: string | null;
+  spans?: SpanRecord[];
+  ms?: number;
+  kinds?: TraceSummary["kinds"];
 } | null {
   if (message.length === 0) return null;
   const first = message[0];
@@ -57,11 +90,76 @@ function parseStructuredLog(message: readonly unknown[]): {
   return null;
 }
 
+function collectTraces(event: TailEvent): Map<string, TraceSummary> {
+  const traces = new Map<string, TraceSummary>();
+
+  for (const logEntry of event.logs) {
+    const structured = parseStructuredLog(logEntry.message);
+    if (!structured?.traceId) continue;
+    if (structured.type !== "spans" && structured.type !== "trace") continue;
+
+    let trace = traces.get(structured.traceId);
+    if (!trace) {
+      trace = {
+        parent: structured.parent ?? null,
+        spanCount: 0,
+        errorSpans: 0,
+        kinds: {},
+        slowest: [],
+      };
+      traces.set(structured.traceId, trace);
+    }
+
+    if (structured.type === "trace") {
+      // Closing totals record — authoritative per-kind totals for the trace
+      trace.ms = structured.ms;
+      trace.kinds = structured.kinds ?? trace.kinds;
+      continue;
+    }
+
+    for (const span of structured.spans ?? []) {
+      trace.spanCount += 1;
+      if (span.status === "error") trace.errorSpans += 1;
+      const kind = (trace.kinds[span.kind] ??= { count: 0, ms: 0, errors: 0 });
+      kind.count += 1;
+      kind.ms += span.ms;
+      if (span.status === "error") kind.errors += 1;
+      trace.slowest.push(span);
+    }
+    trace.slowest.sort((a, b) => b.ms - a.ms);
+    trace.slowest.length = Math.min(trace.slowest.length, SLOWEST_SPANS);
+  }
+
+  return traces;
+}
+
+function roundKinds(kinds: TraceSummary["kinds"]): TraceSummary["kinds"] {
+  return Object.fromEntries(
+    Object.entries(kinds).map(([kind, k]) => [kind, { ...k, ms: Math.round(k.ms * 100) / 100 }])
+  );
+}
+
 export default {
   async tail(events: TailEvent[]): Promise<void> {
     for (const event of events) {
       const errors: ErrorEntry[] = [];
 
+      // Fold exported spans into one summary per trace
+      for (const [traceId, trace] of collectTraces(event)) {
+        console.log(
+          JSON.stringify({
+            worker: "observability-tail",
+            action: "trace-summary",
+            level: trace.errorSpans > 0 ? "warn" : "info",
+            source: event.scriptName,
+            traceId,
+            ...trace,
+            kinds: roundKinds(trace.kinds),
+            timestamp: new Date().toISOString(),
+          })
+        );
+      }
+
       // Collect uncaught exceptions
       for (const ex of event.exceptions) {
         errors.push({
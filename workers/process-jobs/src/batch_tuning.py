@@ -0,0 +1,262 @@
+"""Adaptive batch sizing for the process-jobs pipeline.
+
+Replaces the hard-coded per-phase limits in the cron / queue handlers with a
+small controller that reads the last few run records from ``pipeline_runs``
+and picks each phase's next batch size:
+
+  - throughput bound : jobs/sec observed for the phase × its share of the
+                       wall-clock budget
+  - subrequest bound : subrequest budget ÷ paid-tier calls per job
+                       (derived from the tier mix of recent runs)
+  - growth bound     : at most 2× the last limit, and only when the last
+                       run actually consumed its whole limit
+  - error backoff    : halve the last limit when the error rate spikes
+  - backlog throttle : shrink an upstream phase when the phase it feeds
+                       already has more waiting jobs than it can drain
+
+Every decision carries human-readable reasons that are stored in the run
+record next to the chosen sizes.
+
+Pure Python (no js / workers imports) so it can be unit-tested under CPython.
+"""
+
+from dataclasses import dataclass, field
+
+
+# ---------------------------------------------------------------------------
+# Phase configuration
+# ---------------------------------------------------------------------------
+
+@dataclass(frozen=True)
+class PhaseBounds:
+    """Hard limits for a phase's batch size."""
+    minimum: int
+    maximum: int
+    default: int
+
+
+# Defaults match the limits the cron used before the controller existed.
+PHASE_BOUNDS: dict[str, PhaseBounds] = {
+    "enhance":        PhaseBounds(minimum=5,  maximum=50,   default=25),
+    "tag":            PhaseBounds(minimum=10, maximum=1000, default=100),
+    "backfill_roles": PhaseBounds(minimum=10, maximum=200,  default=50),
+    "classify":       PhaseBounds(minimum=10, maximum=1000, default=100),
+    "extract":        PhaseBounds(minimum=10, maximum=500,  default=100),
+}
+
+# Fraction of the wall-clock budget each phase may spend.
+WALL_CLOCK_SHARE: dict[str, float] = {
+    "enhance":        0.10,
+    "tag":            0.30,
+    "backfill_roles": 0.10,
+    "classify":       0.30,
+    "extract":        0.20,
+}
+
+# Downstream phase → (job status it drains, upstream phase that feeds it).
+# When the status backlog exceeds the threshold, the upstream phase is throttled.
+BACKLOG_EDGES: dict[str, tuple[str, str]] = {
+    "tag":      ("enhanced",   "enhance"),
+    "classify": ("role-match", "tag"),
+}
+
+DEFAULT_SUBREQUEST_BUDGET = 50      # CF Workers subrequests per invocation
+DEFAULT_WALL_CLOCK_BUDGET_S = 900   # cron invocations get ~15 min wall clock
+DEFAULT_BACKLOG_THRESHOLD = 500     # waiting jobs before upstream is throttled
+HISTORY_RUNS = 6                    # recent run records considered per phase
+ERROR_RATE_BACKOFF = 0.2            # error share that triggers a halving
+
+# Tier counters that map to one external call (subrequest) per job.
+PAID_TIER_KEYS = ("workersAI", "deepseek")
+
+
+# ---------------------------------------------------------------------------
+# Metrics
+# ---------------------------------------------------------------------------
+
+def phase_metrics(phase: str, limit: int, stats: dict, elapsed_s: float) -> dict:
+    """Normalise a phase's stats dict into the compact record stored per run.
+
+    The phases report different counter names (``enhanced`` for Phase 1,
+    ``processed`` for the rest); this flattens them into one shape.
+    """
+    processed = stats.get("processed", stats.get("enhanced", 0)) or 0
+    errors    = stats.get("errors", 0) or 0
+    tiers     = {k: stats.get(k, 0) or 0 for k in ("heuristic", *PAID_TIER_KEYS) if k in stats}
+    return {
+        "limit":     int(limit),
+        "processed": int(processed),
+        "errors":    int(errors),
+        "elapsed_s": round(max(0.0, float(elapsed_s)), 3),
+        "hit_limit": processed + errors >= limit,
+        "tiers":     tiers,
+    }
+
+
+def phase_history(run_phases: list[dict], phase: str) -> list[dict]:
+    """Collect a phase's metrics from run records (newest first).
+
+    Phases whose limit a caller capped are skipped: their size says nothing
+    about what the plan would have run.
+    """
+    return [
+        p[phase] for p in run_phases
+        if isinstance(p, dict) and isinstance(p.get(phase), dict) and not p[phase].get("capped")
+    ]
+
+
+# ---------------------------------------------------------------------------
+# Controller
+# ---------------------------------------------------------------------------
+
+@dataclass
+class PhasePlan:
+    """Chosen batch size for one phase plus the reasons that produced it."""
+    limit:   int
+    reasons: list[str] = field(default_factory=list)
+    capped:  bool = False      # lowered to a caller's explicit limit
+
+
+@dataclass
+class BatchPlan:
+    """Per-phase batch sizes for a single pipeline run."""
+    phases: dict[str, PhasePlan] = field(default_factory=dict)
+
+    def limit(self, phase: str) -> int:
+        plan = self.phases.get(phase)
+        return plan.limit if plan else PHASE_BOUNDS[phase].default
+
+    @classmethod
+    def fixed(cls, limit: int, reason: str) -> "BatchPlan":
+        """Every phase at ``limit`` — e.g. a push run over an explicit id set."""
+        return cls({name: PhasePlan(limit, [reason]) for name in PHASE_BOUNDS})
+
+    def cap(self, ceiling: int) -> "BatchPlan":
+        """Return a copy with every limit capped at ``ceiling`` (e.g. a queue message limit)."""
+        capped = BatchPlan()
+        for name, plan in self.phases.items():
+            if plan.limit > ceiling:
+                capped.phases[name] = PhasePlan(
+                    ceiling, plan.reasons + [f"capped at caller limit {ceiling}"], capped=True,
+                )
+            else:
+                capped.phases[name] = plan
+        return capped
+
+    def to_record(self) -> dict:
+        return {
+            name: {"limit": p.limit, "reasons": p.reasons, **({"capped": True} if p.capped else {})}
+            for name, p in self.phases.items()
+        }
+
+
+def clamp_limit(phase: str, requested: int) -> int:
+    """Clamp a caller-supplied limit into the phase's hard bounds."""
+    bounds = PHASE_BOUNDS[phase]
+    return max(1, min(bounds.maximum, int(requested)))
+
+
+def plan_phase(
+    phase: str,
+    history: list[dict],
+    *,
+    subrequest_budget: int = DEFAULT_SUBREQUEST_BUDGET,
+    wall_clock_budget_s: float = DEFAULT_WALL_CLOCK_BUDGET_S,
+) -> PhasePlan:
+    """Pick the next batch size for ``phase`` from its recent metrics."""
+    bounds = PHASE_BOUNDS[phase]
+    if not history:
+        return PhasePlan(bounds.default, ["no run history — using default"])
+
+    last      = history[0]
+    last_lim  = max(bounds.minimum, int(last.get("limit") or bounds.default))
+    processed = sum(h.get("processed", 0) for h in history)
+    errors    = sum(h.get("errors", 0) for h in history)
+    elapsed   = sum(h.get("elapsed_s", 0.0) for h in history)
+    reasons: list[str] = []
+
+    candidates: list[tuple[int, str]] = []
+
+    # Throughput bound
+    if processed and elapsed > 0:
+        rate   = processed / elapsed
+        budget = wall_clock_budget_s * WALL_CLOCK_SHARE.get(phase, 0.2)
+        candidates.append((int(rate * budget), f"throughput {rate:.2f} jobs/s × {budget:.0f}s budget"))
+
+    # Subrequest bound — paid-tier calls per processed job
+    paid = sum(h.get("tiers", {}).get(k, 0) for h in history for k in PAID_TIER_KEYS)
+    if processed and paid:
+        per_job = paid / processed
+        candidates.append((int(subrequest_budget / per_job), f"{per_job:.2f} subrequests/job vs budget {subrequest_budget}"))
+
+    # Growth bound — only grow when the last run used its whole limit
+    if last.get("hit_limit"):
+        candidates.append((last_lim * 2, f"last run hit its limit ({last_lim}) — allow 2× growth"))
+    else:
+        candidates.append((max(last_lim, last.get("processed", 0)), f"last run drained its queue below limit {last_lim}"))
+
+    # Error backoff
+    attempted = processed + errors
+    if attempted and errors / attempted > ERROR_RATE_BACKOFF:
+        candidates.append((last_lim // 2, f"error rate {errors / attempted:.0%} — halving"))
+
+    limit, reason = min(candidates, key=lambda c: c[0])
+    reasons.append(reason)
+
+    if limit < bounds.minimum:
+        limit = bounds.minimum
+        reasons.append(f"raised to phase minimum {bounds.minimum}")
+    elif limit > bounds.maximum:
+        limit = bounds.maximum
+        reasons.append(f"lowered to phase maximum {bounds.maximum}")
+
+    return PhasePlan(limit, reasons)
+
+
+def apply_backlog_throttle(
+    plan: BatchPlan,
+    backlog: dict[str, int],
+    threshold: int = DEFAULT_BACKLOG_THRESHOLD,
+) -> BatchPlan:
+    """Throttle upstream phases whose downstream backlog exceeds ``threshold``.
+
+    The upstream phase is cut to the minimum when the backlog is at least
+    twice the threshold, otherwise halved — downstream must drain first.
+    """
+    for downstream, (status, upstream) in BACKLOG_EDGES.items():
+        waiting = backlog.get(status, 0)
+        if waiting <= threshold or upstream not in plan.phases:
+            continue
+        up     = plan.phases[upstream]
+        bounds = PHASE_BOUNDS[upstream]
+        target = bounds.minimum if waiting >= 2 * threshold else max(bounds.minimum, up.limit // 2)
+        if target < up.limit:
+            up.limit = target
+            up.reasons.append(
+                f"throttled: {waiting} '{status}' jobs waiting for {downstream} (threshold {threshold})"
+            )
+    return plan
+
+
+def plan_batch_sizes(
+    run_phases: list[dict],
+    backlog: dict[str, int],
+    *,
+    subrequest_budget: int = DEFAULT_SUBREQUEST_BUDGET,
+    wall_clock_budget_s: float = DEFAULT_WALL_CLOCK_BUDGET_S,
+    backlog_threshold: int = DEFAULT_BACKLOG_THRESHOLD,
+) -> BatchPlan:
+    """Build the batch plan for every phase from recent run records and backlog counts.
+
+    ``run_phases`` is a newest-first list of the ``phases`` JSON stored in
+    ``pipeline_runs``; ``backlog`` maps job status → waiting job count.
+    """
+    plan = BatchPlan()
+    for phase in PHASE_BOUNDS:
+        plan.phases[phase] = plan_phase(
+            phase,
+            phase_history(run_phases, phase),
+            subrequest_budget=subrequest_budget,
+            wall_clock_budget_s=wall_clock_budget_s,
+        )
+    return apply_backlog_throttle(plan, backlog, backlog_threshold)
@@ -0,0 +1,126 @@
+"""Per-company boilerplate detection for LLM and heuristic inputs.
+
+Every posting from a company repeats the same "About us", benefits and EEO
+paragraphs. They took a large share of the 6,000-char prompt windows in role
+tagging and skill extraction, and gave the keyword heuristic text to match
+that says nothing about the role. Each ``company_key`` gets a model of the
+paragraphs it repeats:
+
+  blocks()   -- the description split into paragraphs / list items (block
+                tags, line breaks), tag-stripped and unescaped
+  learn()    -- word ``SHINGLE``-grams of each block, hashed with crc32; a
+                shingle belongs to the model when it occurs in at least
+                ``MIN_SHARE`` of the company's postings (and ``MIN_REPEATS``
+                of them). One posting per duplicate cluster is sampled, so a
+                job posted once per city doesn't count as boilerplate
+  strip()    -- drops blocks of at least ``MIN_BLOCK_WORDS`` words when
+                ``MATCH_SHARE`` of their shingles are in the model. When
+                nothing is removed, or less than ``MIN_KEEP_CHARS`` would
+                remain, the description is returned unchanged
+
+Both take a ``keep(block) -> bool`` predicate. Blocks it accepts are never
+stripped and don't feed the model, so a repeated "Our stack: Python, React"
+paragraph still reaches the skill and role prompts. The caller passes one
+that matches skill tags and role keywords.
+
+Models are stored in D1 (``company_boilerplate``), with the shingle set
+packed as sorted big-endian uint32 in base64 (``encode()`` / ``decode()``).
+Only the text handed to prompts and heuristics is stripped. The stored
+description is left intact. Pure Python.
+"""
+
+import base64
+import html
+import math
+import re
+import struct
+import zlib
+
+
+SHINGLE         = 4        # words per shingle
+MIN_POSTINGS    = 4        # distinct postings (dup clusters) before a model is learned
+SAMPLE_POSTINGS = 40       # newest postings sampled per company
+MIN_SHARE       = 0.6      # of the sampled postings a shingle must occur in
+MIN_REPEATS     = 3
+MAX_SHINGLES    = 5000     # most frequent shingles kept per company (~27 KB encoded)
+MIN_BLOCK_WORDS = 5        # shorter blocks (headings, one-word bullets) are always kept
+MATCH_SHARE     = 0.8
+MIN_KEEP_CHARS  = 200
+REFRESH_DAYS    = 7
+
+BOILERPLATE_BATCH = 5      # company models (re)learned per run
+
+_BLOCK_RE = re.compile(
+    r"<\s*/?\s*(?:p|div|li|ul|ol|h[1-6]|tr|table|section|blockquote)\b[^>]*>|<\s*br\s*/?\s*>", re.I
+)
+_TAG_RE   = re.compile(r"<[^>]+>")
+_WORD_RE  = re.compile(r"[a-z]+")    # digits dropped: dates and headcounts drift between postings
+
+
+def blocks(description: str | None) -> list[str]:
+    """Non-empty paragraphs / list items of a description, as whitespace-collapsed plain text."""
+    text = description or ""
+    if "&lt;" in text:          # Greenhouse sends escaped HTML
+        text = html.unescape(text)
+    text = html.unescape(_TAG_RE.sub(" ", _BLOCK_RE.sub("\n", text)))
+    return [" ".join(line.split()) for line in text.splitlines() if line.strip()]
+
+
+def block_shingles(block: str) -> set[int]:
+    words = _WORD_RE.findall(block.lower())
+    if len(words) < SHINGLE:
+        return {zlib.crc32(" ".join(words).encode())} if words else set()
+    return {zlib.crc32(" ".join(words[i:i + SHINGLE]).encode()) for i in range(len(words) - SHINGLE + 1)}
+
+
+def posting_shingles(description: str | None, keep=None) -> set[int]:
+    return set().union(*(block_shingles(b) for b in blocks(description) if not (keep and keep(b))))
+
+
+def learn(descriptions: list[str | None], keep=None) -> frozenset[int] | None:
+    """Shingles repeated across a company's postings, or None with too few postings."""
+    postings = [s for s in (posting_shingles(d, keep) for d in descriptions) if s]
+    if len(postings) < MIN_POSTINGS:
+        return None
+    counts: dict[int, int] = {}
+    for shingle_set in postings:
+        for x in shingle_set:
+            counts[x] = counts.get(x, 0) + 1
+    need   = max(MIN_REPEATS, math.ceil(MIN_SHARE * len(postings)))
+    common = sorted((x for x, n in counts.items() if n >= need), key=lambda x: (-counts[x], x))
+    return frozenset(common[:MAX_SHINGLES])
+
+
+def is_boilerplate(block: str, model: frozenset[int]) -> bool:
+    if len(_WORD_RE.findall(block.lower())) < MIN_BLOCK_WORDS:
+        return False
+    shingle_set = block_shingles(block)
+    return sum(x in model for x in shingle_set) >= MATCH_SHARE * len(shingle_set)
+
+
+def strip(description: str | None, model: frozenset[int] | None, keep=None) -> str:
+    """The description without the company's boilerplate blocks (plain text), or unchanged."""
+    if not model or not description:
+        return description or ""
+    parts = blocks(description)
+    kept  = [b for b in parts if (keep and keep(b)) or not is_boilerplate(b, model)]
+    text  = "\n".join(kept)
+    if len(kept) == len(parts) or len(text) < MIN_KEEP_CHARS:
+        return description
+    return text
+
+
+def encode(model: frozenset[int]) -> str:
+    values = sorted(model)
+    return base64.b64encode(struct.pack(f">{len(values)}I", *values)).decode("ascii")
+
+
+def decode(packed: str | None) -> frozenset[int] | None:
+    """Model from its stored form; None for an empty or unreadable value."""
+    try:
+        raw = base64.b64decode(packed or "", validate=True)
+    except ValueError:
+        return None
+    if not raw or len(raw) % 4:
+        return None
+    return frozenset(struct.unpack(f">{len(raw) // 4}I", raw))
@@ -0,0 +1,213 @@
+"""Near-duplicate detection for incoming postings (MinHash + LSH banding).
+
+The same role arrives from several sources (an ATS board plus remoteok /
+remotive / himalayas / jobicy) and companies post one job once per city.
+Every copy used to pay for its own role tagging, EU classification and
+skill extraction.
+
+Jobs are fingerprinted when Phase 1 hands them over at ``enhanced``:
+
+  fingerprint()    -- MinHash signature (``NUM_PERM`` values) over word
+                      ``SHINGLE``-grams of the normalized title + description;
+                      one-permutation hashing (one hash per shingle, minimum
+                      per bin, empty bins filled from the next one) keeps a
+                      long description to a single pass under Pyodide
+  band_keys()      -- one LSH bucket per band of ``ROWS`` values; two jobs
+                      share a bucket with probability ~ s ** ROWS per band,
+                      so with 16 x 4 pairs around s = 0.5 become candidates
+  cluster_batch()  -- verifies candidates by estimated Jaccard
+                      (``DUP_THRESHOLD``) and assigns ``dup_cluster_id``:
+                      the lowest cluster id among verified matches, or the
+                      job's own id when it has none
+
+Buckets live in D1 (``job_lsh_bands``), so candidates come from one indexed
+lookup per batch instead of a scan. Clusters are not merged after the fact:
+a job that matches two clusters joins the older one.
+
+Later phases reuse the labels of an already-processed member of the job's
+cluster: role tags always, skills always, the EU verdict only when
+``same_location()`` holds (city variants of one posting differ there).
+Pure Python.
+"""
+
+import hashlib
+import html
+import re
+import struct
+import zlib
+from dataclasses import dataclass
+
+
+NUM_PERM      = 64
+BANDS         = 16
+ROWS          = NUM_PERM // BANDS
+SHINGLE       = 3        # words per shingle
+MIN_SHINGLES  = 20       # shorter texts (title-only aggregator rows) aren't clustered
+DUP_THRESHOLD = 0.8      # estimated Jaccard for a verified duplicate
+
+FINGERPRINT_BATCH = 200  # jobs fingerprinted per pass
+BUCKET_CHUNK      = 1000 # bucket keys per D1 lookup
+
+# Universal hash ((A * x + B) mod P) applied to each shingle's crc32. Fixed
+# constants: signatures must stay comparable across isolates and deploys.
+_PRIME      = (1 << 61) - 1
+_A          = 0x1F3D5B79A2C4E687 % _PRIME
+_B          = 0x0A1B2C3D4E5F6071 % _PRIME
+_VALUE_BITS = 26                       # + 6 bits of densification offset = 32
+_VALUE_MASK = (1 << _VALUE_BITS) - 1
+
+_TAG_RE   = re.compile(r"<[^>]+>")
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+# ---------------------------------------------------------------------------
+# Signatures
+# ---------------------------------------------------------------------------
+
+def tokens(title: str | None, description: str | None) -> list[str]:
+    """Lowercased word tokens of the title and the tag-stripped description."""
+    text = f"{title or ''} {html.unescape(_TAG_RE.sub(' ', description or ''))}"
+    return _TOKEN_RE.findall(text.lower())
+
+
+def shingles(words: list[str], k: int = SHINGLE) -> set[int]:
+    return {zlib.crc32(" ".join(words[i:i + k]).encode()) for i in range(max(0, len(words) - k + 1))}
+
+
+def minhash(shingle_set: set[int]) -> tuple[int, ...]:
+    """One-permutation MinHash of a non-empty shingle set (32-bit values)."""
+    bins: list[int | None] = [None] * NUM_PERM
+    for x in shingle_set:
+        h     = (_A * x + _B) % _PRIME
+        b, v  = h % NUM_PERM, (h // NUM_PERM) & _VALUE_MASK
+        if bins[b] is None or v < bins[b]:
+            bins[b] = v
+    signature = []
+    for i in range(NUM_PERM):
+        for j in range(NUM_PERM):
+            v = bins[(i + j) % NUM_PERM]
+            if v is not None:
+                signature.append(v | (j << _VALUE_BITS))
+                break
+    return tuple(signature)
+
+
+def fingerprint(title: str | None, description: str | None) -> tuple[int, ...] | None:
+    """MinHash signature of a posting, or None when the text is too short to compare."""
+    shingle_set = shingles(tokens(title, description))
+    if len(shingle_set) < MIN_SHINGLES:
+        return None
+    return minhash(shingle_set)
+
+
+def band_keys(signature: tuple[int, ...]) -> list[int]:
+    """One bucket key per band, 48-bit so it survives the JS number round trip."""
+    keys = []
+    for band in range(BANDS):
+        values = signature[band * ROWS:(band + 1) * ROWS]
+        digest = hashlib.blake2b(struct.pack(f">{ROWS + 1}I", band, *values), digest_size=6).digest()
+        keys.append(int.from_bytes(digest, "big"))
+    return keys
+
+
+def similarity(a: tuple[int, ...], b: tuple[int, ...]) -> float:
+    """Estimated Jaccard similarity: the share of equal MinHash values."""
+    return sum(x == y for x, y in zip(a, b)) / NUM_PERM
+
+
+def encode(signature: tuple[int, ...]) -> str:
+    return "".join(f"{v:08x}" for v in signature)
+
+
+def decode(text: str) -> tuple[int, ...]:
+    return tuple(int(text[i:i + 8], 16) for i in range(0, len(text), 8))
+
+
+# ---------------------------------------------------------------------------
+# Clustering
+# ---------------------------------------------------------------------------
+
+@dataclass(slots=True)
+class Assignment:
+    """Fingerprint outcome for one job; ``signature`` is None when it was too short."""
+    job_id:       int
+    cluster_id:   int
+    signature:    tuple[int, ...] | None = None
+    buckets:      tuple[int, ...] = ()
+    duplicate_of: int | None      = None
+    similarity:   float | None    = None
+
+
+def cluster_batch(signatures: list[tuple], indexed: list[dict]) -> list[Assignment]:
+    """Assign clusters to ``(job_id, signature)`` pairs, oldest job first.
+
+    ``signature`` is ``fingerprint()``'s result (None for short texts).
+    ``indexed`` are the already-fingerprinted jobs sharing a bucket with the
+    batch: ``bucket``, ``job_id``, ``signature`` (encoded) and ``cluster_id``.
+    Jobs earlier in the batch are indexed as they are assigned, so copies
+    arriving together still find each other.
+    """
+    members: dict[int, list] = {}
+    known:   dict = {}   # job_id -> (signature, cluster_id)
+    for row in indexed:
+        members.setdefault(int(row["bucket"]), []).append(row["job_id"])
+        known.setdefault(row["job_id"], (decode(row["signature"]), row["cluster_id"] or row["job_id"]))
+
+    out = []
+    for job_id, signature in signatures:
+        if signature is None:
+            out.append(Assignment(job_id, job_id))
+            continue
+        buckets    = band_keys(signature)
+        candidates = dict.fromkeys(c for key in buckets for c in members.get(key, ()) if c != job_id)
+        best_id, best_sim, cluster = None, 0.0, None
+        for cand in candidates:
+            cand_sig, cand_cluster = known[cand]
+            sim = similarity(signature, cand_sig)
+            if sim < DUP_THRESHOLD:
+                continue
+            if cluster is None or cand_cluster < cluster:
+                cluster = cand_cluster
+            if sim > best_sim:
+                best_id, best_sim = cand, sim
+        assignment = Assignment(
+            job_id, job_id if cluster is None else cluster, signature, tuple(buckets),
+            best_id, None if best_id is None else round(best_sim, 3),
+        )
+        out.append(assignment)
+        known[job_id] = (signature, assignment.cluster_id)
+        for key in buckets:
+            members.setdefault(key, []).append(job_id)
+    return out
+
+
+# ---------------------------------------------------------------------------
+# Reuse
+# ---------------------------------------------------------------------------
+
+def _norm_location(value) -> str:
+    return " ".join(_TOKEN_RE.findall(str(value or "").lower()))
+
+
+LOCATION_COLUMNS = ("location", "country", "workplace_type")
+
+
+def same_location(row: dict) -> bool:
+    """Whether a job and its donor (``donor_<col>``) share location, country and workplace type.
+
+    Only then is the donor's EU verdict reusable.
+    """
+    return all(
+        _norm_location(row.get(col)) == _norm_location(row.get(f"donor_{col}"))
+        for col in LOCATION_COLUMNS
+    )
+
+
+def pick_donors(rows: list[dict], match=None) -> dict:
+    """``{job_id: donor row}`` — the first row per ``job_id`` that passes ``match(row)``."""
+    donors: dict = {}
+    for row in rows:
+        if row["job_id"] in donors or (match is not None and not match(row)):
+            continue
+        donors[row["job_id"]] = row
+    return donors
@@ -6,15 +6,11 @@ Three-phase pipeline that runs on D1 directly:
                                (keyword heuristic → Workers AI → DeepSeek)
   Phase 3 — Classification  : EU-remote classification via Workers AI + DeepSeek
 
-Based on the langchain-cloudflare Python Worker pattern
-(see langchain-cloudflare/libs/langchain-cloudflare/examples/workers/src/entry.py).
-
-Langchain features used:
-  - ChatCloudflareWorkersAI — Workers AI binding for free tagging & classification
-  - ChatPromptTemplate — reusable, parameterised prompt templates
-  - LCEL chain (prompt | model) — composable pipeline
+LLM calls:
+  - env.AI.run — Workers AI binding for free tagging & skill extraction
+  - ChatPrompt (chat_prompt.py) — parameterised prompts with pre-serialized
+    static messages; no langchain on the import or request path
   - Pydantic JobClassification / JobRoleTags — validated structured output
-  - langgraph-checkpoint-cloudflare-d1 — CloudflareD1Saver for run checkpointing
   - DeepSeek API — fallback when Workers AI is uncertain or unavailable
 
 Pipeline status lifecycle:
@@ -29,10 +25,15 @@ D1 migration (run once before deploying):
   ALTER TABLE jobs ADD COLUMN role_source         TEXT;
 """
 
+# Time every import below — reported by GET /health (see import_profile.py)
+from import_profile import IMPORT_PROFILE
+IMPORT_PROFILE.start()
+
 import asyncio
 import json
 import re
-from datetime import datetime, timezone
+import time
+from datetime import datetime, timedelta, timezone
 from enum import Enum
 from typing import Literal
 from urllib.parse import quote
@@ -55,12 +56,105 @@ from _generated_schema import (  # noqa: E402
     JOB_STATUS_CANONICAL_MAP,
 )
 
-# langchain-cloudflare — Workers AI binding integration (PyPI)
-from langchain_cloudflare import ChatCloudflareWorkersAI
-from langchain_core.prompts import ChatPromptTemplate
+from batch_tuning import (  # noqa: E402
+    BatchPlan,
+    DEFAULT_BACKLOG_THRESHOLD,
+    DEFAULT_SUBREQUEST_BUDGET,
+    DEFAULT_WALL_CLOCK_BUDGET_S,
+    HISTORY_RUNS,
+    clamp_limit,
+    phase_metrics,
+    plan_batch_sizes,
+)
+
+from planner import (  # noqa: E402
+    eu_verdicts_from_prescreen,
+    plan_role_tagging,
+    skill_extraction_statuses,
+)
+from llm_usage import DEEPSEEK_USAGE, UsageRecord  # noqa: E402
+from llm_budget import DEEPSEEK_BUDGET  # noqa: E402
+from llm_stream import LLM_LATENCY, LatencyRecord, StreamResult, read_json_stream  # noqa: E402
+from run_log import LOG, LogStats  # noqa: E402
+from tracing import PARENT_HEADER, TRACE_HEADER, TRACER, sql_label  # noqa: E402
+from job_retry import (  # noqa: E402
+    ADVANCE_ACTION,
+    PHASE_ACTIONS,
+    SEND_BATCH_SIZE,
+    RetryPlan,
+    advance_messages,
+    chunk_ids,
+    coalesce_job_ids,
+    id_filter,
+    message_job_ids,
+    plan_retries,
+    retry_delay_s,
+)
+from priority import (  # noqa: E402
+    SCORE_BATCH,
+    band_latency,
+    job_priority,
+    priority_rank,
+)
+from dedup import (  # noqa: E402
+    BUCKET_CHUNK,
+    FINGERPRINT_BATCH,
+    band_keys,
+    cluster_batch,
+    encode as encode_signature,
+    fingerprint,
+    pick_donors,
+    same_location,
+)
+from boilerplate import (  # noqa: E402
+    BOILERPLATE_BATCH,
+    MIN_POSTINGS as BOILERPLATE_MIN_POSTINGS,
+    REFRESH_DAYS as BOILERPLATE_REFRESH_DAYS,
+    SAMPLE_POSTINGS as BOILERPLATE_SAMPLE,
+    blocks as boilerplate_blocks,
+    decode as decode_boilerplate,
+    encode as encode_boilerplate,
+    learn as learn_boilerplate,
+    strip as strip_boilerplate,
+)
+from skill_vocab import (  # noqa: E402
+    GROUP_NAMES as SKILL_GROUPS,
+    audited as vocab_audited,
+    mentions_skill,
+    recall as vocab_recall,
+    select_groups as skill_groups,
+    vocabulary as skill_vocabulary,
+)
+from role_knn import (  # noqa: E402
+    EMBED_MODEL,
+    INDEX_BATCH,
+    INDEX_SOURCES,
+    KnnVote,
+    knn_votes,
+    label_roles,
+    labelled_records,
+)
+from title_memo import (  # noqa: E402
+    LOAD_LIMIT as TITLE_MEMO_LIMIT,
+    LOAD_SQL as TITLE_MEMO_SQL,
+    SOURCE as TITLE_MEMO_SOURCE,
+    TITLE_MEMO,
+    MemoEntry,
+)
+from model_router import (  # noqa: E402
+    INSERT_SQL as ROUTING_INSERT_SQL,
+    MODEL_ROUTER,
+    TASK_ROLE_TAG,
+    TASK_SKILLS,
+    PRUNE_SQL as ROUTING_PRUNE_SQL,
+    WARM_SQL as ROUTING_WARM_SQL,
+    insert_params as routing_insert_params,
+    prune_params as routing_prune_params,
+    run_routed,
+)
 
-# langgraph-checkpoint-cloudflare-d1 removed (saves ~8MB sqlalchemy).
-# CloudflareD1Saver checkpointing is best-effort and now a no-op.
+# Prompt templates and request bodies without langchain (see chat_prompt.py)
+from chat_prompt import ChatPrompt, response_text
 
 
 # ---------------------------------------------------------------------------
@@ -160,25 +254,19 @@ class JobClassification:
 
 
 # ---------------------------------------------------------------------------
-# Prompt templates (langchain ChatPromptTemplate)
+# Prompt templates (ChatPrompt — static messages pre-serialized at import)
 # ---------------------------------------------------------------------------
 
+# Layout: every static instruction lives in the system message and the
+# job-specific text comes last, so DeepSeek serves the shared prefix from its
+# prompt cache (billed as prompt_cache_hit_tokens — see llm_usage.py). Keep
+# the system messages byte-identical across calls.
+
 # Phase 2 — Role Tagging
-ROLE_TAGGING_PROMPT = ChatPromptTemplate.from_messages([
+ROLE_TAGGING_PROMPT = ChatPrompt.from_messages([
     (
         "system",
-        "You are a job-classification specialist. "
-        "Analyze job postings to identify target roles: Frontend/React engineers and AI/ML/LLM engineers. "
-        "Return structured JSON with clear confidence assessment.",
-    ),
-    (
-        "human",
-        """Analyze this job posting and classify the role type.
-
-JOB DETAILS:
-- Title:       {title}
-- Location:    {location}
-- Description: {description}
+        """You are a job-classification specialist. Analyze job postings to identify target roles: Frontend/React engineers and AI/ML/LLM engineers. Return structured JSON with clear confidence assessment.
 
 CLASSIFICATION GUIDANCE:
 
@@ -213,26 +301,25 @@ Return ONLY valid JSON (no markdown):
   "reason": "Brief explanation of classification"
 }}""",
     ),
+    (
+        "human",
+        """Analyze this job posting and classify the role type.
+
+JOB DETAILS:
+- Title:       {title}
+- Location:    {location}
+- Description: {description}""",
+    ),
 ])
 
-# Phase 4 — Skill Extraction
-SKILL_EXTRACTION_PROMPT = ChatPromptTemplate.from_messages([
+# Phase 4 — Skill Extraction ({tags} is the sorted, fixed skill vocabulary)
+SKILL_EXTRACTION_PROMPT = ChatPrompt.from_messages([
     (
         "system",
-        "You are a technical recruiter extracting skills from job descriptions. "
-        "Only output canonical skill tags from the provided list. "
-        "Do not invent tags. Return valid JSON only, no markdown.",
-    ),
-    (
-        "human",
-        """Extract technical skills from this job posting.
+        """You are a technical recruiter extracting skills from job descriptions. Only output canonical skill tags from the provided list. Do not invent tags. Return valid JSON only, no markdown.
 
 ALLOWED TAGS (use ONLY these exact strings): {tags}
 
-JOB:
-- Title: {title}
-- Description: {description}
-
 For each skill found, output:
 - tag: exact string from the allowed list
 - level: "required" (must-have), "preferred" (nice-to-have but important), or "nice" (bonus)
@@ -242,13 +329,20 @@ For each skill found, output:
 Return ONLY valid JSON:
 {{"skills": [{{"tag": "...", "level": "required|preferred|nice", "confidence": 0.0, "evidence": "..."}}]}}""",
     ),
+    (
+        "human",
+        """Extract technical skills from this job posting.
+
+JOB:
+- Title: {title}
+- Description: {description}""",
+    ),
 ])
 
 # Phase 3 — EU Remote Classification prompt moved to workers/eu-classifier/src/prompts.py
 
 # ---------------------------------------------------------------------------
 # Helpers: JS ↔ Python conversion
-# Uses the JSON round-trip pattern from langchain_cloudflare/bindings.py
 # ---------------------------------------------------------------------------
 
 def to_js_obj(d: dict):
@@ -261,27 +355,61 @@ def to_py(js_val):
     return json.loads(JSON.stringify(js_val))
 
 
+def to_rpc(obj):
+    """Convert a Python value to a JS structure for a service-binding RPC call."""
+    from js import Object
+    from pyodide.ffi import to_js
+    return to_js(obj, dict_converter=Object.fromEntries)
+
+
+def from_rpc(val):
+    """Convert an RPC return value to Python without a JSON round-trip."""
+    return val.to_py() if hasattr(val, "to_py") else val
+
+
 # ---------------------------------------------------------------------------
 # D1 helpers
 # ---------------------------------------------------------------------------
 
 async def d1_all(db, sql: str, params: list | None = None) -> list[dict]:
     """Execute a D1 SELECT and return rows as Python list of dicts."""
-    stmt = db.prepare(sql)
-    if params:
-        stmt = stmt.bind(*JSON.parse(json.dumps(params)))
-    result = await stmt.all()
-    # Use JSON.stringify only on result.results (a JS array) then parse in Python.
-    # Avoids Pyodide proxy recursion overhead on large result sets.
-    return json.loads(JSON.stringify(result.results))
+    with TRACER.span("d1.all", "d1", sql=sql_label(sql)) as span:
+        stmt = db.prepare(sql)
+        if params:
+            stmt = stmt.bind(*JSON.parse(json.dumps(params)))
+        result = await stmt.all()
+        # Use JSON.stringify only on result.results (a JS array) then parse in Python.
+        # Avoids Pyodide proxy recursion overhead on large result sets.
+        rows = json.loads(JSON.stringify(result.results))
+        span.attrs["rows"] = len(rows)
+        return rows
 
 
 async def d1_run(db, sql: str, params: list | None = None):
     """Execute a D1 write statement (INSERT/UPDATE/DELETE)."""
-    stmt = db.prepare(sql)
-    if params:
-        stmt = stmt.bind(*JSON.parse(json.dumps(params)))
-    await stmt.run()
+    with TRACER.span("d1.run", "d1", sql=sql_label(sql)):
+        stmt = db.prepare(sql)
+        if params:
+            stmt = stmt.bind(*JSON.parse(json.dumps(params)))
+        await stmt.run()
+
+
+async def d1_batch(db, statements: list[tuple[str, list]], chunk_size: int = 50) -> None:
+    """Execute many D1 writes as batched transactions (one round-trip per chunk).
+
+    ``statements`` is a list of (sql, params) pairs. A failing statement
+    rolls back its whole chunk, so callers should fall back to per-row
+    writes if they need partial progress.
+    """
+    from pyodide.ffi import to_js
+    for i in range(0, len(statements), chunk_size):
+        chunk = statements[i:i + chunk_size]
+        with TRACER.span("d1.batch", "d1", sql=sql_label(chunk[0][0]), statements=len(chunk)):
+            prepared = [
+                db.prepare(sql).bind(*JSON.parse(json.dumps(params)))
+                for sql, params in chunk
+            ]
+            await db.batch(to_js(prepared))
 
 
 # ---------------------------------------------------------------------------
@@ -299,8 +427,18 @@ async def fetch_json(
     headers: dict | None = None,
     body: str | None = None,
     retries: int = 2,
+    read=None,
 ) -> dict:
-    """Fetch JSON from a URL using JS fetch with retry support."""
+    """Fetch JSON from a URL using JS fetch with retry support.
+
+    ``read`` (async, takes the OK response) replaces the JSON parse — used
+    by stream_json to consume a streamed body under the same retry policy.
+    """
+    with TRACER.span("fetch", "fetch", method=method, host=url.split("/")[2] if "://" in url else url) as span:
+        return await _fetch_json(url, method, headers, body, retries, read, span)
+
+
+async def _fetch_json(url, method, headers, body, retries, read, span) -> dict:
     last_err = None
 
     for attempt in range(retries + 1):
@@ -311,7 +449,9 @@ async def fetch_json(
             if body:
                 opts["body"] = body
 
+            span.attrs["attempts"] = attempt + 1
             response = await fetch(url, to_js_obj(opts))
+            span.attrs["status"]   = response.status
 
             # Retry on rate-limit or server errors
             if response.status == 429 or 500 <= response.status <= 599:
@@ -329,6 +469,9 @@ async def fetch_json(
                     break  # non-retriable: exit retry loop immediately (1 subrequest used)
                 raise last_err  # retriable (caught below, will retry with backoff)
 
+            if read is not None:
+                return await read(response)
+
             # Use response.text() + json.loads() instead of response.json() + to_py()
             # to avoid JSON.stringify on large JS proxies (CPU-expensive in Pyodide).
             text = await response.text()
@@ -386,6 +529,146 @@ def _guard_content(content) -> str | None:
     return s if s else None
 
 
+# ---------------------------------------------------------------------------
+# Streaming LLM calls — stop at the first usable JSON object
+# The prompts only need one small object; Qwen3's reasoning and any trailing
+# text after it are never read (see llm_stream.py). Both helpers return a
+# StreamResult whose timings are also summed into LLM_LATENCY.
+# ---------------------------------------------------------------------------
+
+async def stream_json(
+    url: str, api_key: str, prompt: ChatPrompt, values: dict, required: tuple[str, ...], **fields,
+) -> StreamResult:
+    """POST a streamed chat-completions request (DeepSeek) and read it via read_json_stream."""
+    started = time.monotonic()
+
+    async def read(response):
+        return await read_json_stream(
+            response.body.getReader(), required, provider="deepseek", started=started,
+        )
+
+    body   = prompt.request_body(values, **fields, stream=True, stream_options={"include_usage": True})
+    result = await fetch_json(
+        url,
+        method  = "POST",
+        headers = {
+            "Authorization": f"Bearer {api_key}",
+            "Content-Type":  "application/json",
+        },
+        body    = body,
+        retries = 2,
+        read    = read,
+    )
+    result.prompt_chars = len(body)
+    return result
+
+
+async def stream_workers_ai_json(
+    ai_binding, model: str, prompt: ChatPrompt, values: dict, required: tuple[str, ...], **options,
+) -> StreamResult:
+    """Run a Workers AI chat model with ``stream: true`` and read it via read_json_stream."""
+    with TRACER.span("ai.run", "ai", model=model, stream=True):
+        started = time.monotonic()
+        stream  = await ai_binding.run(model, JSON.parse(prompt.request_body(values, **options, stream=True)))
+        return await read_json_stream(
+            stream.getReader(), required, provider="workers_ai", started=started,
+        )
+
+
+async def run_workers_ai_text(ai_binding, model: str, prompt: ChatPrompt, values: dict, **options) -> str | None:
+    """Non-streamed Workers AI call — the fallback when the binding can't stream."""
+    with TRACER.span("ai.run", "ai", model=model, stream=False):
+        result = await ai_binding.run(model, JSON.parse(prompt.request_body(values, **options)))
+    return _guard_content(response_text(to_py(result)))
+
+
+async def service_post(binding, url: str, body: str):
+    """POST JSON to a service binding as a ``service`` span, carrying the trace headers."""
+    with TRACER.span("service", "service", url=url):
+        return await binding.fetch(JsRequest.new(url, to_js_obj({
+            "method":  "POST",
+            "headers": TRACER.headers({"Content-Type": "application/json"}),
+            "body":    body,
+        })))
+
+
+def _stream_content(result: StreamResult) -> dict | None:
+    """Parsed object of a streamed call, falling back to the raw-text extractor."""
+    if result.obj is not None:
+        return result.obj
+    content = _guard_content(result.text)
+    return json.loads(_extract_json_object(content)) if content else None
+
+
+# ---------------------------------------------------------------------------
+# Model routing — which Workers AI model serves each call (model_router.py)
+# ---------------------------------------------------------------------------
+
+ROUTING_WORKER     = "process-jobs"
+ROUTING_WARM_LIMIT = 500
+
+
+async def prepare_model_router(db, env) -> None:
+    """Apply LLM_ROUTES, prune old llm_routing_log rows and seed rolling stats, once per isolate."""
+    MODEL_ROUTER.configure(getattr(env, "LLM_ROUTES", None))
+    if MODEL_ROUTER.warmed:
+        return
+    try:
+        await d1_run(db, ROUTING_PRUNE_SQL, routing_prune_params(ROUTING_WORKER))
+        rows = await d1_all(db, ROUTING_WARM_SQL, [ROUTING_WORKER, ROUTING_WARM_LIMIT])
+        print(f"🧭 Model router warmed with {MODEL_ROUTER.warm(rows)} outcomes")
+    except Exception as e:
+        # Table may not exist yet — route on defaults until outcomes accumulate
+        print(f"   ⚠️  Model router warm-up skipped: {e}")
+        MODEL_ROUTER.warmed = True
+
+
+async def flush_routing_log(db) -> None:
+    """Persist routing decisions and outcomes recorded since the last flush (best-effort)."""
+    rows = MODEL_ROUTER.drain()
+    if not rows:
+        return
+    try:
+        await d1_batch(db, [(ROUTING_INSERT_SQL, routing_insert_params(ROUTING_WORKER, r)) for r in rows])
+    except Exception as e:
+        print(f"   ⚠️  Routing log flush failed ({len(rows)} rows): {e}")
+
+
+# ---------------------------------------------------------------------------
+# DeepSeek rate limit and daily budget — shared across workers (llm_budget.py)
+# ---------------------------------------------------------------------------
+
+def prepare_deepseek_budget(db, env) -> None:
+    """Bind the limiter to this request's D1 and apply the DEEPSEEK_* limits (when ``env`` is given)."""
+    if env is not None:
+        DEEPSEEK_BUDGET.configure(
+            getattr(env, "DEEPSEEK_RPM", None),
+            getattr(env, "DEEPSEEK_DAILY_TOKENS", None),
+            getattr(env, "DEEPSEEK_DAILY_USD", None),
+        )
+    DEEPSEEK_BUDGET.bind(
+        lambda sql, params: d1_all(db, sql, params),
+        lambda seconds: sleep_ms(int(seconds * 1000)),
+    )
+
+
+# ---------------------------------------------------------------------------
+# Title decision memo — role tags by normalized title (title_memo.py)
+# ---------------------------------------------------------------------------
+
+async def prepare_title_memo(db) -> None:
+    """Rebuild the memo from D1 once it is older than its refresh interval (best-effort)."""
+    if db is None or not TITLE_MEMO.stale():
+        return
+    try:
+        rows = await d1_all(db, TITLE_MEMO_SQL, [TITLE_MEMO_LIMIT])
+        LOG.info("title memo loaded", titles=TITLE_MEMO.load(rows), groups=len(rows))
+    except Exception as e:
+        # Keep the previous table (or none) until the next refresh
+        LOG.warn("title memo load skipped", error=str(e))
+        TITLE_MEMO.mark_loaded()
+
+
 # =========================================================================
 # Phase 1 — ATS Enhancement
 # Fetch rich data from Greenhouse / Lever / Ashby public APIs and persist
@@ -668,41 +951,52 @@ async def enhance_job(db, job: dict) -> dict:
         return {"enhanced": False, "error": str(e)}
 
 
-async def enhance_unenhanced_jobs(db, env=None, limit: int = 50) -> dict:
+async def enhance_unenhanced_jobs(db, env=None, limit: int = 50, job_ids: list | None = None) -> dict:
     """Phase 1: Enhance jobs with status='new' via Rust ATS crawler.
 
     Sends a batch of job specs to the ats-crawler worker which fetches
     all ATS APIs in parallel (native Rust join_all) and writes results
     to D1 directly. No subrequest limit issues — the Rust worker handles
-    the HTTP tier.
+    the HTTP tier. ``job_ids`` restricts the phase to those jobs (see
+    job_retry.py); the ids now at 'enhanced' are returned in ``advancedIds``.
+    Enhanced jobs are then fingerprinted for duplicate detection (dedup.py)
+    and their companies' boilerplate models refreshed (boilerplate.py).
     """
     print("🔍 Phase 1 — Finding jobs with status='new'...")
+    only_ids, id_params = id_filter(job_ids)
+    scored = await score_job_priorities(db, SCORE_BATCH, job_ids)
 
     # Promote non-ATS jobs directly (no external fetch needed)
-    non_ats_result = await d1_run(
+    promoted = await d1_all(
         db,
         """UPDATE jobs SET status = ?, updated_at = datetime('now')
            WHERE (status IS NULL OR status = ?)
-             AND source_kind NOT IN ('greenhouse', 'lever', 'ashby')""",
-        [JobStatus.ENHANCED.value, JobStatus.NEW.value],
+             AND source_kind NOT IN ('greenhouse', 'lever', 'ashby')""" + only_ids + """
+           RETURNING id""",
+        [JobStatus.ENHANCED.value, JobStatus.NEW.value, *id_params],
     )
-    non_ats_promoted = non_ats_result.get("changes", 0) if non_ats_result else 0
+    promoted_ids     = [r["id"] for r in promoted]
+    non_ats_promoted = len(promoted_ids)
     if non_ats_promoted:
         print(f"⏩ Auto-promoted {non_ats_promoted} non-ATS jobs to 'enhanced'")
 
     rows = await d1_all(
         db,
-        """SELECT id, external_id, source_kind, company_key
+        """SELECT id, external_id, source_kind, company_key, priority, created_at
            FROM jobs
            WHERE (status IS NULL OR status = ?)
-             AND source_kind IN ('greenhouse', 'lever', 'ashby')
-           ORDER BY created_at DESC
+             AND source_kind IN ('greenhouse', 'lever', 'ashby')""" + only_ids + """
+           ORDER BY priority_rank DESC, created_at DESC
            LIMIT ?""",
-        [JobStatus.NEW.value, limit],
+        [JobStatus.NEW.value, *id_params, limit],
     )
 
     if not rows:
-        return {"enhanced": non_ats_promoted, "errors": 0}
+        return {
+            "enhanced": non_ats_promoted, "errors": 0, "prioritized": scored, "advancedIds": promoted_ids,
+            **await fingerprint_jobs(db, FINGERPRINT_BATCH, job_ids),
+            **await learn_company_boilerplate(db, BOILERPLATE_BATCH, job_ids),
+        }
 
     print(f"📋 Found {len(rows)} ATS jobs to enhance via Rust crawler")
 
@@ -714,19 +1008,15 @@ async def enhance_unenhanced_jobs(db, env=None, limit: int = 50) -> dict:
         for r in rows
     ]})
 
-    stats = {"enhanced": non_ats_promoted, "errors": 0}
+    # Every selected job ends at 'enhanced' — with ATS data or, on failure, without
+    stats = {
+        "enhanced": non_ats_promoted, "errors": 0, "prioritized": scored,
+        "advancedIds": promoted_ids + [r["id"] for r in rows],
+    }
 
     if ats_crawler is not None:
         try:
-            js_req = JsRequest.new(
-                "https://ats-crawler/enhance-batch",
-                to_js_obj({
-                    "method": "POST",
-                    "headers": {"Content-Type": "application/json"},
-                    "body": request_body,
-                }),
-            )
-            resp = await ats_crawler.fetch(js_req)
+            resp = await service_post(ats_crawler, "https://ats-crawler/enhance-batch", request_body)
             text = await resp.text()
             data = json.loads(text)
             result = data.get("data") or data  # ApiResponse wraps in .data
@@ -770,9 +1060,12 @@ async def enhance_unenhanced_jobs(db, env=None, limit: int = 50) -> dict:
                 [r["id"]],
             )
 
+    stats["bandLatency"] = band_latency(rows, datetime.now(timezone.utc))
+    stats.update(await fingerprint_jobs(db, FINGERPRINT_BATCH, job_ids))
+    stats.update(await learn_company_boilerplate(db, BOILERPLATE_BATCH, job_ids))
     print(
         f"✅ Enhancement complete: {stats['enhanced']} enhanced, "
-        f"{stats['errors']} errors"
+        f"{stats['errors']} errors, {stats['duplicatesFound']} duplicates"
     )
     return stats
 
@@ -858,12 +1151,17 @@ async def backfill_first_published(db, limit: int = 100) -> dict:
 #   Phase 3, saving EU-classification API costs.
 #
 #   Three-tier strategy (cheapest first):
+#     Tier 0 — Title memo  (one dict lookup, see title_memo.py)
 #     Tier 1 — Keyword heuristic  (free, CPU-only)
-#     Tier 2 — Workers AI via langchain  (free, Cloudflare quota)
+#              then duplicates and kNN over labelled jobs (role_knn.py;
+#              one embedding call per run), before any chat completion
+#     Tier 2 — Workers AI via AI.run     (free, Cloudflare quota; model
+#              picked per call by MODEL_ROUTER, small → large)
 #     Tier 3 — DeepSeek API  (paid, fallback only)
 # =========================================================================
 
-# Workers AI model shared by Phase 2 and Phase 3
+# Default Workers AI model — the top of the role / skills routes, and what
+# the tier functions use when called without a routed model
 WORKERS_AI_MODEL = "@cf/qwen/qwen3-30b-a3b-fp8"
 
 # Keywords that signal a hard non-target role — prevents false positives
@@ -873,6 +1171,47 @@ _NON_TARGET_PATTERN = re.compile(
     r"|data analyst|sre|site reliability)\b"
 )
 
+_REACT_PATTERN    = re.compile(r"\breact(\.js)?\b")
+_FRONTEND_PATTERN = re.compile(r"\b(frontend|ui engineer|web ui)\b")
+
+# AI Engineer signals — broad title matching + stack confirmation
+_AI_TITLE_PATTERN = re.compile(
+    r"\b(ai engineer|ml engineer|llm engineer|ai/ml|mlops"
+    r"|data scientist|applied scientist|research engineer|research scientist"
+    r"|nlp engineer|computer vision|genai|generative ai|prompt engineer"
+    r"|ai architect|ml platform|machine learning engineer"
+    r"|ai infrastructure|deep learning"
+    r"|foundation model|ai specialist|ml specialist|llm specialist"
+    r"|ai product|ai software|ml software|ai developer|ml developer"
+    r"|intelligence engineer|language model|model engineer"
+    r"|ai lead|ml lead|head of ai|head of ml)\b"
+)
+_AI_STACK_TERMS = (
+    "machine learning", "llm", "rag", "embedding", "vector db", "fine-tun",
+    "pytorch", "tensorflow", "langchain", "hugging face", "transformers",
+    "openai", "anthropic", "claude", "gpt-", "neural network",
+    "deep learning", "reinforcement learning", "natural language processing",
+    "computer vision", "model training", "model serving", "mlflow",
+    "weights & biases", "wandb", "feature store", "model deploy",
+    "vllm", "ollama", "mistral", "llama", "gemini", "vertex ai",
+    "sagemaker", "bedrock", "azure openai", "semantic kernel",
+    "vector search", "retrieval augmented", "knowledge graph",
+    "diffusion model", "stable diffusion", "multimodal",
+)
+
+
+# The stack terms as word starts ("rag" but not "leverage"; "fine-tun" still a prefix)
+_AI_STACK_PATTERN = re.compile(r"(?<![a-z0-9])(?:" + "|".join(map(re.escape, _AI_STACK_TERMS)) + ")")
+
+
+def _mentions_role_keyword(text: str) -> bool:
+    """Whether ``text`` carries any keyword the Tier 1 role heuristic reads."""
+    text = text.lower()
+    return bool(
+        _REACT_PATTERN.search(text) or "next.js" in text or _FRONTEND_PATTERN.search(text)
+        or _AI_TITLE_PATTERN.search(text) or _AI_STACK_PATTERN.search(text)
+    )
+
 
 def _keyword_role_tag(job: dict) -> JobRoleTags | None:
     """Tier 1: fast keyword heuristic — no LLM calls.
@@ -885,7 +1224,7 @@ def _keyword_role_tag(job: dict) -> JobRoleTags | None:
     """
     title = (job.get("title") or "").lower()
     # Truncate description to avoid re scanning huge strings for simple patterns
-    desc  = (job.get("description") or "")[:5000].lower()
+    desc  = _prompt_description(job)[:5000].lower()
     text  = f"{title}\n{desc}"
 
     # Hard exclusion — explicit non-target backend/infra roles (title only
@@ -899,34 +1238,11 @@ def _keyword_role_tag(job: dict) -> JobRoleTags | None:
         )
 
     # Frontend / React signals (need both tech + role signal to be high-confidence)
-    has_react    = bool(re.search(r"\breact(\.js)?\b", text)) or "next.js" in text
-    has_frontend = bool(re.search(r"\b(frontend|ui engineer|web ui)\b", text))
-
-    # AI Engineer signals — broad title matching + stack confirmation
-    has_ai_title = bool(re.search(
-        r"\b(ai engineer|ml engineer|llm engineer|ai/ml|mlops"
-        r"|data scientist|applied scientist|research engineer|research scientist"
-        r"|nlp engineer|computer vision|genai|generative ai|prompt engineer"
-        r"|ai architect|ml platform|machine learning engineer"
-        r"|ai infrastructure|deep learning"
-        r"|foundation model|ai specialist|ml specialist|llm specialist"
-        r"|ai product|ai software|ml software|ai developer|ml developer"
-        r"|intelligence engineer|language model|model engineer"
-        r"|ai lead|ml lead|head of ai|head of ml)\b", text
-    ))
-    has_ai_stack = any(
-        x in text for x in
-        ["machine learning", "llm", "rag", "embedding", "vector db", "fine-tun",
-         "pytorch", "tensorflow", "langchain", "hugging face", "transformers",
-         "openai", "anthropic", "claude", "gpt-", "neural network",
-         "deep learning", "reinforcement learning", "natural language processing",
-         "computer vision", "model training", "model serving", "mlflow",
-         "weights & biases", "wandb", "feature store", "model deploy",
-         "vllm", "ollama", "mistral", "llama", "gemini", "vertex ai",
-         "sagemaker", "bedrock", "azure openai", "semantic kernel",
-         "vector search", "retrieval augmented", "knowledge graph",
-         "diffusion model", "stable diffusion", "multimodal"]
-    )
+    has_react    = bool(_REACT_PATTERN.search(text)) or "next.js" in text
+    has_frontend = bool(_FRONTEND_PATTERN.search(text))
+
+    has_ai_title = bool(_AI_TITLE_PATTERN.search(text))
+    has_ai_stack = any(x in text for x in _AI_STACK_TERMS)
 
     if has_react and has_frontend:
         return JobRoleTags(
@@ -966,45 +1282,57 @@ def _normalise_role_keys(raw: dict) -> dict:
     return {KEY_MAP.get(k, k): v for k, v in raw.items()}
 
 
-async def _tag_with_workers_ai(job: dict, ai_binding) -> JobRoleTags | None:
-    """Tier 2: Workers AI role tagging via langchain LCEL chain.
+def _same_roles(a: JobRoleTags, b: JobRoleTags) -> bool:
+    return (a.isFrontendReact, a.isAIEngineer) == (b.isFrontendReact, b.isAIEngineer)
+
+
+def _role_values(job: dict) -> dict:
+    """ROLE_TAGGING_PROMPT values for one job."""
+    return {
+        "title":       job.get("title", "N/A"),
+        "location":    job.get("location") or "Not specified",
+        "description": _prompt_description(job)[:6000],
+    }
+
+
+async def _tag_with_workers_ai(job: dict, ai_binding, model: str = WORKERS_AI_MODEL) -> JobRoleTags | None:
+    """Tier 2: Workers AI role tagging, streamed; a plain AI.run call as fallback.
 
     Returns a validated JobRoleTags or None on any failure.
     None signals the caller to escalate to Tier 3 (DeepSeek).
 
-    We do NOT use with_structured_output() because in the Pyodide Workers
-    environment the AI binding can return JsNull as AIMessage.content,
-    which crashes langchain's Pydantic validator. We parse raw text instead.
+    The streamed call stops reading once the tag object is complete. If the
+    binding can't stream, the same request body runs without ``stream``.
+    Content is parsed as raw text — in the Pyodide Workers environment the
+    AI binding can return JsNull content (see _guard_content).
     """
     if ai_binding is None:
         return None
 
+    values = _role_values(job)
     try:
-        llm   = ChatCloudflareWorkersAI(
-            model_name=WORKERS_AI_MODEL,
-            binding=ai_binding,
-            temperature=0.2,
+        result = await stream_workers_ai_json(
+            ai_binding, model, ROLE_TAGGING_PROMPT, values, ("confidence",), temperature=0.2,
         )
-        chain = ROLE_TAGGING_PROMPT | llm
-
-        response = await chain.ainvoke({
-            "title":       job.get("title", "N/A"),
-            "location":    job.get("location") or "Not specified",
-            "description": (job.get("description") or "")[:6000],
-        })
+    except Exception as e:
+        LOG.job("warn", job.get("id"), "workers ai role tag stream failed, retrying without", model=model, error=str(e))
+        result = None
 
-        content_str = _guard_content(response.content)
-        if not content_str:
-            print("   ⚠️  Workers AI (role tag) returned null content")
+    try:
+        if result is not None:
+            raw = _stream_content(result)
+        else:
+            content_str = await run_workers_ai_text(
+                ai_binding, model, ROLE_TAGGING_PROMPT, values, temperature=0.2,
+            )
+            raw = json.loads(_extract_json_object(content_str)) if content_str else None
+        if raw is None:
+            LOG.job("warn", job.get("id"), "workers ai role tag returned null content", model=model)
             return None
-
-        json_str   = _extract_json_object(content_str)
-        raw        = json.loads(json_str)
-        normalised = _normalise_role_keys(raw)
-        return JobRoleTags.model_validate(normalised)
+        return JobRoleTags.model_validate(_normalise_role_keys(raw))
 
     except Exception as e:
-        print(f"   ⚠️  Workers AI role tag failed: {e}")
+        LOG.job("warn", job.get("id"), "workers ai role tag failed", model=model, error=str(e))
         return None
 
 
@@ -1013,56 +1341,47 @@ async def _tag_with_deepseek(
 ) -> JobRoleTags | None:
     """Tier 3: DeepSeek role tagging fallback.
 
-    Uses fetch_json (JS fetch wrapper) — no httpx needed in CF Workers.
-    response_format=json_object eliminates the need for _extract_json_object.
-    Returns None on any failure so the caller can apply a safe default.
+    Streams via stream_json (JS fetch wrapper) — no httpx needed in CF Workers.
+    response_format=json_object keeps the answer a bare object, read up to its
+    closing brace. Returns None on any failure so the caller can apply a safe
+    default.
     """
-    prompt_msgs = ROLE_TAGGING_PROMPT.format_messages(
-        title       = job.get("title", "N/A"),
-        location    = job.get("location") or "Not specified",
-        description = (job.get("description") or "")[:6000],
-    )
-    role_map = {"system": "system", "human": "user", "ai": "assistant"}
-    messages = [{"role": role_map.get(m.type, m.type), "content": m.content} for m in prompt_msgs]
-
     try:
-        url     = f"{base_url.rstrip('/')}/chat/completions"
-        payload = json.dumps({
-            "model":           model,
-            "temperature":     0.1,
-            "max_tokens":      300,
-            "response_format": {"type": "json_object"},
-            "messages":        messages,
-        })
-
-        data = await fetch_json(
-            url,
-            method  = "POST",
-            headers = {
-                "Authorization": f"Bearer {api_key}",
-                "Content-Type":  "application/json",
-            },
-            body    = payload,
-            retries = 2,
+        result = await stream_json(
+            f"{base_url.rstrip('/')}/chat/completions",
+            api_key,
+            ROLE_TAGGING_PROMPT,
+            _role_values(job),
+            ("confidence",),
+            model           = model,
+            temperature     = 0.1,
+            max_tokens      = 300,
+            response_format = {"type": "json_object"},
         )
+        DEEPSEEK_USAGE.record({"usage": result.usage})
+        DEEPSEEK_BUDGET.record(result.usage, result.prompt_chars, len(result.text))
 
-        content = (
-            (data.get("choices") or [{}])[0]
-            .get("message", {})
-            .get("content", "")
-        )
-        if not content.strip():
+        raw = _stream_content(result)
+        if raw is None:
             raise ValueError("Empty content in DeepSeek response")
 
-        raw        = json.loads(content)
         normalised = _normalise_role_keys(raw)
         return JobRoleTags.model_validate(normalised)
 
     except Exception as e:
-        print(f"   ⚠️  DeepSeek role tag failed: {e}")
+        LOG.job("warn", job.get("id"), "deepseek role tag failed", error=str(e))
         return None
 
 
+def _memo_role_tags(entry: MemoEntry) -> JobRoleTags:
+    return JobRoleTags(
+        isFrontendReact = entry.is_frontend_react,
+        isAIEngineer    = entry.is_ai_engineer,
+        confidence      = "high",
+        reason          = f"Title memo: {entry.support} past labels, {entry.agreement:.0%} agree",
+    )
+
+
 async def _run_role_tier_pipeline(
     job: dict,
     ai_binding,
@@ -1070,27 +1389,58 @@ async def _run_role_tier_pipeline(
     base_url: str,
     model: str,
     stats: dict,
+    memo: bool = True,
 ) -> tuple[JobRoleTags, str]:
-    """Run the three-tier role tagging pipeline for a single job.
+    """Run the tiered role tagging pipeline for a single job.
 
+    ``memo=False`` skips the title memo (Phase 2 consults it in Tier 0).
     Returns (tags, source_label) where source_label is one of:
-      'heuristic', 'workers-ai', 'deepseek', 'none'
+      'title-memo', 'heuristic', 'workers-ai', 'deepseek', 'none'
     """
+    # Tier 0 — Title memo; audited hits run the tiers and are compared
+    entry = TITLE_MEMO.lookup(job.get("title")) if memo else None
+    if entry is not None and not TITLE_MEMO.audited(job.get("id")):
+        stats["titleMemo"] += 1
+        return _memo_role_tags(entry), TITLE_MEMO_SOURCE
+
+    tags, source = await _run_role_tiers(job, ai_binding, api_key, base_url, model, stats)
+    if entry is not None and source != "none":
+        TITLE_MEMO.record_audit(entry, tags.isFrontendReact, tags.isAIEngineer)
+    return tags, source
+
+
+async def _run_role_tiers(
+    job: dict,
+    ai_binding,
+    api_key: str | None,
+    base_url: str,
+    model: str,
+    stats: dict,
+) -> tuple[JobRoleTags, str]:
     # Tier 1 — Keyword heuristic
     tags = _keyword_role_tag(job)
     if tags and tags.confidence == "high":
         return tags, "heuristic"
 
-    # Tier 2 — Workers AI
+    # Tier 2 — Workers AI, small model first; the router escalates to the
+    # larger one when the answer isn't high-confidence. No keyword hint at
+    # all (generic title) counts as a hard case and starts on the larger model.
     wa_tags = None
     if ai_binding:
-        wa_tags = await _tag_with_workers_ai(job, ai_binding)
+        wa_tags = await run_routed(
+            MODEL_ROUTER, TASK_ROLE_TAG, len(_prompt_description(job)[:6000]),
+            lambda model: _tag_with_workers_ai(job, ai_binding, model),
+            lambda t: t.confidence == "high",
+            hard  = tags is None,
+            agree = _same_roles,
+        )
         if wa_tags and wa_tags.confidence == "high":
             stats["workersAI"] += 1
             return wa_tags, "workers-ai"
 
-    # Tier 3 — DeepSeek fallback (only if key provided and tier 2 didn't give high confidence)
-    if api_key:
+    # Tier 3 — DeepSeek fallback (only if key provided, tier 2 didn't give high
+    # confidence and the shared rate limit / daily budget grants a permit)
+    if api_key and await DEEPSEEK_BUDGET.acquire():
         ds_tags = await _tag_with_deepseek(job, api_key, base_url, model)
         if ds_tags:
             stats["deepseek"] += 1
@@ -1145,7 +1495,7 @@ async def _persist_role_tags(
         await d1_run(db, sql, params)
     except Exception as e:
         # Schema migration may not have run — degrade gracefully
-        print(f"   ⚠️  Full role tag persist failed ({e}). Falling back to status-only update.")
+        LOG.job("warn", job_id, "full role tag persist failed, falling back to status-only update", error=str(e))
         await d1_run(
             db,
             "UPDATE jobs SET status = ?, updated_at = datetime('now') WHERE id = ?",
@@ -1153,6 +1503,182 @@ async def _persist_role_tags(
         )
 
 
+def _donor_role_tags(donor: dict) -> JobRoleTags:
+    """Role tags copied from a duplicate's row (see load_duplicate_donors)."""
+    return JobRoleTags(
+        isFrontendReact = bool(donor.get("role_frontend_react")),
+        isAIEngineer    = bool(donor.get("role_ai_engineer")),
+        confidence      = donor.get("role_confidence") or "low",
+        reason          = f"duplicate of job {donor['donor_id']}: {donor.get('role_reason') or ''}",
+    )
+
+
+class VectorizeIndex:
+    """``role_knn`` index interface over a Vectorize binding (ROLE_INDEX)."""
+
+    def __init__(self, binding):
+        self.binding = binding
+
+    async def query(self, vector: list[float], top_k: int) -> list[dict]:
+        result = await self.binding.query(to_rpc(vector), to_rpc({"topK": top_k, "returnMetadata": "all"}))
+        return to_py(result).get("matches") or []
+
+    async def upsert(self, records: list[dict]) -> None:
+        await self.binding.upsert(to_rpc(records))
+
+
+def _role_index(env) -> VectorizeIndex | None:
+    binding = getattr(env, "ROLE_INDEX", None) if env is not None else None
+    return VectorizeIndex(binding) if binding is not None else None
+
+
+async def _embed_texts(ai_binding, texts: list[str]) -> list[list[float]]:
+    """bge embeddings for ``texts`` in one Workers AI call."""
+    with TRACER.span("ai.run", "ai", model=EMBED_MODEL, texts=len(texts)):
+        result = await ai_binding.run(EMBED_MODEL, to_js_obj({"text": texts}))
+    data = to_py(result).get("data") or []
+    if len(data) != len(texts):
+        raise ValueError(f"expected {len(texts)} embeddings, got {len(data)}")
+    return data
+
+
+def _knn_role_tags(vote: KnnVote) -> JobRoleTags:
+    is_frontend, is_ai = label_roles(vote.label)
+    return JobRoleTags(
+        isFrontendReact = is_frontend,
+        isAIEngineer    = is_ai,
+        confidence      = "high" if vote.unanimous else "medium",
+        reason          = (
+            f"kNN: {vote.agreement:.0%} of {vote.neighbours} labelled neighbours "
+            f"(mean similarity {vote.similarity:.2f})"
+        ),
+    )
+
+
+_UNINDEXED_ROLES_SQL = f"""
+    SELECT id, title, description, role_frontend_react, role_ai_engineer, role_source
+    FROM jobs
+    WHERE role_indexed_at IS NULL
+      AND role_confidence = 'high'
+      AND role_source IN ({", ".join(f"'{s}'" for s in INDEX_SOURCES)})
+    ORDER BY id DESC
+    LIMIT ?
+"""
+
+
+async def index_role_labels(db, ai_binding, index, vectors: dict, limit: int = INDEX_BATCH) -> int:
+    """Add new high-confidence role labels to the kNN index (best-effort).
+
+    Newest first, so the index grows with each run and a fresh ROLE_INDEX
+    backfills from the history ``limit`` jobs at a time. ``vectors`` holds
+    embeddings already computed this run. Returns the number indexed.
+    """
+    if index is None or ai_binding is None:
+        return 0
+    try:
+        rows    = await d1_all(db, _UNINDEXED_ROLES_SQL, [limit])
+        records = await labelled_records(rows, vectors, lambda texts: _embed_texts(ai_binding, texts))
+        if not records:
+            return 0
+        await index.upsert(records)
+        await d1_run(
+            db,
+            "UPDATE jobs SET role_indexed_at = datetime('now') WHERE id IN (SELECT value FROM json_each(?))",
+            [json.dumps([int(r["id"]) for r in records])],
+        )
+        return len(records)
+    except Exception as e:
+        # Index binding or migration 0038 missing — tagging is unaffected
+        LOG.warn("role kNN indexing skipped", phase="tag", error=str(e))
+        return 0
+
+
+# Columns the eu-classifier Tier 0 heuristic reads — selected in Phase 2 so
+# jobs can be prescreened before any paid role-tagging call.
+_PRESCREEN_COLUMNS = """id, title, location, description,
+                  country, workplace_type, offices, categories,
+                  ashby_is_remote, ashby_secondary_locations, ashby_address,
+                  source_kind, company_key, priority, created_at"""
+
+
+async def prescreen_eu_remote(env, jobs: list[dict]) -> dict:
+    """Run the eu-classifier's free Tier 0 over ``jobs`` in one call.
+
+    Returns ``{job_id: {"isRemoteEU", "confidence", "reason", "decided"}}``.
+    Any failure returns {} so Phase 2 falls back to tagging every job.
+    """
+    if not jobs or env is None:
+        return {}
+
+    # The eu-classifier reads the full description: company paragraphs often
+    # carry the remote / location policy, so no boilerplate stripping there
+    body = json.dumps({"jobs": [{k: v for k, v in job.items() if k != "prompt_description"} for job in jobs]})
+    data = None
+
+    eu_classifier = getattr(env, "EU_CLASSIFIER", None)
+    if eu_classifier is not None:
+        try:
+            response = await service_post(eu_classifier, "https://eu-classifier/prescreen", body)
+            data = to_py(await response.json())
+        except Exception as e:
+            LOG.warn("eu-classifier prescreen via service binding failed", error=str(e))
+
+    eu_classifier_url = getattr(env, "EU_CLASSIFIER_URL", None)
+    if data is None and eu_classifier_url:
+        try:
+            data = await fetch_json(
+                f"{eu_classifier_url.rstrip('/')}/prescreen",
+                method="POST",
+                headers=TRACER.headers({"Content-Type": "application/json"}),
+                body=body,
+                retries=1,
+            )
+        except Exception as e:
+            LOG.warn("eu-classifier prescreen via HTTP failed", error=str(e))
+
+    if not data or not data.get("success"):
+        return {}
+    return {r["id"]: r for r in data.get("results", []) if isinstance(r, dict) and "id" in r}
+
+
+async def _persist_prescreen_rejection(
+    db, job_id, tags: JobRoleTags | None, verdict: dict, source: str = "heuristic",
+) -> None:
+    """Mark a job non-eu from the EU Tier 0 verdict, skipping Phases 2b/3.
+
+    Role tags are written when the title memo or role heuristic (``source``)
+    was conclusive; ambiguous roles are left NULL since no paid call was made.
+    """
+    confidence = verdict.get("confidence") or "high"
+    reason     = verdict.get("reason") or "Heuristic: not EU remote"
+    score      = {"high": 0.9, "medium": 0.6, "low": 0.3}.get(confidence, 0.3)
+    await d1_run(
+        db,
+        """
+        UPDATE jobs
+        SET role_frontend_react = COALESCE(?, role_frontend_react),
+            role_ai_engineer    = COALESCE(?, role_ai_engineer),
+            role_confidence     = COALESCE(?, role_confidence),
+            role_reason         = COALESCE(?, role_reason),
+            role_source         = COALESCE(?, role_source),
+            score = ?, score_reason = ?, status = ?,
+            is_remote_eu = 0, remote_eu_confidence = ?, remote_eu_reason = ?,
+            updated_at = datetime('now')
+        WHERE id = ?
+        """,
+        [
+            int(tags.isFrontendReact) if tags else None,
+            int(tags.isAIEngineer) if tags else None,
+            tags.confidence if tags else None,
+            tags.reason if tags else None,
+            source if tags else None,
+            score, f"[prescreen] {reason}", JobStatus.NON_EU.value,
+            confidence, reason,
+            job_id,
+        ],
+    )
+
+
 async def tag_roles_for_enhanced_jobs(
     db,
     ai_binding,
@@ -1160,71 +1686,211 @@ async def tag_roles_for_enhanced_jobs(
     deepseek_base_url: str       = "https://api.deepseek.com/beta",
     deepseek_model: str          = "deepseek-chat",
     limit: int                   = 50,
+    env                          = None,
+    paid_budget: int | None      = None,
+    job_ids: list | None         = None,
 ) -> dict:
     """Phase 2: Tag target roles for all jobs with status='enhanced'.
 
-    Decision logic for next_status:
-      - High-confidence non-match → ROLE_NOMATCH (terminal, skips Phase 3)
-      - Target role found OR uncertain result → ROLE_MATCH (proceeds to Phase 3)
+    All free Tier 0 checks run before any paid call (see planner.py):
+      - Role heuristic no-match            → ROLE_NOMATCH (terminal)
+      - EU prescreen rejects the job       → NON_EU (skips Phase 3, no LLM)
+      - Role heuristic match               → ROLE_MATCH
+      - Duplicate / kNN neighbours agree   → their role tags (no chat call)
+      - Ambiguous                          → Workers AI / DeepSeek, ordered by
+                                             expected value; beyond ``paid_budget``
+                                             the job stays 'enhanced' for next run
 
     Uncertain jobs become ROLE_MATCH (fail-open): a false positive costs one
     extra EU-classification call, but a false negative permanently discards
     a valid job. The asymmetry favours keeping the job in the pipeline.
+    The EU prescreen needs ``env`` (EU_CLASSIFIER binding or URL); without it
+    every ambiguous job is tagged as before. ``job_ids`` restricts the phase
+    to those jobs; ids whose tagging failed are returned in ``failedIds``,
+    ids now at 'role-match' in ``advancedIds``.
     """
-    print("🔍 Phase 2 — Finding jobs with status='enhanced'...")
+    LOG.info("phase 2: finding enhanced jobs", phase="tag", limit=limit)
+    await prepare_model_router(db, env)
+    prepare_deepseek_budget(db, env)
+    await prepare_title_memo(db)
+    memo_before = TITLE_MEMO.snapshot()
 
+    only_ids, id_params = id_filter(job_ids)
     rows = await d1_all(
         db,
-        "SELECT id, title, location, description FROM jobs WHERE status = ? ORDER BY created_at DESC LIMIT ?",
-        [JobStatus.ENHANCED.value, limit],
+        f"SELECT {_PRESCREEN_COLUMNS} FROM jobs WHERE status = ?{only_ids} ORDER BY priority_rank DESC, created_at DESC LIMIT ?",
+        [JobStatus.ENHANCED.value, *id_params, limit],
     )
 
-    print(f"📋 Found {len(rows)} jobs to role-tag")
+    LOG.info("phase 2: jobs to role-tag", phase="tag", jobs=len(rows))
 
     stats = {
         "processed": 0, "targetRole": 0, "irrelevant": 0,
         "errors": 0, "workersAI": 0, "deepseek": 0,
+        "heuristic": 0, "prescreenedNonEu": 0, "deferred": 0, "duplicates": 0,
+        "knn": 0, "knnIndexed": 0, "titleMemo": 0,
+        "failedIds": [], "advancedIds": [],
     }
-
+    stats.update(await strip_company_boilerplate(db, rows))
+
+    # Tier 0 — title memo, then role heuristic, then EU prescreen for jobs
+    # still in play. Audited memo hits go through the tiers and are compared
+    # with the memo once tagged (see apply).
+    memo_hits:    dict = {}
+    memo_decided: set  = set()
+    role_tags:    dict = {}
     for job in rows:
-        job_id = job.get("id", "unknown")
-        try:
-            print(f"🏷️  Role-tagging job {job_id}: {job.get('title')}")
+        job_id = job.get("id")
+        entry  = TITLE_MEMO.lookup(job.get("title"))
+        if entry is not None:
+            memo_hits[job_id] = entry
+            if not TITLE_MEMO.audited(job_id):
+                memo_decided.add(job_id)
+                role_tags[job_id] = _memo_role_tags(entry)
+                continue
+        role_tags[job_id] = _keyword_role_tag(job)
+    to_screen = [
+        job for job in rows
+        if (t := role_tags[job.get("id")]) is None or t.isFrontendReact or t.isAIEngineer
+    ]
+    prescreen   = await prescreen_eu_remote(env, to_screen)
+    eu_verdicts = eu_verdicts_from_prescreen(list(prescreen.values()))
+    plan        = plan_role_tagging(rows, role_tags, eu_verdicts, paid_budget)
+    LOG.info("phase 2: tier 0 plan", phase="tag", plan=plan.summary())
+
+    async def apply(job: dict, tags: JobRoleTags, source: str) -> None:
+        is_target   = tags.isFrontendReact or tags.isAIEngineer
+        next_status = (
+            JobStatus.ROLE_NOMATCH
+            if (not is_target and tags.confidence == "high")
+            else JobStatus.ROLE_MATCH
+        )
 
-            tags, source = await _run_role_tier_pipeline(
-                job, ai_binding, deepseek_api_key, deepseek_base_url, deepseek_model, stats
-            )
+        LOG.job(
+            "info", job.get("id"), "role tagged",
+            title=job.get("title"), status=next_status.value, source=source,
+            confidence=tags.confidence, reason=tags.reason,
+        )
 
-            is_target   = tags.isFrontendReact or tags.isAIEngineer
-            next_status = (
-                JobStatus.ROLE_NOMATCH
-                if (not is_target and tags.confidence == "high")
-                else JobStatus.ROLE_MATCH
-            )
+        await _persist_role_tags(db, job.get("id"), tags, source, next_status)
+        if (entry := memo_hits.get(job.get("id"))) is not None and source != TITLE_MEMO_SOURCE:
+            TITLE_MEMO.record_audit(entry, tags.isFrontendReact, tags.isAIEngineer)
 
-            label = "🎯 Match" if next_status == JobStatus.ROLE_MATCH else "⏭️  No-match"
-            print(f"   {label} [{source}] ({tags.confidence}) — {tags.reason}")
+        stats["processed"] += 1
+        if next_status == JobStatus.ROLE_NOMATCH:
+            stats["irrelevant"] += 1
+        else:
+            stats["advancedIds"].append(job.get("id"))
+            if is_target:
+                stats["targetRole"] += 1
 
-            await _persist_role_tags(db, job_id, tags, source, next_status)
+    for job, tags in plan.no_match + plan.heuristic:
+        job_id = job.get("id", "unknown")
+        try:
+            if job_id in memo_decided:
+                await apply(job, tags, TITLE_MEMO_SOURCE)
+                stats["titleMemo"] += 1
+            else:
+                await apply(job, tags, "heuristic")
+                stats["heuristic"] += 1
+        except Exception as e:
+            LOG.job("error", job_id, "unhandled error tagging job", error=str(e))
+            stats["errors"] += 1
+            stats["failedIds"].append(job_id)
 
+    for job, tags in plan.non_eu:
+        job_id = job.get("id", "unknown")
+        try:
+            verdict = prescreen.get(job_id, {})
+            LOG.job("info", job_id, "non-eu before role tagging", reason=verdict.get("reason"))
+            await _persist_prescreen_rejection(
+                db, job_id, tags, verdict, TITLE_MEMO_SOURCE if job_id in memo_decided else "heuristic",
+            )
             stats["processed"] += 1
-            if next_status == JobStatus.ROLE_NOMATCH:
-                stats["irrelevant"] += 1
-            elif is_target:
-                stats["targetRole"] += 1
+            stats["prescreenedNonEu"] += 1
+        except Exception as e:
+            LOG.job("error", job_id, "unhandled error persisting prescreen", error=str(e))
+            stats["errors"] += 1
+            stats["failedIds"].append(job_id)
+
+    # Duplicates — copy the role tags of an already-tagged copy of the posting,
+    # including jobs the paid budget would have deferred
+    donors = await load_duplicate_donors(
+        db, [job.get("id") for job in plan.paid + plan.deferred],
+        "c.role_frontend_react, c.role_ai_engineer, c.role_confidence, c.role_reason",
+        "c.role_confidence IS NOT NULL AND c.status NOT IN ('new', 'enhanced', 'stale')",
+    )
+    for job in [j for j in plan.paid + plan.deferred if j.get("id") in donors]:
+        job_id = job.get("id")
+        try:
+            await apply(job, _donor_role_tags(donors[job_id]), "duplicate")
+            stats["duplicates"] += 1
+        except Exception as e:
+            LOG.job("error", job_id, "unhandled error copying duplicate role tags", error=str(e))
+            stats["errors"] += 1
+            stats["failedIds"].append(job_id)
+    plan.paid     = [j for j in plan.paid if j.get("id") not in donors]
+    plan.deferred = [j for j in plan.deferred if j.get("id") not in donors]
+
+    # kNN — one batched embedding call; jobs whose labelled neighbours agree
+    # take their tags, the rest go on to the chat tiers
+    index   = _role_index(env)
+    vectors: dict = {}
+    votes:   dict = {}
+    if index is not None and ai_binding and (plan.paid or plan.deferred):
+        try:
+            votes, vectors = await knn_votes(
+                plan.paid + plan.deferred, lambda texts: _embed_texts(ai_binding, texts), index,
+            )
+        except Exception as e:
+            LOG.warn("role kNN tier skipped", phase="tag", error=str(e))
+    for job in [j for j in plan.paid + plan.deferred if j.get("id") in votes]:
+        job_id = job.get("id")
+        try:
+            await apply(job, _knn_role_tags(votes[job_id]), "knn")
+            stats["knn"] += 1
+        except Exception as e:
+            LOG.job("error", job_id, "unhandled error applying knn role tags", error=str(e))
+            stats["errors"] += 1
+            stats["failedIds"].append(job_id)
+    plan.paid     = [j for j in plan.paid if j.get("id") not in votes]
+    plan.deferred = [j for j in plan.deferred if j.get("id") not in votes]
+
+    for job in plan.paid:
+        job_id = job.get("id", "unknown")
+        try:
+            tags, source = await _run_role_tier_pipeline(
+                job, ai_binding, deepseek_api_key, deepseek_base_url, deepseek_model, stats, memo=False,
+            )
+            await apply(job, tags, source)
 
         except Exception as e:
             # Per-job exception: log and continue so one bad job doesn't block the batch
-            print(f"   ❌ Unhandled error tagging job {job_id}: {e}")
+            LOG.job("error", job_id, "unhandled error tagging job", error=str(e))
             stats["errors"] += 1
+            stats["failedIds"].append(job_id)
 
-        # Most jobs handled by keyword heuristic (no API call)
+        # Only paid-tier jobs reach this loop
         await sleep_ms(100)
 
-    print(
-        f"✅ Role tagging complete: {stats['targetRole']} target, "
-        f"{stats['irrelevant']} irrelevant, {stats['errors']} errors"
+    stats["deferred"]   = len(plan.deferred)
+    stats["knnIndexed"] = await index_role_labels(db, ai_binding, index, vectors)
+    stats.update(TITLE_MEMO.since(memo_before))
+    stats["bandLatency"] = band_latency(
+        rows, datetime.now(timezone.utc),
+        exclude=stats["failedIds"] + [job.get("id") for job in plan.deferred],
+    )
+
+    LOG.summary(
+        "role tagging complete", phase="tag",
+        target=stats["targetRole"], irrelevant=stats["irrelevant"],
+        prescreenedNonEu=stats["prescreenedNonEu"], deferred=stats["deferred"],
+        duplicates=stats["duplicates"], knn=stats["knn"], knnIndexed=stats["knnIndexed"],
+        titleMemo=stats["titleMemo"], titleMemoCoverage=stats["titleMemoCoverage"],
+        titleMemoAgreement=stats["titleMemoAgreement"], errors=stats["errors"],
     )
+    await flush_routing_log(db)
+    await DEEPSEEK_BUDGET.flush()
     return stats
 
 
@@ -1235,6 +1901,7 @@ async def backfill_role_tags_for_eu_remote_jobs(
     deepseek_base_url: str       = "https://api.deepseek.com/beta",
     deepseek_model: str          = "deepseek-chat",
     limit: int                   = 100,
+    job_ids: list | None         = None,
 ) -> dict:
     """Phase 2b: Backfill role tags for eu-remote jobs missing role_ai_engineer.
 
@@ -1244,37 +1911,45 @@ async def backfill_role_tags_for_eu_remote_jobs(
 
     This is an idempotent repair pass — safe to run multiple times.
     """
-    print("🔍 Phase 2b — Finding eu-remote jobs missing role_ai_engineer...")
+    LOG.info("phase 2b: finding eu-remote jobs missing role_ai_engineer", phase="backfill_roles", limit=limit)
+    await prepare_model_router(db, None)
+    prepare_deepseek_budget(db, None)
+    await prepare_title_memo(db)
 
+    only_ids, id_params = id_filter(job_ids)
     rows = await d1_all(
         db,
-        """SELECT id, title, location, description
+        """SELECT id, title, location, description, company_key
            FROM jobs
            WHERE status = 'eu-remote'
-             AND role_ai_engineer IS NULL
-           ORDER BY created_at DESC
+             AND role_ai_engineer IS NULL""" + only_ids + """
+           ORDER BY priority_rank DESC, created_at DESC
            LIMIT ?""",
-        [limit],
+        [*id_params, limit],
     )
 
-    print(f"📋 Found {len(rows)} eu-remote jobs to backfill role tags")
+    LOG.info("phase 2b: jobs to backfill", phase="backfill_roles", jobs=len(rows))
 
     stats = {
         "processed": 0, "ai_engineer": 0, "not_target": 0,
-        "errors": 0, "workersAI": 0, "deepseek": 0,
+        "errors": 0, "workersAI": 0, "deepseek": 0, "titleMemo": 0,
+        "failedIds": [],
     }
+    stats.update(await strip_company_boilerplate(db, rows))
 
     for job in rows:
         job_id = job.get("id", "unknown")
         try:
-            print(f"🏷️  Backfill role-tag for eu-remote job {job_id}: {job.get('title')}")
-
             tags, source = await _run_role_tier_pipeline(
                 job, ai_binding, deepseek_api_key, deepseek_base_url, deepseek_model, stats
             )
 
             is_ai = tags.isAIEngineer
-            print(f"   {'AI Engineer' if is_ai else 'Not AI'} [{source}] ({tags.confidence}) — {tags.reason}")
+            LOG.job(
+                "info", job_id, "role tags backfilled",
+                title=job.get("title"), aiEngineer=is_ai, source=source,
+                confidence=tags.confidence, reason=tags.reason,
+            )
 
             # Update role columns only — do NOT change status (job stays eu-remote)
             try:
@@ -1298,8 +1973,9 @@ async def backfill_role_tags_for_eu_remote_jobs(
                     ],
                 )
             except Exception as persist_err:
-                print(f"   ⚠️  Persist failed: {persist_err}")
+                LOG.job("error", job_id, "role tag backfill persist failed", error=str(persist_err))
                 stats["errors"] += 1
+                stats["failedIds"].append(job_id)
                 continue
 
             stats["processed"] += 1
@@ -1309,15 +1985,18 @@ async def backfill_role_tags_for_eu_remote_jobs(
                 stats["not_target"] += 1
 
         except Exception as e:
-            print(f"   ❌ Unhandled error backfilling job {job_id}: {e}")
+            LOG.job("error", job_id, "unhandled error backfilling job", error=str(e))
             stats["errors"] += 1
+            stats["failedIds"].append(job_id)
 
         await sleep_ms(100)
 
-    print(
-        f"✅ Backfill complete: {stats['ai_engineer']} AI engineer, "
-        f"{stats['not_target']} not target, {stats['errors']} errors"
+    LOG.summary(
+        "role tag backfill complete", phase="backfill_roles",
+        aiEngineer=stats["ai_engineer"], notTarget=stats["not_target"], errors=stats["errors"],
     )
+    await flush_routing_log(db)
+    await DEEPSEEK_BUDGET.flush()
     return stats
 
 
@@ -1325,39 +2004,185 @@ async def backfill_role_tags_for_eu_remote_jobs(
 # Phase 3 — EU Remote Classification (delegated to eu-classifier worker)
 #
 #   All classification logic (signal extraction, heuristic, LLM tiers) is
-#   centralized in workers/eu-classifier/. This worker delegates via the
-#   EU_CLASSIFIER service binding (or falls back to HTTP fetch).
+#   centralized in workers/eu-classifier/. This worker loads the rows and
+#   hands them to the classifier's classify_jobs RPC, then persists the
+#   results itself in one D1 batch. Older deployments without the RPC are
+#   reached via POST /classify (service binding or HTTP fetch).
 #
 #   The eu-classifier worker owns:
 #     Tier 0 — Keyword heuristic + ATS signals  (free, CPU-only)
-#     Tier 1 — Workers AI via langchain          (free, Cloudflare quota)
+#     Tier 1 — Workers AI via AI.run             (free, Cloudflare quota)
 #     Tier 2 — DeepSeek API                      (paid, fallback only)
 # =========================================================================
 
 
-async def classify_unclassified_jobs(db, env, limit: int = 50) -> dict:
-    """Phase 3: Delegate EU-remote classification to the eu-classifier worker.
+_CLASSIFICATION_UPDATE_SQL = """
+    UPDATE jobs
+    SET score = ?, score_reason = ?, status = ?,
+        is_remote_eu = ?, remote_eu_confidence = ?, remote_eu_reason = ?,
+        updated_at = datetime('now')
+    WHERE id = ?
+"""
+
+
+async def persist_classifications(db, results: list[dict]) -> list:
+    """Write eu-classifier results to D1 in batches; returns ids of rows that failed.
 
-    Uses the EU_CLASSIFIER service binding for zero-latency inter-worker
-    calls. Falls back to HTTP fetch if the binding is not configured.
+    Falls back to per-row writes when a batch is rejected so one bad row
+    doesn't lose the rest of the chunk.
+    """
+    statements = [
+        (_CLASSIFICATION_UPDATE_SQL, [
+            r["score"], r["scoreReason"], r["status"],
+            1 if r["isRemoteEU"] else 0, r["confidence"], r["reason"],
+            r["id"],
+        ])
+        for r in results
+    ]
+    try:
+        await d1_batch(db, statements)
+        return []
+    except Exception as e:
+        LOG.warn("batched classification write failed, retrying row by row", phase="classify", error=str(e))
+
+    failed = []
+    for sql, params in statements:
+        try:
+            await d1_run(db, sql, params)
+        except Exception as e:
+            LOG.job("error", params[-1], "persist failed", error=str(e))
+            failed.append(params[-1])
+    return failed
+
+
+async def classify_via_rpc(db, eu_classifier, limit: int, job_ids: list | None = None) -> dict | None:
+    """Phase 3 over RPC: load rows here, classify remotely, persist here.
+
+    Returns None when the classifier has no ``classify_jobs`` RPC (or the
+    call fails) so the caller can fall back to POST /classify. Rows that
+    came back without a result or failed to persist are in ``failedIds``.
+    """
+    only_ids, id_params = id_filter(job_ids)
+    rows = await d1_all(
+        db,
+        f"SELECT {_PRESCREEN_COLUMNS} FROM jobs WHERE status = ?{only_ids} ORDER BY priority_rank DESC, created_at DESC LIMIT ?",
+        [JobStatus.ROLE_MATCH.value, *id_params, limit],
+    )
+    print(f"🔍 Phase 3 — Classifying {len(rows)} jobs via eu-classifier RPC...")
+    if not rows:
+        return {
+            "processed": 0, "euRemote": 0, "nonEuRemote": 0,
+            "errors": 0, "workersAI": 0, "deepseek": 0, "heuristic": 0,
+        }
+
+    try:
+        with TRACER.span("service", "service", url="rpc:eu-classifier/classify_jobs", rows=len(rows)):
+            data = from_rpc(await eu_classifier.classify_jobs(to_rpc(rows), to_rpc(TRACER.context())))
+    except Exception as e:
+        print(f"   ⚠️  eu-classifier RPC unavailable: {e}")
+        return None
+
+    results = data.get("results", [])
+    stats   = dict(data.get("stats", {}))
+    failed  = await persist_classifications(db, results)
+    if failed:
+        stats["processed"] = stats.get("processed", 0) - len(failed)
+        stats["errors"]    = stats.get("errors", 0) + len(failed)
+    answered = {r.get("id") for r in results}
+    stats["failedIds"] = [r["id"] for r in rows if r["id"] not in answered] + failed
+    stats["bandLatency"] = band_latency(rows, datetime.now(timezone.utc), exclude=stats["failedIds"])
+
+    print(f"📋 eu-classifier: {stats.get('processed', 0)} classified, "
+          f"{stats.get('euRemote', 0)} EU, {stats.get('nonEuRemote', 0)} non-EU")
+    return stats
+
+
+async def reuse_duplicate_classifications(db, limit: int, job_ids: list | None = None) -> dict:
+    """Copy the EU verdict of a classified duplicate posted for the same location.
+
+    Returns ``{processed, euRemote, nonEuRemote}`` for the jobs it classified;
+    those leave 'role-match', so the classifier never sees them.
+    """
+    only_ids, id_params = id_filter(job_ids)
+    try:
+        rows = await d1_all(
+            db,
+            f"""SELECT id FROM jobs
+                WHERE status = ? AND dup_cluster_id IS NOT NULL{only_ids}
+                ORDER BY priority_rank DESC, created_at DESC
+                LIMIT ?""",
+            [JobStatus.ROLE_MATCH.value, *id_params, limit],
+        )
+    except Exception as e:
+        LOG.warn("duplicate classification lookup skipped", error=str(e))
+        rows = []
+    donors = await load_duplicate_donors(
+        db, [r["id"] for r in rows],
+        """j.location, j.country, j.workplace_type,
+           c.location AS donor_location, c.country AS donor_country,
+           c.workplace_type AS donor_workplace_type,
+           c.status, c.score, c.score_reason, c.is_remote_eu,
+           c.remote_eu_confidence, c.remote_eu_reason""",
+        "c.status IN ('eu-remote', 'non-eu') AND c.is_remote_eu IS NOT NULL",
+        match=same_location,
+    )
+    results = [
+        {
+            "id":          job_id,
+            "score":       d["score"],
+            "scoreReason": f"[duplicate of {d['donor_id']}] {d.get('score_reason') or ''}",
+            "status":      d["status"],
+            "isRemoteEU":  bool(d["is_remote_eu"]),
+            "confidence":  d["remote_eu_confidence"],
+            "reason":      d["remote_eu_reason"],
+        }
+        for job_id, d in donors.items()
+    ]
+    failed = set(await persist_classifications(db, results)) if results else set()
+    copied = [r for r in results if r["id"] not in failed]
+    eu     = sum(1 for r in copied if r["isRemoteEU"])
+    if copied:
+        LOG.info("copied EU verdicts from duplicates", phase="classify", jobs=len(copied), euRemote=eu)
+    return {"processed": len(copied), "euRemote": eu, "nonEuRemote": len(copied) - eu}
+
+
+async def classify_unclassified_jobs(db, env, limit: int = 50, job_ids: list | None = None) -> dict:
+    """Phase 3: EU-remote classification.
+
+    Jobs whose duplicate was already classified for the same location take
+    its verdict (reported as ``duplicates``); the rest go to the eu-classifier.
+    """
+    reused = await reuse_duplicate_classifications(db, limit, job_ids)
+    stats  = await _delegate_classification(db, env, max(1, limit - reused["processed"]), job_ids)
+    return {
+        **stats,
+        "processed":   stats.get("processed", 0) + reused["processed"],
+        "euRemote":    stats.get("euRemote", 0) + reused["euRemote"],
+        "nonEuRemote": stats.get("nonEuRemote", 0) + reused["nonEuRemote"],
+        "duplicates":  reused["processed"],
+    }
+
+
+async def _delegate_classification(db, env, limit: int = 50, job_ids: list | None = None) -> dict:
+    """Delegate EU-remote classification to the eu-classifier worker.
+
+    Prefers the ``classify_jobs`` RPC over the EU_CLASSIFIER service binding
+    (rows pushed from here, results persisted here in one batch). Falls back
+    to POST /classify over the binding, then over HTTP; both forward
+    ``job_ids`` and return the classifier's ``failedIds``.
     """
     eu_classifier = getattr(env, "EU_CLASSIFIER", None)
+    request_body  = json.dumps({"limit": limit, "jobIds": job_ids} if job_ids is not None else {"limit": limit})
 
     if eu_classifier is not None:
-        # Service binding — call the eu-classifier worker directly
+        stats = await classify_via_rpc(db, eu_classifier, limit, job_ids)
+        if stats is not None:
+            return stats
+
+        # Service binding fetch — eu-classifier deployments without the RPC
         print("🔍 Phase 3 — Delegating to eu-classifier via service binding...")
         try:
-            request_body = json.dumps({"limit": limit})
-            response = await eu_classifier.fetch(
-                JsRequest.new(
-                    "https://eu-classifier/classify",
-                    to_js_obj({
-                        "method": "POST",
-                        "headers": {"Content-Type": "application/json"},
-                        "body": request_body,
-                    }),
-                )
-            )
+            response = await service_post(eu_classifier, "https://eu-classifier/classify", request_body)
             data = to_py(await response.json())
             if data.get("success"):
                 stats = data.get("stats", {})
@@ -1377,8 +2202,8 @@ async def classify_unclassified_jobs(db, env, limit: int = 50) -> dict:
             data = await fetch_json(
                 f"{eu_classifier_url.rstrip('/')}/classify",
                 method="POST",
-                headers={"Content-Type": "application/json"},
-                body=json.dumps({"limit": limit}),
+                headers=TRACER.headers({"Content-Type": "application/json"}),
+                body=request_body,
                 retries=2,
             )
             if data.get("success"):
@@ -1403,86 +2228,87 @@ async def classify_unclassified_jobs(db, env, limit: int = 50) -> dict:
 #   but have no entries yet in job_skill_tags.
 #
 #   Same two-tier strategy as Phase 2/3:
-#     Tier 1 — Workers AI via langchain  (free)
+#     Tier 1 — Workers AI via AI.run     (free)
 #     Tier 2 — DeepSeek API              (paid fallback)
+#
+#   The prompt lists only the vocabulary groups a job can use (skill_vocab.py).
 # =========================================================================
 
-_TAGS_STR = ", ".join(sorted(SKILL_TAGS))
+# One system message per vocabulary group set, rendered and JSON-encoded on
+# first use; jobs with the same group set share it (and its cached prefix).
+_SKILL_PROMPTS: dict[tuple[str, ...], ChatPrompt] = {}
+
+
+def _skill_prompt(groups: tuple[str, ...] = SKILL_GROUPS) -> ChatPrompt:
+    prompt = _SKILL_PROMPTS.get(groups)
+    if prompt is None:
+        prompt = SKILL_EXTRACTION_PROMPT.partial(tags=", ".join(skill_vocabulary(groups)))
+        _SKILL_PROMPTS[groups] = prompt
+    return prompt
+
+
+def _skill_values(job: dict) -> dict:
+    """_skill_prompt() values for one job."""
+    return {
+        "title":       job.get("title", "N/A"),
+        "description": _prompt_description(job)[:6000],
+    }
 
 
 async def _extract_with_workers_ai(
-    job: dict, ai_binding
+    job: dict, ai_binding, model: str = WORKERS_AI_MODEL, prompt: ChatPrompt | None = None,
 ) -> list[ExtractedSkill] | None:
-    """Tier 1: skill extraction via Workers AI."""
+    """Tier 1: skill extraction via Workers AI (streamed; plain AI.run fallback)."""
     if ai_binding is None:
         return None
+    prompt = prompt or _skill_prompt()
+    values = _skill_values(job)
     try:
-        llm   = ChatCloudflareWorkersAI(
-            model_name=WORKERS_AI_MODEL,
-            binding=ai_binding,
-            temperature=0.1,
+        result = await stream_workers_ai_json(
+            ai_binding, model, prompt, values, ("skills",), temperature=0.1,
         )
-        chain = SKILL_EXTRACTION_PROMPT | llm
-        response = await chain.ainvoke({
-            "tags":        _TAGS_STR,
-            "title":       job.get("title", "N/A"),
-            "description": (job.get("description") or "")[:6000],
-        })
-        content_str = _guard_content(response.content)
-        if not content_str:
-            return None
-        json_str = _extract_json_object(content_str)
-        raw      = json.loads(json_str)
-        output   = JobSkillOutput.model_validate(raw)
-        return output.skills
     except Exception as e:
-        print(f"   ⚠️  Workers AI skill extraction failed: {e}")
+        LOG.job("warn", job.get("id"), "workers ai skills stream failed, retrying without", model=model, error=str(e))
+        result = None
+    try:
+        if result is not None:
+            raw = _stream_content(result)
+        else:
+            content_str = await run_workers_ai_text(
+                ai_binding, model, prompt, values, temperature=0.1,
+            )
+            raw = json.loads(_extract_json_object(content_str)) if content_str else None
+        return JobSkillOutput.model_validate(raw).skills if raw is not None else None
+    except Exception as e:
+        LOG.job("warn", job.get("id"), "workers ai skill extraction failed", model=model, error=str(e))
         return None
 
 
 async def _extract_with_deepseek(
-    job: dict, api_key: str, base_url: str, model: str
+    job: dict, api_key: str, base_url: str, model: str, prompt: ChatPrompt | None = None,
 ) -> list[ExtractedSkill] | None:
-    """Tier 2: skill extraction via DeepSeek fallback."""
-    prompt_msgs = SKILL_EXTRACTION_PROMPT.format_messages(
-        tags        = _TAGS_STR,
-        title       = job.get("title", "N/A"),
-        description = (job.get("description") or "")[:6000],
-    )
-    role_map = {"system": "system", "human": "user", "ai": "assistant"}
-    messages = [{"role": role_map.get(m.type, m.type), "content": m.content} for m in prompt_msgs]
-
+    """Tier 2: skill extraction via DeepSeek fallback (streamed)."""
     try:
-        url     = f"{base_url.rstrip('/')}/chat/completions"
-        payload = json.dumps({
-            "model":           model,
-            "temperature":     0.1,
-            "max_tokens":      1000,
-            "response_format": {"type": "json_object"},
-            "messages":        messages,
-        })
-        data = await fetch_json(
-            url,
-            method  = "POST",
-            headers = {
-                "Authorization": f"Bearer {api_key}",
-                "Content-Type":  "application/json",
-            },
-            body    = payload,
-            retries = 2,
-        )
-        content = (
-            (data.get("choices") or [{}])[0]
-            .get("message", {})
-            .get("content", "")
+        result = await stream_json(
+            f"{base_url.rstrip('/')}/chat/completions",
+            api_key,
+            prompt or _skill_prompt(),
+            _skill_values(job),
+            ("skills",),
+            model           = model,
+            temperature     = 0.1,
+            max_tokens      = 1000,
+            response_format = {"type": "json_object"},
         )
-        if not content.strip():
+        DEEPSEEK_USAGE.record({"usage": result.usage})
+        DEEPSEEK_BUDGET.record(result.usage, result.prompt_chars, len(result.text))
+        raw = _stream_content(result)
+        if raw is None:
             raise ValueError("Empty content in DeepSeek skill extraction response")
-        raw    = json.loads(content)
         output = JobSkillOutput.model_validate(raw)
         return output.skills
     except Exception as e:
-        print(f"   ⚠️  DeepSeek skill extraction failed: {e}")
+        LOG.job("warn", job.get("id"), "deepseek skill extraction failed", error=str(e))
         return None
 
 
@@ -1494,19 +2320,36 @@ async def extract_skills_for_job(
     base_url: str,
     model:    str,
 ) -> dict:
-    """Extract and persist skills for a single job into job_skill_tags."""
+    """Extract and persist skills for a single job into job_skill_tags.
+
+    The prompt carries the job's vocabulary groups only. Audited jobs get
+    the full vocabulary, and the result reports how many of the tags found
+    the pruned one would have kept (``vocabKept`` / ``vocabFound``).
+    """
     skills: list[ExtractedSkill] | None = None
+    groups  = skill_groups(job, _prompt_description(job))
+    audited = vocab_audited(job.get("id"))
+    prompt  = _skill_prompt(SKILL_GROUPS if audited else groups)
+    result  = {
+        "extracted": 0, "vocabTags": len(skill_vocabulary(SKILL_GROUPS if audited else groups)),
+        "vocabAudited": audited, "vocabKept": 0, "vocabFound": 0,
+    }
 
-    # Tier 1 — Workers AI
+    # Tier 1 — Workers AI (routed: small model for short descriptions,
+    # escalating when it finds nothing)
     if ai_binding:
-        skills = await _extract_with_workers_ai(job, ai_binding)
+        skills = await run_routed(
+            MODEL_ROUTER, TASK_SKILLS, len(_prompt_description(job)[:6000]),
+            lambda model: _extract_with_workers_ai(job, ai_binding, model, prompt),
+            bool,
+        )
 
-    # Tier 2 — DeepSeek fallback
-    if not skills and api_key:
-        skills = await _extract_with_deepseek(job, api_key, base_url, model)
+    # Tier 2 — DeepSeek fallback, while the shared budget allows
+    if not skills and api_key and await DEEPSEEK_BUDGET.acquire():
+        skills = await _extract_with_deepseek(job, api_key, base_url, model, prompt)
 
     if not skills:
-        return {"extracted": 0}
+        return result
 
     # Validate: only canonical tags, evidence required (min 8 chars), max 30 skills
     valid = [
@@ -1515,7 +2358,9 @@ async def extract_skills_for_job(
     ][:30]
 
     if not valid:
-        return {"extracted": 0}
+        return result
+    if audited:
+        result["vocabKept"], result["vocabFound"] = vocab_recall((s.tag for s in valid), groups)
 
     # Upsert: delete existing then insert fresh batch
     await d1_run(db, "DELETE FROM job_skill_tags WHERE job_id = ?", [job["id"]])
@@ -1528,68 +2373,622 @@ async def extract_skills_for_job(
             [job["id"], s.tag, s.level, round(s.confidence, 3), s.evidence],
         )
 
-    return {"extracted": len(valid)}
+    result["extracted"] = len(valid)
+    return result
+
+
+_COPY_SKILLS_SQL = """
+INSERT OR REPLACE INTO job_skill_tags (job_id, tag, level, confidence, evidence, extracted_at, version)
+SELECT ?, tag, level, confidence, evidence, datetime('now'), version
+FROM job_skill_tags WHERE job_id = ?
+"""
 
 
 async def extract_skills_for_classified_jobs(
     db,
     env,
     limit: int = 50,
+    job_ids: list | None = None,
 ) -> dict:
     """Phase 4: Extract skills for classified jobs that have no skill tags yet.
 
-    Targets eu-remote, non-eu, and role-match jobs without existing job_skill_tags rows.
+    Targets eu-remote and role-match jobs without existing job_skill_tags rows —
+    the only ones job-matcher can serve. Non-EU jobs are included only when
+    EXTRACT_SKILLS_NON_EU is set. eu-remote jobs go first.
     Runs after Phase 3 so the description has been enhanced by Phase 1.
+    ``job_ids`` restricts the phase to those jobs; failures are returned in
+    ``failedIds``.
     """
     api_key  = getattr(env, "DEEPSEEK_API_KEY", None) or getattr(env, "OPENAI_API_KEY", None)
     base_url = getattr(env, "DEEPSEEK_BASE_URL", None) or "https://api.deepseek.com/beta"
     model    = getattr(env, "DEEPSEEK_MODEL", None) or "deepseek-chat"
     ai_binding = getattr(env, "AI", None)
 
-    print("🔍 Phase 4 — Finding classified jobs without skill tags...")
+    statuses     = skill_extraction_statuses(_env_flag(env, "EXTRACT_SKILLS_NON_EU"))
+    placeholders = ", ".join("?" for _ in statuses)
+    only_ids, id_params = id_filter(job_ids, "j.id")
+
+    LOG.info("phase 4: finding jobs without skill tags", phase="extract", statuses=list(statuses), limit=limit)
+    await prepare_model_router(db, env)
+    prepare_deepseek_budget(db, env)
 
     rows = await d1_all(
         db,
-        """
-        SELECT j.id, j.title, j.description
+        f"""
+        SELECT j.id, j.title, j.description, j.company_key, j.priority, j.created_at,
+               j.role_frontend_react, j.role_ai_engineer
         FROM jobs j
         LEFT JOIN job_skill_tags t ON t.job_id = j.id
-        WHERE j.status IN ('eu-remote', 'non-eu', 'role-match')
+        WHERE j.status IN ({placeholders})
           AND j.description IS NOT NULL
-          AND t.job_id IS NULL
-        ORDER BY j.created_at DESC
+          AND t.job_id IS NULL{only_ids}
+        ORDER BY (j.status = 'eu-remote') DESC, j.priority_rank DESC, j.created_at DESC
         LIMIT ?
         """,
-        [limit],
+        [*statuses, *id_params, limit],
     )
 
-    print(f"📋 Found {len(rows)} jobs needing skill extraction")
+    LOG.info("phase 4: jobs needing skill extraction", phase="extract", jobs=len(rows))
+
+    stats = {"processed": 0, "extracted": 0, "errors": 0, "duplicates": 0, "failedIds": []}
+    stats.update(await strip_company_boilerplate(db, rows))
+    vocab_tags, vocab_prompts = 0, 0
+    vocab_audited, vocab_kept, vocab_found = 0, 0, 0
 
-    stats = {"processed": 0, "extracted": 0, "errors": 0}
+    # Duplicates — copy the skill tags of an already-extracted copy of the posting
+    donors = await load_duplicate_donors(
+        db, [job.get("id") for job in rows], "",
+        "EXISTS (SELECT 1 FROM job_skill_tags t WHERE t.job_id = c.id)",
+    )
+    if donors:
+        try:
+            await d1_batch(db, [(_COPY_SKILLS_SQL, [job_id, d["donor_id"]]) for job_id, d in donors.items()])
+            stats["processed"]  += len(donors)
+            stats["duplicates"] += len(donors)
+        except Exception as e:
+            LOG.warn("copying duplicate skill tags failed", jobs=len(donors), error=str(e))
+            donors = {}
 
     for job in rows:
         job_id = job.get("id", "unknown")
+        if job_id in donors:
+            continue
         try:
-            print(f"🔬 Extracting skills for job {job_id}: {job.get('title')}")
             result = await extract_skills_for_job(
                 db, job, ai_binding, api_key, base_url, model
             )
             stats["processed"] += 1
             stats["extracted"] += result["extracted"]
-            print(f"   ✅ {result['extracted']} skills extracted")
+            vocab_tags    += result["vocabTags"]
+            vocab_prompts += 1
+            vocab_audited += result["vocabAudited"]
+            vocab_kept    += result["vocabKept"]
+            vocab_found   += result["vocabFound"]
+            LOG.job("info", job_id, "skills extracted", title=job.get("title"), skills=result["extracted"])
         except Exception as e:
-            print(f"   ❌ Error extracting skills for job {job_id}: {e}")
+            LOG.job("error", job_id, "error extracting skills", error=str(e))
             stats["errors"] += 1
+            stats["failedIds"].append(job_id)
 
         await sleep_ms(200)
 
-    print(
-        f"✅ Skill extraction complete: {stats['extracted']} skills across "
-        f"{stats['processed']} jobs, {stats['errors']} errors"
+    stats["skillVocabTags"]    = round(vocab_tags / vocab_prompts, 1) if vocab_prompts else 0.0
+    stats["skillVocabAudited"] = vocab_audited
+    stats["skillVocabRecall"]  = round(vocab_kept / vocab_found, 4) if vocab_found else None
+    stats["bandLatency"] = band_latency(rows, datetime.now(timezone.utc), exclude=stats["failedIds"])
+    LOG.summary(
+        "skill extraction complete", phase="extract",
+        skills=stats["extracted"], jobs=stats["processed"], duplicates=stats["duplicates"],
+        boilerplate=stats["boilerplateStripped"], vocabTags=stats["skillVocabTags"],
+        vocabRecall=stats["skillVocabRecall"], errors=stats["errors"],
+    )
+    await flush_routing_log(db)
+    await DEEPSEEK_BUDGET.flush()
+    return stats
+
+
+# =========================================================================
+# Priority scoring
+#   Jobs are scored once, before Phase 1 selects them, from freshness,
+#   source kind, the Tier 1 role heuristic and the company's EU-remote
+#   history. Phase selectors order by priority_rank, which ages priorities
+#   implicitly — see priority.py.
+#
+#   D1 migration: migrations/0035_add_job_priority.sql
+# =========================================================================
+
+# Statuses whose jobs a phase selector will still pick up
+_PRIORITY_STATUSES = tuple(dict.fromkeys((
+    JobStatus.NEW.value, JobStatus.ENHANCED.value, JobStatus.ROLE_MATCH.value,
+    *skill_extraction_statuses(include_non_eu=True),
+)))
+
+
+async def load_company_history(db, company_keys) -> dict[str, tuple[int, int]]:
+    """``{company_key: (eu_remote, classified)}`` over the companies' classified jobs."""
+    keys = sorted({k for k in company_keys if k})
+    if not keys:
+        return {}
+    rows = await d1_all(
+        db,
+        """SELECT company_key,
+                  SUM(status = 'eu-remote') AS eu_remote,
+                  COUNT(*)                  AS classified
+           FROM jobs
+           WHERE company_key IN (SELECT value FROM json_each(?))
+             AND status IN ('eu-remote', 'non-eu')
+           GROUP BY company_key""",
+        [json.dumps(keys)],
+    )
+    return {r["company_key"]: (int(r["eu_remote"] or 0), int(r["classified"] or 0)) for r in rows}
+
+
+async def score_job_priorities(db, limit: int = SCORE_BATCH, job_ids: list | None = None) -> int:
+    """Score unscored jobs that are still in the pipeline; returns how many were scored."""
+    placeholders = ", ".join("?" for _ in _PRIORITY_STATUSES)
+    only_ids, id_params = id_filter(job_ids)
+    rows = await d1_all(
+        db,
+        f"""SELECT id, title, substr(description, 1, 5000) AS description,
+                   source_kind, company_key, posted_at, first_published, created_at
+            FROM jobs
+            WHERE priority IS NULL
+              AND (status IS NULL OR status IN ({placeholders})){only_ids}
+            ORDER BY created_at DESC
+            LIMIT ?""",
+        [*_PRIORITY_STATUSES, *id_params, limit],
+    )
+    if not rows:
+        return 0
+
+    history = await load_company_history(db, (r.get("company_key") for r in rows))
+    now     = datetime.now(timezone.utc)
+    statements = []
+    for job in rows:
+        tags     = _keyword_role_tag(job)
+        role_hit = None if tags is None else (tags.isFrontendReact or tags.isAIEngineer)
+        priority = job_priority(job, role_hit, history.get(job.get("company_key")), now)
+        statements.append((
+            "UPDATE jobs SET priority = ?, priority_rank = ? WHERE id = ?",
+            [priority, priority_rank(priority, now), job["id"]],
+        ))
+    await d1_batch(db, statements)
+    LOG.info("priorities scored", jobs=len(rows), companies=len(history))
+    return len(rows)
+
+
+# =========================================================================
+# Duplicate detection
+#   Jobs reaching 'enhanced' get a MinHash signature; LSH buckets in D1
+#   find earlier copies of the same posting and put the job in their
+#   dup_cluster_id. Phases 2-4 then copy labels from an already-processed
+#   member of the cluster instead of paying for them again — see dedup.py.
+#
+#   D1 migration: migrations/0037_add_job_duplicates.sql
+# =========================================================================
+
+_FINGERPRINT_CHARS = 20000   # description prefix that is shingled
+
+_DUPLICATE_DONOR_SQL = """
+SELECT j.id AS job_id, c.id AS donor_id{columns}
+FROM jobs j
+JOIN jobs c ON c.dup_cluster_id = j.dup_cluster_id AND c.id <> j.id
+WHERE j.id IN (SELECT value FROM json_each(?)) AND {where}
+ORDER BY c.id
+"""
+
+
+async def fingerprint_jobs(db, limit: int = FINGERPRINT_BATCH, job_ids: list | None = None) -> dict:
+    """Fingerprint jobs without a cluster and assign ``dup_cluster_id`` (best-effort).
+
+    Jobs waiting at 'enhanced' go first, oldest first, so the earliest copy
+    of a posting founds its cluster; spare room backfills processed jobs so
+    they can serve as donors.
+    """
+    only_ids, id_params = id_filter(job_ids)
+    try:
+        rows = await d1_all(
+            db,
+            f"""SELECT id, title, substr(description, 1, {_FINGERPRINT_CHARS}) AS description
+                FROM jobs
+                WHERE dup_cluster_id IS NULL AND status IS NOT NULL AND status <> ?{only_ids}
+                ORDER BY (status = ?) DESC, created_at ASC, id ASC
+                LIMIT ?""",
+            [JobStatus.NEW.value, *id_params, JobStatus.ENHANCED.value, limit],
+        )
+        if not rows:
+            return {"fingerprinted": 0, "duplicatesFound": 0}
+
+        signatures = [(r["id"], fingerprint(r.get("title"), r.get("description"))) for r in rows]
+        buckets    = sorted({key for _, sig in signatures if sig for key in band_keys(sig)})
+        indexed    = []
+        for i in range(0, len(buckets), BUCKET_CHUNK):
+            indexed += await d1_all(
+                db,
+                """SELECT b.bucket, b.job_id, f.signature, j.dup_cluster_id AS cluster_id
+                   FROM job_lsh_bands b
+                   JOIN job_fingerprints f ON f.job_id = b.job_id
+                   JOIN jobs j ON j.id = b.job_id
+                   WHERE b.bucket IN (SELECT value FROM json_each(?))""",
+                [json.dumps(buckets[i:i + BUCKET_CHUNK])],
+            )
+
+        assignments = cluster_batch(signatures, indexed)
+        statements  = []
+        for a in assignments:
+            if a.signature is not None:
+                statements.append((
+                    "INSERT OR REPLACE INTO job_fingerprints (job_id, signature) VALUES (?, ?)",
+                    [a.job_id, encode_signature(a.signature)],
+                ))
+                statements.append((
+                    "INSERT OR IGNORE INTO job_lsh_bands (bucket, job_id) SELECT value, ? FROM json_each(?)",
+                    [a.job_id, json.dumps(list(a.buckets))],
+                ))
+            statements.append((
+                "UPDATE jobs SET dup_cluster_id = ?, dup_of = ?, dup_similarity = ? WHERE id = ?",
+                [a.cluster_id, a.duplicate_of, a.similarity, a.job_id],
+            ))
+        await d1_batch(db, statements)
+    except Exception as e:
+        # Tables may not exist yet — the pipeline runs without duplicate reuse
+        LOG.warn("fingerprinting skipped", error=str(e))
+        return {"fingerprinted": 0, "duplicatesFound": 0}
+
+    found = sum(a.duplicate_of is not None for a in assignments)
+    LOG.info("jobs fingerprinted", jobs=len(assignments), duplicates=found)
+    return {"fingerprinted": len(assignments), "duplicatesFound": found}
+
+
+async def load_duplicate_donors(db, job_ids, columns: str, where: str, match=None) -> dict:
+    """``{job_id: row}`` with one processed cluster-mate per job (``c.`` = the donor).
+
+    ``where`` restricts donors to those whose labels are usable; ``match``
+    filters rows further in Python. Lookup errors mean no reuse.
+    """
+    ids = list(dict.fromkeys(i for i in job_ids if i is not None))
+    if not ids:
+        return {}
+    try:
+        rows = await d1_all(
+            db,
+            _DUPLICATE_DONOR_SQL.format(columns=f", {columns}" if columns else "", where=where),
+            [json.dumps(ids)],
+        )
+    except Exception as e:
+        LOG.warn("duplicate lookup skipped", error=str(e))
+        return {}
+    return pick_donors(rows, match)
+
+
+# =========================================================================
+# Company boilerplate
+#   Paragraphs a company repeats in every posting ("About us", benefits,
+#   EEO) are learned per company_key in Phase 1 and stripped from the text
+#   the role heuristic and the tagging / skill prompts see. The stored
+#   description is never changed — see boilerplate.py.
+#
+#   D1 migration: migrations/0039_add_company_boilerplate.sql
+# =========================================================================
+
+_STALE_BOILERPLATE_SQL = """
+SELECT j.company_key, COUNT(DISTINCT j.dup_cluster_id) AS postings
+FROM jobs j
+LEFT JOIN company_boilerplate b ON b.company_key = j.company_key
+WHERE j.company_key IN (
+        SELECT company_key FROM jobs WHERE status = ? AND company_key IS NOT NULL{only_ids}
+      )
+  AND j.dup_cluster_id IS NOT NULL
+  AND (b.company_key IS NULL OR b.updated_at < datetime('now', ?))
+GROUP BY j.company_key
+HAVING postings >= ?
+ORDER BY postings DESC
+LIMIT ?
+"""
+
+_BOILERPLATE_SAMPLE_SQL = """
+SELECT substr(description, 1, 20000) AS description
+FROM jobs
+WHERE company_key = ? AND id = dup_cluster_id AND description IS NOT NULL
+ORDER BY created_at DESC
+LIMIT ?
+"""
+
+
+def _keep_block(block: str) -> bool:
+    """Blocks never treated as boilerplate: they name a skill tag or a role keyword."""
+    return mentions_skill(block) or _mentions_role_keyword(block)
+
+
+def _prompt_description(job: dict) -> str:
+    """Description text for heuristics and prompts: boilerplate-stripped when available."""
+    text = job.get("prompt_description")
+    return text if text is not None else (job.get("description") or "")
+
+
+async def learn_company_boilerplate(db, limit: int = BOILERPLATE_BATCH, job_ids: list | None = None) -> dict:
+    """(Re)learn boilerplate models for companies with jobs waiting at 'enhanced' (best-effort).
+
+    Companies without a model, or with one older than ``REFRESH_DAYS``, go
+    first by posting count. Samples take one posting per duplicate cluster.
+    A company with too few postings gets an empty model, so it is only
+    rechecked after the next refresh.
+    """
+    only_ids, id_params = id_filter(job_ids)
+    try:
+        companies = await d1_all(
+            db,
+            _STALE_BOILERPLATE_SQL.format(only_ids=only_ids),
+            [JobStatus.ENHANCED.value, *id_params, f"-{BOILERPLATE_REFRESH_DAYS} days",
+             BOILERPLATE_MIN_POSTINGS, limit],
+        )
+        statements = []
+        learned    = 0
+        for c in companies:
+            rows  = await d1_all(db, _BOILERPLATE_SAMPLE_SQL, [c["company_key"], BOILERPLATE_SAMPLE])
+            model = learn_boilerplate([r.get("description") for r in rows], keep=_keep_block)
+            learned += model is not None
+            statements.append((
+                """INSERT OR REPLACE INTO company_boilerplate
+                     (company_key, shingles, shingle_count, postings, updated_at)
+                   VALUES (?, ?, ?, ?, datetime('now'))""",
+                [c["company_key"], encode_boilerplate(model or frozenset()), len(model or ()), len(rows)],
+            ))
+        await d1_batch(db, statements)
+    except Exception as e:
+        # Table may not exist yet — prompts keep the full description
+        LOG.warn("boilerplate learning skipped", error=str(e))
+        return {"boilerplateModels": 0}
+
+    if companies:
+        LOG.info("boilerplate models learned", companies=len(companies), models=learned)
+    return {"boilerplateModels": learned}
+
+
+async def load_boilerplate(db, company_keys) -> dict[str, frozenset]:
+    """``{company_key: model}`` for the companies that have a non-empty one."""
+    keys = sorted({k for k in company_keys if k})
+    if not keys:
+        return {}
+    try:
+        rows = await d1_all(
+            db,
+            """SELECT company_key, shingles FROM company_boilerplate
+               WHERE company_key IN (SELECT value FROM json_each(?)) AND shingle_count > 0""",
+            [json.dumps(keys)],
+        )
+    except Exception as e:
+        LOG.warn("boilerplate lookup skipped", error=str(e))
+        return {}
+    models = {r["company_key"]: decode_boilerplate(r.get("shingles")) for r in rows}
+    return {k: m for k, m in models.items() if m}
+
+
+async def strip_company_boilerplate(db, jobs: list[dict]) -> dict:
+    """Set ``prompt_description`` on ``jobs`` whose company has a boilerplate model.
+
+    Returns ``boilerplateStripped`` (jobs that lost at least one block) and
+    ``boilerplateCharsSaved`` over the prompt window, for the phase stats.
+    Savings compare plain text with plain text, so markup removed by the
+    block split doesn't count as saved.
+    """
+    models = await load_boilerplate(db, (job.get("company_key") for job in jobs))
+    stripped, saved = 0, 0
+    for job in jobs:
+        model = models.get(job.get("company_key"))
+        if model is None:
+            continue
+        original = job.get("description") or ""
+        text     = strip_boilerplate(original, model, keep=_keep_block)
+        if text != original:
+            job["prompt_description"] = text
+            stripped += 1
+            plain     = "\n".join(boilerplate_blocks(original))
+            saved    += len(plain[:6000]) - len(text[:6000])
+    return {"boilerplateStripped": stripped, "boilerplateCharsSaved": saved}
+
+
+# =========================================================================
+# Run records + adaptive batch sizing
+#   Each pipeline run stores per-phase metrics (limit, processed, errors,
+#   elapsed time, tier mix) and the batch plan that produced them in
+#   pipeline_runs. The next run's batch sizes are derived from those
+#   records — see batch_tuning.py.
+#
+#   D1 migration: migrations/0031_add_pipeline_runs.sql
+# =========================================================================
+
+def _env_number(env, name: str, default):
+    """Read a numeric wrangler var (vars arrive as strings), falling back to default."""
+    raw = getattr(env, name, None)
+    try:
+        return type(default)(raw) if raw not in (None, "") else default
+    except (TypeError, ValueError):
+        return default
+
+
+def role_paid_budget(env) -> int | None:
+    """Max jobs per run sent to paid role-tagging tiers (ROLE_PAID_BUDGET); unset = no cap."""
+    budget = _env_number(env, "ROLE_PAID_BUDGET", -1)
+    return budget if budget >= 0 else None
+
+
+def _env_flag(env, name: str) -> bool:
+    """Read a boolean wrangler var ("1", "true", "yes")."""
+    return str(getattr(env, name, "") or "").strip().lower() in ("1", "true", "yes")
+
+
+RUN_RETENTION_DAYS = 30   # pipeline_runs rows kept; older ones are pruned after each run
+
+
+async def load_recent_run_phases(db, runs: int = HISTORY_RUNS) -> list[dict]:
+    """Return the per-phase metrics of the most recent runs (newest first).
+
+    Push runs are left out: their batch sizes come from the id set, not the plan.
+    """
+    rows = await d1_all(
+        db,
+        """SELECT phases FROM pipeline_runs
+           WHERE phases IS NOT NULL AND trigger <> 'push'
+           ORDER BY id DESC LIMIT ?""",
+        [runs],
+    )
+    phases: list[dict] = []
+    for row in rows:
+        try:
+            phases.append(json.loads(row["phases"]))
+        except (TypeError, ValueError):
+            continue
+    return phases
+
+
+async def count_backlog(db) -> dict[str, int]:
+    """Count jobs waiting at each intermediate pipeline status."""
+    rows = await d1_all(
+        db,
+        """SELECT status, COUNT(*) AS cnt FROM jobs
+           WHERE status IN (?, ?, ?)
+           GROUP BY status""",
+        [JobStatus.NEW.value, JobStatus.ENHANCED.value, JobStatus.ROLE_MATCH.value],
+    )
+    return {r["status"]: r["cnt"] for r in rows}
+
+
+async def plan_batches(db, env) -> BatchPlan:
+    """Choose per-phase batch sizes from recent run records and the current backlog.
+
+    Falls back to the static defaults when pipeline_runs is missing or empty.
+    """
+    try:
+        run_phases = await load_recent_run_phases(db)
+        backlog    = await count_backlog(db)
+    except Exception as e:
+        print(f"   ⚠️  Batch planner using defaults ({e})")
+        run_phases, backlog = [], {}
+
+    plan = plan_batch_sizes(
+        run_phases,
+        backlog,
+        subrequest_budget   = _env_number(env, "BATCH_SUBREQUEST_BUDGET", DEFAULT_SUBREQUEST_BUDGET),
+        wall_clock_budget_s = _env_number(env, "BATCH_WALL_CLOCK_BUDGET_S", float(DEFAULT_WALL_CLOCK_BUDGET_S)),
+        backlog_threshold   = _env_number(env, "BATCH_BACKLOG_THRESHOLD", DEFAULT_BACKLOG_THRESHOLD),
     )
+    for name, p in plan.phases.items():
+        print(f"   📐 {name}: limit={p.limit} — {'; '.join(p.reasons)}")
+    return plan
+
+
+async def send_retry_plan(env, plan: RetryPlan) -> None:
+    """Re-enqueue failed jobs (delayed by attempt) and dead-letter the exhausted ones.
+
+    Dead letters go to PROCESS_JOBS_DLQ (consumed by dlq-consumer) when the
+    binding exists; they are logged as per-job errors either way.
+    """
+    queue = getattr(env, "PROCESS_JOBS_QUEUE", None)
+    dlq   = getattr(env, "PROCESS_JOBS_DLQ", None)
+    for i in range(0, len(plan.retry), SEND_BATCH_SIZE):
+        if queue is None:
+            break
+        await queue.sendBatch(to_js_obj([
+            {"body": body, "delaySeconds": retry_delay_s(body["attempts"])}
+            for body in plan.retry[i:i + SEND_BATCH_SIZE]
+        ]))
+    for body in plan.dead:
+        LOG.job("error", body["jobId"], "job dead-lettered", action=body["action"], attempts=body["attempts"])
+    for i in range(0, len(plan.dead), SEND_BATCH_SIZE):
+        if dlq is None:
+            break
+        await dlq.sendBatch(to_js_obj([{"body": body} for body in plan.dead[i:i + SEND_BATCH_SIZE]]))
+    if plan:
+        LOG.summary("queue retries planned", retried=len(plan.retry), deadLettered=len(plan.dead))
+
+
+async def push_advanced(env, job_ids) -> int:
+    """Send ``advance`` messages for jobs a phase moved forward; returns messages sent.
+
+    Used where a phase runs on its own (HTTP phase endpoints, single-phase
+    queue messages). Full runs carry their jobs through the later phases
+    themselves, and the cron sweeps up whatever a push missed.
+    """
+    queue = getattr(env, "PROCESS_JOBS_QUEUE", None)
+    if queue is None or not job_ids:
+        return 0
+    messages = advance_messages(job_ids, TRACER.trace_id)
+    for i in range(0, len(messages), SEND_BATCH_SIZE):
+        await queue.sendBatch(to_js_obj([{"body": body} for body in messages[i:i + SEND_BATCH_SIZE]]))
+    LOG.info("pushed advanced jobs", jobs=len(job_ids), messages=len(messages))
+    return len(messages)
+
+
+async def run_timed_phase(phases: dict, name: str, limit: int, coro) -> dict:
+    """Await a phase coroutine and record its metrics under ``phases[name]``.
+
+    DeepSeek usage, streamed-call latency and log volume made by the phase
+    here (plus any the phase stats already carry from the eu-classifier) are
+    merged into its stats and metrics. The phase runs as a ``phase.<name>``
+    span, and the time its D1 / fetch / AI / service spans took is recorded
+    per kind under ``spans``, and the ingest-to-phase latency of the jobs
+    it finished per priority band under ``bands``.
+    """
+    started = time.monotonic()
+    before  = DEEPSEEK_USAGE.snapshot()
+    lat0    = LLM_LATENCY.snapshot()
+    logs0   = LOG.stats.snapshot()
+    spans0  = TRACER.totals_snapshot()
+    with TRACER.span(f"phase.{name}", "phase", limit=limit):
+        stats = await coro
+    usage   = DEEPSEEK_USAGE.since(before) + UsageRecord.from_stats(stats)
+    latency = LLM_LATENCY.since(lat0) + LatencyRecord.from_stats(stats)
+    logs    = LOG.stats.since(logs0) + LogStats.from_stats(stats)
+    if usage.calls:
+        stats = {**stats, **usage.as_stats()}
+    if latency.calls:
+        stats = {**stats, **latency.as_stats()}
+    stats = {**stats, **logs.as_stats()}
+    phases[name] = phase_metrics(name, limit, stats, time.monotonic() - started)
+    if usage.calls:
+        phases[name]["usage"] = usage.as_stats()
+    if latency.calls:
+        phases[name]["latency"] = latency.as_stats()
+    phases[name]["logs"] = logs.as_stats()
+    phases[name]["spans"] = {k: v for k, v in TRACER.totals_since(spans0).items() if k != "phase"}
+    if stats.get("bandLatency"):
+        phases[name]["bands"] = stats["bandLatency"]
     return stats
 
 
+async def save_run_record(
+    db, trigger: str, started_at: str, stats: dict, phases: dict, plan: BatchPlan,
+) -> None:
+    """Persist a pipeline run (stats, per-phase metrics, batch plan). Best-effort.
+
+    Phases run at a caller-capped limit are flagged ``capped`` so the batch
+    planner leaves them out, and runs older than ``RUN_RETENTION_DAYS`` are
+    deleted.
+    """
+    for name, phase_plan in plan.phases.items():
+        if phase_plan.capped and name in phases:
+            phases[name]["capped"] = True
+    try:
+        await d1_run(
+            db,
+            """INSERT INTO pipeline_runs (trigger, started_at, finished_at, stats, phases, plan)
+               VALUES (?, ?, ?, ?, ?, ?)""",
+            [
+                trigger,
+                started_at,
+                datetime.now(timezone.utc).isoformat(),
+                json.dumps(stats),
+                json.dumps(phases),
+                json.dumps(plan.to_record()),
+            ],
+        )
+        cutoff = datetime.now(timezone.utc) - timedelta(days=RUN_RETENTION_DAYS)
+        await d1_run(db, "DELETE FROM pipeline_runs WHERE started_at < ?", [cutoff.isoformat()])
+    except Exception as e:
+        print(f"   ⚠️  Run record not saved: {e}")
+
+
 # =========================================================================
 # Worker Entrypoint
 # =========================================================================
@@ -1608,6 +3007,9 @@ class Default(WorkerEntrypoint):
 
     async def fetch(self, request, env):
         """Handle incoming HTTP requests."""
+        IMPORT_PROFILE.mark_request()
+        LOG.configure(getattr(self.env, "LOG_LEVEL", None), getattr(self.env, "LOG_JOB_SAMPLE", None))
+        TRACER.start_trace(request.headers.get(TRACE_HEADER), request.headers.get(PARENT_HEADER))
         cors_headers = {
             "Access-Control-Allow-Origin":  "*",
             "Access-Control-Allow-Methods": "POST, OPTIONS",
@@ -1669,6 +3071,8 @@ class Default(WorkerEntrypoint):
                 status=500,
                 headers=cors_headers,
             )
+        finally:
+            TRACER.flush()
 
     # MARK: - Scheduled (Cron) Handler
 
@@ -1676,42 +3080,23 @@ class Default(WorkerEntrypoint):
         """Cron trigger — runs all four phases (enhance → tag → classify → extract).
 
         Configured via [triggers].crons in wrangler.jsonc.
-        Runs every hour. Phase 1/2 are fast (ATS fetch + keyword heuristic),
-        Phase 3/4 involve LLM calls so use smaller batches.
+        Runs every hour. Batch sizes come from plan_batches(), which tunes
+        them from recent run throughput, tier mix and downstream backlog.
         """
+        IMPORT_PROFILE.mark_request()
+        LOG.configure(getattr(self.env, "LOG_LEVEL", None), getattr(self.env, "LOG_JOB_SAMPLE", None))
         print("🔄 Cron: Starting four-phase pipeline...")
+        TRACER.start_trace()
         try:
-            db = self.env.DB
-
-            # Batch sizes tuned for Python Worker CPU limits (cron gets ~15 min wall clock).
-            # Enhancement: 25/run. CF Workers limit is 50 subrequests per invocation;
-            # 1 ATS fetch per job + retries budget = safe ceiling of 25.
-            # 25/hr × 24 = 600/day drains 6k backlog in ~10 days.
-            enhance_stats  = await enhance_unenhanced_jobs(db, self.env, 25)
-            tag_stats      = await tag_roles_for_enhanced_jobs(
-                db, getattr(self.env, "AI", None),
-                deepseek_api_key  = getattr(self.env, "DEEPSEEK_API_KEY", None),
-                deepseek_base_url = getattr(self.env, "DEEPSEEK_BASE_URL", "https://api.deepseek.com/beta"),
-                deepseek_model    = getattr(self.env, "DEEPSEEK_MODEL", "deepseek-chat"),
-                limit             = 100,
-            )
-            # Phase 2b: Backfill role tags for eu-remote jobs that bypassed role tagging
-            await backfill_role_tags_for_eu_remote_jobs(
-                db, getattr(self.env, "AI", None),
-                deepseek_api_key  = getattr(self.env, "DEEPSEEK_API_KEY", None),
-                deepseek_base_url = getattr(self.env, "DEEPSEEK_BASE_URL", "https://api.deepseek.com/beta"),
-                deepseek_model    = getattr(self.env, "DEEPSEEK_MODEL", "deepseek-chat"),
-                limit             = 50,
-            )
-            classify_stats = await classify_unclassified_jobs(db, self.env, 100)
-            skill_stats    = await extract_skills_for_classified_jobs(db, self.env, 100)
-
-            stats = self._merge_stats(enhance_stats, tag_stats, classify_stats, skill_stats)
-            print(f"✅ Cron complete — {self._stats_summary(stats)}")
-            self._save_run_checkpoint(stats)
+            db    = self.env.DB
+            plan  = await plan_batches(db, self.env)
+            stats = await self._run_pipeline(db, plan, "cron", backfill_roles=True)
+            LOG.summary("cron complete", stats=self._stats_summary(stats))
 
         except Exception as e:
             print(f"❌ Error in cron: {e}")
+        finally:
+            TRACER.flush()
 
     # MARK: - Queue Consumer
 
@@ -1719,73 +3104,162 @@ class Default(WorkerEntrypoint):
         """Consume messages from the process-jobs queue.
 
         Supported actions:
-          enhance  — Phase 1 only
-          tag      — Phase 2 only
-          classify — Phase 3 only
-          extract  — Phase 4 only (skill extraction)
-          process  — All four phases (default)
+          enhance            — Phase 1 only
+          tag                — Phase 2 only
+          backfill-role-tags — Phase 2b only
+          classify           — Phase 3 only
+          extract            — Phase 4 only (skill extraction)
+          advance            — Remaining phases for ``jobIds`` (push mode)
+          process            — All four phases (default)
+
+        Phase messages may carry ``jobIds`` (and ``attempts``) instead of a
+        limit. Per-job failures, or the whole id set if the phase itself
+        raises, are re-enqueued one job per message and the message is
+        acked, so a retry costs only the failures (see job_retry.py).
+        The ``advance`` messages of a batch are coalesced and run first.
         """
-        for message in batch.messages:
+        IMPORT_PROFILE.mark_request()
+        LOG.configure(getattr(self.env, "LOG_LEVEL", None), getattr(self.env, "LOG_JOB_SAMPLE", None))
+        bodies  = [to_py(message.body) for message in batch.messages]
+        advance = [(m, b) for m, b in zip(batch.messages, bodies) if b.get("action") == ADVANCE_ACTION]
+        if advance:
             try:
-                body   = to_py(message.body)
-                action = body.get("action", "process")
-                limit  = body.get("limit", 10000)
-                db     = self.env.DB
-
-                print(f"📨 Queue message: action={action}, limit={limit}")
-
-                if action == "enhance":
-                    stats = await enhance_unenhanced_jobs(db, self.env, limit)
-                    print(f"   Enhanced: {stats['enhanced']}, Errors: {stats['errors']}")
-
-                elif action == "tag":
-                    stats = await tag_roles_for_enhanced_jobs(
-                        db, getattr(self.env, "AI", None),
-                        deepseek_api_key  = getattr(self.env, "DEEPSEEK_API_KEY", None),
-                        deepseek_base_url = getattr(self.env, "DEEPSEEK_BASE_URL", "https://api.deepseek.com/beta"),
-                        deepseek_model    = getattr(self.env, "DEEPSEEK_MODEL", "deepseek-chat"),
-                        limit             = limit,
-                    )
-                    print(f"   Tagged: {stats['processed']}, Target: {stats['targetRole']}, Skip: {stats['irrelevant']}")
-
-                elif action == "backfill-role-tags":
-                    stats = await backfill_role_tags_for_eu_remote_jobs(
-                        db, getattr(self.env, "AI", None),
-                        deepseek_api_key  = getattr(self.env, "DEEPSEEK_API_KEY", None),
-                        deepseek_base_url = getattr(self.env, "DEEPSEEK_BASE_URL", "https://api.deepseek.com/beta"),
-                        deepseek_model    = getattr(self.env, "DEEPSEEK_MODEL", "deepseek-chat"),
-                        limit             = limit,
-                    )
-                    print(f"   Backfilled: {stats['processed']}, AI engineer: {stats['ai_engineer']}")
-
-                elif action == "classify":
-                    stats = await classify_unclassified_jobs(db, self.env, limit)
-                    print(f"   Classified: {stats['processed']}, EU: {stats['euRemote']}")
+                await self._run_advance(self.env.DB, [b for _, b in advance])
+                for message, _ in advance:
+                    message.ack()
+            except Exception as e:
+                LOG.error("advance batch failed", messages=len(advance), error=str(e))
+                for message, _ in advance:
+                    message.retry()
+            finally:
+                TRACER.flush()
+
+        for message, body in zip(batch.messages, bodies):
+            if body.get("action") == ADVANCE_ACTION:
+                continue
+            try:
+                action   = body.get("action", "process")
+                job_ids  = message_job_ids(body)
+                attempts = int(body.get("attempts") or 0)
+                limit    = body.get("limit") or (len(job_ids) if job_ids is not None else 10000)
+                db       = self.env.DB
+
+                LOG.start_run(getattr(message, "id", None) or datetime.now(timezone.utc).isoformat())
+                LOG.info(
+                    "queue message", action=action, limit=limit, attempts=attempts,
+                    jobs=len(job_ids) if job_ids is not None else None,
+                    traceId=TRACER.start_trace(body.get("traceId")),
+                )
 
-                elif action == "extract":
-                    stats = await extract_skills_for_classified_jobs(db, self.env, limit)
-                    print(f"   Skills: {stats['extracted']} extracted across {stats['processed']} jobs")
+                if action in PHASE_ACTIONS:
+                    try:
+                        stats = await self._run_phase_action(db, action, limit, job_ids)
+                    except Exception as e:
+                        if job_ids is None:
+                            raise  # nothing to isolate — replay the message
+                        LOG.error("queue phase failed, retrying its jobs", action=action, jobs=len(job_ids), error=str(e))
+                        stats = {"failedIds": job_ids}
+                    failed = {action: stats.get("failedIds") or []}
 
                 else:  # "process" — full pipeline
-                    enhance_stats  = await enhance_unenhanced_jobs(db, self.env, limit)
-                    tag_stats      = await tag_roles_for_enhanced_jobs(
-                        db, getattr(self.env, "AI", None),
-                        deepseek_api_key  = getattr(self.env, "DEEPSEEK_API_KEY", None),
-                        deepseek_base_url = getattr(self.env, "DEEPSEEK_BASE_URL", "https://api.deepseek.com/beta"),
-                        deepseek_model    = getattr(self.env, "DEEPSEEK_MODEL", "deepseek-chat"),
-                        limit             = limit,
+                    plan   = (await plan_batches(db, self.env)).cap(limit)
+                    stats  = await self._run_pipeline(db, plan, "queue")
+                    failed = stats.get("failedIds") or {}
+                    LOG.summary("queue pipeline complete", stats=self._stats_summary(stats))
+
+                for phase_action, ids in failed.items():
+                    await send_retry_plan(
+                        self.env, plan_retries(phase_action, ids, attempts, trace_id=TRACER.trace_id),
                     )
-                    classify_stats = await classify_unclassified_jobs(db, self.env, limit)
-                    skill_stats    = await extract_skills_for_classified_jobs(db, self.env, limit)
-                    stats = self._merge_stats(enhance_stats, tag_stats, classify_stats, skill_stats)
-                    print(f"\n✅ Queue pipeline complete — {self._stats_summary(stats)}")
-                    self._save_run_checkpoint(stats)
-
                 message.ack()
 
             except Exception as e:
-                print(f"❌ Queue message failed: {e}")
+                LOG.error("queue message failed", error=str(e))
                 message.retry()
+            finally:
+                TRACER.flush()
+
+    async def _run_advance(self, db, bodies: list[dict]) -> None:
+        """Push mode: run the remaining phases on the coalesced ids of ``advance`` messages.
+
+        Each job goes as far as it can in one pass — enhance picks it up at
+        'new', tag at 'enhanced', classify at 'role-match', extract once
+        classified. Failures are retried per phase action like any other
+        id-set message.
+        """
+        trace_ids = {b.get("traceId") for b in bodies if b.get("traceId")}
+        shared    = next(iter(trace_ids)) if len(trace_ids) == 1 else None
+        for attempts, job_ids in coalesce_job_ids(bodies):
+            TRACER.start_trace(shared)
+            LOG.start_run(TRACER.trace_id)
+            try:
+                stats  = await self._run_pipeline(
+                    db, BatchPlan.fixed(len(job_ids), "push: explicit job ids"), "push", job_ids=job_ids,
+                )
+                failed = stats.get("failedIds") or {}
+                LOG.summary("push run complete", jobs=len(job_ids), stats=self._stats_summary(stats))
+            except Exception as e:
+                LOG.error("push run failed, retrying its jobs", jobs=len(job_ids), error=str(e))
+                failed = {ADVANCE_ACTION: job_ids}
+            for phase_action, ids in failed.items():
+                await send_retry_plan(
+                    self.env, plan_retries(phase_action, ids, attempts, trace_id=TRACER.trace_id),
+                )
+
+    async def _run_phase_action(self, db, action: str, limit: int, job_ids: list | None) -> dict:
+        """Run one phase for a queue message; returns its stats (with ``failedIds``).
+
+        Jobs that enhance / tag moved forward are pushed on (``advance``).
+        """
+        deepseek = {
+            "deepseek_api_key":  getattr(self.env, "DEEPSEEK_API_KEY", None),
+            "deepseek_base_url": getattr(self.env, "DEEPSEEK_BASE_URL", "https://api.deepseek.com/beta"),
+            "deepseek_model":    getattr(self.env, "DEEPSEEK_MODEL", "deepseek-chat"),
+        }
+
+        if action == "enhance":
+            stats = await enhance_unenhanced_jobs(db, self.env, limit, job_ids)
+            await push_advanced(self.env, stats.get("advancedIds"))
+            LOG.summary("queue enhance done", enhanced=stats["enhanced"], errors=stats["errors"])
+
+        elif action == "tag":
+            stats = await tag_roles_for_enhanced_jobs(
+                db, getattr(self.env, "AI", None), **deepseek,
+                limit       = limit,
+                env         = self.env,
+                paid_budget = role_paid_budget(self.env),
+                job_ids     = job_ids,
+            )
+            await push_advanced(self.env, stats["advancedIds"])
+            LOG.summary(
+                "queue tag done", tagged=stats["processed"],
+                target=stats["targetRole"], irrelevant=stats["irrelevant"], failed=len(stats["failedIds"]),
+            )
+
+        elif action == "backfill-role-tags":
+            stats = await backfill_role_tags_for_eu_remote_jobs(
+                db, getattr(self.env, "AI", None), **deepseek, limit=limit, job_ids=job_ids,
+            )
+            LOG.summary(
+                "queue backfill done", backfilled=stats["processed"],
+                aiEngineer=stats["ai_engineer"], failed=len(stats["failedIds"]),
+            )
+
+        elif action == "classify":
+            stats = await classify_unclassified_jobs(db, self.env, limit, job_ids)
+            LOG.summary(
+                "queue classify done", classified=stats.get("processed", 0),
+                euRemote=stats.get("euRemote", 0), failed=len(stats.get("failedIds") or []),
+            )
+
+        else:  # "extract"
+            stats = await extract_skills_for_classified_jobs(db, self.env, limit, job_ids)
+            LOG.summary(
+                "queue extract done", skills=stats["extracted"],
+                jobs=stats["processed"], failed=len(stats["failedIds"]),
+            )
+
+        return stats
 
     # MARK: - HTTP Handlers
 
@@ -1801,20 +3275,30 @@ class Default(WorkerEntrypoint):
                 "database":   "connected",
                 "queue":      hasattr(self.env, "PROCESS_JOBS_QUEUE"),
                 "workersAI":  hasattr(self.env, "AI"),
+                "roleIndex":  hasattr(self.env, "ROLE_INDEX"),
+                "titleMemo":  TITLE_MEMO.as_stats(),
                 "deepseek":   bool(getattr(self.env, "DEEPSEEK_API_KEY", None)),
+                "deepseekBudget": DEEPSEEK_BUDGET.as_stats(),
                 "value":      rows[0]["value"] if rows else None,
+                "imports":    IMPORT_PROFILE.report(),
             })
         except Exception as e:
             return Response.json({"status": "unhealthy", "error": str(e)}, status=500)
 
     async def handle_enqueue(self, request, cors_headers: dict):
-        """Enqueue a processing job to the CF Queue — returns immediately."""
-        action = "process"
-        limit  = 10000
+        """Enqueue a processing job to the CF Queue — returns immediately.
+
+        A ``jobIds`` list (phase actions and ``advance``) is split into
+        messages of at most MAX_IDS_PER_MESSAGE ids.
+        """
+        action  = "process"
+        limit   = 10000
+        job_ids = None
         try:
-            body   = to_py(await request.json())
-            action = body.get("action", "process")
-            raw    = body.get("limit")
+            body    = to_py(await request.json())
+            action  = body.get("action", "process")
+            job_ids = message_job_ids(body) if action in (*PHASE_ACTIONS, ADVANCE_ACTION) else None
+            raw     = body.get("limit")
             if isinstance(raw, (int, float)) and raw > 0:
                 limit = int(raw)
         except Exception:
@@ -1828,7 +3312,16 @@ class Default(WorkerEntrypoint):
                 headers=cors_headers,
             )
 
-        await queue.send(to_js_obj({"action": action, "limit": limit}))
+        if job_ids:
+            for ids in chunk_ids(job_ids):
+                await queue.send(to_js_obj({"action": action, "jobIds": ids, "traceId": TRACER.trace_id}))
+            print(f"📤 Enqueued: action={action}, {len(job_ids)} job ids")
+            return Response.json(
+                {"success": True, "message": f"Queued '{action}' for {len(job_ids)} jobs", "queued": True},
+                headers=cors_headers,
+            )
+
+        await queue.send(to_js_obj({"action": action, "limit": limit, "traceId": TRACER.trace_id}))
         print(f"📤 Enqueued: action={action}, limit={limit}")
 
         return Response.json(
@@ -1852,7 +3345,7 @@ class Default(WorkerEntrypoint):
         Repairs jobs that were EU-classified before role tagging ran, so
         role_ai_engineer was never set. Safe to run multiple times.
         """
-        limit = await self._parse_limit(request)
+        limit = await self._parse_limit(request, "backfill_roles")
         stats = await backfill_role_tags_for_eu_remote_jobs(
             self.env.DB,
             getattr(self.env, "AI", None),
@@ -1872,8 +3365,9 @@ class Default(WorkerEntrypoint):
 
     async def handle_enhance(self, request, cors_headers: dict):
         """Run Phase 1 only — ATS enhancement (new → enhanced)."""
-        limit = await self._parse_limit(request)
+        limit = await self._parse_limit(request, "enhance")
         stats = await enhance_unenhanced_jobs(self.env.DB, self.env, limit)
+        await push_advanced(self.env, stats.get("advancedIds"))
         return Response.json(
             {"success": True, "message": f"Enhanced {stats['enhanced']} jobs", "stats": stats},
             headers=cors_headers,
@@ -1881,7 +3375,7 @@ class Default(WorkerEntrypoint):
 
     async def handle_tag(self, request, cors_headers: dict):
         """Run Phase 2 only — role tagging (enhanced → role-match | role-nomatch)."""
-        limit = await self._parse_limit(request)
+        limit = await self._parse_limit(request, "tag")
         stats = await tag_roles_for_enhanced_jobs(
             self.env.DB,
             getattr(self.env, "AI", None),
@@ -1889,7 +3383,10 @@ class Default(WorkerEntrypoint):
             deepseek_base_url = getattr(self.env, "DEEPSEEK_BASE_URL", "https://api.deepseek.com/beta"),
             deepseek_model    = getattr(self.env, "DEEPSEEK_MODEL", "deepseek-chat"),
             limit             = limit,
+            env               = self.env,
+            paid_budget       = role_paid_budget(self.env),
         )
+        await push_advanced(self.env, stats["advancedIds"])
         return Response.json(
             {
                 "success": True,
@@ -1901,7 +3398,7 @@ class Default(WorkerEntrypoint):
 
     async def handle_classify(self, request, cors_headers: dict):
         """Run Phase 3 only — EU-remote classification (role-match → eu-remote | non-eu)."""
-        limit = await self._parse_limit(request)
+        limit = await self._parse_limit(request, "classify")
         stats = await classify_unclassified_jobs(self.env.DB, self.env, limit)
         return Response.json(
             {"success": True, "message": f"Classified {stats['processed']} jobs", "stats": stats},
@@ -1936,16 +3433,7 @@ class Default(WorkerEntrypoint):
         if eu_classifier is not None:
             try:
                 request_body = json.dumps({"job_id": job_id})
-                response = await eu_classifier.fetch(
-                    JsRequest.new(
-                        "https://eu-classifier/classify-one",
-                        to_js_obj({
-                            "method": "POST",
-                            "headers": {"Content-Type": "application/json"},
-                            "body": request_body,
-                        }),
-                    )
-                )
+                response = await service_post(eu_classifier, "https://eu-classifier/classify-one", request_body)
                 data = to_py(await response.json())
                 return Response.json(data, headers=cors_headers)
             except Exception as e:
@@ -1959,7 +3447,7 @@ class Default(WorkerEntrypoint):
 
     async def handle_extract(self, request, cors_headers: dict):
         """Run Phase 4 only — skill extraction for classified jobs."""
-        limit = await self._parse_limit(request)
+        limit = await self._parse_limit(request, "extract")
         stats = await extract_skills_for_classified_jobs(self.env.DB, self.env, limit)
         return Response.json(
             {
@@ -1979,25 +3467,14 @@ class Default(WorkerEntrypoint):
         limit = await self._parse_limit(request)
         db    = self.env.DB
 
-        enhance_stats  = await enhance_unenhanced_jobs(db, self.env, limit)
-        tag_stats      = await tag_roles_for_enhanced_jobs(
-            db, getattr(self.env, "AI", None),
-            deepseek_api_key  = getattr(self.env, "DEEPSEEK_API_KEY", None),
-            deepseek_base_url = getattr(self.env, "DEEPSEEK_BASE_URL", "https://api.deepseek.com/beta"),
-            deepseek_model    = getattr(self.env, "DEEPSEEK_MODEL", "deepseek-chat"),
-            limit             = limit,
-        )
-        classify_stats = await classify_unclassified_jobs(db, self.env, limit)
-        skill_stats    = await extract_skills_for_classified_jobs(db, self.env, limit)
-
-        stats   = self._merge_stats(enhance_stats, tag_stats, classify_stats, skill_stats)
+        plan    = (await plan_batches(db, self.env)).cap(limit)
+        stats   = await self._run_pipeline(db, plan, "http")
         message = self._stats_summary(stats)
 
-        print(f"\n✅ Pipeline complete — {message}")
-        self._save_run_checkpoint(stats)
+        LOG.summary("pipeline complete", stats=message)
 
         return Response.json(
-            {"success": True, "message": message, "stats": stats},
+            {"success": True, "message": message, "stats": stats, "plan": plan.to_record()},
             headers=cors_headers,
         )
 
@@ -2020,27 +3497,134 @@ class Default(WorkerEntrypoint):
             "skillsExtracted": s.get("extracted", 0),
             "skillJobs":       s.get("processed", 0),
             "skillErrors":     s.get("errors", 0),
+            "duplicatesFound": enhance.get("duplicatesFound", 0),
+            "duplicateReuse":  tag.get("duplicates", 0) + classify.get("duplicates", 0) + s.get("duplicates", 0),
+            "knnTagged":       tag.get("knn", 0),
+            "boilerplateStripped":   tag.get("boilerplateStripped", 0) + s.get("boilerplateStripped", 0),
+            "boilerplateCharsSaved": tag.get("boilerplateCharsSaved", 0) + s.get("boilerplateCharsSaved", 0),
+            "skillVocabTags":    s.get("skillVocabTags", 0.0),
+            "skillVocabRecall":  s.get("skillVocabRecall"),
+            "titleMemo":       tag.get("titleMemo", 0),
+            "titleMemoCoverage":  tag.get("titleMemoCoverage", 0.0),
+            "titleMemoAgreement": tag.get("titleMemoAgreement"),
             "workersAI":       tag.get("workersAI", 0) + classify.get("workersAI", 0),
             "deepseek":        tag.get("deepseek", 0)  + classify.get("deepseek", 0),
         }
 
     def _stats_summary(self, stats: dict) -> str:
         """One-line human-readable summary of a merged stats dict."""
+        bands = ",".join(
+            f"{band}:{b['p50H']}h" for band, b in (stats.get("bandLatency") or {}).items()
+        )
         return (
             f"enhanced={stats['enhanced']} "
             f"tagged={stats['tagged']} (skip={stats['irrelevant']}) "
             f"classified={stats['processed']} "
             f"eu={stats['euRemote']} "
             f"skills={stats.get('skillsExtracted', 0)} "
-            f"workersAI={stats['workersAI']} deepseek={stats['deepseek']}"
+            f"dups={stats.get('duplicatesFound', 0)}/{stats.get('duplicateReuse', 0)} "
+            f"knn={stats.get('knnTagged', 0)} "
+            f"memo={stats.get('titleMemo', 0)} ({stats.get('titleMemoCoverage', 0):.0%}) "
+            f"boilerplate={stats.get('boilerplateStripped', 0)} (-{stats.get('boilerplateCharsSaved', 0)} chars) "
+            f"workersAI={stats['workersAI']} deepseek={stats['deepseek']} "
+            f"cacheHit={stats.get('promptCacheHitRate', 0):.0%} "
+            f"logs={stats.get('logLines', 0)} ({stats.get('logSuppressed', 0)} sampled out, "
+            f"{stats.get('logMs', 0):.0f} ms) "
+            f"p50={bands or '-'}"
         )
 
-    def _save_run_checkpoint(self, stats: dict):
-        """No-op — langgraph-checkpoint-cloudflare-d1 removed to save ~8MB."""
-        print(f"   ℹ️  Checkpoint skipped (langgraph-checkpoint removed for size)")
+    async def _run_pipeline(
+        self, db, plan: BatchPlan, trigger: str, backfill_roles: bool = False, job_ids: list | None = None,
+    ) -> dict:
+        """Run all phases with the planned batch sizes and persist the run record.
+
+        Returns the merged stats dict. Per-phase metrics and the plan are
+        written to pipeline_runs so the next run can re-tune its batch sizes.
+        Jobs that failed in a phase are listed under ``failedIds`` by queue
+        action, for the queue consumer to retry. ``bandLatency`` is the
+        classify phase's per-priority-band latency. ``job_ids`` restricts
+        every phase to those jobs (push mode).
+        """
+        started_at = datetime.now(timezone.utc).isoformat()
+        phases: dict = {}
+        ai_binding = getattr(self.env, "AI", None)
+        LOG.start_run(started_at)
+        deepseek = {
+            "deepseek_api_key":  getattr(self.env, "DEEPSEEK_API_KEY", None),
+            "deepseek_base_url": getattr(self.env, "DEEPSEEK_BASE_URL", "https://api.deepseek.com/beta"),
+            "deepseek_model":    getattr(self.env, "DEEPSEEK_MODEL", "deepseek-chat"),
+        }
+
+        enhance_stats = await run_timed_phase(
+            phases, "enhance", plan.limit("enhance"),
+            enhance_unenhanced_jobs(db, self.env, plan.limit("enhance"), job_ids),
+        )
+        tag_stats = await run_timed_phase(
+            phases, "tag", plan.limit("tag"),
+            tag_roles_for_enhanced_jobs(
+                db, ai_binding, limit=plan.limit("tag"), **deepseek,
+                env=self.env, paid_budget=role_paid_budget(self.env), job_ids=job_ids,
+            ),
+        )
+        backfill_stats = {}
+        if backfill_roles:
+            # Phase 2b: Backfill role tags for eu-remote jobs that bypassed role tagging
+            backfill_stats = await run_timed_phase(
+                phases, "backfill_roles", plan.limit("backfill_roles"),
+                backfill_role_tags_for_eu_remote_jobs(
+                    db, ai_binding, limit=plan.limit("backfill_roles"), **deepseek,
+                ),
+            )
+        classify_stats = await run_timed_phase(
+            phases, "classify", plan.limit("classify"),
+            classify_unclassified_jobs(db, self.env, plan.limit("classify"), job_ids),
+        )
+        skill_stats = await run_timed_phase(
+            phases, "extract", plan.limit("extract"),
+            extract_skills_for_classified_jobs(db, self.env, plan.limit("extract"), job_ids),
+        )
+
+        stats = self._merge_stats(enhance_stats, tag_stats, classify_stats, skill_stats)
+        usage   = UsageRecord()
+        latency = LatencyRecord()
+        logs    = LogStats()
+        for metrics in phases.values():
+            usage   = usage + UsageRecord.from_stats(metrics.get("usage") or {})
+            latency = latency + LatencyRecord.from_stats(metrics.get("latency") or {})
+            logs    = logs + LogStats.from_stats(metrics.get("logs") or {})
+        stats.update(usage.as_stats(jobs=stats["processed"]))
+        stats.update(latency.as_stats())
+        stats.update(logs.as_stats())
+        stats["traceId"] = TRACER.trace_id
+        stats["prioritized"] = enhance_stats.get("prioritized", 0)
+        stats["deepseekBudget"] = DEEPSEEK_BUDGET.as_stats()
+        if classify_stats.get("bandLatency"):
+            stats["bandLatency"] = classify_stats["bandLatency"]  # time to classification
+        failed = {
+            action: phase_stats["failedIds"]
+            for action, phase_stats in (
+                ("tag", tag_stats), ("backfill-role-tags", backfill_stats),
+                ("classify", classify_stats), ("extract", skill_stats),
+            )
+            if phase_stats.get("failedIds")
+        }
+        if failed:
+            stats["failedIds"] = failed
+        await save_run_record(db, trigger, started_at, stats, phases, plan)
+        return stats
+
+    async def _parse_limit(self, request, phase: str | None = None) -> int:
+        """Parse optional limit from query string or request body JSON, defaulting to 50.
 
-    async def _parse_limit(self, request) -> int:
-        """Parse optional limit from query string or request body JSON, defaulting to 50."""
+        When ``phase`` is given the value is clamped to that phase's hard
+        maximum (batch_tuning.PHASE_BOUNDS) so callers can't request
+        batches larger than a single invocation can finish.
+        """
+        limit = await self._read_limit(request)
+        return clamp_limit(phase, limit) if phase else limit
+
+    async def _read_limit(self, request) -> int:
+        """Read the raw limit from query string or request body JSON, defaulting to 50."""
         # 1. Query string: /enhance?limit=50
         try:
             url_str = str(request.url)
@@ -2060,3 +3644,7 @@ class Default(WorkerEntrypoint):
         except Exception:
             pass
         return 50
+
+
+# Entry module fully loaded — stop timing imports.
+IMPORT_PROFILE.stop()
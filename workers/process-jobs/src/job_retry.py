@@ -0,0 +1,128 @@
+# AUTO-GENERATED by scripts/sync-worker-modules.py
+# Do NOT edit manually. Edit workers/lib/python/job_retry.py and run `pnpm workers:sync`.
+
+"""Per-job outcomes and retries for queue messages.
+
+A queue message used to name a phase and a limit. Any exception escaping
+the phase called ``message.retry()``, replaying up to 10,000 rows,
+including jobs that had already succeeded and paid for LLM calls.
+
+Messages may now carry an explicit ``jobIds`` set:
+
+  id_filter(job_ids)   -- SQL fragment restricting a phase's SELECT to the set
+  failedIds            -- phases report the ids whose per-job work failed
+  plan_retries()       -- one message per failed id with ``attempts`` + 1,
+                          sent with a growing delay; at ``MAX_JOB_ATTEMPTS``
+                          the id goes to the dead-letter queue instead
+
+The consumer acks the original message either way. Jobs that succeeded
+have already moved on (status, skill tags) and are never sent again, so a
+retry costs only the failures.
+
+Push mode uses the same id sets. insert-jobs, and phases that move jobs
+to ``enhanced`` / ``role-match`` outside a full run, send ``advance``
+messages (``advance_messages()``). The consumer unions the ids of every
+``advance`` message in a queue batch (``coalesce_job_ids()``, so the
+batch size / timeout is the coalescing window) and runs the remaining
+phases on exactly those ids. Pure Python.
+"""
+
+import json
+from dataclasses import dataclass, field
+
+
+# Queue actions that run one phase and accept a job-id set
+PHASE_ACTIONS = ("enhance", "tag", "backfill-role-tags", "classify", "extract")
+
+MAX_JOB_ATTEMPTS    = 3
+RETRY_BASE_DELAY_S  = 30        # doubled per attempt
+MAX_RETRY_DELAY_S   = 12 * 3600 # Queues' delaySeconds ceiling
+MAX_IDS_PER_MESSAGE = 500
+SEND_BATCH_SIZE     = 100       # Queue.sendBatch message limit
+
+# Push mode: run every remaining phase on the given ids
+ADVANCE_ACTION = "advance"
+ADVANCE_BATCH  = 50             # ids per coalesced run (Phase 1's batch ceiling)
+
+
+def message_job_ids(body: dict) -> list | None:
+    """The message's explicit job-id set, or None for a limit-based message."""
+    ids = body.get("jobIds")
+    if ids is None and body.get("jobId") is not None:
+        ids = [body["jobId"]]
+    if not isinstance(ids, list):
+        return None
+    return list(dict.fromkeys(i for i in ids if i is not None))
+
+
+def id_filter(job_ids, column: str = "id") -> tuple[str, list]:
+    """``AND <column> IN (...)`` for a job-id set as one bound JSON parameter.
+
+    json_each keeps it to a single parameter, so a 500-id set stays well
+    under D1's bound-parameter limit. Returns ("", []) when ``job_ids`` is None.
+    """
+    if job_ids is None:
+        return "", []
+    return f" AND {column} IN (SELECT value FROM json_each(?))", [json.dumps(list(job_ids))]
+
+
+def chunk_ids(job_ids: list, size: int = MAX_IDS_PER_MESSAGE) -> list[list]:
+    return [job_ids[i:i + size] for i in range(0, len(job_ids), size)]
+
+
+def retry_delay_s(attempts: int) -> int:
+    """Delay before the ``attempts``-th retry of a job."""
+    return min(MAX_RETRY_DELAY_S, RETRY_BASE_DELAY_S * 2 ** max(0, attempts - 1))
+
+
+@dataclass(slots=True)
+class RetryPlan:
+    """Queue message bodies to re-enqueue and to dead-letter."""
+    retry: list[dict] = field(default_factory=list)
+    dead:  list[dict] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.retry or self.dead)
+
+
+def plan_retries(
+    action: str,
+    failed_ids,
+    attempts: int,
+    max_attempts: int = MAX_JOB_ATTEMPTS,
+    trace_id: str | None = None,
+) -> RetryPlan:
+    """One message per failed id; ``attempts`` counts failed tries so far."""
+    plan = RetryPlan()
+    next_attempt = attempts + 1
+    for job_id in dict.fromkeys(failed_ids or []):
+        body = {"action": action, "jobIds": [job_id], "attempts": next_attempt, "traceId": trace_id}
+        if next_attempt >= max_attempts:
+            plan.dead.append({**body, "jobId": job_id})
+        else:
+            plan.retry.append(body)
+    return plan
+
+
+def advance_messages(job_ids, trace_id: str | None = None, size: int = ADVANCE_BATCH) -> list[dict]:
+    """Compact ``advance`` bodies for ``job_ids``, at most ``size`` ids each."""
+    ids = list(dict.fromkeys(i for i in job_ids or [] if i is not None))
+    return [{"action": ADVANCE_ACTION, "jobIds": chunk, "traceId": trace_id} for chunk in chunk_ids(ids, size)]
+
+
+def coalesce_job_ids(bodies: list[dict], size: int = ADVANCE_BATCH) -> list[tuple[int, list]]:
+    """Union the id sets of a batch's messages into ``(attempts, ids)`` runs of at most ``size``.
+
+    Ids keep their first-seen order; an id sent twice keeps its highest
+    ``attempts``, and ids with different attempt counts run separately so
+    their retries stay correctly counted.
+    """
+    attempts: dict = {}
+    for body in bodies:
+        tries = int(body.get("attempts") or 0)
+        for job_id in message_job_ids(body) or []:
+            attempts[job_id] = max(tries, attempts.get(job_id, 0))
+    by_attempts: dict[int, list] = {}
+    for job_id, tries in attempts.items():
+        by_attempts.setdefault(tries, []).append(job_id)
+    return [(tries, chunk) for tries, ids in sorted(by_attempts.items()) for chunk in chunk_ids(ids, size)]
@@ -0,0 +1,102 @@
+# AUTO-GENERATED by scripts/sync-worker-modules.py
+# Do NOT edit manually. Edit workers/lib/python/llm_usage.py and run `pnpm workers:sync`.
+
+"""DeepSeek token accounting — prompt-cache hits/misses and completion tokens.
+
+DeepSeek caches prompt prefixes automatically: the part of a prompt that is
+byte-identical to an earlier request's prefix is billed as
+``prompt_cache_hit_tokens`` at a fraction of the ``prompt_cache_miss_tokens``
+price. The prompts therefore put every static instruction (and the skill
+vocabulary) first and the job-specific text last; this module records what
+each response reports so the cache hit rate and cost per job show up in the
+run stats.
+
+One ``UsageRecord`` per isolate accumulates every call; a run takes a
+``snapshot()`` first and reports ``since(snapshot)`` at the end.
+Pure Python so it can be unit-tested under CPython.
+"""
+
+from dataclasses import dataclass, fields
+
+
+# USD per 1M tokens (deepseek-chat list prices) — only used for estimates.
+PRICE_PER_MILLION = {
+    "cache_hit":  0.028,
+    "cache_miss": 0.28,
+    "completion": 0.42,
+}
+
+
+@dataclass(slots=True)
+class UsageRecord:
+    """Token counts over a set of DeepSeek responses."""
+    calls:             int = 0
+    cache_hit_tokens:  int = 0
+    cache_miss_tokens: int = 0
+    completion_tokens: int = 0
+
+    def record(self, response: dict) -> None:
+        """Add the ``usage`` block of one chat-completions response."""
+        usage = (response or {}).get("usage") or {}
+        hit   = usage.get("prompt_cache_hit_tokens")
+        miss  = usage.get("prompt_cache_miss_tokens")
+        if hit is None and miss is None:
+            # Provider without cache fields — count the whole prompt as a miss
+            hit, miss = 0, usage.get("prompt_tokens")
+        self.calls             += 1
+        self.cache_hit_tokens  += int(hit or 0)
+        self.cache_miss_tokens += int(miss or 0)
+        self.completion_tokens += int(usage.get("completion_tokens") or 0)
+
+    def snapshot(self) -> "UsageRecord":
+        return UsageRecord(*(getattr(self, f.name) for f in fields(self)))
+
+    def since(self, before: "UsageRecord") -> "UsageRecord":
+        return UsageRecord(*(getattr(self, f.name) - getattr(before, f.name) for f in fields(self)))
+
+    def __add__(self, other: "UsageRecord") -> "UsageRecord":
+        return UsageRecord(*(getattr(self, f.name) + getattr(other, f.name) for f in fields(self)))
+
+    @property
+    def cache_hit_rate(self) -> float:
+        prompt = self.cache_hit_tokens + self.cache_miss_tokens
+        return self.cache_hit_tokens / prompt if prompt else 0.0
+
+    def cost_usd(self) -> float:
+        return (
+            self.cache_hit_tokens  * PRICE_PER_MILLION["cache_hit"]
+            + self.cache_miss_tokens * PRICE_PER_MILLION["cache_miss"]
+            + self.completion_tokens * PRICE_PER_MILLION["completion"]
+        ) / 1_000_000
+
+    def as_stats(self, jobs: int | None = None) -> dict:
+        """camelCase counters merged into phase / run stats dicts.
+
+        ``jobs`` adds ``deepseekCostPerJobUsd`` (cost spread over the jobs
+        the run produced a result for).
+        """
+        stats = {
+            "deepseekCalls":         self.calls,
+            "promptCacheHitTokens":  self.cache_hit_tokens,
+            "promptCacheMissTokens": self.cache_miss_tokens,
+            "completionTokens":      self.completion_tokens,
+            "promptCacheHitRate":    round(self.cache_hit_rate, 3),
+            "deepseekCostUsd":       round(self.cost_usd(), 6),
+        }
+        if jobs is not None:
+            stats["deepseekCostPerJobUsd"] = round(self.cost_usd() / jobs, 6) if jobs else 0.0
+        return stats
+
+    @classmethod
+    def from_stats(cls, stats: dict) -> "UsageRecord":
+        """Inverse of ``as_stats`` — e.g. for counters returned by another worker."""
+        return cls(
+            calls             = int(stats.get("deepseekCalls") or 0),
+            cache_hit_tokens  = int(stats.get("promptCacheHitTokens") or 0),
+            cache_miss_tokens = int(stats.get("promptCacheMissTokens") or 0),
+            completion_tokens = int(stats.get("completionTokens") or 0),
+        )
+
+
+# One accumulator per isolate — shared by every request the isolate serves.
+DEEPSEEK_USAGE = UsageRecord()
@@ -0,0 +1,143 @@
+"""Value-aware gating for the paid tiers of the process-jobs pipeline.
+
+Phase 2 (role tagging) used to escalate every ambiguous job to Workers AI /
+DeepSeek, even when the eu-classifier's free Tier 0 heuristic would have
+rejected it as non-EU a moment later.  Phase 4 extracted skills for ``non-eu``
+jobs that job-matcher never serves (it filters on ``is_remote_eu = 1``).
+
+The planner runs every free Tier 0 check first and only then decides which
+jobs are worth a paid call:
+
+  - role heuristic says "not a target role"  → role-nomatch   (free)
+  - EU heuristic says "not EU remote"        → non-eu         (free)
+  - role heuristic says "target role"        → role-match     (free)
+  - everything else                          → paid tier, ordered by the
+                                               chance the job reaches users
+
+Paid jobs beyond the optional per-run budget stay ``enhanced`` and are
+reconsidered next run.
+
+Pure Python (no js / workers imports) so it can be unit-tested under CPython.
+"""
+
+from dataclasses import dataclass, field
+
+
+# ---------------------------------------------------------------------------
+# Expected value
+# ---------------------------------------------------------------------------
+
+# Probability that a job ends up in front of users given the EU Tier 0 verdict.
+# True = heuristic accepted, None = ambiguous (escalated), False = rejected.
+EU_SERVE_PROBABILITY: dict[bool | None, float] = {
+    True:  1.0,
+    None:  0.5,
+    False: 0.0,
+}
+
+# Statuses job-matcher can serve — skill extraction targets these by default.
+SERVABLE_STATUSES = ("eu-remote", "role-match")
+NON_EU_STATUS     = "non-eu"
+
+
+def expected_value(eu_verdict: bool | None) -> float:
+    """Chance that spending a paid call on this job produces a servable job."""
+    return EU_SERVE_PROBABILITY.get(eu_verdict, EU_SERVE_PROBABILITY[None])
+
+
+def eu_verdicts_from_prescreen(results: list[dict]) -> dict:
+    """Map eu-classifier ``/prescreen`` results to ``{job_id: verdict}``.
+
+    Verdict is True / False for a heuristic decision, None when ambiguous.
+    Jobs missing from the response are treated as ambiguous by the caller.
+    """
+    verdicts: dict = {}
+    for r in results or []:
+        if not isinstance(r, dict) or r.get("id") is None:
+            continue
+        verdicts[r["id"]] = r.get("isRemoteEU") if r.get("decided") else None
+    return verdicts
+
+
+# ---------------------------------------------------------------------------
+# Phase 2 plan
+# ---------------------------------------------------------------------------
+
+@dataclass
+class RoleTaggingPlan:
+    """Outcome of the free Tier 0 pass over a batch of enhanced jobs.
+
+    ``heuristic`` and ``non_eu`` hold ``(job, role_tags)`` pairs where
+    role_tags is the keyword result (None when the role was ambiguous).
+    ``paid`` is ordered by expected value, highest first.
+    """
+    no_match:  list[tuple[dict, object]] = field(default_factory=list)
+    non_eu:    list[tuple[dict, object]] = field(default_factory=list)
+    heuristic: list[tuple[dict, object]] = field(default_factory=list)
+    paid:      list[dict]                = field(default_factory=list)
+    deferred:  list[dict]                = field(default_factory=list)
+
+    def summary(self) -> dict:
+        return {
+            "noMatch":   len(self.no_match),
+            "nonEu":     len(self.non_eu),
+            "heuristic": len(self.heuristic),
+            "paid":      len(self.paid),
+            "deferred":  len(self.deferred),
+        }
+
+
+def _is_target(tags) -> bool:
+    return bool(getattr(tags, "isFrontendReact", False) or getattr(tags, "isAIEngineer", False))
+
+
+def plan_role_tagging(
+    jobs: list[dict],
+    role_tags: dict,
+    eu_verdicts: dict,
+    paid_budget: int | None = None,
+) -> RoleTaggingPlan:
+    """Split a batch into free outcomes and an ordered list of paid calls.
+
+    ``role_tags`` maps job id → keyword heuristic result (high-confidence
+    JobRoleTags or None); ``eu_verdicts`` maps job id → EU Tier 0 verdict.
+    A role no-match wins over an EU rejection so the job keeps the more
+    specific terminal status.  Ties in expected value keep the input order
+    (newest first).
+    """
+    plan = RoleTaggingPlan()
+    candidates: list[tuple[float, int, dict]] = []
+
+    for pos, job in enumerate(jobs):
+        tags       = role_tags.get(job.get("id"))
+        eu_verdict = eu_verdicts.get(job.get("id"))
+
+        if tags is not None and not _is_target(tags):
+            plan.no_match.append((job, tags))
+        elif eu_verdict is False:
+            plan.non_eu.append((job, tags))
+        elif tags is not None:
+            plan.heuristic.append((job, tags))
+        else:
+            candidates.append((expected_value(eu_verdict), pos, job))
+
+    candidates.sort(key=lambda c: (-c[0], c[1]))
+    ordered = [job for _, _, job in candidates]
+
+    if paid_budget is not None and paid_budget >= 0:
+        plan.paid, plan.deferred = ordered[:paid_budget], ordered[paid_budget:]
+    else:
+        plan.paid = ordered
+    return plan
+
+
+# ---------------------------------------------------------------------------
+# Phase 4 policy
+# ---------------------------------------------------------------------------
+
+def skill_extraction_statuses(include_non_eu: bool = False) -> tuple[str, ...]:
+    """Job statuses Phase 4 extracts skills for.
+
+    Non-EU jobs are never served, so they are opt-in (``EXTRACT_SKILLS_NON_EU``).
+    """
+    return SERVABLE_STATUSES + ((NON_EU_STATUS,) if include_non_eu else ())
@@ -0,0 +1,186 @@
+"""Freshness-priority scheduling for the processing backlog.
+
+Every phase selector used to take ``ORDER BY created_at DESC``, so a
+backlog of old aggregator jobs competed on equal terms with fresh ATS
+postings from companies that hire EU-remote, and time-to-visible for the
+jobs that matter depended on how large the backlog happened to be.
+
+Jobs are now scored once, when Phase 1 first sees them:
+
+  job_priority()   -- 0..1 from freshness (half-life decay of the posting
+                      date), source kind (ATS board > aggregator), the role
+                      keyword heuristic and the company's EU-remote history
+  priority_rank()  -- the stored sort key: priority minus ``AGING_PER_HOUR``
+                      for every hour between ``PRIORITY_EPOCH`` and scoring
+
+Selectors order by ``priority_rank DESC``. A job that has waited h hours
+outranks a job scored now whose priority is up to ``AGING_PER_HOUR * h``
+higher, so priorities age without rewriting any row and the
+``(status, priority_rank)`` index keeps serving the ORDER BY. Nothing
+starves: after ``1 / AGING_PER_HOUR`` hours the lowest-priority job
+outranks the best fresh one. Unscored rows (NULL rank) sort last.
+
+``band_latency()`` groups the jobs a phase finished by priority band and
+reports ingest-to-completion hours per band for the run metrics.
+Pure Python.
+"""
+
+from datetime import datetime, timezone
+
+
+# ---------------------------------------------------------------------------
+# Score
+# ---------------------------------------------------------------------------
+
+# Component weights (sum to 1.0)
+WEIGHT_FRESHNESS = 0.40
+WEIGHT_SOURCE    = 0.20
+WEIGHT_ROLE      = 0.25
+WEIGHT_COMPANY   = 0.15
+
+FRESHNESS_HALF_LIFE_H = 72.0   # a 3-day-old posting scores half a new one
+
+# ATS boards are first-party postings; everything else is an aggregator feed.
+SOURCE_WEIGHTS = {"greenhouse": 1.0, "lever": 1.0, "ashby": 1.0}
+DEFAULT_SOURCE_WEIGHT = 0.3
+
+# Role keyword heuristic: True = target role, None = ambiguous, False = not a target.
+ROLE_WEIGHTS: dict[bool | None, float] = {True: 1.0, None: 0.5, False: 0.0}
+
+# Company EU-remote rate is smoothed towards this prior over this many jobs,
+# so one classified job doesn't make a company "always EU".
+COMPANY_PRIOR_RATE = 0.3
+COMPANY_PRIOR_JOBS = 5
+
+# ---------------------------------------------------------------------------
+# Aging and bands
+# ---------------------------------------------------------------------------
+
+AGING_PER_HOUR = 0.01          # 100 h of waiting is worth a full priority point
+PRIORITY_EPOCH = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+# (band, lower bound) — highest first
+PRIORITY_BANDS = (("high", 0.7), ("medium", 0.4), ("low", 0.0))
+UNSCORED_BAND  = "unscored"
+
+SCORE_BATCH = 1000             # jobs scored per pass
+
+
+def parse_ts(value) -> datetime | None:
+    """Parse a D1 timestamp: ISO 8601, ``YYYY-MM-DD HH:MM:SS`` or epoch s / ms."""
+    if value is None or value == "":
+        return None
+    if isinstance(value, (int, float)):
+        seconds = value / 1000 if value > 1e11 else value
+        return datetime.fromtimestamp(seconds, tz=timezone.utc)
+    text = str(value).strip()
+    if text.isdigit():
+        return parse_ts(int(text))
+    try:
+        parsed = datetime.fromisoformat(text.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def hours_between(start: datetime, end: datetime) -> float:
+    return (end - start).total_seconds() / 3600
+
+
+def freshness(posted: datetime | None, now: datetime) -> float:
+    """1.0 for a posting made now, halving every ``FRESHNESS_HALF_LIFE_H`` hours."""
+    if posted is None:
+        return 0.5
+    age_h = max(0.0, hours_between(posted, now))
+    return 0.5 ** (age_h / FRESHNESS_HALF_LIFE_H)
+
+
+def company_score(eu_remote: int, classified: int) -> float:
+    """Smoothed share of the company's classified jobs that were EU-remote."""
+    return (eu_remote + COMPANY_PRIOR_RATE * COMPANY_PRIOR_JOBS) / (classified + COMPANY_PRIOR_JOBS)
+
+
+def job_priority(
+    job: dict,
+    role_hit: bool | None,
+    company: tuple[int, int] | None,
+    now: datetime,
+) -> float:
+    """Priority in [0, 1] for one job.
+
+    ``job`` needs ``source_kind`` and one of ``first_published`` /
+    ``posted_at`` / ``created_at``; ``company`` is the company's
+    ``(eu_remote, classified)`` counts, None when it has no history.
+    """
+    posted = (
+        parse_ts(job.get("first_published"))
+        or parse_ts(job.get("posted_at"))
+        or parse_ts(job.get("created_at"))
+    )
+    source = SOURCE_WEIGHTS.get((job.get("source_kind") or "").lower(), DEFAULT_SOURCE_WEIGHT)
+    role   = ROLE_WEIGHTS.get(role_hit, ROLE_WEIGHTS[None])
+    eu, classified = company or (0, 0)
+    score = (
+        WEIGHT_FRESHNESS * freshness(posted, now)
+        + WEIGHT_SOURCE  * source
+        + WEIGHT_ROLE    * role
+        + WEIGHT_COMPANY * company_score(eu, classified)
+    )
+    return round(min(1.0, max(0.0, score)), 4)
+
+
+def priority_rank(priority: float, scored_at: datetime) -> float:
+    """Sort key stored alongside the priority; see the module docstring."""
+    return round(priority - AGING_PER_HOUR * hours_between(PRIORITY_EPOCH, scored_at), 4)
+
+
+def effective_priority(rank: float, now: datetime) -> float:
+    """Priority plus the aging accumulated since scoring, as of ``now``."""
+    return rank + AGING_PER_HOUR * hours_between(PRIORITY_EPOCH, now)
+
+
+def priority_band(priority) -> str:
+    if priority is None:
+        return UNSCORED_BAND
+    for band, floor in PRIORITY_BANDS:
+        if priority >= floor:
+            return band
+    return PRIORITY_BANDS[-1][0]
+
+
+# ---------------------------------------------------------------------------
+# Per-band latency
+# ---------------------------------------------------------------------------
+
+def _percentile(sorted_values: list[float], q: float) -> float:
+    index = min(len(sorted_values) - 1, int(q * len(sorted_values)))
+    return sorted_values[index]
+
+
+def band_latency(rows: list[dict], now: datetime, exclude=()) -> dict[str, dict]:
+    """``{band: {jobs, p50H, p90H, maxH}}`` of ``created_at`` → ``now`` for ``rows``.
+
+    ``rows`` are the jobs a phase selected (with ``priority`` and
+    ``created_at``); ids in ``exclude`` (failed, deferred) are left out.
+    """
+    skip = set(exclude or ())
+    by_band: dict[str, list[float]] = {}
+    for row in rows:
+        if row.get("id") in skip:
+            continue
+        created = parse_ts(row.get("created_at"))
+        if created is None:
+            continue
+        by_band.setdefault(priority_band(row.get("priority")), []).append(
+            max(0.0, hours_between(created, now))
+        )
+    out = {}
+    for band, hours in by_band.items():
+        hours.sort()
+        out[band] = {
+            "jobs": len(hours),
+            "p50H": round(_percentile(hours, 0.5), 2),
+            "p90H": round(_percentile(hours, 0.9), 2),
+            "maxH": round(hours[-1], 2),
+        }
+    return out
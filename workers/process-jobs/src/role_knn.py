@@ -0,0 +1,175 @@
+"""Nearest-neighbour role tagging against previously labelled jobs.
+
+Phase 2 escalates every job the keyword heuristic can't decide to Workers AI
+or DeepSeek, although thousands of similar postings already carry
+``role_frontend_react`` / ``role_ai_engineer`` labels. The kNN tier sits
+between the two:
+
+  embed_text()      -- title + the first section of the description
+                       (``SECTION_CHARS``), embedded with the same bge model
+                       resume-rag uses (``EMBED_MODEL``); one batched call
+                       per run for every ambiguous job
+  vote()            -- the ``TOP_K`` nearest labelled jobs from the index;
+                       neighbours under ``MIN_SIMILARITY`` are ignored and
+                       the majority label wins when at least
+                       ``MIN_NEIGHBOURS`` remain and ``MIN_AGREEMENT`` of the
+                       similarity-weighted vote agrees, else the job escalates
+  labelled_records() -- new high-confidence labels from the heuristic and
+                       LLM tiers, as index records; kNN and duplicate labels
+                       are never fed back
+
+Only a unanimous vote is "high" confidence: a split one is "medium", which
+keeps a non-target verdict at role-match (fail-open, see Phase 2).
+
+The index is any object with async ``query(vector, top_k)`` and
+``upsert(records)``: the worker wraps its Vectorize binding, tests use
+``InMemoryIndex``. Pure Python.
+"""
+
+import html
+import math
+import re
+from dataclasses import dataclass
+
+
+EMBED_MODEL     = "@cf/baai/bge-base-en-v1.5"   # as in resume-rag
+EMBED_DIM       = 768
+SECTION_CHARS   = 1200
+EMBED_BATCH     = 50       # texts per embedding call
+TOP_K           = 10
+MIN_SIMILARITY  = 0.85     # cosine
+MIN_NEIGHBOURS  = 5
+MIN_AGREEMENT   = 0.8
+INDEX_BATCH     = 100      # labelled jobs indexed per run
+
+# Label sources that feed the index (never "knn" itself or "duplicate")
+INDEX_SOURCES = ("heuristic", "workers-ai", "deepseek")
+
+_TAG_RE     = re.compile(r"<[^>]+>")
+_SECTION_RE = re.compile(r"\n\s*\n")
+
+
+def embed_text(job: dict) -> str:
+    """Title plus the description's first section (first paragraph break after 200 chars)."""
+    desc  = html.unescape(_TAG_RE.sub("\n", job.get("description") or ""))
+    desc  = "\n".join(line.strip() for line in desc.splitlines())
+    first = desc.strip()[:SECTION_CHARS]
+    for m in _SECTION_RE.finditer(first):
+        if m.start() >= 200:
+            first = first[:m.start()]
+            break
+    return f"{(job.get('title') or '').strip()}\n{' '.join(first.split())}"
+
+
+def role_label(is_frontend_react, is_ai_engineer) -> str:
+    """Compact label stored in index metadata: ``"<frontend><ai>"``, e.g. ``"10"``."""
+    return f"{int(bool(is_frontend_react))}{int(bool(is_ai_engineer))}"
+
+
+def label_roles(label: str) -> tuple[bool, bool]:
+    return label[:1] == "1", label[1:2] == "1"
+
+
+@dataclass(slots=True)
+class KnnVote:
+    """Winning label of a job's neighbourhood."""
+    label:      str
+    agreement:  float   # similarity-weighted share of the winning label
+    neighbours: int     # neighbours above MIN_SIMILARITY
+    similarity: float   # mean similarity of the agreeing neighbours
+
+    @property
+    def unanimous(self) -> bool:
+        return self.agreement >= 1.0
+
+
+def vote(matches: list[dict]) -> KnnVote | None:
+    """Majority label of ``matches`` (``{"score", "metadata": {"label"}}``), or None to escalate."""
+    weights: dict[str, float] = {}
+    counts:  dict[str, int]   = {}
+    for m in matches or []:
+        label = (m.get("metadata") or {}).get("label")
+        score = float(m.get("score") or 0.0)
+        if not label or score < MIN_SIMILARITY:
+            continue
+        weights[label] = weights.get(label, 0.0) + score
+        counts[label]  = counts.get(label, 0) + 1
+    neighbours = sum(counts.values())
+    if neighbours < MIN_NEIGHBOURS:
+        return None
+    label     = max(weights, key=weights.get)
+    agreement = weights[label] / sum(weights.values())
+    if agreement < MIN_AGREEMENT:
+        return None
+    return KnnVote(label, round(agreement, 3), neighbours, round(weights[label] / counts[label], 3))
+
+
+async def knn_votes(jobs: list[dict], embed, index) -> tuple[dict, dict]:
+    """Embed ``jobs`` in batches and vote each against ``index``.
+
+    ``embed(texts) -> [vector, ...]`` is async. Returns ``({job_id: KnnVote},
+    {job_id: vector})`` — the vectors are reused when the job's final label
+    is indexed.
+    """
+    votes, vectors = {}, {}
+    for i in range(0, len(jobs), EMBED_BATCH):
+        chunk = jobs[i:i + EMBED_BATCH]
+        for job, vector in zip(chunk, await embed([embed_text(job) for job in chunk])):
+            vectors[job.get("id")] = vector
+            result = vote(await index.query(vector, TOP_K))
+            if result is not None:
+                votes[job.get("id")] = result
+    return votes, vectors
+
+
+async def labelled_records(rows: list[dict], vectors: dict, embed) -> list[dict]:
+    """Index records for labelled job rows, embedding only those without a cached vector.
+
+    Rows carry ``id``, ``title``, ``description``, ``role_frontend_react``,
+    ``role_ai_engineer`` and ``role_source``.
+    """
+    missing = [row for row in rows if row.get("id") not in vectors]
+    for i in range(0, len(missing), EMBED_BATCH):
+        chunk = missing[i:i + EMBED_BATCH]
+        for row, vector in zip(chunk, await embed([embed_text(row) for row in chunk])):
+            vectors[row.get("id")] = vector
+    return [
+        {
+            "id":       str(row["id"]),
+            "values":   vectors[row["id"]],
+            "metadata": {
+                "label":  role_label(row.get("role_frontend_react"), row.get("role_ai_engineer")),
+                "source": row.get("role_source") or "",
+            },
+        }
+        for row in rows if vectors.get(row.get("id")) is not None
+    ]
+
+
+# ---------------------------------------------------------------------------
+# Local stand-in for Vectorize (tests, local dev)
+# ---------------------------------------------------------------------------
+
+def cosine(a: list[float], b: list[float]) -> float:
+    dot = sum(x * y for x, y in zip(a, b))
+    na  = math.sqrt(sum(x * x for x in a))
+    nb  = math.sqrt(sum(y * y for y in b))
+    return dot / (na * nb) if na and nb else 0.0
+
+
+class InMemoryIndex:
+    """Exhaustive cosine search with the same interface as the worker's Vectorize wrapper."""
+
+    def __init__(self):
+        self.records: dict[str, dict] = {}
+
+    async def query(self, vector: list[float], top_k: int) -> list[dict]:
+        scored = [
+            {"id": rid, "score": cosine(vector, r["values"]), "metadata": r.get("metadata") or {}}
+            for rid, r in self.records.items()
+        ]
+        return sorted(scored, key=lambda m: m["score"], reverse=True)[:top_k]
+
+    async def upsert(self, records: list[dict]) -> None:
+        for r in records:
+            self.records[str(r["id"])] = r
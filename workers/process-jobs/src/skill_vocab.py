@@ -0,0 +1,162 @@
+"""Per-job skill vocabulary for the Phase 4 extraction prompt.
+
+Every extraction prompt listed all of ``SKILL_TAGS``, whether the posting
+was a React role or an ML role. The vocabulary is now split into fixed
+``GROUPS``, and each job gets only the groups it can use:
+
+  select_groups() -- ``core`` always (languages, git, SQL, Docker, ...);
+                     ``frontend`` / ``ai`` when the stored role tags say so;
+                     any group whose tags or ``TRIGGERS`` occur in the
+                     title or the prompt's description text (word match,
+                     ``-`` also matching a space or nothing)
+  vocabulary()    -- the selected groups' tags in ``GROUPS`` order, sorted
+                     within each group. Jobs with the same group set get a
+                     byte-identical system message, so prefix caching still
+                     works across them
+
+The model has to quote evidence from the description for each tag, and the
+pre-scan matches every tag name plus its common spellings, so a tag left
+out is one the posting doesn't mention (plurals included). To check this, ``audited()`` runs
+``AUDIT_RATE`` of the jobs (by id) with the full vocabulary. ``recall()``
+then measures how many of the tags found would have survived pruning.
+Tags added to ``SKILL_TAGS`` without a group go to ``core``, so they are
+never pruned. ``mentions_skill()`` tells whether a text names any tag; it
+keeps boilerplate stripping away from stack paragraphs. Pure Python.
+"""
+
+import re
+import zlib
+
+from _generated_schema import SKILL_TAGS
+
+
+AUDIT_RATE = 0.05
+
+# Group name -> tags. Order is fixed: it is the order of the rendered vocabulary.
+_GROUP_TAGS: tuple[tuple[str, tuple[str, ...]], ...] = (
+    ("core", (
+        "javascript", "typescript", "python", "java", "csharp", "ruby", "php", "go", "rust",
+        "swift", "kotlin", "scala", "elixir", "sql", "git", "linux", "docker", "ci-cd",
+        "rest-api", "agile", "tdd",
+    )),
+    ("frontend", (
+        "react", "vue", "angular", "svelte", "nextjs", "remix", "astro", "tailwind",
+        "shadcn-ui", "radix-ui", "storybook", "webpack", "zustand", "react-query",
+        "apollo-client", "next-auth",
+    )),
+    ("mobile", ("react-native", "flutter", "ios", "android")),
+    ("backend", (
+        "nodejs", "express", "django", "flask", "laravel", "fastapi", "spring-boot", "hono",
+        "bun", "deno", "prisma", "drizzle-orm", "graphql", "grpc", "trpc", "websocket",
+        "microservices", "event-driven", "serverless",
+    )),
+    ("data", (
+        "postgresql", "mysql", "sqlite", "mongodb", "redis", "cassandra", "dynamodb",
+        "elasticsearch", "pandas", "numpy",
+    )),
+    ("cloud", (
+        "aws", "azure", "gcp", "kubernetes", "terraform", "ansible", "jenkins", "circleci",
+        "cloudflare-workers", "cloudflare-d1", "cloudflare-vectorize", "cloudflare-workers-ai",
+    )),
+    ("testing", ("jest", "vitest", "cypress", "playwright", "pytest")),
+    ("ai", (
+        "llm", "machine-learning", "deep-learning", "nlp", "computer-vision", "mlops",
+        "model-evaluation", "fine-tuning", "prompt-engineering", "rag", "embeddings",
+        "vector-db", "agents", "agentic-ai", "function-calling", "structured-output",
+        "openai", "anthropic", "huggingface", "transformers", "pytorch", "tensorflow",
+        "scikit", "langchain", "langgraph", "langfuse", "mastra", "vercel-ai-sdk",
+        "pinecone", "weaviate", "chromadb",
+    )),
+)
+
+# Extra words that make a group relevant beyond its own tag names
+TRIGGERS: dict[str, tuple[str, ...]] = {
+    "frontend": ("frontend", "front-end", "front end", "ui", "ux", "css", "html", "web app",
+                 "next.js", "vue.js", "react.js", "single page", "spa", "tanstack", "apollo",
+                 "shadcn", "radix"),
+    "mobile":   ("mobile", "react native", "app store", "play store", "objective-c", "swiftui",
+                 "jetpack"),
+    "backend":  ("backend", "back-end", "back end", "api", "apis", "node", "node.js", "spring",
+                 "server", "servers", "lambda", "microservice", "events", "queue", "kafka",
+                 "rabbitmq", "orm", "drizzle", "spring boot"),
+    "data":     ("database", "databases", "postgres", "mongo", "nosql", "data", "cache",
+                 "caching", "elastic", "opensearch", "dynamo", "warehouse"),
+    "cloud":    ("cloud", "google cloud", "k8s", "infrastructure", "iac", "devops", "helm",
+                 "cloudflare", "workers ai", "ec2", "s3", "eks", "gke", "ci/cd"),
+    "testing":  ("test", "tests", "testing", "qa", "e2e", "end-to-end"),
+    "ai":       ("ai", "ml", "genai", "gen ai", "generative", "gpt", "chatgpt", "claude",
+                 "gemini", "llama", "mistral", "model", "models", "neural", "vector",
+                 "vectors", "embedding", "agent", "agentic", "retrieval", "hugging face",
+                 "sklearn", "scikit-learn", "machine learning", "deep learning", "data science",
+                 "inference", "evals", "tool calling", "tool use"),
+}
+
+# Groups implied by the stored role tags
+ROLE_GROUPS = {"role_frontend_react": "frontend", "role_ai_engineer": "ai"}
+
+
+def _groups() -> tuple[tuple[str, tuple[str, ...]], ...]:
+    assigned   = {tag for _, tags in _GROUP_TAGS for tag in tags}
+    unassigned = tuple(sorted(SKILL_TAGS - assigned))
+    return tuple(
+        (name, tuple(sorted(tag for tag in tags + (unassigned if name == "core" else ()) if tag in SKILL_TAGS)))
+        for name, tags in _GROUP_TAGS
+    )
+
+
+GROUPS      = _groups()
+GROUP_NAMES = tuple(name for name, _ in GROUPS)
+
+
+def _pattern(words) -> re.Pattern:
+    alternatives = sorted(
+        (re.escape(w).replace(r"\-", "[- ]?") for w in words), key=len, reverse=True,
+    )
+    return re.compile(r"(?<![a-z0-9])(?:" + "|".join(alternatives) + r")s?(?![a-z0-9])")
+
+
+_SCANS = {
+    name: _pattern(tags + TRIGGERS.get(name, ()))
+    for name, tags in GROUPS if name != "core"
+}
+
+
+_ANY_TAG = _pattern(sorted(SKILL_TAGS))
+
+
+def mentions_skill(text: str) -> bool:
+    """Whether ``text`` names any ``SKILL_TAGS`` tag (word match, as in ``select_groups``)."""
+    return bool(_ANY_TAG.search(text.lower()))
+
+
+def select_groups(job: dict, text: str | None = None) -> tuple[str, ...]:
+    """Vocabulary groups for ``job`` in ``GROUPS`` order.
+
+    ``text`` is the description the prompt will carry (default: the job's
+    ``description``); the title is always scanned with it.
+    """
+    body = (text if text is not None else job.get("description") or "")[:6000]
+    scan = f"{job.get('title') or ''}\n{body}".lower()
+    on   = {group for column, group in ROLE_GROUPS.items() if job.get(column)}
+    return tuple(
+        name for name in GROUP_NAMES
+        if name == "core" or name in on or _SCANS[name].search(scan)
+    )
+
+
+def vocabulary(groups) -> tuple[str, ...]:
+    """Canonical tags of ``groups``, in stable ``GROUPS`` order."""
+    wanted = set(groups)
+    return tuple(tag for name, tags in GROUPS if name in wanted for tag in tags)
+
+
+def audited(job_id) -> bool:
+    """Whether ``job_id`` is extracted with the full vocabulary (deterministic sample)."""
+    return zlib.crc32(f"vocab:{job_id}".encode()) % 10_000 < AUDIT_RATE * 10_000
+
+
+def recall(found, groups) -> tuple[int, int]:
+    """``(kept, found)``: how many full-vocabulary tags ``groups`` would have kept."""
+    found = {tag for tag in found if tag in SKILL_TAGS}
+    kept  = set(vocabulary(groups))
+    return len(found & kept), len(found)
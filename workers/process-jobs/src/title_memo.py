@@ -0,0 +1,169 @@
+"""Title-level decision memo for role tagging.
+
+Titles repeat enormously ("Senior Backend Engineer", "Staff Frontend
+Engineer (React)"), yet every job ran the role heuristic and, when that was
+unsure, an LLM call. ``TITLE_MEMO`` is a per-isolate table built from the
+role tags already in D1:
+
+  normalize_title()  -- lowercase, punctuation and work-mode / location
+                        noise ("remote", "(m/f/d)", "EMEA") dropped, so
+                        spelling variants of one title share an entry
+  TitleMemo.load()   -- ``LOAD_SQL`` counts high-confidence heuristic / LLM
+                        labels per raw title; a normalized title is decided
+                        when it has ``MIN_SUPPORT`` labels and
+                        ``MIN_AGREEMENT`` of them carry the same role flags
+  TitleMemo.lookup() -- one dict lookup, before any regex or LLM work
+
+The table is rebuilt every ``REFRESH_S``. Memo verdicts are stored with
+source ``title-memo`` and never counted as history, so the table only
+learns from independent labels. To keep those flowing and to measure the
+memo, ``audited()`` picks ``AUDIT_RATE`` of the hits (by job id) to run
+the normal tiers anyway; their outcome is compared with the memo.
+Pure Python.
+"""
+
+import re
+import time
+import zlib
+from dataclasses import dataclass
+
+
+MIN_SUPPORT   = 5
+MIN_AGREEMENT = 0.95
+REFRESH_S     = 6 * 3600
+AUDIT_RATE    = 0.02
+LOAD_LIMIT    = 20000       # distinct (title, flags) groups read per refresh
+
+SOURCE = "title-memo"
+
+# Label sources the memo learns from (never its own verdicts, kNN or duplicates)
+HISTORY_SOURCES = ("heuristic", "workers-ai", "deepseek")
+
+LOAD_SQL = f"""
+SELECT title, role_frontend_react, role_ai_engineer, COUNT(*) AS n
+FROM jobs
+WHERE role_confidence = 'high'
+  AND role_source IN ({", ".join(f"'{s}'" for s in HISTORY_SOURCES)})
+  AND title IS NOT NULL
+GROUP BY title, role_frontend_react, role_ai_engineer
+ORDER BY n DESC
+LIMIT ?
+"""
+
+_NOISE_RE = re.compile(
+    r"\((?:[mfwdx]\s*/\s*){1,3}[mfwdx]\)|\b(?:[mfwdx]\s*/\s*){1,3}[mfwdx]\b"      # (m/f/d), w/m/d
+    r"|\b(?:remote|hybrid|on-?site|full[- ]?time|part[- ]?time|contract|freelance"
+    r"|worldwide|anywhere|emea|europe|eu|us|usa|uk|latam|apac)\b"
+)
+_TOKEN_RE = re.compile(r"[a-z0-9+#]+")
+
+
+def normalize_title(title: str | None) -> str:
+    """Canonical form of a job title for memo lookups ('' when nothing is left)."""
+    text = _NOISE_RE.sub(" ", (title or "").lower().replace("&", " and "))
+    return " ".join(_TOKEN_RE.findall(text))
+
+
+@dataclass(frozen=True, slots=True)
+class MemoEntry:
+    """Decided role flags for one normalized title."""
+    is_frontend_react: bool
+    is_ai_engineer:    bool
+    support:           int      # high-confidence labels behind the decision
+    agreement:         float    # share of them with these flags
+
+
+def decide(counts: dict[tuple[bool, bool], int]) -> MemoEntry | None:
+    """Entry for a title's ``{(frontend, ai): labels}`` counts, or None when undecided."""
+    total = sum(counts.values())
+    if total < MIN_SUPPORT:
+        return None
+    flags, n = max(counts.items(), key=lambda kv: kv[1])
+    agreement = n / total
+    if agreement < MIN_AGREEMENT:
+        return None
+    return MemoEntry(flags[0], flags[1], total, round(agreement, 3))
+
+
+class TitleMemo:
+    """Per-isolate title -> role flags table with hit / audit counters."""
+
+    __slots__ = ("entries", "loaded_at", "titles_seen", "lookups", "hits", "audits", "agreed", "_clock")
+
+    def __init__(self, clock=time.time):
+        self.entries:  dict[str, MemoEntry] = {}
+        self.loaded_at = None
+        self.titles_seen = 0
+        self.lookups   = 0
+        self.hits      = 0
+        self.audits    = 0
+        self.agreed    = 0
+        self._clock    = clock
+
+    def stale(self) -> bool:
+        return self.loaded_at is None or self._clock() - self.loaded_at >= REFRESH_S
+
+    def load(self, rows: list[dict]) -> int:
+        """Rebuild the table from ``LOAD_SQL`` rows; returns the number of decided titles."""
+        grouped: dict[str, dict] = {}
+        for row in rows:
+            title = normalize_title(row.get("title"))
+            if not title:
+                continue
+            flags  = (bool(row.get("role_frontend_react")), bool(row.get("role_ai_engineer")))
+            counts = grouped.setdefault(title, {})
+            counts[flags] = counts.get(flags, 0) + int(row.get("n") or 0)
+        self.entries     = {t: e for t, c in grouped.items() if (e := decide(c)) is not None}
+        self.titles_seen = len(grouped)
+        self.loaded_at   = self._clock()
+        return len(self.entries)
+
+    def mark_loaded(self) -> None:
+        """Skip loading until the next refresh (e.g. after a D1 error)."""
+        self.loaded_at = self._clock()
+
+    def lookup(self, title: str | None) -> MemoEntry | None:
+        self.lookups += 1
+        entry = self.entries.get(normalize_title(title))
+        if entry is not None:
+            self.hits += 1
+        return entry
+
+    def audited(self, job_id) -> bool:
+        """Whether a memo hit for ``job_id`` runs the normal tiers instead (deterministic sample)."""
+        return zlib.crc32(str(job_id).encode()) % 10_000 < AUDIT_RATE * 10_000
+
+    def record_audit(self, entry: MemoEntry, is_frontend_react: bool, is_ai_engineer: bool) -> bool:
+        agree = (entry.is_frontend_react, entry.is_ai_engineer) == (bool(is_frontend_react), bool(is_ai_engineer))
+        self.audits  += 1
+        self.agreed  += int(agree)
+        return agree
+
+    def snapshot(self) -> tuple[int, int, int, int]:
+        return self.lookups, self.hits, self.audits, self.agreed
+
+    def since(self, before: tuple[int, int, int, int]) -> dict:
+        """Coverage and audit agreement since ``snapshot()``, as run stats."""
+        lookups, hits, audited, agreed = (now - then for now, then in zip(self.snapshot(), before))
+        return {
+            "titleMemoLookups":   lookups,
+            "titleMemoHits":      hits,
+            "titleMemoCoverage":  round(hits / lookups, 4) if lookups else 0.0,
+            "titleMemoAudited":   audited,
+            "titleMemoAgreement": round(agreed / audited, 4) if audited else None,
+        }
+
+    def as_stats(self) -> dict:
+        return {
+            "titles":     len(self.entries),
+            "titlesSeen": self.titles_seen,
+            "loadedAt":   self.loaded_at,
+            "lookups":    self.lookups,
+            "hits":       self.hits,
+            "audited":    self.audits,
+            "agreed":     self.agreed,
+        }
+
+
+# One memo per isolate — rebuilt from D1 every REFRESH_S.
+TITLE_MEMO = TitleMemo()
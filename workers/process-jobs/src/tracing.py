@@ -0,0 +1,250 @@
+# AUTO-GENERATED by scripts/sync-worker-modules.py
+# Do NOT edit manually. Edit workers/lib/python/tracing.py and run `pnpm workers:sync`.
+
+"""Lightweight cross-worker spans for the enhance → tag → classify chain.
+
+One job's trip touches process-jobs, the ATS_CRAWLER and EU_CLASSIFIER
+service bindings, D1, Workers AI and DeepSeek. ``TRACER`` gives every run
+a trace id and times each hop as a span:
+
+  start_trace(trace_id, parent_id) -- per request / cron / queue message;
+                                      adopts an incoming ``X-Trace-Id``
+  span(name, kind, **attrs)        -- ``with`` block around one D1
+                                      statement, fetch, AI call, service
+                                      call or pipeline phase; nests
+  headers() / context()            -- trace id + current span id for
+                                      service-binding requests / RPC args
+  flush()                          -- export what is still buffered plus a
+                                      per-kind totals record
+
+Spans are buffered and exported in chunks of ``EXPORT_CHUNK`` as
+structured records. ``LogExporter`` prints one JSON line per chunk
+(``{"type": "spans", ...}``) for the observability-tail worker to pick up;
+``JsonExporter`` keeps the records in memory (and can write them to a
+JSON-lines file) for tests and local runs. In the Workers runtime the
+clock only advances across I/O, which is exactly what the spans wrap.
+Pure Python.
+"""
+
+import contextvars
+import json
+import time
+import uuid
+from dataclasses import dataclass, field
+
+
+TRACE_HEADER  = "X-Trace-Id"
+PARENT_HEADER = "X-Parent-Span-Id"
+
+EXPORT_CHUNK = 100   # spans per exported record
+
+
+@dataclass(slots=True)
+class Span:
+    """One timed hop. ``start_ms`` is relative to the start of the trace."""
+    name:      str
+    kind:      str
+    span_id:   str
+    parent_id: str | None
+    start_ms:  float
+    ms:        float = 0.0
+    status:    str   = "ok"
+    attrs:     dict  = field(default_factory=dict)
+
+    def as_record(self) -> dict:
+        record = {
+            "id":      self.span_id,
+            "parent":  self.parent_id,
+            "name":    self.name,
+            "kind":    self.kind,
+            "startMs": round(self.start_ms, 2),
+            "ms":      round(self.ms, 2),
+            "status":  self.status,
+        }
+        if self.attrs:
+            record["attrs"] = self.attrs
+        return record
+
+
+class LogExporter:
+    """Prints each record as one JSON line (tail workers receive console output)."""
+
+    def __init__(self, sink=print):
+        self._sink = sink
+
+    def export(self, record: dict) -> None:
+        self._sink(json.dumps(record, default=str, ensure_ascii=False))
+
+
+class JsonExporter:
+    """Keeps exported records in memory; ``dump(path)`` writes them as JSON lines."""
+
+    def __init__(self):
+        self.records: list[dict] = []
+
+    def export(self, record: dict) -> None:
+        self.records.append(record)
+
+    def spans(self) -> list[dict]:
+        return [s for r in self.records if r.get("type") == "spans" for s in r["spans"]]
+
+    def dump(self, path: str) -> None:
+        with open(path, "w") as out:
+            for record in self.records:
+                out.write(json.dumps(record, default=str) + "\n")
+
+
+class _SpanScope:
+    """Context manager returned by ``Tracer.span``; yields the open Span."""
+
+    __slots__ = ("_tracer", "_span", "_t0", "_token")
+
+    def __init__(self, tracer: "Tracer", span: Span):
+        self._tracer = tracer
+        self._span   = span
+        self._token  = None
+
+    def __enter__(self) -> Span:
+        self._t0    = time.perf_counter()
+        self._token = self._tracer._current.set(self._span.span_id)
+        return self._span
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        try:
+            self._span.ms = (time.perf_counter() - self._t0) * 1000
+            if exc is not None:
+                self._span.status = "error"
+                self._span.attrs["error"] = str(exc)[:200]
+            self._tracer._current.reset(self._token)
+            self._tracer._finish(self._span)
+        except Exception:
+            pass  # tracing must never fail the wrapped call
+        return False
+
+
+class Tracer:
+    """Per-isolate tracer; one trace at a time (the pipeline runs sequentially).
+
+    The open span is tracked per asyncio task (a context variable), not on
+    the tracer: requests the isolate serves concurrently each nest their
+    own spans, and a ``start_trace()`` from one of them can't unbalance
+    another's.
+    """
+
+    __slots__ = (
+        "worker", "exporter", "trace_id", "parent_id", "totals",
+        "_buffer", "_current", "_started", "_totals_at_start",
+    )
+
+    def __init__(self, worker: str, exporter=None):
+        self.worker    = worker
+        self.exporter  = exporter or LogExporter()
+        self.trace_id  = None
+        self.parent_id = None
+        self.totals: dict[str, list] = {}   # kind -> [count, ms, errors], across traces
+        self._buffer: list[Span] = []
+        self._current = contextvars.ContextVar(f"tracer.{worker}.span", default=None)
+        self._started = time.perf_counter()
+        self._totals_at_start: dict[str, list] = {}
+
+    def start_trace(self, trace_id: str | None = None, parent_id: str | None = None) -> str:
+        """Begin a trace, adopting the caller's id when one was propagated."""
+        self.flush()
+        self.trace_id  = str(trace_id) if trace_id else uuid.uuid4().hex
+        self.parent_id = str(parent_id) if parent_id else None
+        self._started  = time.perf_counter()
+        self._totals_at_start = self.totals_snapshot()
+        return self.trace_id
+
+    def span(self, name: str, kind: str = "internal", **attrs) -> _SpanScope:
+        if self.trace_id is None:
+            self.start_trace()
+        parent = self._current.get() or self.parent_id
+        return _SpanScope(self, Span(
+            name      = name,
+            kind      = kind,
+            span_id   = uuid.uuid4().hex[:16],
+            parent_id = parent,
+            start_ms  = (time.perf_counter() - self._started) * 1000,
+            attrs     = attrs,
+        ))
+
+    def context(self) -> dict:
+        """Trace id and current span id, for RPC calls that can't carry headers."""
+        if self.trace_id is None:
+            return {}
+        parent = self._current.get() or self.parent_id
+        return {"traceId": self.trace_id, "parentSpanId": parent}
+
+    def headers(self, base: dict | None = None) -> dict:
+        """``base`` plus the trace headers for a service-binding request."""
+        ctx = self.context()
+        out = dict(base or {})
+        if ctx:
+            out[TRACE_HEADER] = ctx["traceId"]
+            if ctx["parentSpanId"]:
+                out[PARENT_HEADER] = ctx["parentSpanId"]
+        return out
+
+    def totals_snapshot(self) -> dict[str, list]:
+        return {kind: list(v) for kind, v in self.totals.items()}
+
+    def totals_since(self, before: dict[str, list]) -> dict[str, dict]:
+        """Per-kind ``{count, ms, errors}`` accumulated since ``totals_snapshot()``."""
+        out = {}
+        for kind, (count, ms, errors) in self.totals.items():
+            c0, m0, e0 = before.get(kind, (0, 0.0, 0))
+            if count - c0:
+                out[kind] = {"count": count - c0, "ms": round(ms - m0, 2), "errors": errors - e0}
+        return out
+
+    def flush(self) -> None:
+        """Export buffered spans and this trace's totals record, then end the trace."""
+        if self.trace_id is None:
+            return
+        self._export_buffer()
+        kinds = self.totals_since(self._totals_at_start)
+        if kinds:
+            self._export({
+                "type":    "trace",
+                "worker":  self.worker,
+                "traceId": self.trace_id,
+                "parent":  self.parent_id,
+                "ms":      round((time.perf_counter() - self._started) * 1000, 2),
+                "kinds":   kinds,
+            })
+        self.trace_id = None
+
+    def _finish(self, span: Span) -> None:
+        count, ms, errors = self.totals.get(span.kind, (0, 0.0, 0))
+        self.totals[span.kind] = [count + 1, ms + span.ms, errors + (span.status == "error")]
+        self._buffer.append(span)
+        if len(self._buffer) >= EXPORT_CHUNK:
+            self._export_buffer()
+
+    def _export_buffer(self) -> None:
+        if not self._buffer:
+            return
+        spans, self._buffer = self._buffer, []
+        self._export({
+            "type":    "spans",
+            "worker":  self.worker,
+            "traceId": self.trace_id,
+            "parent":  self.parent_id,
+            "spans":   [s.as_record() for s in spans],
+        })
+
+    def _export(self, record: dict) -> None:
+        try:
+            self.exporter.export(record)
+        except Exception:
+            pass  # tracing must never fail the pipeline
+
+
+def sql_label(sql: str, limit: int = 80) -> str:
+    """Whitespace-collapsed head of a SQL statement, used as the span attribute."""
+    return " ".join(sql.split())[:limit]
+
+
+# One tracer per isolate — shared by every request the isolate serves.
+TRACER = Tracer("process-jobs")
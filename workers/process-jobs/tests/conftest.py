@@ -1,12 +1,18 @@
 """Mock the Cloudflare Workers runtime modules so entry.py can be imported in pytest."""
 
+import os
 import sys
 import types
 
+# entry.py imports its sibling modules (_generated_schema, batch_tuning, ...)
+# by bare name, as in the Workers runtime where src/ is the module root.
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../src"))
+
 # Create mock 'js' module (Cloudflare Workers JS interop)
 js_mock = types.ModuleType("js")
 js_mock.JSON = types.SimpleNamespace(parse=lambda x: x, stringify=lambda x: str(x))
 js_mock.fetch = None  # not used in classification tests
+js_mock.Request = types.SimpleNamespace(new=lambda *a, **kw: None)
 sys.modules["js"] = js_mock
 
 # Create mock 'workers' module
@@ -22,26 +28,3 @@ class _MockEntrypoint:
 
 workers_mock.WorkerEntrypoint = _MockEntrypoint
 sys.modules["workers"] = workers_mock
-
-# Mock langchain/langgraph modules (not needed for classification tests)
-for mod_name in [
-    "langchain_cloudflare",
-    "langchain_core",
-    "langchain_core.prompts",
-    "langchain_core.runnables",
-    "langgraph_checkpoint_cloudflare_d1",
-]:
-    mock = types.ModuleType(mod_name)
-    # Provide stub classes that the module-level code references
-    if mod_name == "langchain_cloudflare":
-        mock.ChatCloudflareWorkersAI = type("ChatCloudflareWorkersAI", (), {})
-    elif mod_name == "langchain_core.prompts":
-        mock.ChatPromptTemplate = type(
-            "ChatPromptTemplate", (),
-            {"from_messages": classmethod(lambda cls, *a, **kw: None)},
-        )
-    elif mod_name == "langchain_core.runnables":
-        mock.RunnableLambda = lambda fn: fn  # pass-through for tests
-    elif mod_name == "langgraph_checkpoint_cloudflare_d1":
-        mock.CloudflareD1Saver = type("CloudflareD1Saver", (), {})
-    sys.modules[mod_name] = mock
@@ -0,0 +1,116 @@
+"""Tests for the adaptive batch-size controller."""
+
+from src.batch_tuning import (
+    PHASE_BOUNDS,
+    BatchPlan,
+    PhasePlan,
+    apply_backlog_throttle,
+    clamp_limit,
+    phase_history,
+    phase_metrics,
+    plan_batch_sizes,
+    plan_phase,
+)
+
+
+def _metrics(limit, processed, elapsed_s, errors=0, **tiers) -> dict:
+    stats = {"processed": processed, "errors": errors, **tiers}
+    return phase_metrics("tag", limit, stats, elapsed_s)
+
+
+class TestPhaseMetrics:
+
+    def test_enhance_counter_is_normalised(self):
+        m = phase_metrics("enhance", 25, {"enhanced": 25, "errors": 0}, 4.2)
+        assert m["processed"] == 25
+        assert m["hit_limit"] is True
+
+    def test_tier_mix_recorded(self):
+        m = phase_metrics("classify", 100, {"processed": 40, "heuristic": 30, "workersAI": 8, "deepseek": 2}, 10)
+        assert m["tiers"] == {"heuristic": 30, "workersAI": 8, "deepseek": 2}
+        assert m["hit_limit"] is False
+
+
+class TestPlanPhase:
+
+    def test_no_history_uses_default(self):
+        plan = plan_phase("tag", [])
+        assert plan.limit == PHASE_BOUNDS["tag"].default
+        assert "default" in plan.reasons[0]
+
+    def test_grows_when_limit_hit_and_fast(self):
+        history = [_metrics(100, 100, 5.0, heuristic=100)]
+        plan = plan_phase("tag", history)
+        assert plan.limit == 200
+
+    def test_does_not_grow_when_queue_drained(self):
+        history = [_metrics(100, 30, 5.0, heuristic=30)]
+        plan = plan_phase("tag", history)
+        assert plan.limit == 100
+
+    def test_subrequest_budget_bounds_paid_phases(self):
+        # Every job needed a Workers AI call → 1 subrequest/job → 50 jobs max
+        history = [_metrics(100, 100, 5.0, workersAI=100)]
+        plan = plan_phase("tag", history, subrequest_budget=50)
+        assert plan.limit == 50
+        assert "subrequests/job" in plan.reasons[0]
+
+    def test_slow_throughput_bounds_size(self):
+        # 0.1 jobs/s × (900s × 0.30 share) = 27 jobs
+        history = [_metrics(100, 100, 1000.0, heuristic=100)]
+        plan = plan_phase("tag", history)
+        assert plan.limit == 27
+
+    def test_error_spike_halves(self):
+        history = [_metrics(100, 50, 5.0, errors=50, heuristic=50)]
+        plan = plan_phase("tag", history)
+        assert plan.limit == 50
+        assert "error rate" in plan.reasons[0]
+
+    def test_clamped_to_phase_maximum(self):
+        history = [phase_metrics("enhance", 50, {"enhanced": 50}, 1.0)]
+        plan = plan_phase("enhance", history)
+        assert plan.limit == PHASE_BOUNDS["enhance"].maximum
+
+
+class TestBacklogThrottle:
+
+    def test_upstream_throttled_when_downstream_backlog_large(self):
+        plan = BatchPlan({"tag": PhasePlan(200, ["x"]), "classify": PhasePlan(100, ["y"])})
+        apply_backlog_throttle(plan, {"role-match": 700}, threshold=500)
+        assert plan.limit("tag") == 100
+        assert any("throttled" in r for r in plan.phases["tag"].reasons)
+
+    def test_upstream_cut_to_minimum_when_backlog_doubles(self):
+        plan = BatchPlan({"enhance": PhasePlan(25, ["x"])})
+        apply_backlog_throttle(plan, {"enhanced": 1000}, threshold=500)
+        assert plan.limit("enhance") == PHASE_BOUNDS["enhance"].minimum
+
+    def test_no_throttle_below_threshold(self):
+        plan = plan_batch_sizes([], {"role-match": 10})
+        assert plan.limit("tag") == PHASE_BOUNDS["tag"].default
+
+
+class TestCallerLimits:
+
+    def test_clamp_limit(self):
+        assert clamp_limit("enhance", 10_000) == PHASE_BOUNDS["enhance"].maximum
+        assert clamp_limit("tag", 20) == 20
+
+    def test_cap_records_reason(self):
+        plan = plan_batch_sizes([], {}).cap(10)
+        assert plan.limit("tag") == 10
+        assert plan.to_record()["tag"]["reasons"][-1] == "capped at caller limit 10"
+
+    def test_capped_phases_are_left_out_of_history(self):
+        plan = plan_batch_sizes([], {}).cap(10)
+        assert plan.phases["tag"].capped and plan.to_record()["tag"]["capped"] is True
+        capped = {"tag": {**_metrics(10, 10, 2.0), "capped": True}}
+        normal = {"tag": _metrics(100, 100, 20.0)}
+        assert phase_history([capped, normal], "tag") == [normal["tag"]]
+        assert plan_phase("tag", phase_history([capped, normal], "tag")).limit >= 100
+
+    def test_fixed_plan_covers_every_phase(self):
+        plan = BatchPlan.fixed(7, "push: explicit job ids")
+        assert {name: plan.limit(name) for name in PHASE_BOUNDS} == {name: 7 for name in PHASE_BOUNDS}
+        assert plan.to_record()["extract"]["reasons"] == ["push: explicit job ids"]
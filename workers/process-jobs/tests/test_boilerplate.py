@@ -0,0 +1,108 @@
+"""Tests for per-company boilerplate detection and stripping."""
+
+import asyncio
+
+import src.entry as entry
+from src.boilerplate import (
+    MIN_POSTINGS,
+    blocks,
+    decode,
+    encode,
+    learn,
+    strip,
+)
+from src.skill_vocab import mentions_skill
+
+ABOUT = "<p>Acme builds payment infrastructure for small businesses across forty countries worldwide.</p>"
+EEO   = "<p>Acme is an equal opportunity employer and values diversity of every kind at our company.</p>"
+PERKS = "<ul><li>Generous stock options for every single employee</li><li>Learning budget of 2000 EUR per year</li></ul>"
+
+ROLES = [
+    "We are looking for a React engineer to own our merchant dashboard and its design system.",
+    "Join the data team to build streaming pipelines in Kafka and Flink for fraud detection models.",
+    "As a platform engineer you will run Kubernetes clusters and improve our deployment tooling.",
+    "Our mobile team needs a Swift developer to rebuild onboarding flows for the iOS application.",
+    "Help us scale the ledger service written in Go and Postgres handling millions of transfers.",
+]
+
+
+def _posting(role: str) -> str:
+    return f"{ABOUT}<h3>The role</h3><p>{role}</p>{PERKS}{EEO}"
+
+
+def test_blocks_split_paragraphs_and_list_items():
+    assert blocks(_posting(ROLES[0]))[:3] == [
+        "Acme builds payment infrastructure for small businesses across forty countries worldwide.",
+        "The role",
+        ROLES[0],
+    ]
+    escaped = "&lt;p&gt;First paragraph&lt;/p&gt;&lt;p&gt;Second &amp;amp; last&lt;/p&gt;"
+    assert blocks(escaped) == ["First paragraph", "Second & last"]
+    assert blocks("plain text\n\nsecond line") == ["plain text", "second line"]
+
+
+def test_learn_needs_enough_postings():
+    assert learn([_posting(r) for r in ROLES[:MIN_POSTINGS - 1]]) is None
+    assert learn(["", None, *[_posting(r) for r in ROLES[:MIN_POSTINGS - 1]]]) is None
+
+
+def test_strip_drops_repeated_blocks_only():
+    model = learn([_posting(r) for r in ROLES])
+    new   = (
+        "Build the checkout SDK in TypeScript and React, working closely with our design and payments "
+        "teams on every release. You will own accessibility, performance budgets and the component "
+        "library used by every merchant-facing surface."
+    )
+    text  = strip(_posting(new), model)
+    assert new in text and "The role" in text
+    assert "equal opportunity" not in text and "payment infrastructure" not in text
+    assert "stock options" not in text and "Learning budget of 2000 EUR" not in text
+
+
+def test_blocks_naming_skills_are_never_stripped():
+    stack    = "<p>Our stack is Python, Kafka and Postgres running on Kubernetes across three regions.</p>"
+    postings = [stack + _posting(r) for r in ROLES]
+    new      = stack + _posting(
+        "Build the checkout SDK in TypeScript and React, working closely with our design and payments "
+        "teams on every release. You will own accessibility, performance budgets and the component "
+        "library used by every merchant-facing surface."
+    )
+    assert "Our stack is" not in strip(new, learn(postings))   # repeated, so boilerplate without keep
+    text = strip(new, learn(postings, keep=mentions_skill), keep=mentions_skill)
+    assert "Our stack is Python, Kafka and Postgres" in text
+    assert "equal opportunity" not in text and "payment infrastructure" not in text
+
+
+def test_strip_keeps_description_when_too_little_is_left_or_no_model():
+    model = learn([_posting(r) for r in ROLES])
+    short = _posting("Short role text.")
+    assert strip(short, model) is short
+    assert strip(_posting(ROLES[0]), None) == _posting(ROLES[0])
+    assert strip(None, model) == ""
+
+
+def test_encode_round_trips():
+    model = learn([_posting(r) for r in ROLES])
+    assert decode(encode(model)) == model
+    assert decode("") is None and decode("not base64!") is None
+
+
+def test_chars_saved_counts_dropped_blocks_not_markup(monkeypatch):
+    model   = learn([_posting(r) for r in ROLES])
+    posting = _posting(
+        "Build the checkout SDK in TypeScript and React, working closely with our design and payments "
+        "teams on every release. You will own accessibility, performance budgets and the component "
+        "library used by every merchant-facing surface."
+    )
+
+    async def load(db, keys):
+        return {"acme": model}
+
+    monkeypatch.setattr(entry, "load_boilerplate", load)
+    job   = {"company_key": "acme", "description": posting}
+    stats = asyncio.run(entry.strip_company_boilerplate(None, [job]))
+
+    text = job["prompt_description"]
+    assert stats["boilerplateStripped"] == 1
+    assert stats["boilerplateCharsSaved"] == len("\n".join(blocks(posting))) - len(text)
+    assert stats["boilerplateCharsSaved"] < len(posting) - len(text)
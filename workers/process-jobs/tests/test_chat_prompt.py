@@ -0,0 +1,46 @@
+"""Tests for the langchain-free prompt layer."""
+
+import json
+
+from src.chat_prompt import ChatPrompt, response_text
+
+PROMPT = ChatPrompt.from_messages([
+    ("system", 'Allowed: {tags}. Return {{"ok": true}}'),
+    ("human", "Title: {title}\nDescription: {description}"),
+])
+
+
+class TestChatPrompt:
+
+    def test_roles_and_brace_escaping(self):
+        messages = PROMPT.format_messages(tags="react", title="Dev", description="uses {braces}")
+        assert messages == [
+            {"role": "system", "content": 'Allowed: react. Return {"ok": true}'},
+            {"role": "user", "content": "Title: Dev\nDescription: uses {braces}"},
+        ]
+
+    def test_partial_makes_the_system_message_static(self):
+        bound = PROMPT.partial(tags="react, vue")
+        assert PROMPT.input_variables == ["description", "tags", "title"]
+        assert bound.input_variables == ["description", "title"]
+        assert bound.format_messages(title="a", description="b")[0]["content"].startswith("Allowed: react, vue.")
+
+    def test_request_body_matches_formatted_messages(self):
+        bound  = PROMPT.partial(tags="react")
+        values = {"title": 'Quote " and — dash', "description": "line\nbreak"}
+        body   = json.loads(bound.request_body(values, model="m", temperature=0.1, stream=True))
+        assert body == {
+            "model": "m", "temperature": 0.1, "stream": True,
+            "messages": bound.format_messages(**values),
+        }
+        assert json.loads(bound.request_body(values)) == {"messages": body["messages"]}
+
+
+class TestResponseText:
+
+    def test_workers_ai_and_openai_shapes(self):
+        assert response_text({"response": "hi"}) == "hi"
+        assert json.loads(response_text({"response": {"confidence": "high"}})) == {"confidence": "high"}
+        assert response_text({"choices": [{"message": {"content": "{}"}}]}) == "{}"
+        assert response_text({"response": "  "}) is None
+        assert response_text(None) is None
@@ -0,0 +1,91 @@
+"""Tests for near-duplicate detection (MinHash + LSH)."""
+
+from src.dedup import (
+    BANDS,
+    NUM_PERM,
+    band_keys,
+    cluster_batch,
+    decode,
+    encode,
+    fingerprint,
+    pick_donors,
+    same_location,
+    similarity,
+)
+
+DESCRIPTION = """
+<p>We are looking for a Senior Frontend Engineer to join our product team and build
+the next generation of our analytics dashboard.</p>
+<ul><li>Own large parts of our React and TypeScript codebase end to end</li>
+<li>Work closely with designers and backend engineers on new features</li>
+<li>Improve performance, accessibility and test coverage across the app</li></ul>
+<p>You have five or more years of experience shipping web applications, a strong
+grasp of modern CSS, and you enjoy mentoring other engineers. We offer a
+competitive salary, equity, a yearly learning budget and flexible hours.</p>
+"""
+
+OTHER = """
+Our data platform team is hiring a Staff Data Engineer to design batch and streaming
+pipelines on Spark and Kafka, own our warehouse models in dbt and Snowflake, and
+partner with analysts across finance and marketing. Experience with Airflow, Python
+and infrastructure as code is required; Scala is a plus. Remote within Europe.
+"""
+
+
+def test_signature_shape_and_round_trip():
+    sig = fingerprint("Senior Frontend Engineer", DESCRIPTION)
+    assert len(sig) == NUM_PERM
+    assert all(0 <= v < 2 ** 32 for v in sig)
+    assert decode(encode(sig)) == sig
+    assert len(band_keys(sig)) == BANDS
+    assert all(0 <= k < 2 ** 48 for k in band_keys(sig))
+
+
+def test_markup_and_case_do_not_change_the_signature():
+    plain = DESCRIPTION.replace("<p>", "").replace("</p>", "").replace("<li>", " ").upper()
+    assert fingerprint("Senior Frontend Engineer", DESCRIPTION) == fingerprint("senior frontend engineer", plain)
+
+
+def test_short_text_is_not_fingerprinted():
+    assert fingerprint("Senior Frontend Engineer", "Remote, apply now") is None
+
+
+def test_city_variant_is_similar_and_unrelated_job_is_not():
+    base  = fingerprint("Senior Frontend Engineer", DESCRIPTION)
+    city  = fingerprint("Senior Frontend Engineer (Berlin)", DESCRIPTION + " Location: Berlin, Germany.")
+    other = fingerprint("Staff Data Engineer", OTHER)
+    assert similarity(base, city) >= 0.8
+    assert similarity(base, other) < 0.2
+    assert set(band_keys(base)) & set(band_keys(city))
+
+
+def test_cluster_batch_joins_indexed_and_in_batch_copies():
+    original = fingerprint("Senior Frontend Engineer", DESCRIPTION)
+    indexed  = [
+        {"bucket": key, "job_id": 10, "signature": encode(original), "cluster_id": 10}
+        for key in band_keys(original)
+    ]
+    batch = [
+        (20, fingerprint("Senior Frontend Engineer (Remote EU)", DESCRIPTION + " Remote in the EU.")),
+        (21, fingerprint("Staff Data Engineer", OTHER)),
+        (22, fingerprint("Staff Data Engineer", OTHER + " Apply today.")),
+        (23, None),
+    ]
+    by_id = {a.job_id: a for a in cluster_batch(batch, indexed)}
+    assert by_id[20].cluster_id == 10 and by_id[20].duplicate_of == 10
+    assert by_id[20].similarity >= 0.8
+    assert by_id[21].cluster_id == 21 and by_id[21].duplicate_of is None
+    assert by_id[22].cluster_id == 21 and by_id[22].duplicate_of == 21
+    assert by_id[23].cluster_id == 23 and by_id[23].signature is None
+
+
+def test_donors_respect_location():
+    rows = [
+        {"job_id": 1, "donor_id": 5, "location": "Berlin", "donor_location": "New York"},
+        {"job_id": 1, "donor_id": 6, "location": "Berlin", "donor_location": "berlin"},
+        {"job_id": 2, "donor_id": 7, "location": None, "donor_location": ""},
+    ]
+    assert same_location(rows[1]) and not same_location(rows[0])
+    donors = pick_donors(rows, same_location)
+    assert {k: v["donor_id"] for k, v in donors.items()} == {1: 6, 2: 7}
+    assert pick_donors(rows)[1]["donor_id"] == 5
@@ -0,0 +1,61 @@
+"""HTTP phase handlers pass only arguments their phase functions accept."""
+
+import asyncio
+import inspect
+from types import SimpleNamespace
+
+import src.entry as entry
+
+
+class FakeRequest:
+    url = "https://process-jobs.example/tag?limit=5"
+
+    async def json(self):
+        return {}
+
+
+def _recorder(monkeypatch, name: str, stats: dict) -> list:
+    """Replace ``entry.<name>`` with a fake that binds calls to the real signature."""
+    signature = inspect.signature(getattr(entry, name))
+    calls     = []
+
+    async def fake(*args, **kwargs):
+        calls.append(signature.bind(*args, **kwargs).arguments)   # TypeError like the real call
+        return stats
+
+    monkeypatch.setattr(entry, name, fake)
+    return calls
+
+
+def _handler(monkeypatch):
+    monkeypatch.setattr(entry, "Response", SimpleNamespace(json=lambda body, headers=None: body), raising=False)
+
+    async def no_push(env, job_ids):
+        return 0
+
+    monkeypatch.setattr(entry, "push_advanced", no_push)
+    handler     = entry.Default()
+    handler.env = SimpleNamespace(DB=object(), AI=None, ROLE_PAID_BUDGET="7")
+    return handler
+
+
+def test_tag_passes_env_and_paid_budget(monkeypatch):
+    handler = _handler(monkeypatch)
+    calls   = _recorder(monkeypatch, "tag_roles_for_enhanced_jobs", {
+        "processed": 1, "targetRole": 1, "irrelevant": 0, "advancedIds": [],
+    })
+
+    body = asyncio.run(handler.handle_tag(FakeRequest(), {}))
+
+    assert body["success"]
+    assert calls[0]["env"] is handler.env
+    assert calls[0]["paid_budget"] == 7
+
+
+def test_backfill_role_tags_binds(monkeypatch):
+    handler = _handler(monkeypatch)
+    calls   = _recorder(monkeypatch, "backfill_role_tags_for_eu_remote_jobs", {"processed": 2})
+
+    body = asyncio.run(handler.handle_backfill_role_tags(FakeRequest(), {}))
+
+    assert body["success"] and calls[0]["limit"] == 5
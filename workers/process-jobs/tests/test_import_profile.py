@@ -0,0 +1,34 @@
+"""Tests for the entry-module import profiler."""
+
+import builtins
+import sys
+
+from src.import_profile import ImportProfiler
+
+
+def test_times_first_imports_and_unhooks(tmp_path, monkeypatch):
+    (tmp_path / "prof_outer.py").write_text("import prof_inner\n")
+    (tmp_path / "prof_inner.py").write_text("import time\ntime.sleep(0.02)\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    original = builtins.__import__
+
+    profiler = ImportProfiler()
+    profiler.start()
+    try:
+        import prof_outer  # noqa: F401
+        import prof_outer  # noqa: F401,F811 — already loaded, not timed twice
+    finally:
+        profiler.stop()
+        sys.modules.pop("prof_outer", None)
+        sys.modules.pop("prof_inner", None)
+
+    assert builtins.__import__ is original
+    report = profiler.report()
+    rows   = {row["module"]: row for row in report["modules"]}
+    assert rows["prof_inner"]["ms"] >= 20
+    assert rows["prof_outer"]["ms"] >= rows["prof_inner"]["ms"]
+    assert rows["prof_outer"]["selfMs"] < rows["prof_inner"]["ms"]
+    assert report["initMs"] >= rows["prof_outer"]["ms"]
+    assert report["firstRequestMs"] is None
+    profiler.mark_request()
+    assert profiler.report()["firstRequestMs"] >= report["initMs"]
@@ -0,0 +1,85 @@
+"""Tests for per-job queue retries."""
+
+import json
+import sqlite3
+
+from src.job_retry import (
+    ADVANCE_ACTION,
+    MAX_RETRY_DELAY_S,
+    advance_messages,
+    chunk_ids,
+    coalesce_job_ids,
+    id_filter,
+    message_job_ids,
+    plan_retries,
+    retry_delay_s,
+)
+
+
+def test_message_job_ids():
+    assert message_job_ids({"action": "tag", "limit": 10}) is None
+    assert message_job_ids({"jobIds": [3, 1, 3, None]}) == [3, 1]
+    assert message_job_ids({"jobId": 7}) == [7]
+    assert message_job_ids({"jobIds": "1,2"}) is None
+
+
+def test_id_filter_binds_one_json_parameter():
+    assert id_filter(None) == ("", [])
+    ids = list(range(1, 301))
+    sql, params = id_filter(ids)
+    assert params == [json.dumps(ids)]
+
+    db = sqlite3.connect(":memory:")
+    db.execute("CREATE TABLE jobs (id INTEGER, status TEXT)")
+    db.executemany("INSERT INTO jobs VALUES (?, ?)", [(i, "enhanced") for i in range(1, 1001)])
+    rows = db.execute(f"SELECT count(*) FROM jobs WHERE status = ?{sql}", ["enhanced", *params]).fetchone()
+    assert rows == (300,)
+
+
+def test_plan_retries_one_message_per_failed_job():
+    plan = plan_retries("tag", [5, 6, 5], attempts=0, trace_id="t")
+    assert plan.retry == [
+        {"action": "tag", "jobIds": [5], "attempts": 1, "traceId": "t"},
+        {"action": "tag", "jobIds": [6], "attempts": 1, "traceId": "t"},
+    ]
+    assert plan.dead == []
+    assert not plan_retries("tag", [], attempts=0)
+
+
+def test_plan_retries_dead_letters_at_threshold():
+    plan = plan_retries("extract", [9], attempts=2, max_attempts=3)
+    assert plan.retry == []
+    assert plan.dead == [{"action": "extract", "jobIds": [9], "attempts": 3, "traceId": None, "jobId": 9}]
+
+
+def test_retry_delay_grows_and_caps():
+    assert [retry_delay_s(a) for a in (1, 2, 3)] == [30, 60, 120]
+    assert retry_delay_s(40) == MAX_RETRY_DELAY_S
+
+
+def test_chunk_ids():
+    assert chunk_ids([1, 2, 3, 4, 5], size=2) == [[1, 2], [3, 4], [5]]
+
+
+def test_advance_messages_dedupe_and_chunk():
+    assert advance_messages([1, 2, 2, None, 3], "t", size=2) == [
+        {"action": ADVANCE_ACTION, "jobIds": [1, 2], "traceId": "t"},
+        {"action": ADVANCE_ACTION, "jobIds": [3], "traceId": "t"},
+    ]
+    assert advance_messages([]) == []
+
+
+def test_coalesce_job_ids_unions_a_burst():
+    bodies = [
+        {"action": ADVANCE_ACTION, "jobIds": [1, 2]},
+        {"action": ADVANCE_ACTION, "jobIds": [2, 3]},
+        {"action": ADVANCE_ACTION, "jobIds": [4], "attempts": 1},
+        {"action": ADVANCE_ACTION, "jobIds": [3], "attempts": 2},
+        {"action": ADVANCE_ACTION, "jobIds": [5, 6, 7]},
+    ]
+    assert coalesce_job_ids(bodies, size=3) == [
+        (0, [1, 2, 5]),
+        (0, [6, 7]),
+        (1, [4]),
+        (2, [3]),
+    ]
@@ -0,0 +1,159 @@
+"""Tests for the shared DeepSeek rate limit / daily budget."""
+
+import asyncio
+import sqlite3
+
+from src.llm_budget import LEASE_SIZE, BudgetLimiter, usage_spend
+from src.llm_stream import read_json_stream
+from tests.test_llm_stream import FakeReader, _deepseek_event, _sse, _split
+
+SCHEMA = """
+CREATE TABLE llm_rate_windows (
+  provider TEXT NOT NULL, window_start INTEGER NOT NULL, requests INTEGER NOT NULL DEFAULT 0,
+  PRIMARY KEY (provider, window_start)
+);
+CREATE TABLE llm_budget_ledger (
+  provider TEXT NOT NULL, day TEXT NOT NULL,
+  requests INTEGER NOT NULL DEFAULT 0, tokens INTEGER NOT NULL DEFAULT 0,
+  cost_usd REAL NOT NULL DEFAULT 0, updated_at TEXT,
+  PRIMARY KEY (provider, day)
+);
+"""
+
+T0 = 1_772_366_400.0   # 2026-03-01 12:00:00 UTC, a minute boundary
+
+
+class Clock:
+    def __init__(self, now=T0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def _limiter(db, clock, **config):
+    async def query(sql, params):
+        cur = db.execute(sql, params)
+        cols = [c[0] for c in cur.description or ()]
+        rows = [dict(zip(cols, r)) for r in cur.fetchall()]
+        db.commit()
+        return rows
+
+    async def sleep(seconds):
+        clock.now += seconds
+
+    limiter = BudgetLimiter("deepseek", clock=clock)
+    limiter.configure(**config)
+    limiter.bind(query, sleep)
+    return limiter
+
+
+def _db():
+    db = sqlite3.connect(":memory:")
+    db.executescript(SCHEMA)
+    return db
+
+
+def _permits(limiter, n):
+    return [asyncio.run(limiter.acquire()) for _ in range(n)]
+
+
+def test_usage_spend_prices_cache_hits():
+    spend = usage_spend({"prompt_cache_hit_tokens": 1_000_000, "prompt_cache_miss_tokens": 0, "completion_tokens": 0})
+    assert spend.tokens == 1_000_000 and abs(spend.cost_usd - 0.028) < 1e-9
+    assert usage_spend({"prompt_tokens": 10, "completion_tokens": 5}).tokens == 15
+
+
+def test_leases_are_shared_across_isolates():
+    db, clock = _db(), Clock()
+    a = _limiter(db, clock, rpm=8)
+    b = _limiter(db, clock, rpm=8)
+    assert _permits(a, LEASE_SIZE) == [True] * LEASE_SIZE   # one lease
+    assert a.leases == 1
+    # b's lease of 5 would take the window to 10 > 8: it waits a minute and retries
+    assert asyncio.run(b.acquire()) is True
+    assert b.rate_waits == 1 and clock.now == T0 + 60
+    rows = db.execute("SELECT window_start, requests FROM llm_rate_windows ORDER BY window_start").fetchall()
+    assert rows == [(int(T0 // 60), 5), (int(T0 // 60) + 1, 5)]
+
+
+def test_full_window_denies_after_one_wait():
+    db, clock = _db(), Clock()
+    a = _limiter(db, clock, rpm=5)
+    b = _limiter(db, clock, rpm=5)
+
+    async def exhaust_next_minute(seconds):
+        clock.now += seconds
+        db.execute("INSERT INTO llm_rate_windows VALUES ('deepseek', ?, 5)", [int(clock.now // 60)])
+
+    assert _permits(a, 5) == [True] * 5
+    b._sleep = exhaust_next_minute
+    assert asyncio.run(b.acquire()) is False
+    assert b.rate_denied == 1
+
+
+def test_daily_token_cap_degrades_and_resets_next_day():
+    db, clock = _db(), Clock()
+    a = _limiter(db, clock, daily_tokens=1000)
+    assert asyncio.run(a.acquire()) is True
+    a.record({"prompt_tokens": 900, "completion_tokens": 200})
+    assert a.exhausted()
+    assert asyncio.run(a.acquire()) is False
+    assert a.budget_denied == 1
+    asyncio.run(a.flush())
+    assert db.execute("SELECT requests, tokens FROM llm_budget_ledger").fetchall() == [(1, 1100)]
+
+    # Another isolate sees the written ledger
+    b = _limiter(db, clock, daily_tokens=1000)
+    assert asyncio.run(b.acquire()) is False
+
+    clock.now += 86_400
+    assert asyncio.run(b.acquire()) is True
+
+
+def test_streamed_call_without_usage_is_estimated():
+    db, clock = _db(), Clock()
+    a = _limiter(db, clock, daily_tokens=500, daily_usd="0.0001")
+    answer = '{"skills": [' + ", ".join(['"python"'] * 150) + "]}"
+    # Stream ends (or is cut) before DeepSeek's usage event
+    reader = FakeReader(_split(_sse(_deepseek_event(answer)), 64))
+    result = asyncio.run(read_json_stream(reader, ("skills",), provider="deepseek"))
+    assert result.usage is None
+    a.record(result.usage, prompt_chars=1200, completion_chars=len(result.text))
+    stats = a.as_stats()
+    assert stats["estimated"] == 1
+    assert stats["tokensToday"] == 300 + -(-len(answer) // 4)
+    assert stats["costTodayUsd"] > 0 and a.exhausted()
+    asyncio.run(a.flush())
+    assert db.execute("SELECT requests, tokens FROM llm_budget_ledger").fetchall() == [(1, stats["tokensToday"])]
+
+    # A usage block always wins over the estimate
+    b = _limiter(_db(), clock)
+    b.record({"prompt_tokens": 10, "completion_tokens": 5}, prompt_chars=1200, completion_chars=4000)
+    assert b.as_stats()["tokensToday"] == 15 and b.estimated == 0
+
+
+def test_request_path_acquire_does_not_wait():
+    db, clock = _db(), Clock()
+    a = _limiter(db, clock, rpm=5)
+    b = _limiter(db, clock, rpm=5)
+    assert _permits(a, 5) == [True] * 5
+    assert asyncio.run(b.acquire(wait=False)) is False
+    assert clock.now == T0 and b.rate_waits == 0 and b.rate_denied == 1
+
+
+def test_d1_errors_fail_open():
+    clock = Clock()
+    limiter = BudgetLimiter("deepseek", clock=clock)
+
+    async def broken(sql, params):
+        raise RuntimeError("no such table: llm_rate_windows")
+
+    async def sleep(seconds):
+        clock.now += seconds
+
+    limiter.configure(daily_usd="0.01")
+    limiter.bind(broken, sleep)
+    assert _permits(limiter, 3) == [True] * 3
+    assert limiter.errors >= 2
+    asyncio.run(limiter.flush())
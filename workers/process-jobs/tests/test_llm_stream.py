@@ -0,0 +1,169 @@
+"""Tests for streamed LLM responses with early JSON termination."""
+
+import asyncio
+import json
+from types import SimpleNamespace
+
+from src.llm_stream import (
+    JsonObjectScanner,
+    LatencyRecord,
+    SseDecoder,
+    StreamTimings,
+    content_delta,
+    read_json_stream,
+)
+
+
+def _sse(*events, done=True) -> str:
+    lines = [f"data: {json.dumps(e)}\n\n" for e in events]
+    if done:
+        lines.append("data: [DONE]\n\n")
+    return "".join(lines)
+
+
+def _deepseek_event(text: str) -> dict:
+    return {"choices": [{"delta": {"content": text}}]}
+
+
+class FakeReader:
+    """ReadableStream reader over fixed byte chunks; records cancel()."""
+
+    def __init__(self, chunks: list[bytes]):
+        self.chunks    = list(chunks)
+        self.reads     = 0
+        self.cancelled = False
+
+    async def read(self):
+        if not self.chunks:
+            return SimpleNamespace(done=True, value=None)
+        self.reads += 1
+        return SimpleNamespace(done=False, value=self.chunks.pop(0))
+
+    async def cancel(self):
+        self.cancelled = True
+
+
+def _split(text: str, size: int) -> list[bytes]:
+    raw = text.encode()
+    return [raw[i:i + size] for i in range(0, len(raw), size)]
+
+
+class TestScanner:
+
+    def test_object_split_across_chunks(self):
+        scanner = JsonObjectScanner(("confidence",))
+        text    = 'Sure: {"isRemoteEU": true, "confidence": "high", "reason": "EU only {x}"} trailing'
+        found   = None
+        for i in range(0, len(text), 3):
+            found = scanner.feed(text[i:i + 3]) or found
+        assert found == {"isRemoteEU": True, "confidence": "high", "reason": "EU only {x}"}
+
+    def test_escaped_quote_and_brace_in_string(self):
+        scanner = JsonObjectScanner(("reason",))
+        assert scanner.feed('{"reason": "say \\"}\\" here", "n": {"a": 1}}') == {
+            "reason": 'say "}" here', "n": {"a": 1},
+        }
+
+    def test_skips_think_block_and_prose_braces(self):
+        scanner = JsonObjectScanner(("confidence",))
+        text = '<think>maybe {"confidence": "low"}</think> for {title}: {"confidence": "high"}'
+        assert scanner.feed(text) == {"confidence": "high"}
+
+    def test_missing_required_keys_kept_as_fallback(self):
+        scanner = JsonObjectScanner(("isFrontendReact",))
+        assert scanner.feed('{"is_frontend_react": true}') is None
+        assert scanner.fallback == {"is_frontend_react": True}
+
+
+class TestSse:
+
+    def test_events_split_mid_line(self):
+        decoder = SseDecoder()
+        stream  = _sse(_deepseek_event("a"), {"response": "b"})
+        events  = []
+        for i in range(0, len(stream), 7):
+            events += decoder.feed(stream[i:i + 7])
+        assert [content_delta(e) for e in events] == ["a", "b"]
+        assert decoder.done
+
+    def test_reasoning_content_is_not_answer_text(self):
+        event = {"choices": [{"delta": {"reasoning_content": "hmm", "content": None}}]}
+        assert content_delta(event) == ""
+
+
+class TestReadJsonStream:
+
+    def test_cancels_after_first_complete_object(self):
+        answer = '{"confidence": "high", "reason": "ok"}'
+        events = [_deepseek_event(answer[i:i + 5]) for i in range(0, len(answer), 5)]
+        events += [_deepseek_event(" and a long trailing explanation")] * 100   # past the usage grace
+        reader = FakeReader(_split(_sse(*events), 40))
+        total  = len(reader.chunks)
+
+        result = asyncio.run(read_json_stream(reader, ("confidence",), provider="deepseek"))
+
+        assert result.obj == {"confidence": "high", "reason": "ok"}
+        assert result.timings.early_stop and reader.cancelled
+        assert reader.reads < total
+        assert result.timings.decision_ms >= result.timings.ttfb_ms
+
+    def test_utf8_split_across_chunks_and_usage(self):
+        answer = '{"reason": "Zürich — remote", "confidence": "medium"}'
+        stream = _sse(_deepseek_event(answer), {"choices": [], "usage": {"completion_tokens": 9}})
+        reader = FakeReader(_split(stream, 3))
+
+        result = asyncio.run(read_json_stream(reader, ("reason", "absent"), provider="deepseek"))
+
+        assert result.obj["reason"] == "Zürich — remote"   # fallback: "absent" never arrives
+        assert result.usage == {"completion_tokens": 9}
+        assert not result.timings.early_stop and not reader.cancelled
+
+    def test_deepseek_reads_on_to_the_usage_event(self):
+        answer = '{"confidence": "high", "reason": "ok"}'
+        usage  = {"prompt_tokens": 900, "prompt_cache_hit_tokens": 640, "completion_tokens": 14}
+        stream = _sse(_deepseek_event(answer), {"choices": [], "usage": usage}, done=False)
+        stream += _sse(_deepseek_event("never read"), done=True)
+        reader = FakeReader(_split(stream, 20))
+
+        result = asyncio.run(read_json_stream(reader, ("confidence",), provider="deepseek"))
+
+        assert result.obj["confidence"] == "high" and result.usage == usage
+        assert "never read" not in result.text and reader.cancelled
+
+    def test_usage_wait_is_bounded(self):
+        answer = '{"confidence": "high"}'
+        events = [_deepseek_event(answer)] + [_deepseek_event("x" * 500)] * 10
+        events.append({"choices": [], "usage": {"completion_tokens": 2000}})
+        reader = FakeReader(_split(_sse(*events), 200))
+
+        result = asyncio.run(read_json_stream(reader, ("confidence",), provider="deepseek"))
+
+        assert result.obj == {"confidence": "high"} and result.usage is None
+        assert result.timings.early_stop and reader.cancelled
+
+    def test_workers_ai_does_not_wait_for_usage(self):
+        answer = '{"confidence": "high"}'
+        stream = _sse({"response": answer}, {"response": " trailing"}, {"usage": {"completion_tokens": 5}})
+        reader = FakeReader(_split(stream, 10))
+        result = asyncio.run(read_json_stream(reader, ("confidence",), provider="workers_ai"))
+        assert result.usage is None and result.timings.early_stop
+
+    def test_no_object_returns_text(self):
+        reader = FakeReader([_sse({"response": "no json here"}, done=False).encode()])
+        result = asyncio.run(read_json_stream(reader, provider="workers_ai"))
+        assert result.obj is None
+        assert result.text == "no json here"
+
+
+class TestLatencyRecord:
+
+    def test_round_trip_and_since(self):
+        record = LatencyRecord()
+        record.record(StreamTimings("deepseek", ttfb_ms=100, decision_ms=400, early_stop=True))
+        before = record.snapshot()
+        record.record(StreamTimings("workers_ai", ttfb_ms=50, decision_ms=150))
+        delta = record.since(before)
+        assert (delta.calls, delta.early_stops, delta.decision_ms) == (1, 0, 150)
+        stats = record.as_stats()
+        assert stats["llmDecisionMsAvg"] == 275.0
+        assert LatencyRecord.from_stats(stats) == record
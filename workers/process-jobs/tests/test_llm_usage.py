@@ -0,0 +1,61 @@
+"""Tests for DeepSeek usage accounting."""
+
+from src.llm_usage import PRICE_PER_MILLION, UsageRecord
+
+
+def _response(hit=None, miss=None, prompt=None, completion=0) -> dict:
+    usage = {"completion_tokens": completion}
+    if hit is not None:
+        usage["prompt_cache_hit_tokens"] = hit
+    if miss is not None:
+        usage["prompt_cache_miss_tokens"] = miss
+    if prompt is not None:
+        usage["prompt_tokens"] = prompt
+    return {"choices": [], "usage": usage}
+
+
+class TestRecord:
+
+    def test_cache_split(self):
+        usage = UsageRecord()
+        usage.record(_response(hit=1024, miss=200, completion=50))
+        usage.record(_response(hit=1024, miss=180, completion=40))
+        assert usage.calls == 2
+        assert usage.cache_hit_tokens == 2048
+        assert usage.cache_miss_tokens == 380
+        assert usage.completion_tokens == 90
+        assert round(usage.cache_hit_rate, 3) == round(2048 / 2428, 3)
+
+    def test_provider_without_cache_fields(self):
+        usage = UsageRecord()
+        usage.record(_response(prompt=500, completion=20))
+        assert (usage.cache_hit_tokens, usage.cache_miss_tokens) == (0, 500)
+
+    def test_missing_usage_block(self):
+        usage = UsageRecord()
+        usage.record({"choices": []})
+        assert usage.calls == 1
+        assert usage.cost_usd() == 0.0
+
+
+class TestStats:
+
+    def test_since_snapshot(self):
+        usage = UsageRecord()
+        usage.record(_response(hit=100, miss=100))
+        before = usage.snapshot()
+        usage.record(_response(hit=300, miss=0, completion=10))
+        delta = usage.since(before)
+        assert (delta.calls, delta.cache_hit_tokens, delta.cache_miss_tokens) == (1, 300, 0)
+
+    def test_cost_per_job(self):
+        usage = UsageRecord(calls=1, cache_hit_tokens=1_000_000, cache_miss_tokens=0, completion_tokens=0)
+        stats = usage.as_stats(jobs=4)
+        assert stats["deepseekCostUsd"] == PRICE_PER_MILLION["cache_hit"]
+        assert stats["deepseekCostPerJobUsd"] == round(PRICE_PER_MILLION["cache_hit"] / 4, 6)
+        assert usage.as_stats(jobs=0)["deepseekCostPerJobUsd"] == 0.0
+
+    def test_round_trip_through_stats(self):
+        usage = UsageRecord(calls=3, cache_hit_tokens=10, cache_miss_tokens=20, completion_tokens=5)
+        assert UsageRecord.from_stats(usage.as_stats()) == usage
+        assert UsageRecord.from_stats({}) + usage == usage
@@ -0,0 +1,155 @@
+"""Tests for the cost- and latency-aware Workers AI model router."""
+
+import asyncio
+
+from src.model_router import (
+    AUDIT_EVERY,
+    DEFAULT_ROUTES,
+    EXPLORE_EVERY,
+    LLAMA_70B,
+    MIN_SAMPLES,
+    QWEN3_MODEL,
+    SMALL_INPUT_CHARS,
+    SMALL_MODEL,
+    TASK_EU_CLASSIFY,
+    TASK_ROLE_TAG,
+    TASK_TITLE_SCORE,
+    ModelRouter,
+    insert_params,
+    prune_params,
+    run_routed,
+)
+
+SMALL, LARGE = SMALL_MODEL, QWEN3_MODEL
+
+
+def _router() -> ModelRouter:
+    """A router with the small model opted in for role tagging."""
+    return ModelRouter({TASK_ROLE_TAG: [SMALL, LARGE]})
+
+
+def _seed(router: ModelRouter, model: str, ok: bool, latency_ms: float, n: int = MIN_SAMPLES, verified=True):
+    router.warm([
+        {"task": TASK_ROLE_TAG, "model": model, "ok": int(ok), "verified": int(verified), "latency_ms": latency_ms}
+    ] * n)
+
+
+class TestRoute:
+
+    def test_defaults_keep_the_pre_routing_models(self):
+        router = ModelRouter()
+        assert DEFAULT_ROUTES[TASK_ROLE_TAG] == (QWEN3_MODEL,)
+        assert DEFAULT_ROUTES[TASK_TITLE_SCORE] == (LLAMA_70B,)
+        decision = router.route(TASK_ROLE_TAG, 800)
+        assert (decision.model, decision.reason) == (QWEN3_MODEL, "single-model")
+
+    def test_small_model_first_when_opted_in(self):
+        decision = _router().route(TASK_ROLE_TAG, 800)
+        assert (decision.model, decision.reason) == (SMALL, "default")
+
+    def test_long_input_and_hard_signals_start_large(self):
+        router = _router()
+        long   = router.route(TASK_ROLE_TAG, SMALL_INPUT_CHARS[TASK_ROLE_TAG] + 1)
+        hard   = router.route(TASK_ROLE_TAG, 100, hard=True)
+        assert (long.model, long.reason) == (LARGE, "long-input")
+        assert (hard.model, hard.reason) == (LARGE, "hard-signals")
+
+    def test_inaccurate_small_model_is_skipped_but_explored(self):
+        router = _router()
+        _seed(router, SMALL, ok=False, latency_ms=200)
+        decisions = [router.route(TASK_ROLE_TAG, 100) for _ in range(EXPLORE_EVERY)]
+        assert [d.model for d in decisions[:-1]] == [LARGE] * (EXPLORE_EVERY - 1)
+        assert (decisions[-1].model, decisions[-1].reason) == (SMALL, "explore")
+
+    def test_faster_large_model_wins(self):
+        router = _router()
+        _seed(router, SMALL, ok=True, latency_ms=900)
+        _seed(router, LARGE, ok=True, latency_ms=400, verified=False)
+        assert router.route(TASK_ROLE_TAG, 100).model == LARGE
+
+    def test_unverified_confidence_is_not_accuracy(self):
+        router = _router()
+        _seed(router, SMALL, ok=True, latency_ms=200, verified=False)
+        stats = router.stats(TASK_ROLE_TAG, SMALL)
+        assert (stats.samples, stats.calls) == (0, MIN_SAMPLES)
+        assert router.route(TASK_ROLE_TAG, 100).reason == "default"
+
+    def test_env_override(self):
+        router = ModelRouter()
+        router.configure('{"eu_classify": ["@cf/only/model"]}')
+        decision = router.route(TASK_EU_CLASSIFY, 100)
+        assert (decision.model, decision.reason) == ("@cf/only/model", "single-model")
+        router.configure("not json")
+        assert router.routes[TASK_EU_CLASSIFY] == ("@cf/only/model",)
+
+
+class TestRunRouted:
+
+    def test_escalates_until_accepted_and_logs_each_step(self):
+        router = _router()
+        answers = {SMALL: ("medium", True), LARGE: ("high", True)}
+
+        async def call(model):
+            return answers[model]
+
+        result = asyncio.run(run_routed(
+            router, TASK_ROLE_TAG, 100, call,
+            lambda r: r[0] == "high", agree=lambda a, b: a[1] == b[1],
+        ))
+        rows = router.drain()
+        assert result == ("high", True)
+        assert [(r["model"], r["outcome"], r["ok"], r["verified"]) for r in rows] == [
+            (SMALL, "escalated", True, True),   # same answer as the larger model
+            (LARGE, "accepted", True, False),
+        ]
+        assert rows[1]["escalated_from"] == SMALL
+        assert router.drain() == []
+        assert len(insert_params("process-jobs", rows[0])) == 12
+        assert prune_params("process-jobs") == ["process-jobs", "-30 days"]
+
+    def test_confident_small_model_stops_the_route(self):
+        router = _router()
+        calls  = []
+
+        async def call(model):
+            calls.append(model)
+            return "high"
+
+        asyncio.run(run_routed(router, TASK_ROLE_TAG, 100, call, lambda r: r == "high"))
+        assert calls == [SMALL]
+        assert router.stats(TASK_ROLE_TAG, SMALL).samples == 0   # confidence is not correctness
+
+    def test_accepted_small_answers_are_audited_against_the_top_model(self):
+        router  = _router()
+        answers = {SMALL: ("frontend", "high"), LARGE: ("backend", "high")}
+        calls   = []
+
+        async def call(model):
+            calls.append(model)
+            return answers[model]
+
+        results = [
+            asyncio.run(run_routed(
+                router, TASK_ROLE_TAG, 100, call, lambda r: r[1] == "high", agree=lambda a, b: a[0] == b[0],
+            ))
+            for _ in range(AUDIT_EVERY)
+        ]
+        assert set(results) == {answers[SMALL]}
+        assert calls.count(LARGE) == 1
+        rows = router.drain()
+        assert [(r["model"], r["outcome"], r["ok"], r["verified"]) for r in rows[-2:]] == [
+            (SMALL, "accepted", False, True),    # disagreed with the audit
+            (LARGE, "audit", True, False),
+        ]
+        stats = router.stats(TASK_ROLE_TAG, SMALL)
+        assert (stats.samples, stats.accuracy) == (1, 0.0)
+
+    def test_failures_escalate_and_count_against_the_model(self):
+        router = _router()
+
+        async def call(model):
+            return None
+
+        assert asyncio.run(run_routed(router, TASK_ROLE_TAG, 100, call, bool)) is None
+        assert [r["outcome"] for r in router.drain()] == ["failed", "failed"]
+        assert router.stats(TASK_ROLE_TAG, SMALL).accuracy == 0.0
@@ -0,0 +1,73 @@
+"""Tests for the Tier 0 value-aware planner."""
+
+from types import SimpleNamespace
+
+from src.planner import (
+    eu_verdicts_from_prescreen,
+    expected_value,
+    plan_role_tagging,
+    skill_extraction_statuses,
+)
+
+
+def _tags(frontend=False, ai=False):
+    return SimpleNamespace(isFrontendReact=frontend, isAIEngineer=ai, confidence="high")
+
+
+def _jobs(*ids):
+    return [{"id": i, "title": f"Job {i}"} for i in ids]
+
+
+class TestPrescreenVerdicts:
+
+    def test_undecided_results_are_ambiguous(self):
+        verdicts = eu_verdicts_from_prescreen([
+            {"id": 1, "decided": True,  "isRemoteEU": False},
+            {"id": 2, "decided": True,  "isRemoteEU": True},
+            {"id": 3, "decided": False, "isRemoteEU": None},
+        ])
+        assert verdicts == {1: False, 2: True, 3: None}
+
+    def test_expected_value_ranks_accepted_first(self):
+        assert expected_value(True) > expected_value(None) > expected_value(False)
+
+
+class TestPlanRoleTagging:
+
+    def test_non_eu_never_reaches_paid_tier(self):
+        plan = plan_role_tagging(_jobs(1, 2), {1: None, 2: None}, {1: False})
+        assert [j["id"] for j, _ in plan.non_eu] == [1]
+        assert [j["id"] for j in plan.paid] == [2]
+
+    def test_role_nomatch_wins_over_eu_rejection(self):
+        plan = plan_role_tagging(_jobs(1), {1: _tags()}, {1: False})
+        assert len(plan.no_match) == 1
+        assert not plan.non_eu
+
+    def test_keyword_match_rejected_as_non_eu_keeps_tags(self):
+        tags = _tags(ai=True)
+        plan = plan_role_tagging(_jobs(1), {1: tags}, {1: False})
+        assert plan.non_eu == [({"id": 1, "title": "Job 1"}, tags)]
+
+    def test_keyword_match_stays_free(self):
+        plan = plan_role_tagging(_jobs(1), {1: _tags(frontend=True)}, {})
+        assert len(plan.heuristic) == 1
+        assert not plan.paid
+
+    def test_paid_ordered_by_expected_value_then_recency(self):
+        plan = plan_role_tagging(_jobs(1, 2, 3), {}, {1: None, 2: True, 3: None})
+        assert [j["id"] for j in plan.paid] == [2, 1, 3]
+
+    def test_budget_defers_lowest_value(self):
+        plan = plan_role_tagging(_jobs(1, 2, 3), {}, {3: True}, paid_budget=1)
+        assert [j["id"] for j in plan.paid] == [3]
+        assert [j["id"] for j in plan.deferred] == [1, 2]
+        assert plan.summary()["deferred"] == 2
+
+
+class TestSkillExtractionPolicy:
+
+    def test_non_eu_is_opt_in(self):
+        assert "non-eu" not in skill_extraction_statuses()
+        assert "non-eu" in skill_extraction_statuses(include_non_eu=True)
+        assert "eu-remote" in skill_extraction_statuses()
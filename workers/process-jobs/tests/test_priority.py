@@ -0,0 +1,88 @@
+"""Tests for freshness-priority scheduling."""
+
+import sqlite3
+from datetime import datetime, timedelta, timezone
+
+from src.priority import (
+    AGING_PER_HOUR,
+    band_latency,
+    effective_priority,
+    job_priority,
+    parse_ts,
+    priority_band,
+    priority_rank,
+)
+
+NOW = datetime(2026, 3, 1, 12, tzinfo=timezone.utc)
+
+
+def _job(source_kind="greenhouse", hours_old=0.0, **extra):
+    posted = (NOW - timedelta(hours=hours_old)).isoformat()
+    return {"source_kind": source_kind, "posted_at": posted, **extra}
+
+
+def test_parse_ts_formats():
+    assert parse_ts("2026-03-01 12:00:00") == NOW
+    assert parse_ts("2026-03-01T12:00:00.000Z") == NOW
+    assert parse_ts(int(NOW.timestamp() * 1000)) == NOW
+    assert parse_ts(str(int(NOW.timestamp()))) == NOW
+    assert parse_ts("yesterday") is None
+    assert parse_ts(None) is None
+
+
+def test_fresh_ats_target_role_outranks_stale_aggregator():
+    fresh = job_priority(_job("greenhouse", 1), True, (8, 10), NOW)
+    stale = job_priority(_job("remoteok", 24 * 30), None, None, NOW)
+    assert fresh > 0.9
+    assert stale < 0.4
+    assert priority_band(fresh) == "high"
+    assert priority_band(stale) == "low"
+    assert priority_band(None) == "unscored"
+
+
+def test_components_move_the_score():
+    base = job_priority(_job(hours_old=24), None, None, NOW)
+    assert job_priority(_job(hours_old=24), True, None, NOW) > base
+    assert job_priority(_job(hours_old=24), False, None, NOW) < base
+    assert job_priority(_job(hours_old=24), None, (9, 10), NOW) > base
+    assert job_priority(_job(hours_old=24), None, (0, 10), NOW) < base
+    assert job_priority(_job(hours_old=200), None, None, NOW) < base
+    assert job_priority(_job("linkedin", hours_old=24), None, None, NOW) < base
+
+
+def test_rank_ages_waiting_jobs():
+    low_then  = priority_rank(0.1, NOW - timedelta(hours=100))
+    high_now  = priority_rank(0.9, NOW)
+    assert abs(effective_priority(high_now, NOW) - 0.9) < 1e-6
+    assert abs(effective_priority(low_then, NOW) - (0.1 + 100 * AGING_PER_HOUR)) < 1e-6
+    assert low_then > high_now  # waited long enough to overtake
+
+
+def test_rank_orders_in_sqlite_with_nulls_last():
+    db = sqlite3.connect(":memory:")
+    db.execute("CREATE TABLE jobs (id INTEGER, status TEXT, priority_rank REAL, created_at TEXT)")
+    db.executemany("INSERT INTO jobs VALUES (?, 'enhanced', ?, ?)", [
+        (1, priority_rank(0.2, NOW), "2026-02-01"),
+        (2, priority_rank(0.8, NOW), "2026-01-01"),
+        (3, None, "2026-03-01"),
+        (4, priority_rank(0.2, NOW - timedelta(hours=80)), "2025-12-01"),
+    ])
+    ids = [r[0] for r in db.execute(
+        "SELECT id FROM jobs WHERE status = ? ORDER BY priority_rank DESC, created_at DESC", ["enhanced"],
+    )]
+    assert ids == [4, 2, 1, 3]
+
+
+def test_band_latency():
+    rows = [
+        {"id": 1, "priority": 0.9, "created_at": (NOW - timedelta(hours=2)).isoformat()},
+        {"id": 2, "priority": 0.8, "created_at": (NOW - timedelta(hours=4)).isoformat()},
+        {"id": 3, "priority": 0.1, "created_at": "2026-02-28 12:00:00"},
+        {"id": 4, "priority": 0.1, "created_at": "2026-02-27 12:00:00"},
+        {"id": 5, "priority": None, "created_at": None},
+    ]
+    bands = band_latency(rows, NOW, exclude=[4])
+    assert bands == {
+        "high": {"jobs": 2, "p50H": 4.0, "p90H": 4.0, "maxH": 4.0},
+        "low":  {"jobs": 1, "p50H": 24.0, "p90H": 24.0, "maxH": 24.0},
+    }
@@ -0,0 +1,84 @@
+"""Tests for kNN role tagging against labelled jobs."""
+
+import asyncio
+
+from src.role_knn import (
+    MIN_NEIGHBOURS,
+    InMemoryIndex,
+    embed_text,
+    knn_votes,
+    label_roles,
+    labelled_records,
+    role_label,
+    vote,
+)
+
+VOCAB = ("react", "frontend", "llm", "agents", "java", "billing")
+
+calls: list[int] = []   # batch sizes passed to fake_embed
+
+
+async def fake_embed(texts: list[str]) -> list[list[float]]:
+    """Bag-of-words over a tiny vocabulary — enough to give neighbours structure."""
+    calls.append(len(texts))
+    return [[float(t.lower().count(w)) + 0.01 for w in VOCAB] for t in texts]
+
+
+def _match(label: str, score: float) -> dict:
+    return {"id": "1", "score": score, "metadata": {"label": label}}
+
+
+def test_labels_round_trip():
+    assert role_label(True, False) == "10"
+    assert label_roles("01") == (False, True)
+
+
+def test_embed_text_keeps_title_and_first_section():
+    job = {
+        "title": "Frontend Engineer",
+        "description": "<p>" + "We build React apps. " * 15 + "</p><p>Benefits: lots of them.</p>",
+    }
+    text = embed_text(job)
+    assert text.startswith("Frontend Engineer\nWe build React apps.")
+    assert "Benefits" not in text and "<p>" not in text
+
+
+def test_vote_needs_support_and_agreement():
+    assert vote([_match("10", 0.95)] * (MIN_NEIGHBOURS - 1)) is None
+    assert vote([_match("10", 0.95)] * 10 + [_match("00", 0.5)] * 5).unanimous
+    split = vote([_match("10", 0.9)] * 9 + [_match("00", 0.9)])
+    assert split.label == "10" and not split.unanimous and split.agreement == 0.9
+    assert vote([_match("10", 0.9)] * 6 + [_match("00", 0.9)] * 4) is None
+
+
+def test_knn_votes_and_incremental_index():
+    calls.clear()
+    index   = InMemoryIndex()
+    history = [
+        {"id": i, "title": "Senior React Frontend Engineer", "description": "react frontend",
+         "role_frontend_react": 1, "role_ai_engineer": 0, "role_source": "deepseek"}
+        for i in range(1, 7)
+    ] + [
+        {"id": i, "title": "Java Billing Engineer", "description": "java billing",
+         "role_frontend_react": 0, "role_ai_engineer": 0, "role_source": "heuristic"}
+        for i in range(7, 13)
+    ]
+    vectors = {}
+    asyncio.run(index.upsert(asyncio.run(labelled_records(history, vectors, fake_embed))))
+    assert len(index.records) == 12 and index.records["1"]["metadata"] == {"label": "10", "source": "deepseek"}
+
+    jobs = [
+        {"id": 100, "title": "React Frontend Developer", "description": "react frontend"},
+        {"id": 101, "title": "LLM Agents Engineer", "description": "llm agents"},
+    ]
+    calls.clear()
+    votes, job_vectors = asyncio.run(knn_votes(jobs, fake_embed, index))
+    assert calls == [2]                                  # one batched embedding call
+    assert votes[100].label == "10" and 101 not in votes
+    assert set(job_vectors) == {100, 101}
+
+    # The escalated job's final label reuses its vector — no second embedding
+    calls.clear()
+    labelled = [{**jobs[1], "role_frontend_react": 0, "role_ai_engineer": 1, "role_source": "workers-ai"}]
+    records  = asyncio.run(labelled_records(labelled, job_vectors, fake_embed))
+    assert calls == [] and records[0]["metadata"]["label"] == "01"
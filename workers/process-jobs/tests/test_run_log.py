@@ -0,0 +1,70 @@
+"""Tests for the leveled, sampled run logger."""
+
+import json
+
+from src.run_log import LogStats, RunLogger
+
+
+def make_logger(**config):
+    lines  = []
+    logger = RunLogger("test", sink=lines.append)
+    logger.configure(**config)
+    logger.start_run("run-1")
+    return logger, lines
+
+
+def test_lines_are_json_with_fields():
+    logger, lines = make_logger(level="info", job_sample=1)
+    logger.job("info", 7, "role tagged", source="heuristic")
+    assert json.loads(lines[0]) == {
+        "level": "info", "worker": "test", "msg": "role tagged", "job": 7, "source": "heuristic",
+    }
+
+
+def test_level_filtering():
+    logger, lines = make_logger(level="warn")
+    logger.info("phase start")
+    logger.warn("slow")
+    assert [json.loads(line)["msg"] for line in lines] == ["slow"]
+    assert logger.stats.suppressed == 1
+
+
+def test_job_sampling_is_per_run_and_keeps_whole_jobs():
+    logger, lines = make_logger(job_sample=0.1)
+    for job_id in range(2000):
+        logger.job("info", job_id, "a")
+        logger.job("warn", job_id, "b")
+    printed = [json.loads(line)["job"] for line in lines]
+    assert 100 < len(set(printed)) < 300
+    assert printed.count(printed[0]) == 2
+
+    first = set(printed)
+    logger.start_run("run-2")
+    lines.clear()
+    for job_id in range(2000):
+        logger.job("info", job_id, "a")
+    assert {json.loads(line)["job"] for line in lines} != first
+
+
+def test_errors_and_summaries_always_print():
+    logger, lines = make_logger(level="error", job_sample=0)
+    logger.job("warn", 1, "dropped")
+    logger.job("error", 1, "failed")
+    logger.summary("done", errors=1)
+    assert [json.loads(line)["msg"] for line in lines] == ["failed", "done"]
+    assert json.loads(lines[1])["summary"] is True
+
+
+def test_invalid_config_keeps_defaults():
+    logger, _ = make_logger(level="loud", job_sample="lots")
+    assert (logger.level, logger.job_sample) == (20, 0.02)
+
+
+def test_stats_round_trip():
+    logger, lines = make_logger()
+    before = logger.stats.snapshot()
+    logger.summary("done")
+    delta = logger.stats.since(before)
+    assert delta.lines == 1 and delta.bytes == len(lines[0])
+    assert LogStats.from_stats(delta.as_stats()).lines == 1
+    assert (delta + delta).bytes == 2 * delta.bytes
@@ -0,0 +1,66 @@
+"""Tests for per-job skill vocabulary pruning."""
+
+from src._generated_schema import SKILL_TAGS
+from src.skill_vocab import (
+    GROUP_NAMES,
+    GROUPS,
+    mentions_skill,
+    recall,
+    select_groups,
+    vocabulary,
+)
+
+# Common spellings of tags the extraction prompt should still be able to find
+SPELLINGS = {
+    "nodejs": "Node.js", "nextjs": "Next.js", "postgresql": "Postgres", "kubernetes": "K8s",
+    "huggingface": "Hugging Face", "scikit": "scikit-learn", "react-native": "React Native",
+    "websocket": "WebSockets", "vector-db": "a vector database", "drizzle-orm": "Drizzle",
+    "react-query": "TanStack Query", "apollo-client": "Apollo", "spring-boot": "Spring Boot",
+    "cloudflare-workers-ai": "Workers AI", "shadcn-ui": "shadcn", "agents": "AI agents",
+}
+
+
+def _job(description: str, **columns) -> dict:
+    return {"id": 1, "title": "Software Engineer", "description": description, **columns}
+
+
+def test_groups_partition_the_vocabulary():
+    tags = [tag for _, group in GROUPS for tag in group]
+    assert len(tags) == len(set(tags)) and set(tags) == SKILL_TAGS
+    assert vocabulary(GROUP_NAMES) == tuple(tags)
+
+
+def test_selection_follows_role_tags_and_prescan():
+    plain = select_groups(_job("You will own our payments ledger written in Go."))
+    assert plain[0] == "core" and "ai" not in plain and "frontend" not in plain
+
+    assert "frontend" in select_groups(_job("Own the ledger.", role_frontend_react=1))
+    assert "ai" in select_groups(_job("Own the ledger.", role_ai_engineer=1))
+    ml = select_groups(_job("Fine-tune LLMs with PyTorch and serve them on Kubernetes."))
+    assert {"ai", "cloud"} <= set(ml) and "mobile" not in ml
+    assert select_groups(_job("Nothing here."), "We build React apps.") == ("core", "frontend")
+
+
+def test_same_groups_render_the_same_vocabulary():
+    a = select_groups(_job("React and TypeScript, tested with Jest."))
+    b = select_groups(_job("Jest-tested TypeScript UI in React."))
+    assert a == b and vocabulary(a) == vocabulary(b)
+    assert len(vocabulary(a)) < len(SKILL_TAGS) / 2
+
+
+def test_recall_every_tag_mentioned_survives_pruning():
+    for tag in sorted(SKILL_TAGS):
+        for text in (tag.replace("-", " "), SPELLINGS.get(tag, tag)):
+            groups = select_groups(_job(f"Experience with {text} is required."))
+            assert tag in vocabulary(groups), (tag, text)
+
+
+def test_recall_counts_tags_the_pruned_vocabulary_keeps():
+    groups = select_groups(_job("React and TypeScript."))
+    assert recall(["react", "typescript", "pytorch", "not-a-tag"], groups) == (2, 3)
+
+
+def test_mentions_skill_matches_whole_tag_words():
+    assert mentions_skill("Our stack: Python, Node.js and PostgreSQL.")
+    assert mentions_skill("You will ship React Native apps.")
+    assert not mentions_skill("We are an equal opportunity employer and value diversity.")
@@ -0,0 +1,76 @@
+"""Tests for the title-level role decision memo."""
+
+from src.title_memo import (
+    MIN_SUPPORT,
+    REFRESH_S,
+    TitleMemo,
+    decide,
+    normalize_title,
+)
+
+
+class Clock:
+    def __init__(self, now=1_780_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def _row(title, fr, ai, n):
+    return {"title": title, "role_frontend_react": fr, "role_ai_engineer": ai, "n": n}
+
+
+def test_normalize_title_drops_work_mode_and_location_noise():
+    assert normalize_title("Senior Backend Engineer (Remote - EU)") == "senior backend engineer"
+    assert normalize_title("Senior Backend Engineer (m/f/d)") == "senior backend engineer"
+    assert normalize_title("Staff Frontend Engineer (React)") == "staff frontend engineer react"
+    assert normalize_title("C++ & C# Developer") == "c++ and c# developer"
+    assert normalize_title("Remote") == ""
+
+
+def test_decide_needs_support_and_agreement():
+    assert decide({(False, False): MIN_SUPPORT - 1}) is None
+    entry = decide({(False, False): 40, (True, False): 1})
+    assert entry == decide({(False, False): 40, (True, False): 1})
+    assert (entry.is_frontend_react, entry.support, entry.agreement) == (False, 41, 0.976)
+    assert decide({(True, False): 9, (False, False): 1}) is None
+
+
+def test_load_merges_title_variants_and_counts_hits():
+    clock = Clock()
+    memo  = TitleMemo(clock=clock)
+    assert memo.stale()
+    decided = memo.load([
+        _row("Senior Backend Engineer", 0, 0, 4),
+        _row("Senior Backend Engineer - Remote", 0, 0, 3),
+        _row("Staff Frontend Engineer (React)", 1, 0, 6),
+        _row("Staff Frontend Engineer (React)", 0, 0, 2),
+        _row("ML Engineer", 0, 1, 2),
+    ])
+    assert decided == 1 and memo.titles_seen == 3
+
+    before = memo.snapshot()
+    assert memo.lookup("Senior Backend Engineer (m/f/d)").support == 7
+    assert memo.lookup("Staff Frontend Engineer (React)") is None
+    stats = memo.since(before)
+    assert stats["titleMemoLookups"] == 2 and stats["titleMemoCoverage"] == 0.5
+    assert stats["titleMemoAgreement"] is None
+
+    assert not memo.stale()
+    clock.now += REFRESH_S
+    assert memo.stale()
+
+
+def test_audits_are_a_stable_sample_and_measure_agreement():
+    memo  = TitleMemo()
+    picks = [i for i in range(10_000) if memo.audited(i)]
+    assert 100 < len(picks) < 300
+    assert picks == [i for i in range(10_000) if memo.audited(i)]
+
+    memo.load([_row("Senior Backend Engineer", 0, 0, 10)])
+    before = memo.snapshot()
+    entry  = memo.lookup("Senior Backend Engineer")
+    assert memo.record_audit(entry, False, False) is True
+    assert memo.record_audit(entry, False, True) is False
+    assert memo.since(before)["titleMemoAgreement"] == 0.5
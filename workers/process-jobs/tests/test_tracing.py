@@ -0,0 +1,107 @@
+"""Tests for cross-worker span tracing."""
+
+import asyncio
+import json
+
+import pytest
+
+from src import tracing
+from src.tracing import PARENT_HEADER, TRACE_HEADER, JsonExporter, Tracer
+
+
+def make_tracer():
+    exporter = JsonExporter()
+    return Tracer("test", exporter), exporter
+
+
+def test_spans_nest_and_propagate_headers():
+    tracer, exporter = make_tracer()
+    tracer.start_trace("abc", parent_id="caller")
+    with tracer.span("phase.tag", "phase") as phase:
+        with tracer.span("service", "service") as call:
+            headers = tracer.headers({"Content-Type": "application/json"})
+    tracer.flush()
+
+    assert headers == {"Content-Type": "application/json", TRACE_HEADER: "abc", PARENT_HEADER: call.span_id}
+    spans = {s["name"]: s for s in exporter.spans()}
+    assert spans["phase.tag"]["parent"] == "caller"
+    assert spans["service"]["parent"] == phase.span_id
+    assert exporter.records[-1]["type"] == "trace"
+    assert exporter.records[-1]["kinds"]["service"]["count"] == 1
+    assert tracer.trace_id is None and tracer.headers() == {}
+
+
+def test_errors_are_recorded_and_reraised():
+    tracer, exporter = make_tracer()
+    tracer.start_trace()
+    with pytest.raises(ValueError):
+        with tracer.span("d1.run", "d1", sql="UPDATE jobs"):
+            raise ValueError("locked")
+    tracer.flush()
+    span = exporter.spans()[0]
+    assert span["status"] == "error" and span["attrs"] == {"sql": "UPDATE jobs", "error": "locked"}
+    assert exporter.records[-1]["kinds"]["d1"]["errors"] == 1
+
+
+def test_spans_export_in_chunks(monkeypatch):
+    monkeypatch.setattr(tracing, "EXPORT_CHUNK", 3)
+    tracer, exporter = make_tracer()
+    tracer.start_trace("t")
+    before = tracer.totals_snapshot()
+    for _ in range(7):
+        with tracer.span("fetch", "fetch"):
+            pass
+    assert [len(r["spans"]) for r in exporter.records] == [3, 3]
+    assert tracer.totals_since(before)["fetch"]["count"] == 7
+    tracer.flush()
+    assert [r["type"] for r in exporter.records] == ["spans", "spans", "spans", "trace"]
+
+
+def test_json_exporter_dump(tmp_path):
+    tracer, exporter = make_tracer()
+    with tracer.span("ai.run", "ai", model="m"):
+        pass
+    tracer.flush()
+    path = tmp_path / "trace.jsonl"
+    exporter.dump(str(path))
+    records = [json.loads(line) for line in path.read_text().splitlines()]
+    assert records == exporter.records and records[0]["worker"] == "test"
+
+
+def test_concurrent_requests_keep_their_own_span_nesting():
+    tracer, exporter = make_tracer()
+
+    async def job(name, started, resume):
+        with tracer.span(name, "phase") as phase:
+            started.set()
+            await resume.wait()
+            with tracer.span(f"{name}.d1", "d1") as child:
+                pass
+        return phase, child
+
+    async def main():
+        tracer.start_trace("first")
+        started, resume = asyncio.Event(), asyncio.Event()
+        first = asyncio.create_task(job("first", started, resume))
+        await started.wait()
+        # A second request (e.g. /health) starts its trace while "first" has a span open
+        tracer.start_trace("second")
+        with tracer.span("health", "internal"):
+            pass
+        resume.set()
+        return await first
+
+    phase, child = asyncio.run(main())
+    tracer.flush()
+    assert child.parent_id == phase.span_id and phase.status == "ok"
+    assert tracer.headers() == {}
+
+
+def test_span_exit_never_raises():
+    tracer, _ = make_tracer()
+    scope = tracer.span("fetch", "fetch")
+    scope.__enter__()
+    other = tracer.span("other", "fetch")
+    other._token = scope._token
+    scope.__exit__(None, None, None)
+    assert other.__exit__(None, None, None) is False     # token already used
@@ -5,10 +5,14 @@ Features:
   ✓ LlamaParse for intelligent PDF parsing (OCR, tables, markdown)
   ✓ Workers AI embeddings (bge-base-en-v1.5, 768-dim)
   ✓ Vectorize storage with user-based namespacing
-  ✓ RAG-powered chat using Llama 3.3 70B
+  ✓ RAG-powered chat (Llama 3.1 8B, escalating to Llama 3.3 70B — model_router.py)
   ✓ Base64 PDF upload (browser compatible)
 """
 
+# Time every import below — reported by GET /health (see import_profile.py)
+from import_profile import IMPORT_PROFILE
+IMPORT_PROFILE.start()
+
 import json
 import re
 import base64
@@ -19,6 +23,8 @@ from typing import Any, Dict, List, Optional
 # Cloudflare Workers runtime
 from workers import Response, WorkerEntrypoint
 
+from model_router import MODEL_ROUTER, TASK_CHAT, run_routed
+
 
 # ---------------------------------------------------------------------------
 # Constants
@@ -397,7 +403,13 @@ class Default(WorkerEntrypoint):
         }
 
     async def _generate_text(self, prompt: str, context: str) -> str:
-        """Call Workers AI text generation directly (no langchain)."""
+        """Call Workers AI text generation directly (no langchain).
+
+        The model router picks the model from the prompt + context size,
+        moving to the larger one only when the smaller returns nothing.
+        Routing decisions are logged as ``[model-router]`` JSON lines (this
+        worker has no D1 binding).
+        """
         from js import JSON as JsJSON
 
         messages = [
@@ -417,12 +429,26 @@ class Default(WorkerEntrypoint):
         ]
 
         js_input = JsJSON.parse(json.dumps({"messages": messages}))
-        result = await self.env.AI.run(
-            "@cf/meta/llama-3.3-70b-instruct-fp8-fast",
-            js_input,
+
+        async def generate_with(model: str) -> Optional[str]:
+            try:
+                result = await self.env.AI.run(model, js_input)
+            except Exception as e:
+                print(f"Workers AI {model} failed: {e}")
+                return None
+            result_dict = json.loads(JsJSON.stringify(result))
+            return result_dict.get("response", "")
+
+        MODEL_ROUTER.configure(getattr(self.env, "LLM_ROUTES", None))
+        text = await run_routed(
+            MODEL_ROUTER, TASK_CHAT, len(prompt) + len(context), generate_with,
+            lambda r: bool(r and r.strip()),
         )
-        result_dict = json.loads(JsJSON.stringify(result))
-        return result_dict.get("response", "")
+        for row in MODEL_ROUTER.drain():
+            print(f"[model-router] {json.dumps({'worker': 'resume-rag', **row})}")
+        if text is None:
+            raise RuntimeError("Workers AI text generation failed on every routed model")
+        return text
 
     def _authenticate(self, request) -> Optional[Response]:
         """Validate API key. Returns an error Response if invalid, None if ok."""
@@ -472,6 +498,7 @@ class Default(WorkerEntrypoint):
                 "ai": hasattr(self.env, "AI"),
                 "vectorize": hasattr(self.env, "VECTORIZE"),
             },
+            "imports": IMPORT_PROFILE.report(),
         }, headers=self._cors_headers)
 
     async def _handle_resume_status(self, request):
@@ -789,6 +816,7 @@ class Default(WorkerEntrypoint):
 
     async def fetch(self, request):
         """Handle incoming HTTP requests."""
+        IMPORT_PROFILE.mark_request()
         try:
             # CORS preflight — 204 with max-age so browsers cache it
             if request.method == "OPTIONS":
@@ -856,3 +884,7 @@ class Default(WorkerEntrypoint):
                 status=500,
                 headers=self._cors_headers,
             )
+
+
+# Entry module fully loaded — stop timing imports.
+IMPORT_PROFILE.stop()